@@ -0,0 +1,141 @@
+"""
+Command to benchmark the import of a generated OLX course into the split modulestore, with the
+structures and definitions of the import inserted one by one and in batches.
+"""
+
+
+import shutil
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from unittest.mock import patch
+
+import pymongo
+from django.core.management.base import BaseCommand
+from path import Path as path
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.xml_importer import import_course_from_xml
+
+# The methods of the mongo collections that are counted as reads and as writes.
+MONGO_READ_METHODS = ['find', 'count_documents', 'aggregate']
+MONGO_WRITE_METHODS = ['insert_one', 'insert_many', 'replace_one', 'update_one', 'update_many', 'bulk_write', '_delete']
+
+
+def write_synthetic_course(course_dir, num_chapters, num_sequentials, num_verticals, num_components):
+    """
+    Writes the OLX of a synthetic course, with the given number of chapters,
+    sequentials per chapter, verticals per sequential and components (alternately
+    html blocks and problems) per vertical, inline in the course run XML.
+
+    Returns the number of blocks of the course.
+    """
+    lines = ['<course display_name="OLX Import Benchmark">']
+    num_blocks = 1
+    for chapter in range(num_chapters):
+        lines.append(f'  <chapter url_name="chapter_{chapter}" display_name="Chapter {chapter}">')
+        for sequential in range(num_sequentials):
+            sequential_id = f'{chapter}_{sequential}'
+            lines.append(f'    <sequential url_name="sequential_{sequential_id}" graded="true" format="Homework">')
+            for vertical in range(num_verticals):
+                vertical_id = f'{sequential_id}_{vertical}'
+                lines.append(f'      <vertical url_name="vertical_{vertical_id}">')
+                for component in range(num_components):
+                    component_id = f'{vertical_id}_{component}'
+                    if component % 2:
+                        lines.append(
+                            f'        <problem url_name="problem_{component_id}"><multiplechoiceresponse>'
+                            '<choicegroup type="MultipleChoice"><choice correct="true">Yes</choice>'
+                            '<choice correct="false">No</choice></choicegroup></multiplechoiceresponse></problem>'
+                        )
+                    else:
+                        lines.append(f'        <html url_name="html_{component_id}"><p>Html {component_id}</p></html>')
+                lines.append('      </vertical>')
+            lines.append('    </sequential>')
+        lines.append('  </chapter>')
+        num_blocks += 1 + num_sequentials * (1 + num_verticals * (1 + num_components))
+    lines.append('</course>')
+
+    course_dir.makedirs_p()
+    (course_dir / 'course.xml').write_text('<course url_name="run" org="Benchmark" course="OLX"/>')
+    (course_dir / 'course').makedirs_p()
+    (course_dir / 'course' / 'run.xml').write_text('\n'.join(lines))
+    return num_blocks
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py cms benchmark_olx_import --settings=devstack
+        $ ./manage.py cms benchmark_olx_import --chapters 2 --batch-size 500
+    """
+    help = (
+        'Compares the wall time and the number of mongo reads and writes of the import of a generated OLX course '
+        'into the split modulestore, with the structures and definitions inserted one by one and in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chapters', type=int, default=11, help='Number of chapters of the course.')
+        parser.add_argument('--sequentials', type=int, default=10, help='Number of sequentials per chapter.')
+        parser.add_argument('--verticals', type=int, default=10, help='Number of verticals per sequential.')
+        parser.add_argument('--components', type=int, default=8, help='Number of components per vertical.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000, help='Number of documents per insert of the batched import.',
+        )
+
+    def handle(self, *args, **options):
+        store = modulestore()
+        split_store = store._get_modulestore_by_type(ModuleStoreEnum.Type.split)  # pylint: disable=protected-access
+        data_dir = path(tempfile.mkdtemp())
+        try:
+            num_blocks = write_synthetic_course(
+                data_dir / 'benchmark', options['chapters'], options['sequentials'], options['verticals'],
+                options['components'],
+            )
+            self.stdout.write(f"{'batch size':>10} {'blocks':>8} {'time (s)':>9} {'reads':>8} {'writes':>8}")
+            for batch_size in (0, options['batch_size']):
+                course_key = split_store.make_course_key('Benchmark', 'OLX', f'batch_{batch_size}_{int(time.time())}')
+                original_batch_size = split_store.bulk_write_batch_size
+                split_store.bulk_write_batch_size = batch_size
+                try:
+                    with store.default_store(ModuleStoreEnum.Type.split), _count_mongo_calls() as counts:
+                        start = time.time()
+                        import_course_from_xml(
+                            store, ModuleStoreEnum.UserID.mgmt_command, data_dir, ['benchmark'],
+                            target_id=course_key, create_if_not_present=True, raise_on_failure=True,
+                            do_import_static=False,
+                        )
+                        duration = time.time() - start
+                finally:
+                    split_store.bulk_write_batch_size = original_batch_size
+                store.delete_course(course_key, ModuleStoreEnum.UserID.mgmt_command)
+                reads = sum(counts[method] for method in MONGO_READ_METHODS)
+                writes = sum(counts[method] for method in MONGO_WRITE_METHODS)
+                self.stdout.write(f'{batch_size:>10} {num_blocks:>8} {duration:>9.2f} {reads:>8} {writes:>8}')
+        finally:
+            shutil.rmtree(data_dir)
+
+
+@contextmanager
+def _count_mongo_calls():
+    """
+    Counts the calls to the read and write methods of the mongo collections,
+    by method name, in the yielded Counter.
+    """
+    counts = Counter()
+
+    def counted(method_name, method):
+        @wraps(method)
+        def counted_method(*args, **kwargs):
+            counts[method_name] += 1
+            return method(*args, **kwargs)
+        return counted_method
+
+    with patch.multiple(pymongo.collection.Collection, **{
+        method_name: counted(method_name, getattr(pymongo.collection.Collection, method_name))
+        for method_name in MONGO_READ_METHODS + MONGO_WRITE_METHODS
+    }):
+        yield counts
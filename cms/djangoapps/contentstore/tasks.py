@@ -53,7 +53,11 @@ from cms.djangoapps.contentstore.courseware_index import (
     SearchIndexingError
 )
 from cms.djangoapps.contentstore.storage import course_import_export_storage
-from cms.djangoapps.contentstore.toggles import enable_course_optimizer_check_prev_run_links
+from cms.djangoapps.contentstore.toggles import (
+    enable_course_optimizer_check_prev_run_links,
+    stream_olx_export,
+    use_parallel_static_import,
+)
 from cms.djangoapps.contentstore.utils import (
     IMPORTABLE_FILE_TYPES,
     contains_course_reference,
@@ -89,8 +93,14 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT, ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, InvalidProctoringProvider, ItemNotFoundError
+from xmodule.modulestore.tar_export import TarExportFS
 from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
-from xmodule.modulestore.xml_importer import CourseImportException, import_course_from_xml, import_library_from_xml
+from xmodule.modulestore.xml_importer import (
+    CourseImportException,
+    generate_missing_thumbnails,
+    import_course_from_xml,
+    import_library_from_xml,
+)
 from xmodule.tabs import StaticTab
 from xmodule.util.keys import BlockKey
 
@@ -409,23 +419,25 @@ def create_export_tarball(course_block, course_key, context, status=None):
     name = course_block.url_name
     export_file = NamedTemporaryFile(prefix=name + '.',
                                      suffix=".tar.gz")  # lint-amnesty, pylint: disable=consider-using-with
-    root_dir = path(mkdtemp())
+    root_dir = None
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
+        if stream_olx_export(course_key):
+            # The exported files are compressed into the tarball as they are written.
+            LOGGER.debug('tar file being generated at %s', export_file.name)
+            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
+                _export_to_xml(course_block, course_key, None, name, root_fs=TarExportFS(tar_file))
         else:
-            set_custom_attribute("exporting_course_to_xml_started", str(course_key))
-            export_course_to_xml(modulestore(), contentstore(), course_block.id, root_dir, name)
-
-            set_custom_attribute("exporting_course_to_xml_completed", str(course_key))
+            root_dir = path(mkdtemp())
+            _export_to_xml(course_block, course_key, root_dir, name)
         if status:
             status.set_state('Compressing')
             set_custom_attribute("compressing_started", str(course_key))
             status.increment_completed_steps()
-        LOGGER.debug('tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+        if root_dir is not None:
+            LOGGER.debug('tar file being generated at %s', export_file.name)
+            with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
+                tar_file.add(root_dir / name, arcname=name)
 
     except SerializationError as exc:
         LOGGER.exception('There was an error exporting %s', course_key, exc_info=True)
@@ -459,13 +471,26 @@ def create_export_tarball(course_block, course_key, context, status=None):
             status.fail(json.dumps({'raw_error_msg': context['raw_err_msg']}))
         raise
     finally:
-        if os.path.exists(root_dir / name):
+        if root_dir is not None and os.path.exists(root_dir / name):
             shutil.rmtree(root_dir / name)
 
     set_custom_attribute("compressing_completed", str(course_key))
     return export_file
 
 
+def _export_to_xml(course_block, course_key, root_dir, name, root_fs=None):
+    """
+    Exports the course or library as OLX to the `name` directory of `root_dir`, or of `root_fs` if given.
+    """
+    if isinstance(course_key, LibraryLocator):
+        export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name, root_fs=root_fs)
+    else:
+        set_custom_attribute("exporting_course_to_xml_started", str(course_key))
+        export_course_to_xml(modulestore(), contentstore(), course_block.id, root_dir, name, root_fs=root_fs)
+
+        set_custom_attribute("exporting_course_to_xml_completed", str(course_key))
+
+
 class CourseImportTask(UserTask):  # pylint: disable=abstract-method
     """
     Base class for course and library import tasks.
@@ -731,6 +756,7 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
         self.status.increment_completed_steps()
         LOGGER.info(f'{log_prefix}: Extracted file verified. Updating course started')
 
+        parallel_static_import = use_parallel_static_import(courselike_key)
         courselike_items = import_func(
             modulestore(), user.id,
             settings.GITHUB_REPO_ROOT, [dirpath],
@@ -738,10 +764,14 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
             static_content_store=contentstore(),
             target_id=courselike_key,
             verbose=True,
+            static_content_workers=settings.COURSE_IMPORT_STATIC_CONTENT_WORKERS if parallel_static_import else 0,
+            defer_thumbnails=parallel_static_import,
         )
 
         new_location = courselike_items[0].location
         LOGGER.debug('new course at %s', new_location)
+        if parallel_static_import:
+            generate_missing_asset_thumbnails.delay(str(courselike_key))
 
         LOGGER.info(f'{log_prefix}: Course import successful')
         set_custom_attribute('course_import_completed', True)
@@ -773,6 +803,18 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
         sync_discussion_settings(courselike_key, user)
 
 
+@shared_task
+@set_code_owner_attribute
+def generate_missing_asset_thumbnails(course_key_string):
+    """
+    Generates the thumbnails of the image assets of the course that have none, such as the
+    ones whose generation was deferred during a course import.
+    """
+    course_key = CourseKey.from_string(course_key_string)
+    generate_missing_thumbnails(contentstore(), course_key)
+    LOGGER.info('Generated the missing asset thumbnails of %s', course_key)
+
+
 @shared_task
 @set_code_owner_attribute
 def update_all_outlines_from_modulestore_task():
@@ -4,6 +4,7 @@ Unit tests for course import and export Celery tasks
 import copy
 import json
 import logging
+import tarfile
 from unittest import mock
 from unittest.mock import AsyncMock, patch, MagicMock
 from uuid import uuid4
@@ -22,6 +23,7 @@ from user_tasks.models import UserTaskArtifact, UserTaskStatus
 
 from cms.djangoapps.contentstore.tests.test_libraries import LibraryTestCase
 from cms.djangoapps.contentstore.tests.utils import CourseTestCase
+from cms.djangoapps.contentstore.toggles import STREAM_OLX_EXPORT
 from common.djangoapps.course_action_state.models import CourseRerunState
 from common.djangoapps.student.tests.factories import UserFactory
 from openedx.core.djangoapps.course_apps.toggles import EXAMS_IDA
@@ -76,6 +78,29 @@ class ExportCourseTestCase(CourseTestCase):
         output = artifacts[0]
         self.assertEqual(output.name, 'Output')
 
+    @override_waffle_flag(STREAM_OLX_EXPORT, active=True)
+    def test_success_streamed(self):
+        """
+        Verify that a course export streamed into the tarball has the same OLX as a routine one
+        """
+        key = str(self.course.location.course_key)
+        with override_waffle_flag(STREAM_OLX_EXPORT, active=False):
+            routine_names = self._export_tarball_names(key)
+        streamed_names = self._export_tarball_names(key)
+        self.assertIn(f'{self.course.url_name}/course.xml', streamed_names)
+        self.assertEqual(streamed_names, routine_names)
+
+    def _export_tarball_names(self, key):
+        """
+        Export the course and return the names of the files and directories in the tarball
+        """
+        result = export_olx.delay(self.user.id, key, 'en')
+        status = UserTaskStatus.objects.get(task_id=result.id)
+        self.assertEqual(status.state, UserTaskStatus.SUCCEEDED)
+        output = UserTaskArtifact.objects.get(status=status)
+        with output.file.open('rb') as export_file, tarfile.open(fileobj=export_file, mode='r:gz') as tar_file:
+            return sorted(tar_file.getnames())
+
     @mock.patch('cms.djangoapps.contentstore.tasks.export_course_to_xml', side_effect=side_effect_exception)
     def test_exception(self, mock_export):  # pylint: disable=unused-argument
         """
@@ -561,3 +561,44 @@ def enable_course_optimizer_check_prev_run_links(course_key):
     Returns a boolean if previous run course optimizer feature is enabled for the given course.
     """
     return ENABLE_COURSE_OPTIMIZER_CHECK_PREV_RUN_LINKS.is_enabled(course_key)
+
+
+# .. toggle_name: contentstore.stream_olx_export
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, the OLX and the static assets of a course export are written straight
+#   into the compressed export tarball as they are exported, with the assets streamed from GridFS, instead of
+#   being written to a temporary directory tree on disk which is then archived in a second pass.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+STREAM_OLX_EXPORT = CourseWaffleFlag(
+    f'{CONTENTSTORE_NAMESPACE}.stream_olx_export', __name__, CONTENTSTORE_LOG_PREFIX
+)
+
+
+def stream_olx_export(course_key):
+    """
+    Returns a boolean if the OLX exports of the course are streamed into the export tarball.
+    """
+    return STREAM_OLX_EXPORT.is_enabled(course_key)
+
+
+# .. toggle_name: contentstore.parallel_static_import
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, the static assets of a course import are uploaded on up to
+#   COURSE_IMPORT_STATIC_CONTENT_WORKERS threads, the assets that are already stored with the same content digest
+#   and attributes are not uploaded again, and the thumbnails of the imported images are generated by a celery task
+#   after the import rather than during it.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+PARALLEL_STATIC_IMPORT = CourseWaffleFlag(
+    f'{CONTENTSTORE_NAMESPACE}.parallel_static_import', __name__, CONTENTSTORE_LOG_PREFIX
+)
+
+
+def use_parallel_static_import(course_key):
+    """
+    Returns a boolean if the static assets of the course imports are imported in parallel.
+    """
+    return PARALLEL_STATIC_IMPORT.is_enabled(course_key)
@@ -592,6 +592,12 @@ MODULESTORE = {
                         'default_class': 'xmodule.hidden_block.HiddenBlock',
                         'fs_root': DATA_DIR,
                         'render_template': 'common.djangoapps.edxmako.shortcuts.render_to_string',
+                        # Large loads of definitions are queried in batches of definition_load_batch_size
+                        # definitions, on up to definition_load_workers threads (if not 0). The definitions of
+                        # lazily loaded blocks are fetched together, lazy_definition_batch_size at a time.
+                        'definition_load_workers': 0,
+                        'definition_load_batch_size': 500,
+                        'lazy_definition_batch_size': 100,
                     }
                 },
                 {
@@ -693,6 +699,13 @@ STATICFILES_DIRS = [
 ]
 
 COURSE_IMPORT_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
+
+# .. setting_name: COURSE_IMPORT_STATIC_CONTENT_WORKERS
+# .. setting_default: 8
+# .. setting_description: Number of threads that upload the static assets of a course import, when the
+#   contentstore.parallel_static_import course waffle flag is enabled.
+COURSE_IMPORT_STATIC_CONTENT_WORKERS = 8
+
 COURSE_METADATA_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
 STATICI18N_ROOT = PROJECT_ROOT / "static"
@@ -183,6 +183,32 @@ def anonymous_id_for_user(user, course_id):
     return anonymous_user_id
 
 
+def prefetch_anonymous_ids_for_users(users, course_id):
+    """
+    Reads the stored anonymous ids of the given users for the course_id with
+    a single query, and caches them in the user objects, so that the calls of
+    anonymous_id_for_user for these users and course_id don't query them one
+    by one. The ids that aren't stored yet are still created by
+    anonymous_id_for_user.
+    """
+    users_by_id = {
+        user.id: user for user in users
+        if not user.is_anonymous and course_id not in getattr(user, '_anonymous_id', {})
+    }
+    if not users_by_id:
+        return
+    # Ordered by id, so that the most recently created id of a user is the
+    # one cached, as in anonymous_id_for_user.
+    stored_ids = AnonymousUserId.objects.filter(
+        user_id__in=list(users_by_id), course_id=course_id,
+    ).order_by('id').values_list('user_id', 'anonymous_user_id')
+    for user_id, anonymous_user_id in stored_ids:
+        user = users_by_id[user_id]
+        if not hasattr(user, '_anonymous_id'):
+            user._anonymous_id = {}  # pylint: disable=protected-access
+        user._anonymous_id[course_id] = anonymous_user_id  # pylint: disable=protected-access
+
+
 def user_by_anonymous_id(uid):
     """
     Return user by anonymous_user_id using AnonymousUserId lookup table.
@@ -30,6 +30,7 @@ from common.djangoapps.student.models import (
     LinkedInAddToProfileConfiguration,
     UserAttribute,
     anonymous_id_for_user,
+    prefetch_anonymous_ids_for_users,
     unique_id_for_user,
     user_by_anonymous_id
 )
@@ -1129,6 +1130,18 @@ class AnonymousLookupTable(ModuleStoreTestCase):
             assert anonymous_id != new_anonymous_id
             assert self.user == user_by_anonymous_id(new_anonymous_id)
 
+    def test_prefetch_anonymous_ids_for_users(self):
+        anonymous_id = anonymous_id_for_user(self.user, self.course.id)
+        users = [User.objects.get(pk=self.user.id), User.objects.get(pk=self.user2.id)]
+        with self.assertNumQueries(1):
+            prefetch_anonymous_ids_for_users(users, self.course.id)
+        with self.assertNumQueries(0):
+            assert anonymous_id_for_user(users[0], self.course.id) == anonymous_id
+        # The ids that aren't stored yet are created as before.
+        anonymous_id_2 = anonymous_id_for_user(users[1], self.course.id)
+        assert anonymous_id_2 != anonymous_id
+        assert self.user2 == user_by_anonymous_id(anonymous_id_2)
+
 
 @skip_unless_lms
 @patch('openedx.core.djangoapps.programs.utils.get_programs')
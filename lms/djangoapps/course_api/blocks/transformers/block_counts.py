@@ -12,6 +12,8 @@ class BlockCountsTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    # Only the category of each block is collected; the counts are aggregated in transform.
+    INCREMENTAL_COLLECT = True
     BLOCK_COUNTS = 'block_counts'
 
     def __init__(self, block_types_to_count):
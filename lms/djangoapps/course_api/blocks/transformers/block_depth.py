@@ -13,6 +13,7 @@ class BlockDepthTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
     BLOCK_DEPTH = 'block_depth'
 
     def __init__(self, requested_depth=None):
@@ -25,6 +25,8 @@ class BlockNavigationTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    # Only the hide_from_toc field of each block is collected; the navigation is built in transform.
+    INCREMENTAL_COLLECT = True
     BLOCK_NAVIGATION = 'block_nav'
     BLOCK_NAVIGATION_FOR_CHILDREN = 'children_block_nav'
 
@@ -12,6 +12,7 @@ from openedx.core.djangoapps.content.block_structure.api import get_block_struct
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.features.content_type_gating.block_transformers import ContentTypeGateTransformer
 
+from . import transformed_cache
 from .transformers import library_content, load_override_data, start_date, user_partitions, visibility
 from .usage_info import CourseUsageInfo
 
@@ -93,20 +94,66 @@ def get_course_blocks(
             exactly equivalent to the blocks that the given user has
             access.
     """
+    # Only the default transformers are known to transform the structure
+    # based on nothing but the collected data and the user's context in
+    # the course, so only their output is cached.
+    cacheable_transformers = None
     if not transformers:
-        transformers = BlockStructureTransformers(get_course_block_access_transformers(user))
+        cacheable_transformers = get_course_block_access_transformers(user)
+        transformers = BlockStructureTransformers(cacheable_transformers)
+
+    # The user's completions change without the course changing, so when
+    # the output of the default transformers is cached, completion data is
+    # added to it after it's cached.
+    completion_transformers = None
     if include_completion:
-        transformers += [BlockCompletionTransformer()]
+        if cacheable_transformers is None:
+            transformers += [BlockCompletionTransformer()]
+        else:
+            completion_transformers = BlockStructureTransformers([BlockCompletionTransformer()])
     transformers.usage_info = CourseUsageInfo(
         starting_block_usage_key.course_key,
         user,
         allow_start_dates_in_future,
         include_has_scheduled_content
     )
-
-    return get_block_structure_manager(starting_block_usage_key.course_key).get_transformed(
+    if completion_transformers is not None:
+        completion_transformers.usage_info = transformers.usage_info
+
+    manager = get_block_structure_manager(starting_block_usage_key.course_key)
+
+    cache_key = None
+    if cacheable_transformers is not None and transformed_cache.is_enabled():
+        if collected_block_structure:
+            course_version = collected_block_structure.get_xblock_field(
+                collected_block_structure.root_block_usage_key, 'course_version',
+            )
+        else:
+            course_version = manager.get_collected_data_version()
+        cache_key = transformed_cache.get_cache_key(
+            user, starting_block_usage_key, cacheable_transformers, transformers.usage_info, course_version,
+        )
+        if cache_key:
+            block_structure = transformed_cache.get_transformed(cache_key)
+            if block_structure is not None:
+                return _add_completion(block_structure, completion_transformers)
+
+    block_structure = manager.get_transformed(
         transformers,
         starting_block_usage_key,
         collected_block_structure,
         user,
     )
+    if cache_key:
+        transformed_cache.set_transformed(cache_key, block_structure)
+    return _add_completion(block_structure, completion_transformers)
+
+
+def _add_completion(block_structure, completion_transformers):
+    """
+    Transforms the given block structure with the given completion
+    transformers, if any, and returns it.
+    """
+    if completion_transformers is not None:
+        completion_transformers.transform(block_structure)
+    return block_structure
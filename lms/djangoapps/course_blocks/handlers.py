@@ -0,0 +1,71 @@
+"""
+Signal handlers that invalidate the cached transformed block structures
+of a user in a course when the user's context in the course changes.
+"""
+
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_when.models import UserDate
+
+from common.djangoapps.student.models import CourseAccessRole
+from common.djangoapps.student.signals import ENROLL_STATUS_CHANGE, ENROLLMENT_TRACK_UPDATED
+from lms.djangoapps.courseware.models import StudentFieldOverride
+from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
+
+from . import transformed_cache
+
+
+def _invalidate(user_id, course_key):
+    """
+    Invalidates the cached transformed block structures of the given user
+    in the given course, if the cache is enabled.
+    """
+    if user_id and course_key and transformed_cache.is_enabled():
+        transformed_cache.invalidate_user_course(user_id, course_key)
+
+
+@receiver(ENROLL_STATUS_CHANGE, dispatch_uid="course_blocks_invalidate_on_enroll_status_change")
+def invalidate_on_enroll_status_change(sender, user, course_id, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached structures when their enrollment changes.
+    """
+    _invalidate(user.id, course_id)
+
+
+@receiver(ENROLLMENT_TRACK_UPDATED, dispatch_uid="course_blocks_invalidate_on_enrollment_track_updated")
+@receiver(COHORT_MEMBERSHIP_UPDATED, dispatch_uid="course_blocks_invalidate_on_cohort_membership_updated")
+def invalidate_on_user_group_updated(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached structures when their enrollment track or
+    cohort changes.
+    """
+    _invalidate(user.id, course_key)
+
+
+@receiver(post_save, sender=StudentFieldOverride, dispatch_uid="course_blocks_invalidate_on_field_override_save")
+@receiver(post_delete, sender=StudentFieldOverride, dispatch_uid="course_blocks_invalidate_on_field_override_delete")
+def invalidate_on_student_field_override_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached structures when their field overrides change.
+    """
+    _invalidate(instance.student_id, instance.course_id)
+
+
+@receiver(post_save, sender=UserDate, dispatch_uid="course_blocks_invalidate_on_user_date_save")
+@receiver(post_delete, sender=UserDate, dispatch_uid="course_blocks_invalidate_on_user_date_delete")
+def invalidate_on_user_date_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached structures when their date overrides change.
+    """
+    _invalidate(instance.user_id, instance.content_date.course_id)
+
+
+@receiver(post_save, sender=CourseAccessRole, dispatch_uid="course_blocks_invalidate_on_access_role_save")
+@receiver(post_delete, sender=CourseAccessRole, dispatch_uid="course_blocks_invalidate_on_access_role_delete")
+def invalidate_on_course_access_role_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's cached structures when their roles in the course
+    change.
+    """
+    _invalidate(instance.user_id, instance.course_id)
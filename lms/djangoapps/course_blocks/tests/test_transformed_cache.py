@@ -0,0 +1,135 @@
+"""
+Tests for the cache of transformed block structures.
+"""
+
+from unittest.mock import Mock, patch
+
+import ddt
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from edx_django_utils.cache import RequestCache
+from edx_toggles.toggles.testutils import override_waffle_switch
+
+from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.course_api.blocks.transformers.block_completion import BlockCompletionTransformer
+from lms.djangoapps.course_blocks import transformed_cache
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.course_blocks.toggles import CACHE_TRANSFORMED_STRUCTURES
+from lms.djangoapps.course_blocks.usage_info import CourseUsageInfo
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.djangoapps.content.block_structure.compact import CompactBlockStructureBlockData
+from openedx.core.djangoapps.content.block_structure.tests.helpers import (
+    ChildrenMapTestMixin,
+    UsageKeyFactoryMixin,
+    mock_registered_transformers
+)
+from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
+
+
+@ddt.ddt
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT=60,
+)
+class TestTransformedCache(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the transformed_cache module.
+    """
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory.create()
+        self.usage_key = self.block_key_factory(0)
+        self.usage_info = CourseUsageInfo(self.course_key, self.user)
+        self.transformers = [Mock(READ_VERSION=1, **{'name.return_value': 'mock_transformer'})]
+        cache.clear()
+        RequestCache.clear_all_namespaces()
+
+    def get_cache_key(self, user=None, transformers=None, course_version='version'):
+        """
+        Returns the cache key for the test course.
+        """
+        return transformed_cache.get_cache_key(
+            user or self.user,
+            self.usage_key,
+            transformers or self.transformers,
+            self.usage_info,
+            course_version,
+        )
+
+    def test_cache_key(self):
+        cache_key = self.get_cache_key()
+        assert cache_key == self.get_cache_key()
+        assert cache_key != self.get_cache_key(user=UserFactory.create())
+        assert cache_key != self.get_cache_key(course_version='other_version')
+        assert cache_key != self.get_cache_key(
+            transformers=[Mock(READ_VERSION=2, **{'name.return_value': 'mock_transformer'})],
+        )
+
+    def test_no_cache_key(self):
+        assert self.get_cache_key(course_version=None) is None
+        assert self.get_cache_key(user=AnonymousUser()) is None
+
+    @ddt.data(BlockStructureBlockData, CompactBlockStructureBlockData)
+    def test_get_and_set(self, block_structure_cls):
+        cache_key = self.get_cache_key()
+        assert transformed_cache.get_transformed(cache_key) is None
+
+        children_map = self.SIMPLE_CHILDREN_MAP
+        block_structure = self.create_block_structure(children_map, block_structure_cls)
+        transformed_cache.set_transformed(cache_key, block_structure)
+        self.assert_block_structure(transformed_cache.get_transformed(cache_key), children_map)
+
+        # from the shared cache
+        RequestCache.clear_all_namespaces()
+        cached_block_structure = transformed_cache.get_transformed(cache_key)
+        assert isinstance(cached_block_structure, block_structure_cls)
+        self.assert_block_structure(cached_block_structure, children_map)
+
+    @override_settings(COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT=0)
+    def test_request_only(self):
+        cache_key = self.get_cache_key()
+        transformed_cache.set_transformed(cache_key, self.create_block_structure(self.SIMPLE_CHILDREN_MAP))
+        assert transformed_cache.get_transformed(cache_key) is not None
+
+        RequestCache.clear_all_namespaces()
+        assert transformed_cache.get_transformed(cache_key) is None
+
+    def test_cached_copy_is_not_modified(self):
+        cache_key = self.get_cache_key()
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        transformed_cache.set_transformed(cache_key, block_structure)
+        block_structure.remove_block(self.block_key_factory(1), keep_descendants=False)
+        transformed_cache.get_transformed(cache_key).remove_block(self.block_key_factory(2), keep_descendants=False)
+        self.assert_block_structure(transformed_cache.get_transformed(cache_key), self.SIMPLE_CHILDREN_MAP)
+
+    def test_invalidate_user_course(self):
+        cache_key = self.get_cache_key()
+        transformed_cache.invalidate_user_course(self.user.id, self.course_key)
+        assert self.get_cache_key() != cache_key
+
+    @ddt.data(True, False)
+    def test_invalidate_on_signal(self, switch_active):
+        cache_key = self.get_cache_key()
+        with override_waffle_switch(CACHE_TRANSFORMED_STRUCTURES, active=switch_active):
+            COHORT_MEMBERSHIP_UPDATED.send(sender=None, user=self.user, course_key=self.course_key)
+        RequestCache.clear_all_namespaces()
+        assert (self.get_cache_key() != cache_key) == switch_active
+
+    @override_waffle_switch(CACHE_TRANSFORMED_STRUCTURES, active=True)
+    def test_completion_not_cached(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        manager = Mock(**{
+            'get_collected_data_version.return_value': 'version',
+            'get_transformed.side_effect': lambda *args: block_structure.copy(),
+        })
+        with patch('lms.djangoapps.course_blocks.api.get_block_structure_manager', return_value=manager), \
+                patch('lms.djangoapps.course_blocks.api.get_course_block_access_transformers', return_value=[]), \
+                patch.object(BlockCompletionTransformer, 'transform') as mock_transform, \
+                mock_registered_transformers([BlockCompletionTransformer]):
+            for __ in range(2):
+                get_course_blocks(self.user, self.usage_key, include_completion=True)
+
+        # The cached structure is transformed with the user's current completions.
+        assert manager.get_transformed.call_count == 1
+        assert mock_transform.call_count == 2
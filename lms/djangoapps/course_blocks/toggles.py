@@ -0,0 +1,19 @@
+"""
+Toggles for the course_blocks app.
+"""
+
+from edx_toggles.toggles import WaffleSwitch
+
+# .. toggle_name: course_blocks.cache_transformed_structures
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, the block structures transformed by get_course_blocks with the
+#   default transformers are cached per user, course version and transformer set, both for the rest of
+#   the request and for COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT seconds in the shared django cache.
+#   Cached structures of a user are invalidated when their enrollment, cohort, course roles or
+#   student-specific date and field overrides change in the course.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_warning: Changes to a user's access that are not signalled, such as the passing of a
+#   start or due date, are only reflected once the shared cache entry expires.
+CACHE_TRANSFORMED_STRUCTURES = WaffleSwitch('course_blocks.cache_transformed_structures', __name__)
@@ -0,0 +1,154 @@
+"""
+Per-user cache of the block structures transformed by get_course_blocks.
+
+The cache has two tiers:
+
+  * a request cache, which returns the structure that was transformed
+    with the same arguments earlier in the same request, and
+  * the shared django cache, which keeps a pickle of the structure for
+    COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT seconds.
+
+Entries are keyed by the user, the starting block, the version of the
+collected course structure, the transformers with their read versions,
+and the options of the usage info.  The key also includes a generation
+token of the user in the course, which invalidate_user_course replaces
+whenever the user's enrollment, cohort, course roles or overrides in the
+course change, so that entries transformed before the change are no
+longer found.
+
+The cache is enabled with the course_blocks.cache_transformed_structures
+waffle switch.
+"""
+
+
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from edx_django_utils.cache import RequestCache
+
+from lms.djangoapps.courseware.masquerade import is_masquerading
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureModulestoreData
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .toggles import CACHE_TRANSFORMED_STRUCTURES
+
+REQUEST_CACHE_NAMESPACE = 'course_blocks.transformed_cache'
+
+
+def is_enabled():
+    """
+    Returns whether transformed block structures are cached.
+    """
+    return CACHE_TRANSFORMED_STRUCTURES.is_enabled()
+
+
+def get_cache_key(user, starting_block_usage_key, transformers, usage_info, course_version):
+    """
+    Returns the key under which the block structure transformed with the
+    given arguments is cached, or None if it can't be cached.
+
+    Arguments:
+        user (django.contrib.auth.models.User) - User object for which
+            the block structure is transformed.
+
+        starting_block_usage_key (UsageKey) - The starting block of the
+            transformed block structure.
+
+        transformers ([BlockStructureTransformer]) - The transformers
+            that are applied.  Their output must only depend on the
+            collected data and the user's context in the course.
+
+        usage_info (CourseUsageInfo) - The usage info passed to the
+            transformers.
+
+        course_version (string) - The version of the course from which
+            the block structure was collected.
+    """
+    course_key = starting_block_usage_key.course_key
+    if course_version is None or not getattr(user, 'id', None):
+        return None
+
+    # Masquerading users see the course as configured in their session,
+    # which is not part of the key.
+    if is_masquerading(user, course_key):
+        return None
+
+    key_data = (
+        user.id,
+        str(starting_block_usage_key),
+        str(course_version),
+        [(transformer.name(), transformer.READ_VERSION) for transformer in transformers],
+        usage_info.allow_start_dates_in_future,
+        usage_info.include_has_scheduled_content,
+        _get_generation(user.id, course_key),
+    )
+    return f'course_blocks.transformed.{md5(repr(key_data).encode()).hexdigest()}'
+
+
+def get_transformed(cache_key):
+    """
+    Returns a copy of the transformed block structure cached under the
+    given key, or None if not found.
+    """
+    request_cache = RequestCache(REQUEST_CACHE_NAMESPACE)
+    cached_response = request_cache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        return cached_response.value.copy()
+
+    if not settings.COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT:
+        return None
+    serialized_data = cache.get(cache_key)
+    if serialized_data is None:
+        return None
+    block_structure = zunpickle(serialized_data)
+    request_cache.set(cache_key, block_structure.copy())
+    return block_structure
+
+
+def set_transformed(cache_key, block_structure):
+    """
+    Caches a copy of the given transformed block structure under the
+    given key.
+    """
+    RequestCache(REQUEST_CACHE_NAMESPACE).set(cache_key, block_structure.copy())
+
+    # Structures that were just collected from the modulestore still
+    # reference their xBlocks, so they are only cached for the request.
+    timeout = settings.COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT
+    if timeout and not isinstance(block_structure, BlockStructureModulestoreData):
+        cache.set(cache_key, zpickle(block_structure), timeout)
+
+
+def invalidate_user_course(user_id, course_key):
+    """
+    Invalidates the cached transformed block structures of the given
+    user in the given course.
+    """
+    cache.delete(_get_generation_cache_key(user_id, course_key))
+    RequestCache(REQUEST_CACHE_NAMESPACE).clear()
+
+
+def _get_generation(user_id, course_key):
+    """
+    Returns the current generation token of the given user in the given
+    course, creating one if needed.
+    """
+    request_cache = RequestCache(REQUEST_CACHE_NAMESPACE)
+    generation_cache_key = _get_generation_cache_key(user_id, course_key)
+    cached_response = request_cache.get_cached_response(generation_cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+
+    generation = cache.get_or_set(generation_cache_key, lambda: uuid4().hex, timeout=None)
+    request_cache.set(generation_cache_key, generation)
+    return generation
+
+
+def _get_generation_cache_key(user_id, course_key):
+    """
+    Returns the cache key of the generation token of the given user in
+    the given course.
+    """
+    return f'course_blocks.transformed.generation.{user_id}.{course_key}'
@@ -33,6 +33,7 @@ class HiddenContentTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 4
     READ_VERSION = 4
+    INCREMENTAL_COLLECT = True
     MERGED_HIDE_AFTER_DUE = 'merged_hide_after_due'
     MERGED_END_DATE = 'merged_end_date'
 
@@ -44,27 +45,6 @@ class HiddenContentTransformer(BlockStructureTransformer):
         """
         return "hidden_content"
 
-    @classmethod
-    def _get_merged_hide_after_due(cls, block_structure, block_key):
-        """
-        Returns whether the block with the given block_key in the
-        given block_structure should be hidden after due date per
-        computed value from ancestry chain.
-        """
-        return block_structure.get_transformer_block_field(
-            block_key, cls, cls.MERGED_HIDE_AFTER_DUE, False
-        )
-
-    @classmethod
-    def _get_merged_end_date(cls, block_structure, block_key):
-        """
-        Returns the merged value for the end date for the block with
-        the given block_key in the given block_structure.
-        """
-        return block_structure.get_transformer_block_field(
-            block_key, cls, cls.MERGED_END_DATE
-        )
-
     @classmethod
     def collect(cls, block_structure):
         """
@@ -92,21 +72,38 @@ class HiddenContentTransformer(BlockStructureTransformer):
         if usage_info.has_staff_access:
             return [block_structure.create_universal_filter()]
 
-        block_structure.remove_block_traversal(lambda block_key: self._is_block_hidden(block_structure, block_key))
+        block_structure.filter_topological_traversal(
+            block_structure.create_removal_mask_filter(self._get_removal_mask(block_structure))
+        )
 
-    def _is_block_hidden(self, block_structure, block_key):
+    def _get_removal_mask(self, block_structure):
         """
-        Returns whether the block with the given block_key should
-        be hidden, given the current time.
+        Returns the usage keys of the blocks in the given block_structure
+        that should be hidden, given the current time.
         """
-        hide_after_due = self._get_merged_hide_after_due(block_structure, block_key)
+        hide_after_due_values = block_structure.get_transformer_block_field_values(
+            self, self.MERGED_HIDE_AFTER_DUE, False,
+        )
         self_paced = block_structure[block_structure.root_block_usage_key].self_paced
         if self_paced:
-            hidden_date = self._get_merged_end_date(block_structure, block_key)
+            hidden_dates = block_structure.get_transformer_block_field_values(self, self.MERGED_END_DATE)
         else:
             # Important Note:
             # A small subtlety of grabbing the due date here is that this transformer relies on the
             # DateOverrideTransformer (located in edx-when repo) to first set any overrides (one
             # example is a user receiving an extension on an assignment).
-            hidden_date = block_structure.get_xblock_field(block_key, 'due', None) or MAXIMUM_DATE
-        return not SequenceBlock.verify_current_content_visibility(hidden_date, hide_after_due)
+            hidden_dates = {
+                block_key: due or MAXIMUM_DATE
+                for block_key, due in block_structure.get_xblock_field_values('due').items()
+            }
+
+        is_visible_by_values = {}
+        removal_mask = set()
+        for block_key, hide_after_due in hide_after_due_values.items():
+            values = (hidden_dates[block_key], hide_after_due)
+            is_visible = is_visible_by_values.get(values)
+            if is_visible is None:
+                is_visible = is_visible_by_values[values] = SequenceBlock.verify_current_content_visibility(*values)
+            if not is_visible:
+                removal_mask.add(block_key)
+        return removal_mask
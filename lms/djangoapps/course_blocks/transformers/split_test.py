@@ -26,6 +26,7 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -82,8 +83,8 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
         # The UserPartitionTransformer will enforce group access, so
         # go ahead and remove all extraneous split_test blocks.
         return [
-            block_structure.create_removal_filter(
-                lambda block_key: block_key.block_type == 'split_test',
+            block_structure.create_removal_mask_filter(
+                {block_key for block_key in block_structure.get_block_keys() if block_key.block_type == 'split_test'},
                 keep_descendants=True,
             )
         ]
@@ -34,6 +34,7 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
     MERGED_START_DATE = 'merged_start_date'
 
     @classmethod
@@ -61,16 +62,6 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             block_structure.root_block_usage_key, 'has_scheduled_content', has_scheduled_content
         )
 
-    @classmethod
-    def _get_merged_start_date(cls, block_structure, block_key):
-        """
-        Returns the merged value for the start date for the block with
-        the given block_key in the given block_structure.
-        """
-        return block_structure.get_transformer_block_field(
-            block_key, cls, cls.MERGED_START_DATE, False
-        )
-
     @classmethod
     def collect(cls, block_structure):
         """
@@ -94,18 +85,38 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
         if usage_info.has_staff_access or usage_info.allow_start_dates_in_future:
             return [block_structure.create_universal_filter()]
 
-        now = datetime.now(UTC)
-
-        def _removal_condition(block_key):
-            return not check_start_date(
-                usage_info.user,
-                block_structure.get_xblock_field(block_key, 'days_early_for_beta'),
-                self._get_merged_start_date(block_structure, block_key),
-                usage_info.course_key,
-                now=now
-            )
+        removal_mask = self._get_removal_mask(usage_info, block_structure)
 
         if usage_info.include_has_scheduled_content:
-            self._check_has_scheduled_content(block_structure, _removal_condition)
+            self._check_has_scheduled_content(block_structure, removal_mask.__contains__)
+
+        return [block_structure.create_removal_mask_filter(removal_mask)]
+
+    def _get_removal_mask(self, usage_info, block_structure):
+        """
+        Returns the usage keys of the blocks in the given block_structure
+        that the user cannot access yet.
+        """
+        now = datetime.now(UTC)
+        days_early_for_beta = block_structure.get_xblock_field_values('days_early_for_beta')
+        merged_start_dates = block_structure.get_transformer_block_field_values(
+            self, self.MERGED_START_DATE, False,
+        )
 
-        return [block_structure.create_removal_filter(_removal_condition)]
+        # Most blocks inherit their start date from their section, so
+        # check each distinct combination of values only once.
+        has_access_by_values = {}
+        removal_mask = set()
+        for block_key, merged_start_date in merged_start_dates.items():
+            values = (days_early_for_beta[block_key], merged_start_date)
+            has_access = has_access_by_values.get(values)
+            if has_access is None:
+                has_access = has_access_by_values[values] = bool(check_start_date(
+                    usage_info.user,
+                    *values,
+                    usage_info.course_key,
+                    now=now
+                ))
+            if not has_access:
+                removal_mask.add(block_key)
+        return removal_mask
@@ -6,11 +6,13 @@ from unittest import mock
 
 from common.djangoapps.student.tests.factories import CourseEnrollmentFactory
 from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache
+from openedx.core.djangoapps.content.block_structure.transformer_registry import TransformerRegistry
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
 import openedx.core.djangoapps.content.block_structure.api as bs_api
 from ...api import get_course_blocks
 from ..library_content import ContentLibraryOrderTransformer, ContentLibraryTransformer
+from ..split_test import SplitTestTransformer
 from .helpers import CourseStructureTestCase
 
 
@@ -360,3 +362,85 @@ class ContentLibraryOrderTransformerTestCase(CourseStructureTestCase):
                     break
 
             assert expected_children_without_hiding_or_gating != [child.block_id for child in children]
+
+
+class ContentLibrarySplitTestTransformerTestCase(CourseStructureTestCase):
+    """
+    ContentLibraryTransformer Test, combined with the filters of the SplitTestTransformer
+    """
+    TRANSFORMER_CLASS_TO_TEST = ContentLibraryTransformer
+
+    def setUp(self):
+        """
+        Setup course structure with a split_test block in a content library, and create user.
+        """
+        super().setUp()
+        TransformerRegistry.get_registered_transformers.return_value = {
+            ContentLibraryTransformer, SplitTestTransformer,
+        }
+        self.transformers = BlockStructureTransformers([ContentLibraryTransformer(), SplitTestTransformer()])
+
+        self.course_hierarchy = self.get_course_hierarchy()
+        self.blocks = self.build_course(self.course_hierarchy)
+        self.course = self.blocks['course']
+        bs_api.update_course_in_cache(self.course.id)
+        clear_course_from_cache(self.course.id)
+
+        # Enroll user in course.
+        CourseEnrollmentFactory.create(user=self.user, course_id=self.course.id, is_active=True)
+
+    def get_course_hierarchy(self):
+        """
+        Get a course hierarchy to test with.
+        """
+        return [{
+            'org': 'ContentLibraryTransformer',
+            'course': 'CL101F',
+            'run': 'test_run',
+            '#type': 'course',
+            '#ref': 'course',
+            '#children': [
+                {
+                    '#type': 'library_content',
+                    '#ref': 'library_content1',
+                    'max_count': 1,
+                    '#children': [
+                        {
+                            '#type': 'vertical',
+                            '#ref': 'vertical1',
+                        },
+                        {
+                            '#type': 'split_test',
+                            '#ref': 'split_test1',
+                            '#children': [
+                                {
+                                    '#type': 'vertical',
+                                    '#ref': 'vertical2',
+                                },
+                                {
+                                    '#type': 'vertical',
+                                    '#ref': 'vertical3',
+                                },
+                            ]
+                        }
+                    ]
+                }
+            ]
+        }]
+
+    @mock.patch('lms.djangoapps.course_blocks.transformers.library_content.get_student_module_as_dict')
+    def test_unselected_split_test(self, mocked):
+        """
+        Test that the children of a split_test block that isn't selected in a content library
+        are removed along with it, rather than moved to the content library by the removal
+        of split_test blocks.
+        """
+        mocked.return_value = {'selected': [['vertical', 'vertical_vertical1']]}
+        trans_block_structure = get_course_blocks(
+            self.user,
+            self.course.location,
+            self.transformers,
+        )
+        assert set(trans_block_structure.get_block_keys()) == self.get_block_key_set(
+            self.blocks, 'course', 'library_content1', 'vertical1',
+        )
@@ -28,6 +28,7 @@ class UserPartitionTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -90,11 +91,13 @@ class UserPartitionTransformer(BlockStructureTransformer):
 
         user_groups = get_user_partition_groups(usage_info.course_key, user_partitions, user, 'id')
 
-        for block_key in block_structure.topological_traversal():
-            transformer_block_field = block_structure.get_transformer_block_field(
-                block_key, self, 'merged_group_access'
-            )
-            if transformer_block_field is None:
+        # Compute the blocks to remove in a single pass over the merged
+        # group access of all blocks, skipping the common case of
+        # blocks without any group access restrictions.
+        removal_mask = set()
+        merged_group_accesses = block_structure.get_transformer_block_field_values(self, 'merged_group_access')
+        for block_key, transformer_block_field in merged_group_accesses.items():
+            if transformer_block_field is None or not transformer_block_field.get_allowed_groups():
                 continue
 
             access_denying_partition_ids = transformer_block_field.get_access_denying_partitions(
@@ -116,7 +119,7 @@ class UserPartitionTransformer(BlockStructureTransformer):
                         access_denying_messages.append(access_denied_message)
 
             if access_denying_reasons and not access_denying_messages:
-                block_structure.remove_block(block_key, keep_descendants=False)
+                removal_mask.add(block_key)
             else:
                 if access_denying_reasons:
                     block_structure.override_xblock_field(
@@ -127,6 +130,9 @@ class UserPartitionTransformer(BlockStructureTransformer):
                         block_key, 'authorization_denial_message', access_denying_messages[0]
                     )
 
+        if removal_mask:
+            block_structure.filter_topological_traversal(block_structure.create_removal_mask_filter(removal_mask))
+
 
 class _MergedGroupAccess:
     """
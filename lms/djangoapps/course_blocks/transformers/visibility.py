@@ -26,6 +26,7 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    INCREMENTAL_COLLECT = True
 
     MERGED_VISIBLE_TO_STAFF_ONLY = 'merged_visible_to_staff_only'
 
@@ -37,17 +38,6 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
         """
         return "visibility"
 
-    @classmethod
-    def _get_visible_to_staff_only(cls, block_structure, block_key):
-        """
-        Returns whether the block with the given block_key in the
-        given block_structure should be visible to staff only per
-        computed value from ancestry chain.
-        """
-        return block_structure.get_transformer_block_field(
-            block_key, cls, cls.MERGED_VISIBLE_TO_STAFF_ONLY, False
-        )
-
     @classmethod
     def collect(cls, block_structure):
         """
@@ -66,8 +56,11 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
         if usage_info.has_staff_access:
             return [block_structure.create_universal_filter()]
 
+        visible_to_staff_only = block_structure.get_transformer_block_field_values(
+            self, self.MERGED_VISIBLE_TO_STAFF_ONLY, False,
+        )
         return [
-            block_structure.create_removal_filter(
-                lambda block_key: self._get_visible_to_staff_only(block_structure, block_key),
+            block_structure.create_removal_mask_filter(
+                {block_key for block_key, staff_only in visible_to_staff_only.items() if staff_only},
             )
         ]
@@ -3,7 +3,15 @@ Custom fields
 """
 
 
-from django.db.models.fields import AutoField
+import zlib
+from base64 import b85decode, b85encode
+
+from django.conf import settings
+from django.db.models.fields import AutoField, TextField
+
+# Marker that starts the compressed values of StudentModuleStateField, which
+# plain JSON state can't start with.
+COMPRESSED_STATE_PREFIX = 'zlib:'
 
 
 class UnsignedBigIntAutoField(AutoField):
@@ -34,3 +42,38 @@ class UnsignedBigIntAutoField(AutoField):
             return "BIGSERIAL"
         else:
             return None
+
+
+def compress_state(state, min_size):
+    """
+    Returns the given JSON state compressed with zlib, as text starting with
+    COMPRESSED_STATE_PREFIX, if it is at least min_size characters long and
+    compressing it makes it shorter. Otherwise, returns the state unchanged.
+    """
+    if not state or min_size is None or len(state) < min_size or state.startswith(COMPRESSED_STATE_PREFIX):
+        return state
+    compressed_state = COMPRESSED_STATE_PREFIX + b85encode(zlib.compress(state.encode('utf-8'))).decode('ascii')
+    return compressed_state if len(compressed_state) < len(state) else state
+
+
+def decompress_state(value):
+    """
+    Returns the JSON state of the given stored value, which may be compressed.
+    """
+    if value and value.startswith(COMPRESSED_STATE_PREFIX):
+        return zlib.decompress(b85decode(value[len(COMPRESSED_STATE_PREFIX):])).decode('utf-8')
+    return value
+
+
+class StudentModuleStateField(TextField):
+    """
+    A text field for the JSON state of XBlocks, which compresses the states that
+    are at least STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE characters long when
+    they are saved, and transparently decompresses them when they are loaded.
+    """
+    def from_db_value(self, value, expression, connection):  # pylint: disable=unused-argument
+        return decompress_state(value)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        return compress_state(value, settings.STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE)
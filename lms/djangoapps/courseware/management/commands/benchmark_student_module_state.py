@@ -0,0 +1,111 @@
+"""
+Command to benchmark the compression of the XBlock user states of the StudentModule table.
+"""
+
+
+import json
+import timeit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.keys import CourseKey
+
+from lms.djangoapps.courseware.fields import compress_state, decompress_state
+from lms.djangoapps.courseware.models import StudentModule
+
+
+def create_synthetic_problem_state(num_inputs):
+    """
+    Returns the JSON state of a synthetic capa problem with the given number of
+    inputs, similar to the states of real problems that were answered.
+    """
+    correct_map = {}
+    input_state = {}
+    student_answers = {}
+    for index in range(num_inputs):
+        input_id = f'd2e35c1d294b4ba0b3b1048615605d2a_{index + 2}_1'
+        correct_map[input_id] = {
+            'correctness': 'correct' if index % 2 else 'incorrect',
+            'npoints': None,
+            'msg': '',
+            'hint': '',
+            'hintmode': None,
+            'queuestate': None,
+            'answervariable': None,
+        }
+        input_state[input_id] = {}
+        student_answers[input_id] = f'choice_{index % 4}'
+    return json.dumps({
+        'correct_map': correct_map,
+        'input_state': input_state,
+        'student_answers': student_answers,
+        'last_submission_time': '2024-03-01T12:00:00Z',
+        'attempts': 2,
+        'seed': 1,
+        'done': True,
+        'score': {'raw_earned': num_inputs // 2, 'raw_possible': num_inputs},
+    })
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_student_module_state --settings=devstack
+        $ ./manage.py lms benchmark_student_module_state --course-id course-v1:edX+DemoX+Demo_Course --min-size 512
+    """
+    help = (
+        'Compares the size and decoding time, as in the get_many method of the user state client, of the '
+        'uncompressed and compressed states of a sample of StudentModules or of synthetic problems.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course-id', help='Course of the sampled StudentModules, instead of any course.')
+        parser.add_argument('--sample-size', type=int, default=1000, help='Number of states to sample.')
+        parser.add_argument(
+            '--min-size',
+            type=int,
+            default=settings.STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE or 1024,
+            help='Minimum length of the states to compress.',
+        )
+        parser.add_argument(
+            '--synthetic',
+            action='store_true',
+            help='Benchmark the states of synthetic problems rather than sampled StudentModules.',
+        )
+        parser.add_argument('--iterations', type=int, default=10, help='Number of times to repeat each measurement.')
+
+    def handle(self, *args, **options):
+        sample_size = options['sample_size']
+        if options['synthetic']:
+            states = [create_synthetic_problem_state(1 + index % 20) for index in range(sample_size)]
+        else:
+            modules = StudentModule.objects.filter(state__isnull=False)
+            if options['course_id']:
+                modules = modules.filter(course_id=CourseKey.from_string(options['course_id']))
+            states = list(modules.order_by('-id').values_list('state', flat=True)[:sample_size])
+
+        compressed_states = [compress_state(state, options['min_size']) for state in states]
+        iterations = options['iterations']
+        load_time = _best_time(lambda: [json.loads(decompress_state(state)) for state in states], iterations)
+        compressed_load_time = _best_time(
+            lambda: [json.loads(decompress_state(state)) for state in compressed_states], iterations,
+        )
+        size = sum(len(state) for state in states)
+        compressed_size = sum(len(state) for state in compressed_states)
+        self.stdout.write(
+            f"{'states':>8} {'compressed':>10} {'size (KB)':>10} {'compressed (KB)':>16} {'reduction':>10} "
+            f"{'decode (ms)':>12} {'compressed decode (ms)':>23}"
+        )
+        self.stdout.write(
+            f'{len(states):>8} {sum(state != compressed for state, compressed in zip(states, compressed_states)):>10} '
+            f'{size / 1024:>10.1f} {compressed_size / 1024:>16.1f} {1 - compressed_size / max(size, 1):>10.1%} '
+            f'{load_time * 1000:>12.1f} {compressed_load_time * 1000:>23.1f}'
+        )
+
+
+def _best_time(func, iterations):
+    """
+    Returns the shortest time, in seconds, of the given number of calls
+    to func.
+    """
+    return min(timeit.repeat(func, number=1, repeat=iterations))
@@ -0,0 +1,69 @@
+"""
+Command to compress the existing XBlock user states of the StudentModule table.
+"""
+
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.functions import Length
+
+from lms.djangoapps.courseware.fields import compress_state
+from lms.djangoapps.courseware.models import StudentModule
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms compress_student_module_state --settings=devstack
+        $ ./manage.py lms compress_student_module_state --batch-size 500 --batch-delay 2 --start-id 1000000
+    """
+    help = (
+        'Compresses the uncompressed states of the StudentModule table that are at least '
+        'STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE characters long, in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of states to compress per batch')
+        parser.add_argument('--batch-delay', type=float, default=1.0, help='Time delay between batches, in seconds')
+        parser.add_argument('--start-id', type=int, default=0, help='StudentModule id to resume from')
+
+    def handle(self, *args, **options):
+        min_size = settings.STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE
+        if min_size is None:
+            raise CommandError('STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE must be set to compress the states.')
+
+        batch_size = options['batch_size']
+        last_id = options['start_id']
+        total_modules = total_size = total_compressed_size = 0
+        while True:
+            # The batch is locked until it's written back, so that a learner's
+            # state saved meanwhile isn't overwritten with the one read here.
+            with transaction.atomic():
+                # Compressed states start with COMPRESSED_STATE_PREFIX rather than '{'.
+                modules = list(
+                    StudentModule.objects.select_for_update().filter(id__gt=last_id, state__startswith='{').annotate(
+                        state_length=Length('state'),
+                    ).filter(state_length__gte=min_size).only('id', 'state').order_by('id')[:batch_size]
+                )
+                if not modules:
+                    break
+
+                # The field compresses the states when they are saved, without
+                # changing their modification time or their history.
+                StudentModule.objects.bulk_update(modules, ['state'])
+            last_id = modules[-1].id
+            total_modules += len(modules)
+            total_size += sum(len(module.state) for module in modules)
+            total_compressed_size += sum(len(compress_state(module.state, min_size)) for module in modules)
+            log.info('Compressed %d StudentModule states, up to id %d', total_modules, last_id)
+            time.sleep(options['batch_delay'])
+
+        self.stdout.write(
+            f'Compressed {total_modules} StudentModule states from {total_size} to {total_compressed_size} characters.'
+        )
@@ -0,0 +1,67 @@
+"""
+Tests for the compress_student_module_state and benchmark_student_module_state management commands.
+"""
+
+
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import TestCase, override_settings
+
+from lms.djangoapps.courseware.fields import COMPRESSED_STATE_PREFIX
+from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.courseware.tests.factories import StudentModuleFactory
+
+
+class TestCompressStudentModuleState(TestCase):
+    """
+    Tests for the compress_student_module_state management command.
+    """
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        self.large_state = json.dumps({'answers': ['answer'] * 100})
+        self.small_state = json.dumps({'attempts': 1})
+        self.modules = [
+            StudentModuleFactory.create(state=state)
+            for state in (self.large_state, self.small_state, self.large_state, None)
+        ]
+
+    def _compressed_ids(self):
+        return set(
+            StudentModule.objects.filter(state__startswith=COMPRESSED_STATE_PREFIX).values_list('id', flat=True)
+        )
+
+    @override_settings(STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE=100)
+    def test_compresses_large_states(self):
+        modified = {module.id: StudentModule.objects.get(id=module.id).modified for module in self.modules}
+        out = StringIO()
+        call_command('compress_student_module_state', '--batch-size', '1', '--batch-delay', '0', stdout=out)
+
+        assert self._compressed_ids() == {self.modules[0].id, self.modules[2].id}
+        assert 'Compressed 2 StudentModule states' in out.getvalue()
+        for module in self.modules:
+            module_after = StudentModule.objects.get(id=module.id)
+            assert module_after.state == module.state
+            assert module_after.modified == modified[module.id]
+
+    @override_settings(STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE=100)
+    def test_start_id(self):
+        call_command(
+            'compress_student_module_state', '--start-id', str(self.modules[1].id), '--batch-delay', '0',
+            stdout=StringIO(),
+        )
+        assert self._compressed_ids() == {self.modules[2].id}
+
+    def test_requires_min_size(self):
+        with self.assertRaises(CommandError):
+            call_command('compress_student_module_state')
+        assert not self._compressed_ids()
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_student_module_state', '--iterations', '1', '--min-size', '100', stdout=out)
+        assert out.getvalue().splitlines()[1].split()[:2] == ['3', '2']
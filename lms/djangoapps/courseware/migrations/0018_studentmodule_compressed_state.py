@@ -0,0 +1,18 @@
+from django.db import migrations
+
+import lms.djangoapps.courseware.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courseware', '0017_financialassistanceconfiguration'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentmodule',
+            name='state',
+            field=lms.djangoapps.courseware.fields.StudentModuleStateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courseware', '0018_studentmodule_compressed_state'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentmodule',
+            index=models.Index(fields=['student', 'course_id'], name='courseware_student_course'),
+        ),
+    ]
@@ -966,6 +966,30 @@ class ScoresClient:
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients for the given users with pre-fetched data for the
+        given locations, using a single query for all of the users.
+
+        Returns a dict of user id to ScoresClient.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(clients),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+            'student_id', 'module_state_key', 'grade', 'max_grade', 'created',
+        ):
+            clients[user_id]._locations_to_scores[location.map_into_course(course_id)] = cls.Score(  # pylint: disable=protected-access
+                correct, total, created,
+            )
+        for client in clients.values():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 def set_score(user_id, usage_key, score, max_score):
     """
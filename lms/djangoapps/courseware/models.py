@@ -28,7 +28,7 @@ from django.utils.translation import gettext_lazy as _
 from edx_django_utils.cache.utils import RequestCache
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import BlockTypeKeyField, CourseKeyField, LearningContextKeyField, UsageKeyField
-from lms.djangoapps.courseware.fields import UnsignedBigIntAutoField
+from lms.djangoapps.courseware.fields import StudentModuleStateField, UnsignedBigIntAutoField
 
 from openedx.core.djangolib.markup import HTML
 
@@ -102,11 +102,12 @@ class StudentModule(models.Model):
         app_label = "courseware"
         unique_together = (('student', 'module_state_key', 'course_id'),)
         indexes = [
-            models.Index(fields=['module_state_key', 'grade', 'student'], name="courseware_stats")
+            models.Index(fields=['module_state_key', 'grade', 'student'], name="courseware_stats"),
+            models.Index(fields=['student', 'course_id'], name="courseware_student_course"),
         ]
 
-    # Internal state of the object
-    state = models.TextField(null=True, blank=True)
+    # Internal state of the object, which may be stored compressed
+    state = StudentModuleStateField(null=True, blank=True)
 
     # Grade, and are we done?
     grade = models.FloatField(null=True, blank=True, db_index=True)
@@ -0,0 +1,21 @@
+"""
+This module contains tasks for asynchronous execution of courseware updates.
+"""
+
+from celery import shared_task
+from edx_django_utils.monitoring import set_code_owner_attribute
+from opaque_keys.edx.keys import UsageKey
+
+from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
+
+
+@shared_task
+@set_code_owner_attribute
+def flush_write_behind_user_state(username, usage_key):
+    """
+    Writes the buffered write-behind user state of the given user for the
+    given block to the database.
+    """
+    DjangoXBlockUserStateClient().flush_write_behind_state(
+        username, [UsageKey.from_string(usage_key)], reschedule=True,
+    )
@@ -13,7 +13,7 @@ from xblock.exceptions import KeyValueMultiSaveError
 from xblock.fields import BlockScope, Scope, ScopeIds
 
 from common.djangoapps.student.tests.factories import UserFactory
-from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError, ScoresClient
 from lms.djangoapps.courseware.models import (
     StudentModule,
     XModuleStudentInfoField,
@@ -444,3 +444,28 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+class TestScoresClient(TestCase):
+    """Tests for ScoresClient"""
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def setUp(self):
+        super().setUp()
+        self.users = [UserFactory.create(), UserFactory.create()]
+        self.location = LOCATION('usage_id')
+        StudentModuleFactory.create(student=self.users[0], grade=1, max_grade=2)
+        StudentModuleFactory.create(student=self.users[1], module_state_key=LOCATION('other_id'), grade=2, max_grade=2)
+
+    def test_create_for_users(self):
+        locations = [self.location, LOCATION('other_id')]
+        with self.assertNumQueries(1):
+            clients = ScoresClient.create_for_users(COURSE_KEY, [user.id for user in self.users], locations)
+
+        for user in self.users:
+            client = ScoresClient.create_for_locations(COURSE_KEY, user.id, locations)
+            for location in locations:
+                assert clients[user.id].get(location) == client.get(location)
+        assert clients[self.users[0].id].get(self.location)[:2] == (1, 2)
+        assert clients[self.users[1].id].get(self.location) is None
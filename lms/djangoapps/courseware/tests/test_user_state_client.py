@@ -3,15 +3,24 @@ Black-box tests of the DjangoUserStateClient against the semantics
 defined in edx_user_state_client.
 """
 
+import json
 import pytz
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 from xblock.fields import Scope
 from datetime import datetime
+from threading import Thread
 from unittest import TestCase
 from collections import defaultdict
+from unittest.mock import patch
+from django.core.cache import cache
 from django.db import connections
+from django.test import TestCase as DjangoTestCase
+from django.test.utils import override_settings
 
 from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.courseware.fields import COMPRESSED_STATE_PREFIX
+from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.courseware.tasks import flush_write_behind_user_state
 from lms.djangoapps.courseware.user_state_client import (
     DjangoXBlockUserStateClient,
     XBlockUserStateClient,
@@ -757,3 +766,197 @@ class TestDjangoUserStateClient(UserStateClientTestBase, ModuleStoreTestCase):
             2. Update the test in the other repo to align with the new functionality
             3. Remove this override to re-enable the working test
         """
+
+
+@override_settings(
+    USER_STATE_COURSE_SCAN_MIN_BLOCKS=1,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class TestDjangoUserStateClientCourseScans(_UserStateClientTestCRUD, DjangoTestCase):
+    """
+    Tests of the DjangoUserStateClient backend when it loads the user state
+    by scanning all the StudentModules of a user in a course.
+    It reuses the CRUD tests from :class:`~UserStateClientTestBase`.
+    """
+    __test__ = True
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def _user(self, user_idx):  # lint-amnesty, pylint: disable=arguments-differ
+        return self.users[user_idx].username
+
+    def setUp(self):
+        super().setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = defaultdict(UserFactory.create)
+
+    def test_single_query(self):
+        self.set_many(0, {block: {'block': block} for block in range(1000)})
+        self.set_many(1, {0: {'block': 0}})
+
+        # The 1000 blocks would take 2 chunked queries.
+        with self.assertNumQueries(1):
+            states = list(self.get_many(0, range(999, -1, -1)))
+        assert {state.block_key: state.state for state in states} == {
+            self._block(block): {'block': block} for block in range(1000)
+        }
+
+    @override_settings(USER_STATE_COURSE_SCAN_MAX_ROWS_PER_BLOCK=4)
+    def test_adapts_to_row_count(self):
+        self.set_many(0, {block: {'block': block} for block in range(10)})
+
+        # Until a scan counted the 10 rows of the user, any number of blocks is scanned.
+        assert self._should_scan_course(0, [0])
+        assert len(list(self.get_many(0, [0, 1, 20]))) == 2
+
+        # Then only 3 blocks or more, since 2 blocks would scan 5 rows per block.
+        assert self._should_scan_course(0, [2, 3, 4])
+        assert not self._should_scan_course(0, [2, 3])
+        assert len(list(self.get_many(0, [2, 3]))) == 2
+
+    def _should_scan_course(self, user, blocks):
+        """
+        Return whether the client would scan the course of the blocks to load the state of the user.
+        """
+        return self.client._should_scan_course(  # pylint: disable=protected-access
+            self._user(user), self._course(0), [self._block(block) for block in blocks]
+        )
+
+
+@override_settings(
+    USER_STATE_WRITE_BEHIND_FIELDS={'block_type': ['position']},
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class TestDjangoUserStateClientWriteBehind(_UserStateClientTestCRUD, DjangoTestCase):
+    """
+    Tests of the DjangoUserStateClient backend when it buffers write-behind fields.
+    It reuses the CRUD tests from :class:`~UserStateClientTestBase`.
+    """
+    __test__ = True
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def _user(self, user_idx):  # lint-amnesty, pylint: disable=arguments-differ
+        return self.users[user_idx].username
+
+    def setUp(self):
+        super().setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = defaultdict(UserFactory.create)
+        patcher = patch.object(flush_write_behind_user_state, 'apply_async')
+        self.mock_apply_async = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _stored_state(self, user, block):
+        """
+        Return the state of the block stored in the database, or None.
+        """
+        module = StudentModule.objects.filter(
+            student__username=self._user(user), module_state_key=self._block(block),
+        ).first()
+        return json.loads(module.state) if module else None
+
+    def test_buffers_write_behind_fields(self):
+        self.set(0, 0, {'position': 1})
+        self.set(0, 0, {'position': 2})
+
+        assert self._stored_state(0, 0) is None
+        assert self.get(0, 0).state == {'position': 2}
+        assert self.mock_apply_async.call_count == 1
+        assert self.mock_apply_async.call_args[1]['kwargs'] == {
+            'username': self._user(0), 'usage_key': str(self._block(0)),
+        }
+
+    def test_writes_buffered_state_with_other_fields(self):
+        self.set(0, 0, {'answer': 'a'})
+        self.set(0, 0, {'position': 1})
+        assert self.get(0, 0).state == {'answer': 'a', 'position': 1}
+
+        self.set(0, 0, {'answer': 'b'})
+        assert self._stored_state(0, 0) == {'answer': 'b', 'position': 1}
+        assert self.client.get(self._user(0), self._block(0)).state == {'answer': 'b', 'position': 1}
+
+    def test_flush(self):
+        self.set_many(0, {0: {'position': 1}, 1: {'position': 2}})
+        flush_write_behind_user_state(self._user(0), str(self._block(0)))
+
+        assert self._stored_state(0, 0) == {'position': 1}
+        assert self._stored_state(0, 1) is None
+
+        self.client.flush_write_behind_state(self._user(0), [self._block(1)])
+        assert self._stored_state(0, 1) == {'position': 2}
+        assert {state.block_key: state.state for state in self.get_many(0, [0, 1])} == {
+            self._block(0): {'position': 1},
+            self._block(1): {'position': 2},
+        }
+
+    def test_delete_buffered_state(self):
+        self.set(0, 0, {'answer': 'a'})
+        self.set(0, 0, {'position': 1})
+        self.delete(0, 0, fields=['position'])
+
+        assert self._stored_state(0, 0) == {'answer': 'a'}
+        assert self.get(0, 0).state == {'answer': 'a'}
+
+    def test_buffers_state_while_flushed_state_is_deleted(self):
+        self.set(0, 0, {'position': 1})
+        cache_key = self.client._write_behind_cache_key(self._user(0), self._block(0))  # pylint: disable=protected-access
+        # Another process, which doesn't share this client, buffers state at the same time.
+        other_client = DjangoXBlockUserStateClient(self.users[0])
+        other_set = Thread(target=other_client.set, args=(self._user(0), self._block(0), {'position': 2}))
+        get_many = cache.get_many
+        get_many_calls = []
+
+        def get_entries_to_delete(keys, *args, **kwargs):
+            get_many_calls.append(keys)
+            # The flush reads the buffered state to write it, then again to delete it.
+            if len(get_many_calls) == 2:
+                other_set.start()
+                other_set.join(0.2)
+                # It waits until the flushed state is deleted.
+                assert other_set.is_alive()
+            return get_many(keys, *args, **kwargs)
+
+        with patch.object(cache, 'get_many', side_effect=get_entries_to_delete):
+            self.client.flush_write_behind_state(self._user(0), [self._block(0)])
+        other_set.join()
+
+        assert self._stored_state(0, 0) == {'position': 1}
+        assert cache.get(cache_key)['state'] == {'position': 2}
+        assert self.get(0, 0).state == {'position': 2}
+
+
+@override_settings(STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE=1)
+class TestDjangoUserStateClientCompressedState(_UserStateClientTestCRUD, DjangoTestCase):
+    """
+    Tests of the DjangoUserStateClient backend when it stores compressed states.
+    It reuses the CRUD tests from :class:`~UserStateClientTestBase`.
+    """
+    __test__ = True
+    # Tell Django to clean out all databases, not just default
+    databases = set(connections)
+
+    def _user(self, user_idx):  # lint-amnesty, pylint: disable=arguments-differ
+        return self.users[user_idx].username
+
+    def setUp(self):
+        super().setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.users = defaultdict(UserFactory.create)
+
+    def test_stores_compressed_state(self):
+        state = {'answers': ['answer'] * 100}
+        self.set(0, 0, state)
+
+        assert StudentModule.objects.filter(state__startswith=COMPRESSED_STATE_PREFIX).count() == 1
+        assert StudentModule.objects.get().state == json.dumps(state)
+        assert self.get(0, 0).state == state
+
+    def test_reads_uncompressed_state(self):
+        with override_settings(STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE=None):
+            self.set(0, 0, {'answers': ['answer'] * 100})
+        assert not StudentModule.objects.filter(state__startswith=COMPRESSED_STATE_PREFIX).exists()
+
+        self.set(0, 0, {'attempts': 1})
+        assert self.get(0, 0).state == {'answers': ['answer'] * 100, 'attempts': 1}
+        assert StudentModule.objects.filter(state__startswith=COMPRESSED_STATE_PREFIX).count() == 1
@@ -6,17 +6,22 @@ data in a Django ORM model.
 
 import itertools
 import logging
+from hashlib import md5
+from math import ceil
 from operator import attrgetter
-from time import time
+from time import sleep, time
 
 from abc import abstractmethod
 from collections import namedtuple
+from contextlib import contextmanager
 
 from django.conf import settings
 from django.contrib.auth.models import User  # lint-amnesty, pylint: disable=imported-auth-user
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.db import transaction
 from django.db.utils import IntegrityError
+from django.utils.timezone import now
 from edx_django_utils import monitoring as monitoring_utils
 from xblock.fields import Scope
 
@@ -30,6 +35,23 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Number of usage keys per query when loading the StudentModules of blocks.
+STUDENT_MODULE_CHUNK_SIZE = 500
+
+# How long the number of StudentModules of a user in a course is remembered
+# after scanning them, to decide whether to scan them again.
+COURSE_ROW_COUNT_TIMEOUT = 24 * 60 * 60
+
+# How long buffered write-behind user state is kept in the cache, which must be
+# much longer than USER_STATE_WRITE_BEHIND_SECONDS so that it is flushed before
+# it expires.
+WRITE_BEHIND_TIMEOUT = 60 * 60
+
+# How long a lock on buffered write-behind user state is kept at most, in case
+# the process holding it dies, and how long to wait between attempts to take it.
+WRITE_BEHIND_LOCK_TIMEOUT = 10
+WRITE_BEHIND_LOCK_RETRY_DELAY = 0.01
+
 
 class XBlockUserState(namedtuple('_XBlockUserState', ['username', 'block_key', 'state', 'updated', 'scope'])):
     """
@@ -205,7 +227,7 @@ class XBlockUserStateClient():
         """
         raise NotImplementedError()
 
-    def iter_all_for_block(self, block_key, scope=Scope.user_state):
+    def iter_all_for_block(self, block_key, scope=Scope.user_state, modified_after=None):
         """
         You get no ordering guarantees. If you're using this method, you should be running in an
         async task.
@@ -282,17 +304,70 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         )
 
         for course_key, usage_keys in by_course:
-            query = StudentModule.objects.chunked_filter(
-                'module_state_key__in',
-                usage_keys,
-                student__username=username,
-                course_id=course_key,
-            )
+            usage_keys = list(usage_keys)
+            if self._should_scan_course(username, course_key, usage_keys):
+                query = self._scan_course_student_modules(username, course_key, usage_keys)
+            else:
+                query = StudentModule.objects.chunked_filter(
+                    'module_state_key__in',
+                    usage_keys,
+                    student__username=username,
+                    course_id=course_key,
+                    chunk_size=STUDENT_MODULE_CHUNK_SIZE,
+                )
 
             for student_module in query:
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
                 yield (student_module, usage_key)
 
+    def _should_scan_course(self, username, course_key, usage_keys):
+        """
+        Returns whether the :class:`~StudentModule`s of the supplied ``usage_keys`` should be
+        loaded by scanning all the ``StudentModule``s of the user in the course with a single
+        query, instead of querying them in chunks of usage keys.
+
+        This is the case when there are at least USER_STATE_COURSE_SCAN_MIN_BLOCKS usage keys,
+        unless a previous scan found that the user has many more ``StudentModule``s in the
+        course than there are usage keys.
+        """
+        min_blocks = settings.USER_STATE_COURSE_SCAN_MIN_BLOCKS
+        if min_blocks is None or len(usage_keys) < min_blocks:
+            return False
+        row_count = cache.get(self._course_row_count_cache_key(username, course_key))
+        return row_count is None or row_count <= len(usage_keys) * settings.USER_STATE_COURSE_SCAN_MAX_ROWS_PER_BLOCK
+
+    def _scan_course_student_modules(self, username, course_key, usage_keys):
+        """
+        Return the :class:`~StudentModule`s of the supplied ``usage_keys``, loaded with a single
+        scan of all the ``StudentModule``s of the user in the course, through the
+        ``courseware_student_course`` index.
+        """
+        student_modules = list(StudentModule.objects.filter(student__username=username, course_id=course_key))
+        cache.set(
+            self._course_row_count_cache_key(username, course_key), len(student_modules), COURSE_ROW_COUNT_TIMEOUT
+        )
+
+        # count the scans and the chunked queries they replaced
+        self._nr_stat_increment('get_student_modules', 'course_scans')
+        self._nr_stat_accumulate(
+            'get_student_modules', 'queries_saved', ceil(len(usage_keys) / STUDENT_MODULE_CHUNK_SIZE) - 1
+        )
+
+        # Same as the module_state_key__in filter of the chunked queries.
+        module_state_keys = {str(usage_key) for usage_key in usage_keys}
+        return [
+            student_module for student_module in student_modules
+            if str(student_module.module_state_key) in module_state_keys
+        ]
+
+    @staticmethod
+    def _course_row_count_cache_key(username, course_key):
+        """
+        Return the cache key of the number of ``StudentModule``s of the user in the course.
+        """
+        user_course = md5(f'{username}.{course_key}'.encode('utf-8')).hexdigest()
+        return f'xb_user_state.course_row_count.{user_course}'
+
     def _nr_attribute_name(self, function_name, stat_name, block_type=None):
         """
         Return an attribute name (string) representing the provided blocks.
@@ -364,13 +439,24 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # keep track of blocks requested
         self._nr_stat_accumulate('get_many', 'blocks_requested', len(block_keys))
 
+        # Write-behind state that is not written to the database yet is newer
+        # than the state stored in the database.
+        buffered_entries = {
+            usage_key: entry for usage_key, (_, entry) in self._get_write_behind_entries(username, block_keys).items()
+        }
+
         modules = self._get_student_modules(username, block_keys)
         for module, usage_key in modules:
-            if module.state is None:
+            buffered_entry = buffered_entries.pop(usage_key, None)
+            if module.state is None and buffered_entry is None:
                 continue
 
-            state = json.loads(module.state)
-            state_length = len(module.state)
+            state = json.loads(module.state) if module.state is not None else {}
+            state_length = len(module.state or '')
+            updated = module.modified
+            if buffered_entry is not None:
+                state.update(buffered_entry['state'])
+                updated = buffered_entry['modified']
 
             # If the state is the empty dict, then it has been deleted, and so
             # conformant UserStateClients should treat it as if it doesn't exist.
@@ -382,24 +468,45 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             self._nr_block_stat_accumulate('get_many', usage_key.block_type, 'size', state_length)
             total_block_count += 1
 
-            # filter state on fields
-            if fields is not None:
-                state = {
-                    field: state[field]
-                    for field in fields
-                    if field in state
-                }
-            yield XBlockUserState(username, usage_key, state, module.modified, scope)
+            yield XBlockUserState(username, usage_key, self._filter_fields(state, fields), updated, scope)
+
+        # The blocks whose state has only been buffered so far.
+        for usage_key, buffered_entry in buffered_entries.items():
+            self._nr_block_stat_increment('get_many', usage_key.block_type, 'blocks_out')
+            total_block_count += 1
+            yield XBlockUserState(
+                username, usage_key, self._filter_fields(buffered_entry['state'], fields), buffered_entry['modified'],
+                scope,
+            )
 
         # The rest of this method exists only to report custom attributes.
         finish_time = time()
         duration = (finish_time - evt_time) * 1000  # milliseconds
         self._nr_stat_accumulate('get_many', 'duration', duration)
 
+    @staticmethod
+    def _filter_fields(state, fields):
+        """
+        Return the supplied state filtered on the supplied fields, if any.
+        """
+        if fields is None:
+            return state
+        return {
+            field: state[field]
+            for field in fields
+            if field in state
+        }
+
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
         Set fields for a particular XBlock.
 
+        The fields listed for the type of the block in the USER_STATE_WRITE_BEHIND_FIELDS
+        setting are buffered in the cache when they are the only fields set for the block,
+        and written to the database by a task after USER_STATE_WRITE_BEHIND_SECONDS, along
+        with the next write of the other fields of the block, or before a score of the block
+        is published.
+
         Arguments:
             username: The name of the user whose state should be retrieved
             block_keys_to_state (dict): A dict mapping UsageKeys to state dicts.
@@ -411,6 +518,13 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        self._set_many(username, block_keys_to_state, write_behind=True)
+
+    def _set_many(self, username, block_keys_to_state, write_behind):
+        """
+        Set fields for a particular XBlock, buffering the write-behind fields if ``write_behind``
+        is True. See :meth:`set_many`.
+        """
         # count how many times this function gets called
         self._nr_stat_increment('set_many', 'calls')
 
@@ -428,6 +542,12 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # what we have.
             return
 
+        # The buffered state of the blocks that are written to the database is
+        # written along with it.
+        flushed_entries = {}
+        if write_behind:
+            block_keys_to_state, flushed_entries = self._buffer_write_behind_state(username, block_keys_to_state)
+
         evt_time = time()
 
         for usage_key, state in block_keys_to_state.items():
@@ -493,6 +613,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # Event to record number of existing fields updated in set/set_many.
             num_fields_updated = max(0, len(state) - num_new_fields_set)
 
+        self._delete_flushed_entries(flushed_entries)
+
         # Events for the entire set_many call.
         finish_time = time()
         duration = (finish_time - evt_time) * 1000  # milliseconds
@@ -511,6 +633,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        # Write the buffered state to the database first, so that it is deleted as well.
+        self.flush_write_behind_state(username, block_keys)
+
         evt_time = time()  # lint-amnesty, pylint: disable=unused-variable
         student_modules = self._get_student_modules(username, block_keys)
         for student_module, _ in student_modules:
@@ -530,6 +655,180 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # Event for the entire delete_many call.
         finish_time = time()  # lint-amnesty, pylint: disable=unused-variable
 
+    def flush_write_behind_state(self, username, block_keys, reschedule=False):
+        """
+        Write the buffered write-behind state of the specified XBlock usages to the database.
+
+        Arguments:
+            username: The name of the user whose state should be written
+            block_keys (list): The UsageKeys identifying which xblock states to write.
+            reschedule (bool): Whether to schedule another flush of the blocks whose state
+                was buffered again while it was being written.
+        """
+        entries = self._get_write_behind_entries(username, block_keys)
+        if not entries:
+            return
+
+        self._set_many(
+            username,
+            {usage_key: entry['state'] for usage_key, (_, entry) in entries.items()},
+            write_behind=False,
+        )
+        self._nr_stat_accumulate('flush_write_behind_state', 'blocks_flushed', len(entries))
+        rebuffered_keys = self._delete_flushed_entries({
+            cache_key: entry['version'] for cache_key, entry in entries.values()
+        })
+        if reschedule:
+            for usage_key, (cache_key, _) in entries.items():
+                if cache_key in rebuffered_keys:
+                    self._schedule_write_behind_flush(username, usage_key)
+
+    @staticmethod
+    def _write_behind_fields(block_type):
+        """
+        Return the write-behind fields of the supplied block type.
+        """
+        return settings.USER_STATE_WRITE_BEHIND_FIELDS.get(block_type, ())
+
+    @staticmethod
+    def _write_behind_cache_key(username, usage_key):
+        """
+        Return the cache key of the buffered write-behind state of the user for the block.
+        """
+        user_block = md5(f'{username}.{usage_key}'.encode('utf-8')).hexdigest()
+        return f'xb_user_state.write_behind.{user_block}'
+
+    @staticmethod
+    def _write_behind_lock_key(cache_key):
+        """
+        Return the cache key of the lock on the buffered write-behind state with the supplied cache key.
+        """
+        return f'{cache_key}.lock'
+
+    @classmethod
+    @contextmanager
+    def _lock_write_behind_entries(cls, cache_keys):
+        """
+        Lock the buffered write-behind states with the supplied cache keys, so that they
+        aren't modified by other processes between reading and writing them.
+
+        The locks are taken in the order of their keys to avoid deadlocks, and expire
+        after WRITE_BEHIND_LOCK_TIMEOUT in case they are never released.
+        """
+        lock_keys = [cls._write_behind_lock_key(cache_key) for cache_key in sorted(cache_keys)]
+        locked_keys = []
+        try:
+            for lock_key in lock_keys:
+                while not cache.add(lock_key, True, WRITE_BEHIND_LOCK_TIMEOUT):
+                    sleep(WRITE_BEHIND_LOCK_RETRY_DELAY)
+                locked_keys.append(lock_key)
+            yield
+        finally:
+            if locked_keys:
+                cache.delete_many(locked_keys)
+
+    def _get_write_behind_entries(self, username, block_keys):
+        """
+        Return the buffered write-behind state of the user for the supplied blocks, as a dict
+        mapping the UsageKeys of the blocks with buffered state to (cache key, entry) tuples.
+
+        An entry is a dict of the buffered state, its version, which is incremented whenever
+        state is buffered, the time it was last buffered at and the time its flush is due at.
+        """
+        cache_keys = {
+            usage_key: self._write_behind_cache_key(username, usage_key)
+            for usage_key in block_keys
+            if self._write_behind_fields(usage_key.block_type)
+        }
+        if not cache_keys:
+            return {}
+        entries = cache.get_many(list(cache_keys.values()))
+        return {
+            usage_key: (cache_key, entries[cache_key])
+            for usage_key, cache_key in cache_keys.items()
+            if cache_key in entries
+        }
+
+    def _buffer_write_behind_state(self, username, block_keys_to_state):
+        """
+        Buffer the states of the blocks that only set write-behind fields.
+
+        Returns a tuple of the states to write to the database, which include the buffered
+        state of their blocks, and of a dict mapping the cache keys of the buffered states
+        that they include to their versions, to delete once the states are written.
+        """
+        if not any(self._write_behind_fields(usage_key.block_type) for usage_key in block_keys_to_state):
+            return block_keys_to_state, {}
+
+        cache_keys = [
+            self._write_behind_cache_key(username, usage_key)
+            for usage_key in block_keys_to_state
+            if self._write_behind_fields(usage_key.block_type)
+        ]
+        with self._lock_write_behind_entries(cache_keys):
+            entries = self._get_write_behind_entries(username, block_keys_to_state)
+            states_to_write = {}
+            flushed_entries = {}
+            for usage_key, state in block_keys_to_state.items():
+                cache_key, entry = entries.get(usage_key, (None, None))
+                write_behind_fields = self._write_behind_fields(usage_key.block_type)
+                if not state or not all(field in write_behind_fields for field in state):
+                    if entry is not None:
+                        state = dict(entry['state'], **state)
+                        flushed_entries[cache_key] = entry['version']
+                    states_to_write[usage_key] = state
+                    continue
+
+                cache_key = cache_key or self._write_behind_cache_key(username, usage_key)
+                if entry is None:
+                    entry = {'state': {}, 'version': 0, 'flush_at': None}
+                entry['state'].update(state)
+                entry['version'] += 1
+                entry['modified'] = now()
+                # Schedule a flush of the first buffered state, or again if the
+                # scheduled flush seems to have been lost.
+                delay = settings.USER_STATE_WRITE_BEHIND_SECONDS
+                should_schedule = entry['flush_at'] is None or entry['flush_at'] + delay < time()
+                if should_schedule:
+                    entry['flush_at'] = time() + delay
+                cache.set(cache_key, entry, WRITE_BEHIND_TIMEOUT)
+                if should_schedule:
+                    self._schedule_write_behind_flush(username, usage_key)
+                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_buffered')
+        return states_to_write, flushed_entries
+
+    @classmethod
+    def _delete_flushed_entries(cls, flushed_entries):
+        """
+        Delete the supplied buffered states, given as a dict mapping their cache keys to
+        their versions when they were written to the database, unless state was buffered
+        again since then.
+
+        Returns the cache keys of the buffered states that were not deleted.
+        """
+        if not flushed_entries:
+            return set()
+        with cls._lock_write_behind_entries(flushed_entries):
+            current_entries = cache.get_many(list(flushed_entries))
+            rebuffered_keys = {
+                cache_key for cache_key, entry in current_entries.items()
+                if entry['version'] != flushed_entries[cache_key]
+            }
+            cache.delete_many([cache_key for cache_key in current_entries if cache_key not in rebuffered_keys])
+        return rebuffered_keys
+
+    @staticmethod
+    def _schedule_write_behind_flush(username, usage_key):
+        """
+        Schedule a task to write the buffered state of the user for the block to the database.
+        """
+        # Imported here since the tasks module imports this module.
+        from lms.djangoapps.courseware.tasks import flush_write_behind_user_state
+        flush_write_behind_user_state.apply_async(
+            kwargs={'username': username, 'usage_key': str(usage_key)},
+            countdown=settings.USER_STATE_WRITE_BEHIND_SECONDS,
+        )
+
     def get_history(self, username, block_key, scope=Scope.user_state):
         """
         Retrieve history of state changes for a given block for a given
@@ -582,7 +881,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
             yield XBlockUserState(username, block_key, state, history_entry.created, scope)
 
-    def iter_all_for_block(self, block_key, scope=Scope.user_state):
+    def iter_all_for_block(self, block_key, scope=Scope.user_state, modified_after=None):
         """
         Return an iterator over the data stored in the block (e.g. a problem block).
 
@@ -592,6 +891,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         Arguments:
             block_key: an XBlock's locator (e.g. :class:`~BlockUsageLocator`)
             scope (Scope): must be `Scope.user_state`
+            modified_after (datetime): if set, only the data modified at or after
+                this time is returned.
 
         Returns:
             an iterator over all data. Each invocation returns the next :class:`~XBlockUserState`
@@ -601,6 +902,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             raise ValueError("Only Scope.user_state is supported")
 
         results = StudentModule.objects.order_by('id').filter(module_state_key=block_key).select_related('student')
+        if modified_after is not None:
+            results = results.filter(modified__gte=modified_after)
         p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
 
         for page_number in p.page_range:
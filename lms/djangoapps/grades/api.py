@@ -15,10 +15,15 @@ from common.djangoapps.track.event_transaction_utils import create_new_event_tra
 from lms.djangoapps.grades import constants, context, course_data, events
 # Grades APIs that should NOT belong within the Grades subsystem
 # TODO move Gradebook to be an external feature outside of core Grades
-from lms.djangoapps.grades.config.waffle import gradebook_bulk_management_enabled, is_writable_gradebook_enabled
+from lms.djangoapps.grades.config.waffle import (
+    are_gradebook_snapshots_enabled,
+    gradebook_bulk_management_enabled,
+    is_writable_gradebook_enabled
+)
 # Public Grades Factories
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.grades.models_api import *
+from lms.djangoapps.grades.score_matrix import ProblemScoreMatrix
 from lms.djangoapps.grades.signals import signals
 # TODO exposing functionality from Grades handlers seems fishy.
 from lms.djangoapps.grades.signals.handlers import disconnect_submissions_signal_receiver
@@ -0,0 +1,116 @@
+"""
+Coalescing of subsection grade recalculations.
+
+Every change to a learner's problem score enqueues a
+recalculate_subsection_grade_v3 task, so a learner who submits several
+problems of a subsection in a row generates a burst of tasks that each
+recompute the same subsection and course grades, and so does a learner who
+submits the same problem several times or whose problem is rescored.
+
+When the grades.coalesce_subsection_grade_updates waffle switch is enabled,
+the tasks are delayed by SUBSECTION_GRADE_COALESCING_WINDOW_SECONDS and keyed
+by the learner, the course, the changed problem and the options of the
+update. The key doesn't depend on the subsections of the problem, so that it
+is computed without reading the course structure in the request that changed
+the score; only the score changes of the same problem are coalesced. Each
+new task becomes the latest of its key,
+and an earlier task whose latest task hasn't started yet skips the
+recalculation, since the latest task reads all the scores after they were
+saved. Each task still checks that the database was updated with its own
+score before it is skipped or run, so that it is retried as before if the
+score wasn't saved yet.
+"""
+
+
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from opaque_keys.edx.keys import UsageKey
+
+from .config.waffle import COALESCE_SUBSECTION_GRADE_UPDATES
+
+# How long the markers of the latest and started tasks are kept, which must be
+# longer than the tasks may wait in the queue for coalescing to be effective.
+MARKER_TIMEOUT_SECONDS = 60 * 60
+
+
+def is_enabled():
+    """
+    Returns whether subsection grade recalculations are coalesced.
+    """
+    return COALESCE_SUBSECTION_GRADE_UPDATES.is_enabled()
+
+
+def get_countdown():
+    """
+    Returns the delay of coalesced recalculation tasks, in seconds.
+    """
+    return settings.SUBSECTION_GRADE_COALESCING_WINDOW_SECONDS
+
+
+def register_update(user_id, course_key, usage_id, **options):
+    """
+    Registers a new recalculation task for the given learner and scored
+    block, as the latest of its key.
+
+    Returns the keyword arguments to add to the task, or an empty dict if
+    coalescing is disabled.
+
+    Arguments:
+        user_id (int) - id of the learner.
+        course_key (CourseKey) - key of the course.
+        usage_id (string) - usage key of the scored block.
+        options - options of the update, such as only_if_higher, which are
+            part of the key so that only identical updates are coalesced.
+    """
+    if not is_enabled():
+        return {}
+
+    usage_key = UsageKey.from_string(usage_id).replace(course_key=course_key)
+    key_data = (
+        user_id,
+        str(course_key),
+        str(usage_key),
+        sorted(options.items()),
+    )
+    coalesce_key = md5(repr(key_data).encode('utf-8')).hexdigest()
+    coalesce_token = uuid4().hex
+    cache.set(_latest_cache_key(coalesce_key), coalesce_token, MARKER_TIMEOUT_SECONDS)
+    return {
+        'coalesce_key': coalesce_key,
+        'coalesce_token': coalesce_token,
+    }
+
+
+def is_superseded(coalesce_key, coalesce_token):
+    """
+    Returns whether the recalculation of the task with the given coalescing
+    arguments can be skipped, because a later task of the same key is yet
+    to start.
+    """
+    if not coalesce_key:
+        return False
+    latest_token = cache.get(_latest_cache_key(coalesce_key))
+    if latest_token is None or latest_token == coalesce_token:
+        return False
+    return not cache.get(_started_cache_key(coalesce_key, latest_token))
+
+
+def mark_started(coalesce_key, coalesce_token):
+    """
+    Marks the task with the given coalescing arguments as started, before
+    it reads the scores, so that earlier tasks of the same key no longer
+    skip their recalculation.
+    """
+    if coalesce_key:
+        cache.set(_started_cache_key(coalesce_key, coalesce_token), True, MARKER_TIMEOUT_SECONDS)
+
+
+def _latest_cache_key(coalesce_key):
+    return f'grades.coalescing.latest.{coalesce_key}'
+
+
+def _started_cache_key(coalesce_key, coalesce_token):
+    return f'grades.coalescing.started.{coalesce_key}.{coalesce_token}'
@@ -23,6 +23,49 @@ LOG_PREFIX = 'Grades: '
 # .. toggle_tickets: https://github.com/openedx/edx-platform/pull/15733
 DISABLE_REGRADE_ON_POLICY_CHANGE = WaffleSwitch(f'{WAFFLE_NAMESPACE}.disable_regrade_on_policy_change', __name__)
 
+# .. toggle_name: grades.batch_course_grade_iteration
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, CourseGradeFactory.iter computes the grades of learners in batches of
+#   GRADES_ITER_BATCH_SIZE learners. The user state scores, anonymous ids, subsection grade overrides and visible
+#   blocks of all the learners of a batch are prefetched with bulk queries instead of being queried for every
+#   learner. The Submissions API scores and the course transformers are still read and run for every learner.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+BATCH_COURSE_GRADE_ITERATION = WaffleSwitch(f'{WAFFLE_NAMESPACE}.batch_course_grade_iteration', __name__)
+
+# .. toggle_name: grades.batch_course_grade_aggregation
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled along with grades.batch_course_grade_iteration, CourseGradeFactory.iter
+#   computes the percents, letter grades and passed flags of each batch of learners at once with
+#   CourseGrade.update_many, instead of computing them for every learner with CourseGrade.update.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+BATCH_COURSE_GRADE_AGGREGATION = WaffleSwitch(f'{WAFFLE_NAMESPACE}.batch_course_grade_aggregation', __name__)
+
+# .. toggle_name: grades.coalesce_subsection_grade_updates
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, the subsection grade recalculations enqueued for score changes of the same
+#   problem of a learner within SUBSECTION_GRADE_COALESCING_WINDOW_SECONDS are coalesced into one recalculation, by
+#   the last of their tasks. See lms/djangoapps/grades/coalescing.py.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_warning: Requires a django cache shared by the LMS and its celery workers, and delays every subsection
+#   grade recalculation by SUBSECTION_GRADE_COALESCING_WINDOW_SECONDS.
+COALESCE_SUBSECTION_GRADE_UPDATES = WaffleSwitch(f'{WAFFLE_NAMESPACE}.coalesce_subsection_grade_updates', __name__)
+
+# .. toggle_name: grades.maintain_gradebook_snapshots
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, every update of a course grade also updates the PersistentGradebookSnapshot
+#   of the learner, a denormalized copy of their course grade and graded subsection grades from which the gradebook
+#   can read a page of learners with a single query.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+MAINTAIN_GRADEBOOK_SNAPSHOTS = WaffleSwitch(f'{WAFFLE_NAMESPACE}.maintain_gradebook_snapshots', __name__)
+
 # Course Flags
 
 # .. toggle_name: grades.rejected_exam_overrides_grade
@@ -72,6 +115,19 @@ WRITABLE_GRADEBOOK = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.writable_gradebook',
 # .. toggle_tickets: https://github.com/openedx/edx-platform/pull/21389
 BULK_MANAGEMENT = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.bulk_management', __name__, LOG_PREFIX)
 
+# .. toggle_name: grades.gradebook_snapshots
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When enabled, the gradebook filters and sorts learners by course grade and reads the grades
+#   of a page of learners from their PersistentGradebookSnapshot, instead of reading the course and subsection grades
+#   of each learner of the page. Learners without a snapshot are still graded as before.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_warning: Requires the grades.maintain_gradebook_snapshots switch to be enabled, and the grades of the
+#   course to be recomputed once after enabling it (for instance with the compute_grades management command) so that
+#   learners are filtered and sorted by their current grades.
+GRADEBOOK_SNAPSHOTS = CourseWaffleFlag(f'{WAFFLE_NAMESPACE}.gradebook_snapshots', __name__, LOG_PREFIX)
+
 
 def is_writable_gradebook_enabled(course_key):
     """
@@ -85,3 +141,10 @@ def gradebook_bulk_management_enabled(course_key):
     Returns whether bulk management features should be specially enabled for a given course.
     """
     return BULK_MANAGEMENT.is_enabled(course_key)
+
+
+def are_gradebook_snapshots_enabled(course_key):
+    """
+    Returns whether the gradebook reads the grades of the given course from gradebook snapshots.
+    """
+    return GRADEBOOK_SNAPSHOTS.is_enabled(course_key)
@@ -2,17 +2,26 @@
 Course Grade Factory Class
 """
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
+from django.conf import settings
+
 from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_CHANGED,
     COURSE_GRADE_NOW_FAILED,
     COURSE_GRADE_NOW_PASSED
 )
+from .config.waffle import BATCH_COURSE_GRADE_AGGREGATION, BATCH_COURSE_GRADE_ITERATION
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
 from .models import PersistentCourseGrade
-from .models_api import prefetch_grade_overrides_and_visible_blocks
+from .models_api import (
+    clear_prefetched_grade_overrides_and_visible_blocks,
+    prefetch_grade_overrides_and_visible_blocks,
+    prefetch_grade_overrides_and_visible_blocks_for_users
+)
+from .subsection_grade_factory import SubsectionGradeFactory
 
 log = getLogger(__name__)
 
@@ -84,6 +93,14 @@ class CourseGradeFactory:
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        When the grades.batch_course_grade_iteration switch is enabled and
+        force_update is True, the students are graded in batches of
+        GRADES_ITER_BATCH_SIZE, whose scores and subsection grade data are
+        prefetched in bulk. When the grades.batch_course_grade_aggregation
+        switch is also enabled, the grades of each batch are computed at once
+        with CourseGrade.update_many. The grades are the same as when the
+        students are graded one by one.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -93,10 +110,90 @@ class CourseGradeFactory:
         course_data = CourseData(
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        if not (force_update and BATCH_COURSE_GRADE_ITERATION.is_enabled()):
+            for user in users:
+                yield self._iter_grade_result(user, course_data, force_update)
+            return
+
+        users = iter(users)
+        aggregate = BATCH_COURSE_GRADE_AGGREGATION.is_enabled()
+        while batch := list(islice(users, settings.GRADES_ITER_BATCH_SIZE)):
+            prefetched = self._prefetch_batch(batch, course_data)
+            try:
+                if prefetched and aggregate:
+                    yield from self._iter_batch_grade_results(batch, course_data)
+                else:
+                    for user in batch:
+                        yield self._iter_grade_result(user, course_data, force_update, prefetched=prefetched)
+            finally:
+                if prefetched:
+                    self._clear_prefetched_batch(batch, course_data)
+
+    @staticmethod
+    def _prefetch_batch(users, course_data):
+        """
+        Prefetches the scores, subsection grade overrides and visible blocks
+        of the given users, for updating their grades. Returns whether they
+        were prefetched.
+        """
+        try:
+            prefetch_grade_overrides_and_visible_blocks_for_users(users, course_data.course_key)
+            SubsectionGradeFactory.prefetch_scores(users, course_data)
+        except Exception:  # pylint: disable=broad-except
+            # The users are graded one by one with their own queries instead,
+            # which report any errors per user.
+            log.exception('Grades: Could not prefetch a batch of users in course %s', course_data.course_key)
+            CourseGradeFactory._clear_prefetched_batch(users, course_data)
+            return False
+        return True
+
+    @staticmethod
+    def _clear_prefetched_batch(users, course_data):
+        """
+        Clears the data prefetched by _prefetch_batch for the given users.
+        """
+        clear_prefetched_grade_overrides_and_visible_blocks(users, course_data.course_key)
+        SubsectionGradeFactory.clear_prefetched_scores(users, course_data.course_key)
+
+    def _iter_batch_grade_results(self, users, course_data):
+        """
+        Yields a GradeResult for each of the given users, whose scores and
+        subsection grade data were prefetched by _prefetch_batch, computing
+        their grades at once with CourseGrade.update_many.
+        """
+        try:
+            course_grades = CourseGrade.update_many([
+                CourseGrade(
+                    user,
+                    CourseData(
+                        user,
+                        course=course_data.course,
+                        collected_block_structure=course_data.collected_structure,
+                        course_key=course_data.course_key,
+                    ),
+                    force_update_subsections=True,
+                )
+                for user in users
+            ])
+        except Exception:  # pylint: disable=broad-except
+            # The users are graded one by one instead, which reports any
+            # errors per user.
+            log.exception('Grades: Could not grade a batch of users in course %s', course_data.course_key)
+            course_grades = None
+
+        if course_grades is None:
+            for user in users:
+                yield self._iter_grade_result(user, course_data, force_update=True, prefetched=True)
+            return
 
-    def _iter_grade_result(self, user, course_data, force_update):  # lint-amnesty, pylint: disable=missing-function-docstring
+        for user, course_grade in zip(users, course_grades):
+            try:
+                result = self.GradeResult(user, self._save(user, course_grade.course_data, course_grade), None)
+            except Exception as exc:  # pylint: disable=broad-except
+                result = self._grade_error_result(user, course_data, exc)
+            yield result
+
+    def _iter_grade_result(self, user, course_data, force_update, prefetched=False):  # lint-amnesty, pylint: disable=missing-function-docstring
         try:
             kwargs = {
                 'user': user,
@@ -104,6 +201,17 @@ class CourseGradeFactory:
                 'collected_block_structure': course_data.collected_structure,
                 'course_key': course_data.course_key,
             }
+            if prefetched:
+                # The grade overrides and visible blocks of the user are
+                # already prefetched with the rest of the batch.
+                course_grade = self._update(
+                    user,
+                    CourseData(**kwargs),
+                    force_update_subsections=True,
+                    overrides_prefetched=True,
+                )
+                return self.GradeResult(user, course_grade, None)
+
             if force_update:
                 kwargs['force_update_subsections'] = True
 
@@ -111,15 +219,22 @@ class CourseGradeFactory:
             course_grade = method(**kwargs)
             return self.GradeResult(user, course_grade, None)
         except Exception as exc:  # pylint: disable=broad-except
-            # Keep marching on even if this student couldn't be graded for
-            # some reason, but log it for future reference.
-            log.exception(
-                'Cannot grade student %s in course %s because of exception: %s',
-                user.id,
-                course_data.course_key,
-                str(exc)
-            )
-            return self.GradeResult(user, None, exc)
+            return self._grade_error_result(user, course_data, exc)
+
+    def _grade_error_result(self, user, course_data, exc):
+        """
+        Returns the GradeResult of the given user, who couldn't be graded
+        because of the given exception.
+        """
+        # Keep marching on even if this student couldn't be graded for
+        # some reason, but log it for future reference.
+        log.exception(
+            'Cannot grade student %s in course %s because of exception: %s',
+            user.id,
+            course_data.course_key,
+            str(exc)
+        )
+        return self.GradeResult(user, None, exc)
 
     @staticmethod
     def _create_zero(user, course_data):
@@ -148,7 +263,7 @@ class CourseGradeFactory:
         )
 
     @staticmethod
-    def _update(user, course_data, force_update_subsections=False):
+    def _update(user, course_data, force_update_subsections=False, overrides_prefetched=False):
         """
         Computes, saves, and returns a CourseGrade object for the
         given user and course.
@@ -156,7 +271,7 @@ class CourseGradeFactory:
         COURSE_GRADE_NOW_PASSED if learner has passed course or
         COURSE_GRADE_NOW_FAILED if learner is now failing course
         """
-        if force_update_subsections:
+        if force_update_subsections and not overrides_prefetched:
             prefetch_grade_overrides_and_visible_blocks(user, course_data.course_key)
 
         course_grade = CourseGrade(
@@ -165,7 +280,14 @@ class CourseGradeFactory:
             force_update_subsections=force_update_subsections
         )
         course_grade = course_grade.update()
+        return CourseGradeFactory._save(user, course_data, course_grade)
 
+    @staticmethod
+    def _save(user, course_data, course_grade):
+        """
+        Saves the given computed CourseGrade object for the given user
+        and course, sends the signals described in _update, and returns it.
+        """
         should_persist = course_grade.attempted
         if should_persist:
             course_grade._subsection_grade_factory.bulk_create_unsaved()  # lint-amnesty, pylint: disable=protected-access
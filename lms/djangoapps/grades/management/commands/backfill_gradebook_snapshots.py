@@ -0,0 +1,74 @@
+"""
+Command to create or update the gradebook snapshots of the learners of
+courses from their persisted grades, for courses whose grades were computed
+before the snapshots were maintained.
+"""
+
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentGradebookSnapshot
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms backfill_gradebook_snapshots course-v1:edX+DemoX+Demo_Course --batch_size 500
+    """
+    help = (
+        'Creates or updates the gradebook snapshots of the learners of the given courses '
+        'from their persisted course and subsection grades, without recomputing them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_ids', nargs='+', help='The ids of the courses whose snapshots to backfill.')
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='The number of learners whose grades are read at once.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            course_keys = [CourseKey.from_string(course_id) for course_id in options['course_ids']]
+        except InvalidKeyError as exc:
+            raise CommandError(f'Invalid course id: {exc}') from exc
+
+        for course_key in course_keys:
+            self.backfill_course(course_key, options['batch_size'])
+
+    def backfill_course(self, course_key, batch_size):
+        """
+        Creates or updates the snapshots of the learners with a persisted
+        course grade in the given course, batch_size learners at a time.
+        """
+        user_ids = list(
+            PersistentCourseGrade.objects.filter(course_id=course_key).order_by('user_id').values_list(
+                'user_id', flat=True,
+            )
+        )
+        updated, failed = 0, 0
+        for start in range(0, len(user_ids), batch_size):
+            users = get_user_model().objects.filter(id__in=user_ids[start:start + batch_size])
+            for user, course_grade, error in CourseGradeFactory().iter(users, course_key=course_key):
+                if error:
+                    failed += 1
+                    continue
+                PersistentGradebookSnapshot.update_from_course_grade(user.id, course_key, course_grade)
+                updated += 1
+
+        log.info(
+            'Grades: Backfilled the gradebook snapshots of %d learners in course %s, %d learners failed.',
+            updated, course_key, failed,
+        )
@@ -0,0 +1,48 @@
+"""
+Tests for backfill_gradebook_snapshots management command.
+"""
+
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from common.djangoapps.student.models import CourseEnrollment
+from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.grades.models import PersistentGradebookSnapshot
+from lms.djangoapps.grades.tests.base import GradeTestBase
+from lms.djangoapps.grades.tests.utils import mock_get_score
+
+
+class TestBackfillGradebookSnapshots(GradeTestBase):
+    """
+    Tests backfill_gradebook_snapshots management command.
+    """
+
+    def test_backfill(self):
+        other_users = [UserFactory.create(), UserFactory.create()]
+        for user in other_users:
+            CourseEnrollment.enroll(user, self.course.id)
+        with mock_get_score(1, 2):
+            course_grades = {
+                user.id: CourseGradeFactory().update(user, self.course, force_update_subsections=True)
+                for user in (self.request.user, other_users[0])
+            }
+
+        with mock_get_score(2, 2):
+            call_command('backfill_gradebook_snapshots', str(self.course.id), '--batch_size', '1')
+
+        # Only the learners with a course grade get a snapshot, from their persisted grades.
+        snapshots = PersistentGradebookSnapshot.read_snapshots(
+            [self.request.user.id] + [user.id for user in other_users], self.course.id,
+        )
+        assert sorted(snapshots) == sorted(course_grades)
+        for user_id, snapshot in snapshots.items():
+            assert snapshot.percent_grade == course_grades[user_id].percent
+            assert snapshot.subsection_grades[str(self.sequence.location)] == {
+                'earned': 1.0, 'possible': 2.0, 'percent': 0.5, 'attempted': True,
+            }
+
+    def test_invalid_course_id(self):
+        with pytest.raises(CommandError):
+            call_command('backfill_gradebook_snapshots', 'not_a_course_id')
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.20 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import lms.djangoapps.courseware.fields
+import model_utils.fields
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0022_rename_persistentsubsectiongrade_first_attempted_course_id_user_id_first_course_id_user_id_idx_and_m'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersistentGradebookSnapshot',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('id', lms.djangoapps.courseware.fields.UnsignedBigIntAutoField(primary_key=True, serialize=False)),
+                ('user_id', models.IntegerField()),
+                ('course_id', opaque_keys.edx.django.models.CourseKeyField(max_length=255)),
+                ('percent_grade', models.FloatField()),
+                ('letter_grade', models.CharField(blank=True, max_length=255, verbose_name='Letter grade for course')),
+                ('passed', models.BooleanField(default=False)),
+                ('subsection_grades', models.JSONField(default=dict)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course_id', 'percent_grade'], name='snapshot_course_id_percent_idx')],
+                'unique_together': {('course_id', 'user_id')},
+            },
+        ),
+    ]
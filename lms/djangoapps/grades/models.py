@@ -278,6 +278,29 @@ class VisibleBlocks(models.Model):
         get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(user_id, course_key)] = prefetched
         return prefetched
 
+    @classmethod
+    def bulk_prefetch(cls, user_ids, course_key):
+        """
+        Prefetches visible blocks for the given users and course with a single
+        query, and stores them in the cache used by bulk_read.
+        """
+        prefetched = {user_id: {} for user_id in user_ids}
+        grades_with_blocks = PersistentSubsectionGrade.objects.select_related('visible_blocks').filter(
+            user_id__in=user_ids,
+            course_id=course_key,
+        )
+        for grade in grades_with_blocks:
+            prefetched[grade.user_id][grade.visible_blocks.hashed] = grade.visible_blocks
+        for user_id, user_prefetched in prefetched.items():
+            get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(user_id, course_key)] = user_prefetched
+
+    @classmethod
+    def clear_prefetched_data(cls, user_id, course_key):
+        """
+        Clears prefetched visible blocks for this user and course from the RequestCache.
+        """
+        get_cache(cls._CACHE_NAMESPACE).pop(cls._cache_key(user_id, course_key), None)
+
     @classmethod
     def _update_cache(cls, user_id, course_key, visible_blocks):
         """
@@ -739,6 +762,121 @@ class PersistentCourseGrade(TimeStampedModel):
         )
 
 
+class PersistentGradebookSnapshot(TimeStampedModel):
+    """
+    A django model tracking a denormalized snapshot of the course grade and
+    graded subsection grades of a learner, maintained whenever the course
+    grade of the learner is updated, so that a page of the gradebook can be
+    filtered, sorted and read with indexed queries instead of grading each
+    learner of the page.
+
+    .. no_pii:
+    """
+
+    class Meta:
+        app_label = "grades"
+        # Indices:
+        # (course_id, user_id) for the grades of a page of learners, implicitly created via the unique_together
+        #     constraint
+        # (course_id, percent_grade) for filtering and sorting the learners of a course by course grade
+        unique_together = [
+            ('course_id', 'user_id'),
+        ]
+        indexes = [
+            models.Index(fields=['course_id', 'percent_grade'], name="snapshot_course_id_percent_idx"),
+        ]
+
+    # primary key will need to be large for this table
+    id = UnsignedBigIntAutoField(primary_key=True)  # pylint: disable=invalid-name
+    user_id = models.IntegerField(blank=False)
+    course_id = CourseKeyField(blank=False, max_length=255)
+
+    # Information about the course grade itself
+    percent_grade = models.FloatField(blank=False)
+    letter_grade = models.CharField('Letter grade for course', blank=True, max_length=255)
+    passed = models.BooleanField(default=False)
+
+    # The graded subsection grades of the learner, keyed by the usage key of
+    # the subsection, as dicts with the keys earned, possible, percent and
+    # attempted. earned and possible are only set for attempted or overridden
+    # subsections.
+    subsection_grades = models.JSONField(default=dict)
+
+    def __str__(self):
+        """
+        Returns a string representation of this model.
+        """
+        return ', '.join([
+            f"{type(self).__name__} user: {self.user_id}",
+            f"course: {self.course_id}",
+            f"percent grade: {self.percent_grade}%",
+            f"letter grade: {self.letter_grade}",
+            f"passed: {self.passed}",
+        ])
+
+    @classmethod
+    def read_snapshots(cls, user_ids, course_id):
+        """
+        Returns the snapshots of the given users in the given course, as a
+        dict keyed by user id. Users without a snapshot are not included.
+        """
+        return {
+            snapshot.user_id: snapshot
+            for snapshot in cls.objects.filter(user_id__in=user_ids, course_id=course_id)
+        }
+
+    @classmethod
+    def update_or_create(cls, user_id, course_id, **kwargs):
+        """
+        Creates or updates the snapshot of the given user in the given course.
+        Returns a PersistentGradebookSnapshot object.
+        """
+        snapshot, _ = cls.objects.update_or_create(
+            user_id=user_id,
+            course_id=course_id,
+            defaults=kwargs
+        )
+        return snapshot
+
+    @classmethod
+    def update_from_course_grade(cls, user_id, course_id, course_grade):
+        """
+        Creates or updates the snapshot of the given user in the given course
+        from the given CourseGrade object.
+        """
+        subsection_grades = {}
+        for subsection_grade in course_grade.subsection_grades.values():
+            if not subsection_grade.graded:
+                continue
+            # Same as the gradebook, the scores of subsections that were neither
+            # attempted nor overridden are not included.
+            attempted = bool(subsection_grade.attempted_graded or subsection_grade.override)
+            subsection_grades[str(subsection_grade.location)] = {
+                'earned': subsection_grade.graded_total.earned if attempted else 0,
+                'possible': subsection_grade.graded_total.possible if attempted else 0,
+                'percent': subsection_grade.percent_graded,
+                'attempted': attempted,
+            }
+        return cls.update_or_create(
+            user_id=user_id,
+            course_id=course_id,
+            percent_grade=course_grade.percent,
+            letter_grade=course_grade.letter_grade or "",
+            passed=course_grade.passed,
+            subsection_grades=subsection_grades,
+        )
+
+    @classmethod
+    def delete_snapshot_for_learner(cls, course_id, user_id):
+        """
+        Clears the snapshot of a learner in a course
+        Arguments:
+            course_id: The id of the course associated with the snapshot
+            user_id: The user associated with the snapshot
+        """
+        cls.objects.filter(user_id=user_id, course_id=course_id).delete()
+
+
 class PersistentSubsectionGradeOverride(models.Model):
     """
     A django model tracking persistent grades overrides at the subsection level.
@@ -794,6 +932,19 @@ class PersistentSubsectionGradeOverride(models.Model):
             cls.objects.filter(grade__user_id=user_id, grade__course_id=course_key)
         }
 
+    @classmethod
+    def bulk_prefetch(cls, user_ids, course_key):
+        """
+        Prefetches the overrides of the given users in the given course with
+        a single query.
+        """
+        prefetched = {user_id: {} for user_id in user_ids}
+        overrides = cls.objects.select_related('grade').filter(grade__user_id__in=user_ids, grade__course_id=course_key)
+        for override in overrides:
+            prefetched[override.grade.user_id][override.grade.usage_key] = override
+        for user_id, user_overrides in prefetched.items():
+            get_cache(cls._CACHE_NAMESPACE)[(user_id, str(course_key))] = user_overrides
+
     @classmethod
     def get_override(cls, user_id, usage_key):  # lint-amnesty, pylint: disable=missing-function-docstring
         prefetch_values = get_cache(cls._CACHE_NAMESPACE).get((user_id, str(usage_key.course_key)), None)
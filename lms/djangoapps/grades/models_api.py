@@ -7,6 +7,7 @@ from django.db import transaction
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from lms.djangoapps.grades.models import PersistentCourseGrade as _PersistentCourseGrade
+from lms.djangoapps.grades.models import PersistentGradebookSnapshot as _PersistentGradebookSnapshot
 from lms.djangoapps.grades.models import PersistentSubsectionGrade as _PersistentSubsectionGrade
 from lms.djangoapps.grades.models import PersistentSubsectionGradeOverride as _PersistentSubsectionGradeOverride
 from lms.djangoapps.grades.models import VisibleBlocks as _VisibleBlocks
@@ -18,6 +19,18 @@ def prefetch_grade_overrides_and_visible_blocks(user, course_key):
     _VisibleBlocks.bulk_read(user.id, course_key)
 
 
+def prefetch_grade_overrides_and_visible_blocks_for_users(users, course_key):
+    user_ids = [user.id for user in users]
+    _PersistentSubsectionGradeOverride.bulk_prefetch(user_ids, course_key)
+    _VisibleBlocks.bulk_prefetch(user_ids, course_key)
+
+
+def clear_prefetched_grade_overrides_and_visible_blocks(users, course_key):
+    for user in users:
+        _PersistentSubsectionGradeOverride.clear_prefetched_overrides_for_learner(user.id, course_key)
+        _VisibleBlocks.clear_prefetched_data(user.id, course_key)
+
+
 def prefetch_course_grades(course_key, users):
     _PersistentCourseGrade.prefetch(course_key, users)
 
@@ -109,3 +122,4 @@ def clear_user_course_grades(user_id, course_key):
     with transaction.atomic():
         _PersistentSubsectionGrade.delete_subsection_grades_for_learner(user_id, course_key)
         _PersistentCourseGrade.delete_course_grade_for_learner(course_key, user_id)
+        _PersistentGradebookSnapshot.delete_snapshot_for_learner(course_key, user_id)
@@ -10,7 +10,8 @@ from functools import wraps
 
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.db.models import Case, Exists, F, OuterRef, Q, When
+from django.db.models import Case, Exists, F, FloatField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from opaque_keys import InvalidKeyError
@@ -31,7 +32,11 @@ from common.djangoapps.track.event_transaction_utils import (
 )
 from common.djangoapps.util.date_utils import to_timestamp
 from lms.djangoapps.course_blocks.api import get_course_blocks
-from lms.djangoapps.grades.api import CourseGradeFactory, clear_prefetched_course_and_subsection_grades
+from lms.djangoapps.grades.api import (
+    CourseGradeFactory,
+    are_gradebook_snapshots_enabled,
+    clear_prefetched_course_and_subsection_grades
+)
 from lms.djangoapps.grades.api import constants as grades_constants
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.grades.api import events as grades_events
@@ -43,6 +48,7 @@ from lms.djangoapps.grades.grade_utils import are_grades_frozen
 # to be refactored so Gradebook views only access public Grades APIs.
 from lms.djangoapps.grades.models import (
     PersistentCourseGrade,
+    PersistentGradebookSnapshot,
     PersistentSubsectionGrade,
     PersistentSubsectionGradeOverride
 )
@@ -50,7 +56,12 @@ from lms.djangoapps.grades.rest_api.serializers import (
     StudentGradebookEntrySerializer,
     SubsectionGradeResponseSerializer
 )
-from lms.djangoapps.grades.rest_api.v1.utils import USER_MODEL, CourseEnrollmentPagination, GradeViewMixin
+from lms.djangoapps.grades.rest_api.v1.utils import (
+    USER_MODEL,
+    CourseEnrollmentPagination,
+    GradeViewMixin,
+    OrderedCourseEnrollmentPagination
+)
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.subsection_grade_factory import SubsectionGradeFactory
 from lms.djangoapps.grades.tasks import recalculate_subsection_grade_v3
@@ -67,11 +78,22 @@ from openedx.core.lib.api.view_utils import (
 )
 from openedx.core.lib.cache_utils import request_cached
 from openedx.core.lib.courses import get_course_by_id
+from xmodule import block_metadata_utils  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.util.misc import get_default_short_labeler  # lint-amnesty, pylint: disable=wrong-import-order
 
 log = logging.getLogger(__name__)
 
+# The course grade of a learner, as read from their PersistentGradebookSnapshot.
+SnapshotCourseGrade = namedtuple('SnapshotCourseGrade', ['percent', 'letter_grade', 'passed'])
+
+# Values of the ordering parameter of the gradebook, with the orderings of the
+# enrollments they stand for.
+GRADEBOOK_ORDERINGS = {
+    'course_grade': ('course_grade_percent', 'id'),
+    '-course_grade': ('-course_grade_percent', '-id'),
+}
+
 
 @contextmanager
 def bulk_gradebook_view_context(course_key, users):
@@ -367,6 +389,9 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
           only for course enrollees who belong to that cohort.
         * enrollment_mode: (optional) The slug of an enrollment mode (e.g. "verified").  If present, will return grades
           only for course enrollees with the given enrollment mode.
+        * ordering: (optional) Either "course_grade" or "-course_grade", to sort course enrollees by ascending or
+          descending course grade. Only supported when the grades.gradebook_snapshots flag is enabled for the course.
+          The ordered results are paginated by page number, with the "page" parameter, rather than with a cursor.
     **GET Response Values**
         If the request for gradebook data is successful,
         an HTTP 200 "OK" response is returned.
@@ -500,7 +525,61 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
         """
         user_entry = self._serialize_user_grade(user, course.id, course_grade)
         breakdown = self._section_breakdown(course, graded_subsections, course_grade)
+        return self._complete_gradebook_entry(user, course, user_entry, breakdown)
+
+    def _snapshot_section_breakdown(self, course, graded_subsections, snapshot):
+        """
+        Given a gradebook snapshot and a list of graded subsections for a given course,
+        returns a list of grade data broken down by subsection, the same as `_section_breakdown`.
 
+        Args:
+            course: A CourseBlock object
+            graded_subsections: A list of graded subsection objects in the given course.
+            snapshot: A PersistentGradebookSnapshot object.
+        """
+        breakdown = []
+        default_labeler = get_default_short_labeler(course)
+
+        for subsection in graded_subsections:
+            subsection_grade = snapshot.subsection_grades.get(str(subsection.location), {})
+            subsection_format = getattr(subsection, 'format', '')
+            breakdown.append({
+                'attempted': subsection_grade.get('attempted', False),
+                'category': subsection_format,
+                'label': default_labeler(subsection_format),
+                'module_id': str(subsection.location),
+                'percent': subsection_grade.get('percent', 0.0),
+                'score_earned': subsection_grade.get('earned', 0),
+                'score_possible': subsection_grade.get('possible', 0),
+                'subsection_name': block_metadata_utils.display_name_with_default(subsection),
+            })
+        return breakdown
+
+    def _snapshot_gradebook_entry(self, user, course, graded_subsections, snapshot):
+        """
+        Returns a dictionary of course- and subsection-level grade data for
+        a given user in a given course, read from their gradebook snapshot.
+
+        Args:
+            user: A User object.
+            course: A CourseBlock object.
+            graded_subsections: A list of graded subsections in the given course.
+            snapshot: A PersistentGradebookSnapshot object.
+        """
+        course_grade = SnapshotCourseGrade(
+            percent=snapshot.percent_grade,
+            letter_grade=snapshot.letter_grade,
+            passed=snapshot.passed,
+        )
+        user_entry = self._serialize_user_grade(user, course.id, course_grade)
+        breakdown = self._snapshot_section_breakdown(course, graded_subsections, snapshot)
+        return self._complete_gradebook_entry(user, course, user_entry, breakdown)
+
+    def _complete_gradebook_entry(self, user, course, user_entry, breakdown):
+        """
+        Adds the subsection breakdown and the user data to the given serialized
+        course grade of a given user, and returns it.
+        """
         user_entry['section_breakdown'] = breakdown
         user_entry['progress_page_url'] = reverse(
             'student_progress',
@@ -541,6 +620,7 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
             course_key: The edx course opaque key of a course object.
         """
         course = get_course_by_id(course_key, depth=None)
+        use_snapshots = are_gradebook_snapshots_enabled(course_key)
 
         # We fetch the entire course structure up-front, and use this when iterating
         # over users to determine their subsection grades.  We purposely avoid fetching
@@ -606,7 +686,31 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
                     )
                 )
                 q_objects.append(Q(selected_assignment_grade_in_range=True))
-            if request.GET.get('course_grade_min') or request.GET.get('course_grade_max'):
+            if use_snapshots:
+                # Learners without a snapshot yet use their PersistentCourseGrade,
+                # and learners without either have no course grade yet.
+                annotations['course_grade_percent'] = Coalesce(
+                    Subquery(
+                        PersistentGradebookSnapshot.objects.filter(
+                            course_id=OuterRef('course'),
+                            user_id=OuterRef('user_id'),
+                        ).values('percent_grade')[:1]
+                    ),
+                    Subquery(
+                        PersistentCourseGrade.objects.filter(
+                            course_id=OuterRef('course'),
+                            user_id=OuterRef('user_id'),
+                        ).values('percent_grade')[:1]
+                    ),
+                    Value(0.0),
+                    output_field=FloatField(),
+                )
+            if use_snapshots and (request.GET.get('course_grade_min') or request.GET.get('course_grade_max')):
+                if request.GET.get('course_grade_min'):
+                    q_objects.append(Q(course_grade_percent__gte=float(request.GET.get('course_grade_min')) / 100))
+                if request.GET.get('course_grade_max'):
+                    q_objects.append(Q(course_grade_percent__lte=float(request.GET.get('course_grade_max')) / 100))
+            elif request.GET.get('course_grade_min') or request.GET.get('course_grade_max'):
                 grade_conditions = {}
                 q_object = Q()
                 course_grade_min = request.GET.get('course_grade_min')
@@ -653,19 +757,37 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
                 )
                 # TODO: In django 3.0+, we can directly filter on this 'exists' rather than annotating
                 q_objects.append(Q(has_excluded_role=False))
-            entries = []
+            if use_snapshots and request.GET.get('ordering') in GRADEBOOK_ORDERINGS:
+                # Course grades aren't unique, so they can't be the position of a cursor.
+                self.pagination_class = OrderedCourseEnrollmentPagination
+                self.paginator.ordering = GRADEBOOK_ORDERINGS[request.GET.get('ordering')]
+            entries_by_user_id = {}
             related_models = ['user']
             users = self._paginate_users(course_key, q_objects, related_models, annotations=annotations)
 
             users_counts = self._get_users_counts(course_key, q_objects, annotations=annotations)
 
-            with bulk_gradebook_view_context(course_key, users):
-                for user, course_grade, exc in CourseGradeFactory().iter(
-                    users, course_key=course_key, collected_block_structure=course_data.collected_structure
-                ):
-                    if not exc:
-                        entry = self._gradebook_entry(user, course, graded_subsections, course_grade)
-                        entries.append(entry)
+            snapshots = {}
+            if use_snapshots:
+                snapshots = PersistentGradebookSnapshot.read_snapshots([user.id for user in users], course_key)
+                for user in users:
+                    if user.id in snapshots:
+                        entries_by_user_id[user.id] = self._snapshot_gradebook_entry(
+                            user, course, graded_subsections, snapshots[user.id]
+                        )
+
+            # Learners without a snapshot are graded as usual.
+            users_to_grade = [user for user in users if user.id not in snapshots]
+            if users_to_grade:
+                with bulk_gradebook_view_context(course_key, users_to_grade):
+                    for user, course_grade, exc in CourseGradeFactory().iter(
+                        users_to_grade, course_key=course_key, collected_block_structure=course_data.collected_structure
+                    ):
+                        if not exc:
+                            entries_by_user_id[user.id] = self._gradebook_entry(
+                                user, course, graded_subsections, course_grade
+                            )
+            entries = [entries_by_user_id[user.id] for user in users if user.id in entries_by_user_id]
 
             serializer = StudentGradebookEntrySerializer(entries, many=True)
             return self.get_paginated_response(serializer.data, **users_counts)
@@ -36,7 +36,7 @@ from common.djangoapps.student.tests.factories import InstructorFactory
 from common.djangoapps.student.tests.factories import StaffFactory
 from lms.djangoapps.certificates.data import CertificateStatuses
 from lms.djangoapps.certificates.models import GeneratedCertificate
-from lms.djangoapps.grades.config.waffle import BULK_MANAGEMENT, WRITABLE_GRADEBOOK
+from lms.djangoapps.grades.config.waffle import BULK_MANAGEMENT, GRADEBOOK_SNAPSHOTS, WRITABLE_GRADEBOOK
 from lms.djangoapps.grades.constants import GradeOverrideFeatureEnum
 from lms.djangoapps.grades.course_data import CourseData
 from lms.djangoapps.grades.course_grade import CourseGrade
@@ -44,6 +44,7 @@ from lms.djangoapps.grades.models import (
     BlockRecord,
     BlockRecordList,
     PersistentCourseGrade,
+    PersistentGradebookSnapshot,
     PersistentSubsectionGrade,
     PersistentSubsectionGradeOverride
 )
@@ -1508,6 +1509,119 @@ class GradebookViewTest(GradebookViewTestBase):
         response_data = dict(response.data)
         assert response_data['full_name'] == self.program_masters_student.profile.name
 
+    def test_gradebook_snapshots(self):
+        subsection_grades = {
+            str(subsection.location): {'earned': 1.0, 'possible': 2.0, 'percent': 0.5, 'attempted': True}
+            for chapter_subsections in self.subsections.values()
+            for subsection in chapter_subsections
+        }
+        for user, percent in ((self.other_student, 0.45), (self.program_student, 0.75), (self.student, 0.85)):
+            PersistentGradebookSnapshot.update_or_create(
+                user_id=user.id,
+                course_id=self.course_key,
+                percent_grade=percent,
+                letter_grade='',
+                passed=percent > 0.5,
+                subsection_grades=subsection_grades,
+            )
+
+        with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read') as mock_grade:
+            with override_waffle_flag(self.waffle_flag, active=True):
+                with override_waffle_flag(GRADEBOOK_SNAPSHOTS, active=True):
+                    self.login_staff()
+                    resp = self.client.get(
+                        self.get_url(course_key=self.course.id) + '?course_grade_min=50&ordering=-course_grade'
+                    )
+        assert not mock_grade.called
+
+        expected_results = [
+            OrderedDict([
+                ('user_id', self.student.id),
+                ('username', self.student.username),
+                ('email', ''),
+                ('percent', 0.85),
+                ('section_breakdown', self.expected_subsection_grades()),
+            ]),
+            OrderedDict([
+                ('user_id', self.program_student.id),
+                ('username', self.program_student.username),
+                ('email', ''),
+                ('external_user_key', 'program_user_key_0'),
+                ('percent', 0.75),
+                ('section_breakdown', self.expected_subsection_grades()),
+            ]),
+        ]
+        assert status.HTTP_200_OK == resp.status_code
+        actual_data = dict(resp.data)
+        assert expected_results == actual_data['results']
+        assert actual_data['filtered_users_count'] == 2
+
+    def test_gradebook_snapshots_ordering_with_equal_grades(self):
+        for user in (self.student, self.other_student, self.program_student):
+            PersistentGradebookSnapshot.update_or_create(
+                user_id=user.id,
+                course_id=self.course_key,
+                percent_grade=0.5,
+                letter_grade='',
+                passed=False,
+                subsection_grades={},
+            )
+
+        with override_waffle_flag(self.waffle_flag, active=True):
+            with override_waffle_flag(GRADEBOOK_SNAPSHOTS, active=True):
+                self.login_staff()
+                first_page = self.client.get(
+                    self.get_url(course_key=self.course.id) + '?ordering=course_grade&page_size=2'
+                )
+                second_page = self.client.get(first_page.data['next'])
+
+        assert status.HTTP_200_OK == first_page.status_code == second_page.status_code
+        user_ids = [result['user_id'] for result in first_page.data['results'] + second_page.data['results']]
+        # Learners with equal grades are ordered by id, and each is on exactly one page.
+        assert user_ids == sorted([self.student.id, self.other_student.id, self.program_student.id])
+        assert second_page.data['next'] is None
+
+    def test_gradebook_snapshots_fall_back_to_course_grades(self):
+        # The student has no snapshot yet, so their persisted course grade is used.
+        PersistentCourseGrade(user_id=self.student.id, course_id=self.course_key, percent_grade=0.85).save()
+        for user, percent in ((self.other_student, 0.45), (self.program_student, 0.75)):
+            PersistentGradebookSnapshot.update_or_create(
+                user_id=user.id,
+                course_id=self.course_key,
+                percent_grade=percent,
+                letter_grade='',
+                passed=percent > 0.5,
+                subsection_grades={},
+            )
+
+        with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read') as mock_grade:
+            mock_grade.return_value = self.mock_course_grade(self.student, passed=True, percent=0.85)
+            with override_waffle_flag(self.waffle_flag, active=True):
+                with override_waffle_flag(GRADEBOOK_SNAPSHOTS, active=True):
+                    self.login_staff()
+                    resp = self.client.get(
+                        self.get_url(course_key=self.course.id) + '?course_grade_min=80&ordering=-course_grade'
+                    )
+
+        assert status.HTTP_200_OK == resp.status_code
+        actual_data = dict(resp.data)
+        assert [result['user_id'] for result in actual_data['results']] == [self.student.id]
+        assert actual_data['filtered_users_count'] == 1
+
+    def test_gradebook_snapshots_missing(self):
+        with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read') as mock_grade:
+            mock_grade.side_effect = [
+                self.mock_course_grade(self.student, passed=True, percent=0.85),
+                self.mock_course_grade(self.other_student, passed=False, percent=0.45),
+                self.mock_course_grade(self.program_student, passed=True, percent=0.75)
+            ]
+
+            with override_waffle_flag(self.waffle_flag, active=True):
+                with override_waffle_flag(GRADEBOOK_SNAPSHOTS, active=True):
+                    self.login_staff()
+                    resp = self.client.get(self.get_url(course_key=self.course.id))
+                    self._assert_data_all_users(resp)
+
 
 @ddt.ddt
 class GradebookBulkUpdateViewTest(GradebookViewTestBase):
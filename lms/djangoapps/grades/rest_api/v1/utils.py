@@ -9,7 +9,7 @@ from django.contrib.auth import get_user_model
 from django.db.models import Q
 from rest_framework import status
 from rest_framework.exceptions import AuthenticationFailed
-from rest_framework.pagination import CursorPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 from common.djangoapps.student.models import CourseEnrollment
@@ -20,11 +20,10 @@ from openedx.core.lib.api.view_utils import DeveloperErrorViewMixin
 USER_MODEL = get_user_model()
 
 
-class CourseEnrollmentPagination(CursorPagination):
+class CourseEnrollmentPaginationMixin:
     """
-    Paginates over CourseEnrollment objects.
+    Page size and response of the paginations of CourseEnrollment objects.
     """
-    ordering = 'id'
     page_size = 50
     page_size_query_param = 'page_size'
 
@@ -54,6 +53,24 @@ class CourseEnrollmentPagination(CursorPagination):
         return resp
 
 
+class CourseEnrollmentPagination(CourseEnrollmentPaginationMixin, CursorPagination):
+    """
+    Paginates over CourseEnrollment objects.
+    """
+    ordering = 'id'
+
+
+class OrderedCourseEnrollmentPagination(CourseEnrollmentPaginationMixin, PageNumberPagination):
+    """
+    Paginates over CourseEnrollment objects in the given ordering, by page
+    number, since a cursor requires a unique ordering, such as by id.
+    """
+    ordering = ('id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return super().paginate_queryset(queryset.order_by(*self.ordering), request, view=view)
+
+
 class GradeViewMixin(DeveloperErrorViewMixin):
     """
     Mixin class for Grades related views.
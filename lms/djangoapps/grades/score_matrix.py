@@ -0,0 +1,159 @@
+"""
+Bulk computation of the problem scores of many learners in a course.
+
+Reports that list the score of every graded problem for every learner used to
+read a CourseGrade per learner, which transforms the course structure for the
+learner and reads the persisted grades and the scores of the learner with
+several queries. A ProblemScoreMatrix instead reads the persisted course and
+subsection grades and the user state scores of a whole batch of learners with
+a query each, and computes the scores of a fixed list of problems (the columns
+of the matrix) from the collected course structure. The Submissions API scores
+are still read one learner at a time.
+
+Only the learners with a persisted course grade get a row of the matrix; the
+scores of the other learners have to be read from their CourseGrades.
+
+The scores are the ones of the CourseGrades read from storage, except that the
+problems that are visible to a learner are taken from the blocks persisted
+with their subsection grades, or else from the collected course structure,
+rather than from the course structure transformed for the learner.
+"""
+
+
+from collections import OrderedDict, defaultdict, namedtuple
+
+from common.djangoapps.student.models import anonymous_id_for_user, prefetch_anonymous_ids_for_users
+from lms.djangoapps.courseware.model_data import ScoresClient
+
+from .models import BlockRecordList, PersistentCourseGrade, PersistentSubsectionGrade, VisibleBlocks
+from .scores import get_score
+from .subsection_grade_factory import get_submissions_scores_for_users
+
+# The scores of a learner in the matrix:
+#   percent - the percent of the persisted course grade of the learner.
+#   problem_scores - list with the ProblemScore of each column, or None if the
+#       problem is not available to the learner.
+ProblemScoreRow = namedtuple('ProblemScoreRow', ['percent', 'problem_scores'])
+
+
+class ProblemScoreMatrix:
+    """
+    Computes the problem scores of batches of learners in a course, for a
+    fixed list of scorable blocks.
+    """
+
+    def __init__(self, course_key, collected_structure, block_subsections):
+        """
+        Arguments:
+            course_key (CourseKey) - key of the course.
+            collected_structure (BlockStructureBlockData) - the collected
+                structure of the course.
+            block_subsections (OrderedDict) - the usage key of the subsection
+                of each scorable block, in the order of the columns.
+        """
+        self.course_key = course_key
+        self.collected_structure = collected_structure
+        self.columns = list(block_subsections.items())
+
+        # Parsed blocks of VisibleBlocks, by hash, which are shared by the
+        # learners that saw the same blocks.
+        # dict {hash: {UsageKey: BlockRecord}}
+        self._visible_blocks = {}
+
+        # Scores of the columns in subsections without persisted grades,
+        # which are the same for all learners.
+        # dict {UsageKey: ProblemScore}
+        self._ungraded_scores = {}
+
+    def rows_for_users(self, users):
+        """
+        Returns an OrderedDict of the ProblemScoreRow of each of the given
+        users that has a persisted course grade, by user id.
+        """
+        user_ids = [user.id for user in users]
+        percents = dict(
+            PersistentCourseGrade.objects.filter(
+                user_id__in=user_ids, course_id=self.course_key,
+            ).values_list('user_id', 'percent_grade')
+        )
+        subsection_grades = self._read_subsection_grades([user_id for user_id in user_ids if user_id in percents])
+        graded_users = [user for user in users if user.id in subsection_grades]
+        csm_scores = ScoresClient.create_for_users(
+            self.course_key, [user.id for user in graded_users], [block_key for block_key, _ in self.columns],
+        )
+        prefetch_anonymous_ids_for_users(graded_users, self.course_key)
+        anonymous_user_ids = {user.id: anonymous_id_for_user(user, self.course_key) for user in graded_users}
+        submissions_scores = get_submissions_scores_for_users(str(self.course_key), anonymous_user_ids.values())
+
+        rows = OrderedDict()
+        for user in users:
+            if user.id not in percents:
+                continue
+            if user.id in subsection_grades:
+                problem_scores = self._problem_scores(
+                    subsection_grades[user.id],
+                    submissions_scores.get(anonymous_user_ids[user.id], {}),
+                    csm_scores[user.id],
+                )
+            else:
+                problem_scores = [self._ungraded_score(block_key) for block_key, _ in self.columns]
+            rows[user.id] = ProblemScoreRow(percents[user.id], problem_scores)
+        return rows
+
+    def _read_subsection_grades(self, user_ids):
+        """
+        Returns the visible blocks of the persisted subsection grades of the
+        given users, as a dict {user_id: {subsection UsageKey: {UsageKey: BlockRecord}}}.
+        """
+        subsection_grades = defaultdict(dict)
+        if not user_ids:
+            return subsection_grades
+        records = PersistentSubsectionGrade.objects.filter(
+            user_id__in=user_ids, course_id=self.course_key,
+        ).values_list('user_id', 'usage_key', 'visible_blocks_id')
+        records = [
+            (user_id, usage_key.replace(course_key=self.course_key), visible_blocks_hash)
+            for user_id, usage_key, visible_blocks_hash in records
+        ]
+        self._read_visible_blocks({visible_blocks_hash for _, _, visible_blocks_hash in records})
+        for user_id, usage_key, visible_blocks_hash in records:
+            subsection_grades[user_id][usage_key] = self._visible_blocks[visible_blocks_hash]
+        return subsection_grades
+
+    def _read_visible_blocks(self, hashes):
+        """
+        Reads and parses the VisibleBlocks of the given hashes, unless they
+        were already read.
+        """
+        hashes = hashes - set(self._visible_blocks)
+        for hashed, blocks_json in VisibleBlocks.objects.filter(hashed__in=hashes).values_list('hashed', 'blocks_json'):
+            self._visible_blocks[hashed] = {
+                block.locator: block for block in BlockRecordList.from_json(blocks_json)
+            }
+
+    def _problem_scores(self, subsection_grades, submissions_scores, csm_scores):
+        """
+        Returns the scores of the columns for a learner with persisted
+        subsection grades.
+        """
+        problem_scores = []
+        for block_key, subsection_key in self.columns:
+            visible_blocks = subsection_grades.get(subsection_key)
+            if visible_blocks is None:
+                problem_scores.append(self._ungraded_score(block_key))
+            elif block_key not in visible_blocks:
+                problem_scores.append(None)
+            else:
+                problem_scores.append(get_score(
+                    submissions_scores, csm_scores, visible_blocks[block_key], self.collected_structure[block_key],
+                ))
+        return problem_scores
+
+    def _ungraded_score(self, block_key):
+        """
+        Returns the score of the block in a subsection that has no persisted
+        grade, which is never attempted, as for a ZeroSubsectionGrade.
+        """
+        if block_key not in self._ungraded_scores:
+            self._ungraded_scores[block_key] = get_score({}, {}, None, self.collected_structure[block_key])
+        return self._ungraded_scores[block_key]
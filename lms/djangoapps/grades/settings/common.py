@@ -8,3 +8,16 @@ def plugin_settings(settings):
 
     # Queue to use for individual learner course regrades
     settings.SINGLE_LEARNER_COURSE_REGRADE_ROUTING_KEY = settings.DEFAULT_PRIORITY_QUEUE
+
+    # .. setting_name: GRADES_ITER_BATCH_SIZE
+    # .. setting_default: 100
+    # .. setting_description: Number of learners whose grades are computed together by CourseGradeFactory.iter when
+    #   the grades.batch_course_grade_iteration switch is enabled.
+    settings.GRADES_ITER_BATCH_SIZE = 100
+
+    # .. setting_name: SUBSECTION_GRADE_COALESCING_WINDOW_SECONDS
+    # .. setting_default: 10
+    # .. setting_description: Delay of the subsection grade recalculation tasks when the
+    #   grades.coalesce_subsection_grade_updates switch is enabled. Score changes of the same problem of a
+    #   learner within this window are coalesced into one recalculation.
+    settings.SUBSECTION_GRADE_COALESCING_WINDOW_SECONDS = 10
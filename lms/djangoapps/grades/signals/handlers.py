@@ -17,6 +17,7 @@ from common.djangoapps.student.signals import ENROLLMENT_TRACK_UPDATED
 from common.djangoapps.track.event_transaction_utils import get_event_transaction_id, get_event_transaction_type
 from common.djangoapps.util.date_utils import to_timestamp
 from lms.djangoapps.courseware.model_data import get_score, set_score
+from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
 from lms.djangoapps.grades.tasks import (
     RECALCULATE_GRADE_DELAY_SECONDS,
     recalculate_course_and_subsection_grades_for_user,
@@ -25,9 +26,11 @@ from lms.djangoapps.grades.tasks import (
 from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 
-from .. import events
+from .. import coalescing, events
+from ..config.waffle import MAINTAIN_GRADEBOOK_SNAPSHOTS
 from ..constants import GradeOverrideFeatureEnum, ScoreDatabaseTableEnum
 from ..course_grade_factory import CourseGradeFactory
+from ..models import PersistentGradebookSnapshot
 from ..scores import weighted_score
 from .signals import (
     PROBLEM_RAW_SCORE_CHANGED,
@@ -38,6 +41,7 @@ from .signals import (
     COURSE_GRADE_PASSED_FIRST_TIME
 )
 from openedx.core.djangoapps.signals.signals import (  # lint-amnesty, pylint: disable=wrong-import-order
+    COURSE_GRADE_CHANGED,
     COURSE_GRADE_NOW_FAILED,
     COURSE_GRADE_NOW_PASSED
 )
@@ -167,6 +171,9 @@ def score_published_handler(sender, block, user, raw_earned, raw_possible, only_
                 )
 
     if update_score:
+        # Write any buffered state of the block first, so that the graded state is stored with its score.
+        DjangoXBlockUserStateClient(user).flush_write_behind_state(user.username, [block.location])
+
         # Set the problem score in CSM.
         score_modified_time = set_score(user.id, block.location, raw_earned, raw_possible)
 
@@ -233,22 +240,32 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     context_key = LearningContextKey.from_string(kwargs['course_id'])
     if not context_key.is_course:
         return  # If it's not a course, it has no subsections, so skip the subsection grading update
-    recalculate_subsection_grade_v3.apply_async(
-        kwargs=dict(
-            user_id=kwargs['user_id'],
-            anonymous_user_id=kwargs.get('anonymous_user_id'),
-            course_id=kwargs['course_id'],
-            usage_id=kwargs['usage_id'],
-            only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
-            score_deleted=kwargs.get('score_deleted', False),
-            event_transaction_id=str(get_event_transaction_id()),
-            event_transaction_type=str(get_event_transaction_type()),
-            score_db_table=kwargs['score_db_table'],
-            force_update_subsections=kwargs.get('force_update_subsections', False),
-        ),
-        countdown=RECALCULATE_GRADE_DELAY_SECONDS,
+    task_kwargs = dict(
+        user_id=kwargs['user_id'],
+        anonymous_user_id=kwargs.get('anonymous_user_id'),
+        course_id=kwargs['course_id'],
+        usage_id=kwargs['usage_id'],
+        only_if_higher=kwargs.get('only_if_higher'),
+        expected_modified_time=to_timestamp(kwargs['modified']),
+        score_deleted=kwargs.get('score_deleted', False),
+        event_transaction_id=str(get_event_transaction_id()),
+        event_transaction_type=str(get_event_transaction_type()),
+        score_db_table=kwargs['score_db_table'],
+        force_update_subsections=kwargs.get('force_update_subsections', False),
+    )
+    countdown = RECALCULATE_GRADE_DELAY_SECONDS
+    coalescing_kwargs = coalescing.register_update(
+        task_kwargs['user_id'],
+        context_key,
+        task_kwargs['usage_id'],
+        only_if_higher=task_kwargs['only_if_higher'],
+        score_deleted=task_kwargs['score_deleted'],
+        force_update_subsections=task_kwargs['force_update_subsections'],
     )
+    if coalescing_kwargs:
+        task_kwargs.update(coalescing_kwargs)
+        countdown = max(countdown, coalescing.get_countdown())
+    recalculate_subsection_grade_v3.apply_async(kwargs=task_kwargs, countdown=countdown)
 
 
 @receiver(SUBSECTION_SCORE_CHANGED)
@@ -276,6 +293,16 @@ def recalculate_course_and_subsection_grades(sender, user, course_key, countdown
     )
 
 
+@receiver(COURSE_GRADE_CHANGED)
+def update_gradebook_snapshot(sender, user, course_grade, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Updates the gradebook snapshot of the user in the course with their
+    updated course grade.
+    """
+    if MAINTAIN_GRADEBOOK_SNAPSHOTS.is_enabled():
+        PersistentGradebookSnapshot.update_from_course_grade(user.id, course_key, course_grade)
+
+
 @receiver(COURSE_GRADE_NOW_PASSED)
 def listen_for_passing_grade(sender, user, course_id, **kwargs):  # pylint: disable=unused-argument
     """
@@ -10,11 +10,12 @@ from django.conf import settings
 from lazy import lazy
 from submissions import api as submissions_api
 
-from common.djangoapps.student.models import anonymous_id_for_user
+from common.djangoapps.student.models import anonymous_id_for_user, prefetch_anonymous_ids_for_users
 from lms.djangoapps.courseware.model_data import ScoresClient
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.djangoapps.signals.signals import COURSE_ASSESSMENT_GRADE_CHANGED
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 
 from .course_data import CourseData
@@ -27,6 +28,8 @@ class SubsectionGradeFactory:
     """
     Factory for Subsection Grades.
     """
+    _PREFETCHED_SCORES_NAMESPACE = 'grades.subsection_grade_factory.SubsectionGradeFactory.scores'
+
     def __init__(self, student, course=None, course_structure=None, course_data=None):
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
@@ -115,12 +118,65 @@ class SubsectionGradeFactory:
 
         return calculated_grade
 
+    @classmethod
+    def prefetch_scores(cls, users, course_data):
+        """
+        Prefetches the scores of the given users in the course, stored in the
+        user state (in CSM) and by the Submissions API.
+
+        The CSM scores and the anonymous ids of the users are read with a
+        single query each for all of the users. The Submissions API scores
+        are still read one user at a time, see
+        get_submissions_scores_for_users.
+
+        The scores are prefetched for all the scorable blocks of the collected
+        course structure, which include the blocks of any of the users.
+        """
+        course_key = course_data.course_key
+        scorable_locations = [
+            block_key for block_key in course_data.collected_structure if possibly_scored(block_key)
+        ]
+        csm_scores = ScoresClient.create_for_users(course_key, [user.id for user in users], scorable_locations)
+        prefetch_anonymous_ids_for_users(users, course_key)
+        anonymous_user_ids = {user.id: anonymous_id_for_user(user, course_key) for user in users}
+        submissions_scores = get_submissions_scores_for_users(str(course_key), anonymous_user_ids.values())
+        for user in users:
+            get_cache(cls._PREFETCHED_SCORES_NAMESPACE)[cls._prefetched_scores_key(user.id, course_key)] = (
+                csm_scores[user.id],
+                submissions_scores.get(anonymous_user_ids[user.id], {}),
+            )
+
+    @classmethod
+    def clear_prefetched_scores(cls, users, course_key):
+        """
+        Clears the prefetched scores of the given users in the course from
+        the RequestCache.
+        """
+        for user in users:
+            get_cache(cls._PREFETCHED_SCORES_NAMESPACE).pop(cls._prefetched_scores_key(user.id, course_key), None)
+
+    @staticmethod
+    def _prefetched_scores_key(user_id, course_key):
+        return f"{course_key}.{user_id}"
+
+    def _get_prefetched_scores(self):
+        """
+        Returns the (csm_scores, submissions_scores) prefetched for the
+        student, or None if they were not prefetched.
+        """
+        return get_cache(self._PREFETCHED_SCORES_NAMESPACE).get(
+            self._prefetched_scores_key(self.student.id, self.course_data.course_key)
+        )
+
     @lazy
     def _csm_scores(self):
         """
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        prefetched_scores = self._get_prefetched_scores()
+        if prefetched_scores is not None:
+            return prefetched_scores[0]
         scorable_locations = [block_key for block_key in self.course_data.structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course_data.course_key, self.student.id, scorable_locations)
 
@@ -130,6 +186,9 @@ class SubsectionGradeFactory:
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
+        prefetched_scores = self._get_prefetched_scores()
+        if prefetched_scores is not None:
+            return prefetched_scores[1]
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
 
@@ -177,3 +236,19 @@ class SubsectionGradeFactory:
             getattr(subsection, 'subtree_edited_on', None),
             self.student.id,
         ))
+
+
+def get_submissions_scores_for_users(course_id, anonymous_user_ids):
+    """
+    Returns the scores stored by the Submissions API for the given students
+    in the course.
+
+    Returns a dict of anonymous user id to a dict of item ids to scores, in
+    the format returned by submissions_api.get_scores.
+    """
+    # The Submissions API has no call for the scores of many students, so
+    # they're read one student at a time rather than from its models.
+    return {
+        anonymous_user_id: submissions_api.get_scores(course_id, anonymous_user_id)
+        for anonymous_user_id in anonymous_user_ids
+    }
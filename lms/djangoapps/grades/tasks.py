@@ -30,6 +30,7 @@ from openedx.core.djangoapps.content.course_overviews.models import \
     CourseOverview  # lint-amnesty, pylint: disable=unused-import
 from xmodule.modulestore.django import modulestore  # lint-amnesty, pylint: disable=wrong-import-order
 
+from . import coalescing
 from .config.waffle import DISABLE_REGRADE_ON_POLICY_CHANGE
 from .constants import ScoreDatabaseTableEnum
 from .course_grade_factory import CourseGradeFactory
@@ -212,6 +213,10 @@ def _recalculate_subsection_grade(self, **kwargs):
             event at the root of the current event transaction.
         score_db_table (ScoreDatabaseTableEnum): database table that houses
             the changed score. Used in conjunction with expected_modified_time.
+        coalesce_key (string, OPTIONAL): key under which the recalculation
+            is coalesced with those of other score changes.
+        coalesce_token (string, OPTIONAL): identifies this task among those
+            coalesced under coalesce_key.
     """
     try:
         course_key = CourseLocator.from_string(kwargs['course_id'])
@@ -241,6 +246,21 @@ def _recalculate_subsection_grade(self, **kwargs):
         if not has_database_updated:
             raise ScoreNotFoundError
 
+        if kwargs.get('coalesce_key'):
+            # .. custom_attribute_name: subsection_grade_recalculation_coalesced
+            # .. custom_attribute_description: True if the coalesced subsection grade recalculation
+            #   was skipped because a later task recalculates the same grades, False if it was run.
+            #   The ratio of True values is the coalescing ratio.
+            if coalescing.is_superseded(kwargs['coalesce_key'], kwargs.get('coalesce_token')):
+                set_custom_attribute('subsection_grade_recalculation_coalesced', True)
+                log.info(
+                    "Grades: Skipped the recalculation of task %s, which is coalesced into a later task.",
+                    self.request.id,
+                )
+                return
+            set_custom_attribute('subsection_grade_recalculation_coalesced', False)
+            coalescing.mark_started(kwargs['coalesce_key'], kwargs.get('coalesce_token'))
+
         _update_subsection_grades(
             course_key,
             scored_block_usage_key,
@@ -0,0 +1,54 @@
+"""
+Tests for the coalescing of subsection grade recalculations.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from edx_toggles.toggles.testutils import override_waffle_switch
+from opaque_keys.edx.keys import CourseKey
+
+from .. import coalescing
+from ..config.waffle import COALESCE_SUBSECTION_GRADE_UPDATES
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestCoalescing(TestCase):
+    """
+    Tests for the coalescing module.
+    """
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.course_key = CourseKey.from_string('course-v1:edX+coalescing+run')
+        self.problem_ids = [str(self.course_key.make_usage_key('problem', f'problem{i}')) for i in range(2)]
+
+    def register_update(self, problem_id, user_id=1, **options):
+        """
+        Registers an update with coalescing enabled.
+        """
+        with override_waffle_switch(COALESCE_SUBSECTION_GRADE_UPDATES, active=True):
+            return coalescing.register_update(user_id, self.course_key, problem_id, **options)
+
+    def test_disabled(self):
+        assert coalescing.register_update(1, self.course_key, self.problem_ids[0]) == {}
+        assert not coalescing.is_superseded(None, None)
+
+    def test_coalesce_keys(self):
+        coalesce_key = self.register_update(self.problem_ids[0])['coalesce_key']
+        assert self.register_update(self.problem_ids[0])['coalesce_key'] == coalesce_key
+        assert self.register_update(self.problem_ids[1])['coalesce_key'] != coalesce_key
+        assert self.register_update(self.problem_ids[0], user_id=2)['coalesce_key'] != coalesce_key
+        assert self.register_update(self.problem_ids[0], only_if_higher=True)['coalesce_key'] != coalesce_key
+
+    def test_superseded(self):
+        first = self.register_update(self.problem_ids[0])
+        other = self.register_update(self.problem_ids[1])
+        assert not coalescing.is_superseded(**first)
+
+        last = self.register_update(self.problem_ids[0])
+        assert coalescing.is_superseded(**first)
+        assert not coalescing.is_superseded(**last)
+        assert not coalescing.is_superseded(**other)
+
+        coalescing.mark_started(**last)
+        assert not coalescing.is_superseded(**first)
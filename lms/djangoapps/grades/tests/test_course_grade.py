@@ -2,7 +2,9 @@
 from unittest.mock import patch
 
 import ddt
+import numpy as np
 from crum import set_current_request
+from django.test import TestCase
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, BlockFactory
 
@@ -11,7 +13,7 @@ from common.djangoapps.student.tests.factories import UserFactory
 from openedx.core.djangolib.testing.utils import get_mock_request
 
 from ..course_data import CourseData
-from ..course_grade import ZeroCourseGrade
+from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
 from .base import GradeTestBase
 from .utils import answer_problem
@@ -149,3 +151,38 @@ class TestScoreForModule(SharedModuleStoreTestCase):
         earned, possible = self.course_grade.score_for_block(self.m.location)
         assert earned == 0
         assert possible == 0
+
+
+@ddt.ddt
+class TestVectorizedCourseGrade(TestCase):
+    """
+    Tests that the vectorized computations of CourseGrade.update_many
+    give the same results as those of CourseGrade.update.
+    """
+    GRADER_PERCENTS = [0.0, 0.004999, 0.005, 0.1249, 0.4949, 0.495, 0.5, 0.6449999, 0.645, 0.7999, 0.85, 1.0, 1.2]
+
+    def test_compute_percents(self):
+        percents = CourseGrade._compute_percents(np.array(self.GRADER_PERCENTS))  # pylint: disable=protected-access
+        assert percents.tolist() == [
+            CourseGrade._compute_percent({'percent': percent})  # pylint: disable=protected-access
+            for percent in self.GRADER_PERCENTS
+        ]
+
+    @ddt.data(
+        {'A': 0.9, 'B': 0.8, 'C': 0.65},
+        {'Pass': 0.5},
+        {'Pass': 0.5, 'Audit': 0},
+        {'A': 0.8, 'B': 0.8},
+        {'Fail': 0},
+        {},
+    )
+    def test_compute_letter_grades_and_passed(self, grade_cutoffs):
+        percents = CourseGrade._compute_percents(np.array(self.GRADER_PERCENTS))  # pylint: disable=protected-access
+        assert CourseGrade._compute_letter_grades(grade_cutoffs, percents) == [  # pylint: disable=protected-access
+            CourseGrade._compute_letter_grade(grade_cutoffs, percent)  # pylint: disable=protected-access
+            for percent in percents.tolist()
+        ]
+        assert CourseGrade._compute_passed_many(grade_cutoffs, percents) == [  # pylint: disable=protected-access
+            CourseGrade._compute_passed(grade_cutoffs, percent)  # pylint: disable=protected-access
+            for percent in percents.tolist()
+        ]
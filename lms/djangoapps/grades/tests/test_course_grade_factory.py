@@ -1,16 +1,21 @@
 """
 Tests for the CourseGradeFactory class.
 """
+import itertools
 from unittest.mock import patch
 
 import ddt
+from django.test import override_settings
+from edx_toggles.toggles.testutils import override_waffle_switch
 
 from common.djangoapps.student.tests.factories import UserFactory
 from lms.djangoapps.courseware.access import has_access
+from lms.djangoapps.courseware.model_data import ScoresClient, set_score
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase  # lint-amnesty, pylint: disable=wrong-import-order
 from xmodule.modulestore.tests.factories import CourseFactory  # lint-amnesty, pylint: disable=wrong-import-order
 
+from ..config.waffle import BATCH_COURSE_GRADE_AGGREGATION, BATCH_COURSE_GRADE_ITERATION
 from ..course_grade import CourseGrade, ZeroCourseGrade
 from ..course_grade_factory import CourseGradeFactory
 from ..subsection_grade import ReadSubsectionGrade, ZeroSubsectionGrade
@@ -158,6 +163,30 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         assert mock_update.called == force_update
 
+    @ddt.data(*itertools.product((1, 2, 100), (False, True)))
+    @ddt.unpack
+    def test_iter_batched(self, batch_size, aggregate):
+        users = [self.request.user, UserFactory.create(), UserFactory.create()]
+        set_score(users[0].id, self.problem.location, 1, 1)
+        set_score(users[1].id, self.problem2.location, 1, 1)
+
+        def _iter_grades():
+            return [
+                (user, course_grade.percent, course_grade.letter_grade, exc)
+                for user, course_grade, exc in CourseGradeFactory().iter(users, self.course, force_update=True)
+            ]
+
+        expected_grades = _iter_grades()
+        with override_waffle_switch(BATCH_COURSE_GRADE_ITERATION, active=True):
+            with override_waffle_switch(BATCH_COURSE_GRADE_AGGREGATION, active=aggregate):
+                with override_settings(GRADES_ITER_BATCH_SIZE=batch_size):
+                    with patch.object(ScoresClient, 'create_for_locations') as mock_create_for_locations:
+                        with patch.object(CourseGrade, 'update', autospec=True, side_effect=CourseGrade.update) as mock:
+                            assert _iter_grades() == expected_grades
+        assert not mock_create_for_locations.called
+        assert mock.called != aggregate
+        assert [percent for _, percent, _, _ in expected_grades] == [0.5, 0.5, 0.0]
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -8,7 +8,7 @@ from base64 import b64encode
 from collections import OrderedDict
 from datetime import datetime
 from hashlib import sha1
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import ddt
 import pytest
@@ -28,6 +28,7 @@ from lms.djangoapps.grades.models import (
     BlockRecord,
     BlockRecordList,
     PersistentCourseGrade,
+    PersistentGradebookSnapshot,
     PersistentSubsectionGrade,
     PersistentSubsectionGradeOverride,
     VisibleBlocks
@@ -550,3 +551,73 @@ class PersistentCourseGradesTest(GradesModelTestCase):
         self.assertTrue(PersistentCourseGrade.objects.filter(
             user_id=self.params['user_id'], course_id=other_course_key).exists()
         )
+
+
+class PersistentGradebookSnapshotTest(GradesModelTestCase):
+    """
+    Tests the PersistentGradebookSnapshot model.
+    """
+
+    def _mock_subsection_grade(self, location, graded=True, attempted=True, override=None):
+        """
+        Returns a mock subsection grade of 1 out of 2 graded points.
+        """
+        return Mock(
+            location=location,
+            graded=graded,
+            attempted_graded=attempted,
+            override=override,
+            graded_total=Mock(earned=1.0, possible=2.0),
+            percent_graded=0.5,
+        )
+
+    def test_update_from_course_grade(self):
+        ungraded_locator = BlockUsageLocator(self.course_key, 'sequential', 'ungraded')
+        course_grade = Mock(
+            percent=0.5,
+            letter_grade=None,
+            passed=False,
+            subsection_grades=OrderedDict([
+                (self.locator_a, self._mock_subsection_grade(self.locator_a)),
+                (self.locator_b, self._mock_subsection_grade(self.locator_b, attempted=False)),
+                (ungraded_locator, self._mock_subsection_grade(ungraded_locator, graded=False)),
+            ]),
+        )
+        PersistentGradebookSnapshot.update_from_course_grade(12345, self.course_key, course_grade)
+
+        course_grade.percent = 0.75
+        course_grade.letter_grade = 'Pass'
+        course_grade.passed = True
+        course_grade.subsection_grades[self.locator_b].override = Mock()
+        PersistentGradebookSnapshot.update_from_course_grade(12345, self.course_key, course_grade)
+
+        snapshots = PersistentGradebookSnapshot.read_snapshots([12345, 54321], self.course_key)
+        assert list(snapshots) == [12345]
+        snapshot = snapshots[12345]
+        assert snapshot.percent_grade == 0.75
+        assert snapshot.letter_grade == 'Pass'
+        assert snapshot.passed
+        expected_grade = {'earned': 1.0, 'possible': 2.0, 'percent': 0.5, 'attempted': True}
+        assert snapshot.subsection_grades == {
+            str(self.locator_a): expected_grade,
+            str(self.locator_b): expected_grade,
+        }
+
+    def test_unattempted_subsection(self):
+        course_grade = Mock(
+            percent=0.0,
+            letter_grade=None,
+            passed=False,
+            subsection_grades={self.locator_a: self._mock_subsection_grade(self.locator_a, attempted=False)},
+        )
+        snapshot = PersistentGradebookSnapshot.update_from_course_grade(12345, self.course_key, course_grade)
+        assert snapshot.letter_grade == ''
+        assert snapshot.subsection_grades == {
+            str(self.locator_a): {'earned': 0, 'possible': 0, 'percent': 0.5, 'attempted': False},
+        }
+
+    def test_delete_snapshot_for_learner(self):
+        for user_id in (12345, 54321):
+            PersistentGradebookSnapshot.update_or_create(user_id=user_id, course_id=self.course_key, percent_grade=0.5)
+        PersistentGradebookSnapshot.delete_snapshot_for_learner(self.course_key, 12345)
+        assert list(PersistentGradebookSnapshot.read_snapshots([12345, 54321], self.course_key)) == [54321]
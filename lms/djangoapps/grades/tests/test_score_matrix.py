@@ -0,0 +1,104 @@
+"""
+Tests for the problem score matrix.
+"""
+
+
+from collections import OrderedDict
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytz
+from django.test import TestCase
+from opaque_keys.edx.locator import CourseLocator
+
+from common.djangoapps.student.tests.factories import UserFactory
+from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.grades.models import BlockRecord, BlockRecordList, PersistentCourseGrade, PersistentSubsectionGrade
+from lms.djangoapps.grades.score_matrix import ProblemScoreMatrix
+from lms.djangoapps.grades.transformer import GradesTransformer
+
+
+class ProblemScoreMatrixTest(TestCase):
+    """
+    Tests for ProblemScoreMatrix.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course_key = CourseLocator('org', 'course', 'run')
+        self.subsection_1 = self.course_key.make_usage_key('sequential', 'subsection_1')
+        self.subsection_2 = self.course_key.make_usage_key('sequential', 'subsection_2')
+        self.problem_a = self.course_key.make_usage_key('problem', 'problem_a')
+        self.problem_b = self.course_key.make_usage_key('problem', 'problem_b')
+        self.problem_c = self.course_key.make_usage_key('problem', 'problem_c')
+        self.collected_structure = {
+            problem: SimpleNamespace(
+                location=problem,
+                weight=None,
+                transformer_data={GradesTransformer: SimpleNamespace(max_score=2)},
+            )
+            for problem in (self.problem_a, self.problem_b, self.problem_c)
+        }
+        self.matrix = ProblemScoreMatrix(
+            self.course_key,
+            self.collected_structure,
+            OrderedDict([
+                (self.problem_a, self.subsection_1),
+                (self.problem_b, self.subsection_1),
+                (self.problem_c, self.subsection_2),
+            ]),
+        )
+        self.graded_user = UserFactory()
+        self.ungraded_user = UserFactory()
+
+        PersistentCourseGrade.update_or_create(
+            user_id=self.graded_user.id,
+            course_id=self.course_key,
+            course_version='deadbeef',
+            course_edited_timestamp=None,
+            grading_policy_hash='grading_policy',
+            percent_grade=0.5,
+            letter_grade='',
+            passed=False,
+        )
+        # Only problem_a was visible to the learner in subsection_1.
+        PersistentSubsectionGrade.update_or_create_grade(
+            user_id=self.graded_user.id,
+            usage_key=self.subsection_1,
+            course_version='deadbeef',
+            subtree_edited_timestamp=None,
+            earned_all=0.5,
+            possible_all=1.0,
+            earned_graded=0.5,
+            possible_graded=1.0,
+            visible_blocks=BlockRecordList([BlockRecord(self.problem_a, 1, 2, True)], self.course_key),
+            first_attempted=datetime(2000, 1, 1, tzinfo=pytz.UTC),
+        )
+        StudentModule.objects.create(
+            student=self.graded_user,
+            course_id=self.course_key,
+            module_state_key=self.problem_a,
+            grade=1,
+            max_grade=2,
+        )
+
+    def test_rows_for_users(self):
+        with self.assertNumQueries(8):
+            rows = self.matrix.rows_for_users([self.graded_user, self.ungraded_user])
+        # The learners without a persisted course grade have no row.
+        assert list(rows) == [self.graded_user.id]
+
+        graded_row = rows[self.graded_user.id]
+        assert graded_row.percent == 0.5
+        attempted_score, unavailable_score, unattempted_score = graded_row.problem_scores
+        assert (attempted_score.earned, attempted_score.possible) == (0.5, 1)
+        assert attempted_score.first_attempted is not None
+        assert unavailable_score is None
+        assert (unattempted_score.earned, unattempted_score.possible) == (0, 2)
+        assert unattempted_score.first_attempted is None
+
+    def test_visible_blocks_are_read_once(self):
+        self.matrix.rows_for_users([self.graded_user])
+        # The visible blocks and the anonymous id of the learner were already read.
+        with self.assertNumQueries(4):
+            self.matrix.rows_for_users([self.graded_user])
@@ -12,8 +12,9 @@ from unittest.mock import MagicMock, patch
 import ddt
 import pytz
 from django.db.utils import IntegrityError
+from django.test import override_settings
 from django.utils import timezone
-from edx_toggles.toggles.testutils import override_waffle_flag
+from edx_toggles.toggles.testutils import override_waffle_flag, override_waffle_switch
 from stevedore.extension import Extension, ExtensionManager
 
 from common.djangoapps.student.models import CourseEnrollment, anonymous_id_for_user
@@ -22,7 +23,7 @@ from common.djangoapps.track.event_transaction_utils import create_new_event_tra
 from common.djangoapps.util.date_utils import to_timestamp
 from lms.djangoapps.courseware.tests.test_group_access import MemoryUserPartitionScheme
 from lms.djangoapps.grades import tasks
-from lms.djangoapps.grades.config.waffle import ENFORCE_FREEZE_GRADE_AFTER_COURSE_END
+from lms.djangoapps.grades.config.waffle import COALESCE_SUBSECTION_GRADE_UPDATES, ENFORCE_FREEZE_GRADE_AFTER_COURSE_END
 from lms.djangoapps.grades.constants import ScoreDatabaseTableEnum
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED
@@ -137,6 +138,41 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
             PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
             mock_task_apply.assert_called_once_with(countdown=RECALCULATE_GRADE_DELAY_SECONDS, kwargs=local_task_args)
 
+    @override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        SUBSECTION_GRADE_COALESCING_WINDOW_SECONDS=10,
+    )
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_coalesced_recalculations(self, mock_subsection_signal):
+        """
+        Ensures that the tasks of score changes of the same problem are
+        coalesced into the last one.
+        """
+        self.set_up_course()
+        with override_waffle_switch(COALESCE_SUBSECTION_GRADE_UPDATES, active=True):
+            with patch(
+                'lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async',
+                return_value=None
+            ) as mock_task_apply:
+                for _ in range(2):
+                    PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **self.problem_weighted_score_changed_kwargs)
+            assert [call[1]['countdown'] for call in mock_task_apply.call_args_list] == [10, 10]
+            first_task_kwargs, second_task_kwargs = [call[1]['kwargs'] for call in mock_task_apply.call_args_list]
+            assert first_task_kwargs['coalesce_key'] == second_task_kwargs['coalesce_key']
+
+            self.recalculate_subsection_grade_kwargs = first_task_kwargs
+            self._apply_recalculate_subsection_grade()
+            assert mock_subsection_signal.call_count == 0
+
+            self.recalculate_subsection_grade_kwargs = second_task_kwargs
+            self._apply_recalculate_subsection_grade()
+            assert mock_subsection_signal.call_count == 1
+
+            # Once the last task started, earlier tasks are no longer skipped.
+            self.recalculate_subsection_grade_kwargs = first_task_kwargs
+            self._apply_recalculate_subsection_grade()
+            assert mock_subsection_signal.call_count == 2
+
     @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
     def test_triggers_subsection_score_signal(self, mock_subsection_signal):
         """
@@ -39,6 +39,9 @@ class GradesTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 4
     READ_VERSION = 4
+    # The collected max score of a block depends only on the block, and its subsections and
+    # explicit_graded only on its ancestors; the grading policy hash is collected on the root.
+    INCREMENTAL_COLLECT = True
     FIELDS_TO_COLLECT = [
         'due',
         'format',
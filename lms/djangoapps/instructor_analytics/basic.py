@@ -348,7 +348,7 @@ def coupon_codes_features(features, coupons_list, course_id):
     return [extract_coupon(coupon, features) for coupon in coupons_list]
 
 
-def list_problem_responses(course_key, problem_location, limit_responses=None):
+def list_problem_responses(course_key, problem_location, limit_responses=None, modified_after=None):
     """
     Return responses to a given problem as a dict.
 
@@ -362,6 +362,9 @@ def list_problem_responses(course_key, problem_location, limit_responses=None):
 
     where `state` represents a student's response to the problem
     identified by `problem_location`.
+
+    If `modified_after` is set, only the responses modified at or after
+    that time are returned.
     """
     if isinstance(problem_location, UsageKey):
         problem_key = problem_location
@@ -378,6 +381,8 @@ def list_problem_responses(course_key, problem_location, limit_responses=None):
         course_id=course_key,
         module_state_key=problem_key
     ).select_related('student')
+    if modified_after is not None:
+        smdat = smdat.filter(modified__gte=modified_after)
     smdat = smdat.order_by('student')
     if limit_responses is not None:
         smdat = smdat[:limit_responses]
@@ -29,6 +29,44 @@ USE_ON_DISK_GRADE_REPORTING = CourseWaffleFlag(
     f'{WAFFLE_NAMESPACE}.use_on_disk_grade_reporting', __name__
 )
 
+# .. toggle_name: instructor_task.use_sharded_grade_reporting
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating course grade reports of courses with more than GRADE_REPORT_LEARNERS_PER_SHARD
+#   learners, compute the rows of ranges of learners in parallel subtasks, which write them to shard files that the
+#   last subtask merges into the report.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+USE_SHARDED_GRADE_REPORTING = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_sharded_grade_reporting', __name__
+)
+
+# .. toggle_name: instructor_task.use_problem_score_matrix
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating problem grade reports, compute the scores of each batch of learners from bulk
+#   queries of their persisted grades and scores, instead of reading a course grade per learner. The problems that are
+#   available to a learner are taken from the blocks persisted with the subsection grades of the learner, or else from
+#   the course structure without the learner's content groups and access restrictions. The scores of the learners
+#   without a persisted course grade are still read from their course grades.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+USE_PROBLEM_SCORE_MATRIX = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_problem_score_matrix', __name__
+)
+
+# .. toggle_name: instructor_task.use_incremental_problem_responses
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: When generating problem responses reports without a MAX_PROBLEM_RESPONSES_COUNT limit, keep
+#   the responses of each block in the report store, with the time they were read, and only read again the responses
+#   that were modified since then. The responses of a block are all read again when the block is edited.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+USE_INCREMENTAL_PROBLEM_RESPONSES = CourseWaffleFlag(
+    f'{WAFFLE_NAMESPACE}.use_incremental_problem_responses', __name__
+)
+
 
 def problem_grade_report_verified_only(course_id):
     """
@@ -55,3 +93,27 @@ def use_on_disk_grade_reporting(course_id):
     False otherwise.
     """
     return USE_ON_DISK_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_sharded_grade_reporting(course_id):
+    """
+    Returns True if grade reports should be computed
+    in parallel shards, False otherwise.
+    """
+    return USE_SHARDED_GRADE_REPORTING.is_enabled(course_id)
+
+
+def use_problem_score_matrix(course_id):
+    """
+    Returns True if problem grade reports should compute
+    the scores of batches of learners in bulk, False otherwise.
+    """
+    return USE_PROBLEM_SCORE_MATRIX.is_enabled(course_id)
+
+
+def use_incremental_problem_responses(course_id):
+    """
+    Returns True if problem responses reports should only read
+    the responses modified since the previous report, False otherwise.
+    """
+    return USE_INCREMENTAL_PROBLEM_RESPONSES.is_enabled(course_id)
@@ -16,3 +16,8 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass  # lint-amnesty, pylint: disable=unnecessary-pass
+
+
+class GradeReportShardError(Exception):
+    """Exception indicating that shards of a sharded grade report could not be computed."""
+    pass  # lint-amnesty, pylint: disable=unnecessary-pass
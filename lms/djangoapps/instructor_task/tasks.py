@@ -201,6 +201,51 @@ def calculate_grades_csv(entry_id, xblock_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@shared_task
+@set_code_owner_attribute
+def calculate_grades_csv_shard(entry_id, xblock_instance_args, user_ids, action_name, subtask_status_dict):
+    """
+    Grade the given learners of a course for a shard of a sharded grade report,
+    and queue the merge of the shards into the report once they are all complete.
+
+    Progress is recorded in the subtasks of the InstructorTask entry of the report,
+    as described by `subtask_status_dict`.
+    """
+    TASK_LOG.info(
+        "Task: %s, InstructorTask ID: %s, Task type: %s, Preparing for shard execution",
+        xblock_instance_args.get('task_id'), entry_id, action_name
+    )
+    return CourseGradeReport.generate_shard(
+        xblock_instance_args, entry_id, user_ids, action_name, subtask_status_dict,
+    )
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    max_retries=5,
+    retry_backoff=30,
+    retry_backoff_max=600,
+    retry_jitter=True,
+)
+@set_code_owner_attribute
+def merge_grades_csv_shards(self, entry_id, xblock_instance_args, action_name):
+    """
+    Merge the shards of a sharded grade report into the report and push it to an S3 bucket
+    for download, once all the shards are computed.
+
+    The InstructorTask entry of the report stays in progress until the report is uploaded.
+    A failed merge is retried, and the entry is only marked as failed by the final attempt.
+    """
+    TASK_LOG.info(
+        "Task: %s, InstructorTask ID: %s, Task type: %s, Preparing to merge the shards",
+        xblock_instance_args.get('task_id'), entry_id, action_name
+    )
+    return CourseGradeReport.merge_shards(
+        xblock_instance_args, entry_id, action_name, final_attempt=self.request.retries >= self.max_retries,
+    )
+
+
 @shared_task(base=BaseInstructorTask)
 @set_code_owner_attribute
 def calculate_problem_grade_report(entry_id, xblock_instance_args):
@@ -3,17 +3,24 @@ Functionality for generating grade reports.
 """
 
 import csv
+import gzip
+import hashlib
+import json
 import logging
+import os
 import re
 from collections import OrderedDict, defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from itertools import chain
 from tempfile import TemporaryFile
 
 from time import time
 
+from celery.states import FAILURE, READY_STATES, SUCCESS
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.utils.timezone import now
 from lazy import lazy
 from opaque_keys.edx.keys import UsageKey
 from pytz import UTC
@@ -25,8 +32,9 @@ from common.djangoapps.student.roles import BulkRoleCache
 from lms.djangoapps.certificates import api as certs_api
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
-from lms.djangoapps.grades.api import CourseGradeFactory
+from lms.djangoapps.grades.api import CourseGradeFactory, ProblemScoreMatrix
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.grades.api import prefetch_course_and_subsection_grades
 from lms.djangoapps.instructor_analytics.basic import list_problem_responses
@@ -34,7 +42,18 @@ from lms.djangoapps.instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.instructor_task.config.waffle import (
     course_grade_report_verified_only,
     problem_grade_report_verified_only,
+    use_incremental_problem_responses,
     use_on_disk_grade_reporting,
+    use_problem_score_matrix,
+    use_sharded_grade_reporting,
+)
+from lms.djangoapps.instructor_task.exceptions import GradeReportShardError
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status
 )
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.services import IDVerificationService
@@ -56,6 +75,12 @@ ENROLLED_IN_COURSE = 'enrolled'
 
 NOT_ENROLLED_IN_COURSE = 'unenrolled'
 
+# How long before the responses to a block were read the next incremental report
+# reads them again from, so that it doesn't miss the responses that were modified
+# before they were read but committed after, or timestamped by a server whose clock
+# is behind.
+INCREMENTAL_RESPONSES_SAFETY_WINDOW = timedelta(minutes=5)
+
 
 def _user_enrollment_status(user, course_id):
     """
@@ -92,6 +117,9 @@ class _CourseGradeReportContext:
             course_id=course_id,
             task_input=_task_input,
         )
+        self.xblock_instance_args = _xblock_instance_args
+        self.entry_id = _entry_id
+        self.task_input = _task_input
         self.action_name = action_name
         self.course_id = course_id
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
@@ -190,6 +218,7 @@ class _ProblemGradeReportContext:
         self.action_name = action_name
         self.course_id = course_id
         self.report_for_verified_only = problem_grade_report_verified_only(self.course_id)
+        self.use_problem_score_matrix = use_problem_score_matrix(self.course_id)
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
         self.upload_filename = _task_input.get('filename', 'problem_grade_report')
         self.upload_parent_dir = _task_input.get('upload_parent_dir', '')
@@ -198,6 +227,10 @@ class _ProblemGradeReportContext:
     def course(self):
         return get_course_by_id(self.course_id)
 
+    @lazy
+    def grading_context(self):
+        return grades_context.grading_context_for_course(self.course)
+
     @lazy
     def graded_scorable_blocks_header(self):
         """
@@ -205,7 +238,7 @@ class _ProblemGradeReportContext:
         headers in the final report.
         """
         scorable_blocks_map = OrderedDict()
-        grading_context = grades_context.grading_context_for_course(self.course)
+        grading_context = self.grading_context
         for assignment_type_name, subsection_infos in grading_context['all_graded_subsections_by_type'].items():
             for subsection_index, subsection_info in enumerate(subsection_infos, start=1):
                 for scorable_block in subsection_info['scored_descendants']:
@@ -222,6 +255,23 @@ class _ProblemGradeReportContext:
                                                                     header_name + " (Possible)"]
         return scorable_blocks_map
 
+    @lazy
+    def score_matrix(self):
+        """
+        Returns the ProblemScoreMatrix whose columns are the scorable blocks
+        of the report.
+        """
+        block_subsections = OrderedDict()
+        for subsection_infos in self.grading_context['all_graded_subsections_by_type'].values():
+            for subsection_info in subsection_infos:
+                for scorable_block in subsection_info['scored_descendants']:
+                    block_subsections[scorable_block.location] = subsection_info['subsection_block'].location
+        # The columns must be in the order of the header.
+        block_subsections = OrderedDict(
+            (block_key, block_subsections[block_key]) for block_key in self.graded_scorable_blocks_header
+        )
+        return ProblemScoreMatrix(self.course_id, self.course_structure, block_subsections)
+
     @lazy
     def course_structure(self):
         return get_course_in_cache(self.course_id)
@@ -411,6 +461,212 @@ class TemporaryFileReportMixin:
             )
 
 
+class ShardedReportMixin:
+    """
+    Mixin for a file report whose rows are computed in parallel by subtasks. Each subtask
+    writes the rows of a range of learners to shard files in the report store, and the last
+    subtask to complete queues a task that merges the shards into the report.
+    """
+    # Celery task that computes a shard of the report, which is called with the id of the
+    # InstructorTask, the xblock_instance_args, the ids of the learners of the shard, the
+    # action name and the status dict of the subtask.
+    shard_task_name = None
+
+    # Celery task that merges the shards into the report, which is called with the id of the
+    # InstructorTask, the xblock_instance_args and the action name.
+    merge_task_name = None
+
+    # Ids of the learners of the shard computed by this subtask, if any.
+    shard_user_ids = None
+
+    def _generate(self):
+        """
+        Queues the subtasks that compute the shards of the report, or generates the report
+        in this task if it has no more learners than a single shard.
+        """
+        entry = InstructorTask.objects.get(pk=self.context.entry_id)
+        # The task may have been requeued after it queued its subtasks.
+        if len(entry.subtasks) > 0:
+            TASK_LOG.warning('%s, Subtasks of the report are already queued', self.context.task_info_string)
+            return json.loads(entry.task_output)
+
+        learners = self._enrolled_learners().order_by('id')
+        num_learners = learners.count()
+        learners_per_shard = settings.GRADE_REPORT_LEARNERS_PER_SHARD
+        if num_learners <= learners_per_shard:
+            return super()._generate()
+
+        self.context.update_status(f'ShardedReportMixin - 1: Queueing {num_learners} learners in shards')
+        return queue_subtasks_for_query(
+            entry,
+            self.context.action_name,
+            self._create_shard_subtask,
+            [learners],
+            [],
+            learners_per_shard,
+            num_learners,
+        )
+
+    def _create_shard_subtask(self, learners, initial_subtask_status):
+        """
+        Creates the subtask that computes the shard of the report for the given learners.
+        """
+        # Imported here since the tasks module imports this module.
+        from lms.djangoapps.instructor_task import tasks
+        return getattr(tasks, self.shard_task_name).subtask(
+            (
+                self.context.entry_id,
+                self.context.xblock_instance_args,
+                [learner['pk'] for learner in learners],
+                self.context.action_name,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+        )
+
+    def _generate_shard(self, user_ids, subtask_status_dict):
+        """
+        Writes the rows of the given learners to the shard files of the subtask, then queues
+        the merge of the shards into the report if this is the last subtask to complete.
+        """
+        subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+        current_task_id = subtask_status.task_id
+        check_subtask_is_valid(self.context.entry_id, current_task_id, subtask_status)
+
+        self.shard_user_ids = user_ids
+        try:
+            with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+                success_writer = csv.writer(success_file)
+                error_writer = csv.writer(error_file)
+                succeeded, failed = 0, 0
+                for success_rows, error_rows in self._batched_rows():
+                    success_writer.writerows(success_rows)
+                    error_writer.writerows(error_rows)
+                    succeeded += len(success_rows)
+                    failed += len(error_rows)
+
+                report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+                for shard_file, shard_name in ((success_file, current_task_id), (error_file, f'{current_task_id}_err')):
+                    shard_file.seek(0)
+                    report_store.store(self.context.course_id, f'{shard_name}.csv', shard_file, self._shard_dir())
+        except Exception:
+            TASK_LOG.exception('%s, Shard %s of the report failed', self.context.task_info_string, current_task_id)
+            subtask_status.increment(failed=len(user_ids), state=FAILURE)
+            if update_subtask_status(self.context.entry_id, current_task_id, subtask_status, mark_complete=False):
+                self._queue_merge()
+            raise
+
+        subtask_status.increment(succeeded=succeeded, failed=failed, state=SUCCESS)
+        # The task stays in progress until the shards are merged into the report.
+        if update_subtask_status(self.context.entry_id, current_task_id, subtask_status, mark_complete=False):
+            self._queue_merge()
+        return subtask_status.to_dict()
+
+    def _batch_users(self):
+        """
+        Returns a generator of batches of the learners of the shard.
+        """
+        if self.shard_user_ids is None:
+            yield from super()._batch_users()
+            return
+
+        batch_size = self.USER_BATCH_SIZE
+        for index in range(0, len(self.shard_user_ids), batch_size):
+            yield get_user_model().objects.filter(
+                id__in=self.shard_user_ids[index:index + batch_size],
+            ).select_related('profile').order_by('id')
+
+    def _merge_shards(self, final_attempt=True):
+        """
+        Merges the shards into the report, in the order of the learners, then marks the task
+        as succeeded. Failing to merge the shards marks the task as failed, unless this is not
+        the final attempt of the merge, in which case the error is raised for the merge to be
+        retried and the shards are kept.
+        """
+        entry = InstructorTask.objects.get(pk=self.context.entry_id)
+        # The merge may have been requeued after it completed.
+        if entry.task_state in READY_STATES:
+            TASK_LOG.warning('%s, Shards of the report are already merged', self.context.task_info_string)
+            return json.loads(entry.task_output)
+
+        subtask_dict = json.loads(entry.subtasks)
+        # The statuses are stored in the order of the learners of the subtasks.
+        subtask_ids = list(subtask_dict['status'])
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        shard_dir = self._shard_dir()
+        try:
+            if subtask_dict['failed']:
+                raise GradeReportShardError(
+                    f"{subtask_dict['failed']} of {subtask_dict['total']} shards of the report failed"
+                )
+
+            self.context.update_status('ShardedReportMixin - 2: Merging the shards')
+            with TemporaryFile('r+') as success_file, TemporaryFile('r+') as error_file:
+                csv.writer(success_file).writerow(self._success_headers())
+                csv.writer(error_file).writerow(self._error_headers())
+                has_errors = False
+                for subtask_id in subtask_ids:
+                    success_file.write(self._read_shard(report_store, shard_dir, subtask_id))
+                    error_rows = self._read_shard(report_store, shard_dir, f'{subtask_id}_err')
+                    error_file.write(error_rows)
+                    has_errors = has_errors or bool(error_rows)
+
+                date = datetime.now(UTC)
+                for report_file, suffix in ((success_file, ''), (error_file, '_err')):
+                    if suffix and not has_errors:
+                        continue
+                    report_file.seek(0)
+                    upload_csv_file_to_report_store(
+                        report_file,
+                        self.context.upload_filename + suffix,
+                        self.context.course_id,
+                        date,
+                        parent_dir=self.context.upload_parent_dir
+                    )
+        except Exception as exc:  # pylint: disable=broad-except
+            TASK_LOG.exception('%s, Merging the shards of the report failed', self.context.task_info_string)
+            if not final_attempt and not isinstance(exc, GradeReportShardError):
+                raise
+            entry.task_output = InstructorTask.create_output_for_failure(exc, None)
+            entry.task_state = FAILURE
+        else:
+            entry.task_state = SUCCESS
+        entry.save_now()
+
+        for subtask_id in subtask_ids:
+            for shard_name in (subtask_id, f'{subtask_id}_err'):
+                report_store.storage.delete(report_store.path_to(
+                    self.context.course_id, f'{shard_name}.csv', shard_dir,
+                ))
+        return json.loads(entry.task_output)
+
+    def _queue_merge(self):
+        """
+        Queues the task that merges the shards into the report.
+        """
+        # Imported here since the tasks module imports this module.
+        from lms.djangoapps.instructor_task import tasks
+        getattr(tasks, self.merge_task_name).delay(
+            self.context.entry_id, self.context.xblock_instance_args, self.context.action_name,
+        )
+
+    def _read_shard(self, report_store, shard_dir, shard_name):
+        """
+        Returns the CSV rows of the given shard file, as text.
+        """
+        path = report_store.path_to(self.context.course_id, f'{shard_name}.csv', shard_dir)
+        with report_store.storage.open(path) as shard_file:
+            content = shard_file.read()
+        return content.decode('utf-8') if isinstance(content, bytes) else content
+
+    def _shard_dir(self):
+        """
+        Returns the directory of the report store that stores the shards of the report.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        return os.path.join(report_store.path_to(self.context.course_id), 'shards', str(self.context.entry_id))
+
+
 class GradeReportBase:
     """
     Base class for grade reports (ProblemGradeReport and CourseGradeReport).
@@ -443,6 +699,17 @@ class GradeReportBase:
         TASK_LOG.info('%s, Task type: %s, %s, %s', task_info_string, self.context.action_name,
                       message, self.context.task_progress.state)
 
+    def _enrolled_learners(self):
+        """
+        Returns a queryset of the learners of the report.
+        """
+        filter_kwargs = {
+            'courseenrollment__course_id': self.context.course_id,
+        }
+        if self.context.report_for_verified_only:
+            filter_kwargs['courseenrollment__mode'] = CourseMode.VERIFIED
+        return get_user_model().objects.filter(**filter_kwargs)
+
     def _batch_users(self):
         """
         Returns a generator of batches of users.
@@ -519,11 +786,41 @@ class CourseGradeReport(GradeReportBase):
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, _task_input, action_name)
-            if use_on_disk_grade_reporting(course_id):  # AU-926
+            if use_sharded_grade_reporting(course_id):
+                return ShardedCourseGradeReport(context)._generate()  # pylint: disable=protected-access
+            elif use_on_disk_grade_reporting(course_id):  # AU-926
                 return TempFileCourseGradeReport(context)._generate()  # pylint: disable=protected-access
             else:
                 return InMemoryCourseGradeReport(context)._generate()  # pylint: disable=protected-access
 
+    @classmethod
+    def generate_shard(cls, _xblock_instance_args, _entry_id, user_ids, action_name, subtask_status_dict):
+        """
+        Public method to compute the shard of a sharded grade report for the given learners.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        course_id = entry.course_id
+        task_input = json.loads(entry.task_input)
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, task_input, action_name)
+            return ShardedCourseGradeReport(context)._generate_shard(  # pylint: disable=protected-access
+                user_ids, subtask_status_dict,
+            )
+
+    @classmethod
+    def merge_shards(cls, _xblock_instance_args, _entry_id, action_name, final_attempt=True):
+        """
+        Public method to merge the shards of a sharded grade report into the report.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        course_id = entry.course_id
+        task_input = json.loads(entry.task_input)
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(_xblock_instance_args, _entry_id, course_id, task_input, action_name)
+            return ShardedCourseGradeReport(context)._merge_shards(  # pylint: disable=protected-access
+                final_attempt,
+            )
+
     def _success_headers(self):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -706,6 +1003,12 @@ class TempFileCourseGradeReport(CourseGradeReport, TemporaryFileReportMixin):
     """ Course Grade Report that writes file iteratively to a TempFile to then be uploaded """
 
 
+class ShardedCourseGradeReport(ShardedReportMixin, CourseGradeReport, TemporaryFileReportMixin):
+    """ Course Grade Report whose rows are computed by parallel subtasks and merged once uploaded """
+    shard_task_name = 'calculate_grades_csv_shard'
+    merge_task_name = 'merge_grades_csv_shards'
+
+
 class ProblemGradeReport(GradeReportBase):
     """
     Class to encapsulate functionality related to generating user/row had header data for Problem Grade Reports.
@@ -749,6 +1052,15 @@ class ProblemGradeReport(GradeReportBase):
         """
         Returns a list of rows for the given users for this report.
         """
+        if self.context.use_problem_score_matrix:
+            return self._rows_for_users_from_score_matrix(users)
+        return self._rows_for_users_from_course_grades(users)
+
+    def _rows_for_users_from_course_grades(self, users):
+        """
+        Returns a list of rows for the given users for this report, computed
+        from the course grade of each user.
+        """
         success_rows, error_rows = [], []
         for student, course_grade, error in CourseGradeFactory().iter(
             users,
@@ -788,6 +1100,56 @@ class ProblemGradeReport(GradeReportBase):
 
         return success_rows, error_rows
 
+    def _rows_for_users_from_score_matrix(self, users):
+        """
+        Returns a list of rows for the given users for this report, computed
+        from the problem score matrix of the users.
+        """
+        users = list(users)
+        try:
+            score_rows = self.context.score_matrix.rows_for_users(users)
+        except Exception as error:  # pylint: disable=broad-except
+            TASK_LOG.exception(
+                '%s, Task type: %s, Could not compute the problem scores of %d learners',
+                self.context.task_info_string, self.context.action_name, len(users),
+            )
+            return [], [
+                [student.id, student.email, student.username] + [str(error) or 'Unknown error']
+                for student in users
+            ]
+
+        # The learners without a persisted course grade aren't in the matrix,
+        # so their scores are read from their course grades instead.
+        course_grade_rows, error_rows = self._rows_for_users_from_course_grades(
+            [student for student in users if student.id not in score_rows]
+        )
+        course_grade_rows = {row[0]: row for row in course_grade_rows}
+
+        success_rows = []
+        for student in users:
+            if student.id not in score_rows:
+                if student.id in course_grade_rows:
+                    success_rows.append(course_grade_rows[student.id])
+                continue
+            score_row = score_rows[student.id]
+            earned_possible_values = []
+            for problem_score in score_row.problem_scores:
+                if problem_score is None:
+                    earned_possible_values.append(['Not Available', 'Not Available'])
+                elif problem_score.first_attempted:
+                    earned_possible_values.append([problem_score.earned, problem_score.possible])
+                else:
+                    earned_possible_values.append(['Not Attempted', problem_score.possible])
+
+            enrollment_status = _user_enrollment_status(student, self.context.course_id)
+            success_rows.append(
+                [student.id, student.email, student.username] +
+                [enrollment_status, score_row.percent] +
+                _flatten(earned_possible_values)
+            )
+
+        return success_rows, error_rows
+
     def _clear_caches(self):
         get_cache('get_enrollment').clear()
         get_cache(CourseEnrollment.MODE_CACHE_NAMESPACE).clear()
@@ -879,6 +1241,10 @@ class ProblemResponses:
         store = modulestore()
         user_state_client = DjangoXBlockUserStateClient()
 
+        # The incremental mode can't tell which responses are within the limit.
+        incremental = max_count is None and use_incremental_problem_responses(course_key)
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD') if incremental else None
+
         # Each user's generated report data may contain different fields, so we use an OrderedDict to prevent
         # duplication of keys while preserving the order the XBlock provides the keys in.
         student_data_keys = OrderedDict()
@@ -899,29 +1265,29 @@ class ProblemResponses:
                         continue
 
                     block = store.get_item(block_key)
-                    generated_report_data = defaultdict(list)
-
-                    # Blocks can implement the generate_report_data method to provide their own
-                    # human-readable formatting for user state.
-                    if hasattr(block, 'generate_report_data'):
-                        try:
-                            user_state_iterator = user_state_client.iter_all_for_block(block_key)
-                            for username, state in block.generate_report_data(user_state_iterator, max_count):
-                                generated_report_data[username].append(state)
-                        except NotImplementedError:
-                            pass
+                    if incremental:
+                        block_responses = cls._get_incremental_block_responses(
+                            block, block_key, course_key, user_state_client, report_store,
+                        )
+                    else:
+                        block_responses = cls._get_block_responses(
+                            block, block_key, course_key, user_state_client, max_count,
+                        )
 
                     responses = []
 
-                    for response in list_problem_responses(course_key, block_key, max_count):
-                        response['title'] = title
-                        # A human-readable location for the current block
-                        response['location'] = ' > '.join(base_path + path)
-                        # A machine-friendly location for the current block
-                        response['block_key'] = str(block_key)
+                    for username, state, user_states in block_responses:
+                        response = {
+                            'username': username,
+                            'state': state,
+                            'title': title,
+                            # A human-readable location for the current block
+                            'location': ' > '.join(base_path + path),
+                            # A machine-friendly location for the current block
+                            'block_key': str(block_key),
+                        }
                         # A block that has a single state per user can contain multiple responses
                         # within the same state.
-                        user_states = generated_report_data.get(response['username'])
                         if user_states:
                             # For each response in the block, copy over the basic data like the
                             # title, location, block_key and state, and add in the responses
@@ -929,12 +1295,8 @@ class ProblemResponses:
                                 user_response = response.copy()
                                 user_response.update(user_state)
 
-                                # Respect the column order as returned by the xblock, if any.
-                                if isinstance(user_state, OrderedDict):
-                                    user_state_keys = user_state.keys()
-                                else:
-                                    user_state_keys = sorted(user_state.keys())
-                                for key in user_state_keys:
+                                # The columns are in the order returned by the xblock, if any.
+                                for key in user_state.keys():
                                     student_data_keys[key] = 1
 
                                 responses.append(user_response)
@@ -959,6 +1321,136 @@ class ProblemResponses:
 
         return student_data, student_data_keys_list
 
+    @staticmethod
+    def _get_block_responses(block, block_key, course_key, user_state_client, max_count, **filters):
+        """
+        Returns the responses of the learners to the given block, ordered by learner.
+
+        Arguments:
+            block: the block.
+            block_key (UsageKey): the usage key of the block in the course.
+            course_key (CourseKey): the key of the course.
+            user_state_client (DjangoXBlockUserStateClient): the client to read the user states.
+            max_count (int): the maximum number of responses, or None.
+            filters: filters of the responses, such as modified_after.
+        Returns:
+            List[Tuple[str, str, List[OrderedDict]]]: the username and the state of each
+                response, with the human-readable states that the block generated for it,
+                if any, whose keys are in the order of the report columns.
+        """
+        generated_report_data = defaultdict(list)
+
+        # Blocks can implement the generate_report_data method to provide their own
+        # human-readable formatting for user state.
+        if hasattr(block, 'generate_report_data'):
+            try:
+                user_state_iterator = user_state_client.iter_all_for_block(block_key, **filters)
+                for username, user_state in block.generate_report_data(user_state_iterator, max_count):
+                    # Respect the column order as returned by the xblock, if any.
+                    if not isinstance(user_state, OrderedDict):
+                        user_state = OrderedDict(sorted(user_state.items()))
+                    generated_report_data[username].append(user_state)
+            except NotImplementedError:
+                pass
+
+        return [
+            (response['username'], response['state'], generated_report_data.get(response['username'], []))
+            for response in list_problem_responses(course_key, block_key, max_count, **filters)
+        ]
+
+    @classmethod
+    def _get_incremental_block_responses(cls, block, block_key, course_key, user_state_client, report_store):
+        """
+        Returns the responses of the learners to the given block, like _get_block_responses,
+        reading only the responses that were modified since the previous report, whose
+        responses are kept in the report store.
+        """
+        read_time = now()
+        # The learners who currently have a state for the block, in the order of the report.
+        learners = OrderedDict(
+            StudentModule.objects.filter(
+                course_id=course_key, module_state_key=block_key,
+            ).order_by('student').values_list('student__username', 'student_id')
+        )
+        edited_on = str(getattr(block, 'edited_on', None))
+
+        previous = cls._read_block_responses(report_store, course_key, block_key)
+        if previous and previous['edited_on'] == edited_on:
+            modified_after = datetime.fromisoformat(previous['modified_after'])
+            responses = {
+                int(student_id): (state, [OrderedDict(user_state) for user_state in user_states])
+                for student_id, (state, user_states) in previous['responses'].items()
+            }
+        else:
+            modified_after = None
+            responses = {}
+
+        filters = {'modified_after': modified_after} if modified_after else {}
+        for username, state, user_states in cls._get_block_responses(
+            block, block_key, course_key, user_state_client, None, **filters
+        ):
+            # A learner whose state was created after the learners were listed is
+            # skipped, but modified after read_time so it is read by the next report.
+            if username in learners:
+                responses[learners[username]] = (state, user_states)
+
+        if not set(learners.values()).issubset(responses):
+            # The responses of some learners weren't kept, so all of them are read.
+            TASK_LOG.info('Reading all the responses to %s, some of them were not kept', block_key)
+            modified_after = None
+            responses = {
+                learners[username]: (state, user_states)
+                for username, state, user_states in cls._get_block_responses(
+                    block, block_key, course_key, user_state_client, None,
+                )
+                if username in learners
+            }
+
+        # The responses of the learners whose state was deleted are dropped.
+        responses = {student_id: responses[student_id] for student_id in learners.values()}
+        cls._write_block_responses(report_store, course_key, block_key, {
+            'edited_on': edited_on,
+            'modified_after': (read_time - INCREMENTAL_RESPONSES_SAFETY_WINDOW).isoformat(),
+            'responses': responses,
+        })
+        return [
+            (username, *responses[student_id])
+            for username, student_id in learners.items()
+        ]
+
+    @classmethod
+    def _read_block_responses(cls, report_store, course_key, block_key):
+        """
+        Returns the responses to the given block kept by the previous report, or None.
+        """
+        path = cls._block_responses_path(report_store, course_key, block_key)
+        if not report_store.storage.exists(path):
+            return None
+        try:
+            with report_store.storage.open(path) as responses_file:
+                return json.loads(gzip.decompress(responses_file.read()))
+        except (OSError, ValueError):
+            TASK_LOG.exception('Could not read the responses to %s kept by the previous report', block_key)
+            return None
+
+    @classmethod
+    def _write_block_responses(cls, report_store, course_key, block_key, block_responses):
+        """
+        Keeps the responses to the given block for the next report.
+        """
+        path = cls._block_responses_path(report_store, course_key, block_key)
+        content = gzip.compress(json.dumps(block_responses, default=str).encode('utf-8'))
+        report_store.storage.delete(path)
+        report_store.storage.save(path, ContentFile(content))
+
+    @staticmethod
+    def _block_responses_path(report_store, course_key, block_key):
+        """
+        Returns the path of the responses to the given block in the report store.
+        """
+        block_hash = hashlib.sha1(str(block_key).encode('utf-8')).hexdigest()
+        return os.path.join(report_store.path_to(course_key), 'problem_responses', f'{block_hash}.json.gz')
+
     @classmethod
     def generate(cls, _xblock_instance_args, _entry_id, course_id, task_input, action_name):
         """
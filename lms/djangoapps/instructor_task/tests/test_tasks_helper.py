@@ -7,17 +7,20 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 
 
+import json
 import os
 import shutil
 import tempfile
 from collections import OrderedDict
 from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
-from unittest.mock import ANY, MagicMock, Mock, patch
+from unittest.mock import ANY, MagicMock, Mock, call, patch
+from uuid import uuid4
 
 import ddt
 import pytest
 import unicodecsv
+from celery.states import SUCCESS
 from django.conf import settings
 from django.test.utils import override_settings
 from edx_django_utils.cache import RequestCache
@@ -35,14 +38,18 @@ from lms.djangoapps.certificates.models import GeneratedCertificate
 from lms.djangoapps.certificates.tests.factories import CertificateAllowlistFactory, GeneratedCertificateFactory
 from lms.djangoapps.courseware.models import StudentModule
 from lms.djangoapps.grades.course_data import CourseData
+from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGradeOverride
 from lms.djangoapps.grades.subsection_grade import CreateSubsectionGrade
 from lms.djangoapps.grades.transformer import GradesTransformer
 from lms.djangoapps.instructor_analytics.basic import UNAVAILABLE, list_problem_responses
+from lms.djangoapps.instructor_task.data import InstructorTaskTypes
+from lms.djangoapps.instructor_task.models import PROGRESS
 from lms.djangoapps.instructor_task.tasks_helper.certs import generate_students_certificates
 from lms.djangoapps.instructor_task.tasks_helper.enrollments import upload_may_enroll_csv, upload_students_csv
 from lms.djangoapps.instructor_task.tasks_helper.grades import (
     ENROLLED_IN_COURSE,
+    INCREMENTAL_RESPONSES_SAFETY_WINDOW,
     NOT_ENROLLED_IN_COURSE,
     CourseGradeReport,
     ProblemGradeReport,
@@ -55,6 +62,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_ora2_submission_files,
     upload_ora2_summary
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -84,6 +92,11 @@ _TEAMS_CONFIG = TeamsConfig({
     'topics': [{'id': 'topic', 'name': 'Topic', 'description': 'A Topic'}],
 })
 USE_ON_DISK_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_on_disk_grade_reporting'
+USE_SHARDED_GRADE_REPORT = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_sharded_grade_reporting'
+USE_PROBLEM_SCORE_MATRIX = 'lms.djangoapps.instructor_task.tasks_helper.grades.use_problem_score_matrix'
+USE_INCREMENTAL_PROBLEM_RESPONSES = (
+    'lms.djangoapps.instructor_task.tasks_helper.grades.use_incremental_problem_responses'
+)
 
 
 class InstructorGradeReportTestCase(TestReportMixin, InstructorTaskCourseTestCase):
@@ -156,6 +169,71 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         assert any(('grade_report_err' in item[0]) for item in report_store.links_for(self.course.id))
 
+    @override_settings(GRADE_REPORT_LEARNERS_PER_SHARD=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_sharded_report(self, _mock_current_task):
+        """
+        Test that the rows of the learners of a sharded report are computed in
+        subtasks and merged in the order of the learners.
+        """
+        usernames = [f'student{index}' for index in range(5)]
+        for username in usernames:
+            self.create_student(username, f'{username}@example.com')
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id, task_type=InstructorTaskTypes.GRADE_COURSE, task_id=str(uuid4()),
+        )
+
+        with patch(USE_SHARDED_GRADE_REPORT, return_value=True):
+            result = CourseGradeReport.generate({}, entry.id, self.course.id, {}, 'graded')
+        assert result['total'] == 5
+
+        entry.refresh_from_db()
+        assert entry.task_state == SUCCESS
+        assert json.loads(entry.subtasks)['succeeded'] == 3
+        assert_dict_contains_subset(self, {'attempted': 5, 'succeeded': 5, 'failed': 0}, json.loads(entry.task_output))
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        assert len(links) == 1
+        with report_store.storage.open(report_store.path_to(self.course.id, links[0][0])) as csv_file:
+            rows = list(unicodecsv.DictReader(csv_file))
+        assert [row['Username'] for row in rows] == usernames
+
+    @override_settings(GRADE_REPORT_LEARNERS_PER_SHARD=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_sharded_report_merge_retry(self, _mock_current_task):
+        """
+        Test that a sharded report stays in progress until its shards are merged, and that
+        a failed merge keeps the shards for the merge to be retried.
+        """
+        for index in range(3):
+            self.create_student(f'student{index}', f'student{index}@example.com')
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id, task_type=InstructorTaskTypes.GRADE_COURSE, task_id=str(uuid4()),
+        )
+
+        with patch(USE_SHARDED_GRADE_REPORT, return_value=True):
+            with patch('lms.djangoapps.instructor_task.tasks.merge_grades_csv_shards.delay') as mock_merge:
+                CourseGradeReport.generate({}, entry.id, self.course.id, {}, 'graded')
+        mock_merge.assert_called_once_with(entry.id, {}, 'graded')
+        entry.refresh_from_db()
+        assert entry.task_state == PROGRESS
+        assert json.loads(entry.subtasks)['succeeded'] == 2
+
+        upload = 'lms.djangoapps.instructor_task.tasks_helper.grades.upload_csv_file_to_report_store'
+        with patch(upload, side_effect=OSError('Report store unavailable')):
+            with pytest.raises(OSError):
+                CourseGradeReport.merge_shards({}, entry.id, 'graded', final_attempt=False)
+        entry.refresh_from_db()
+        assert entry.task_state == PROGRESS
+
+        CourseGradeReport.merge_shards({}, entry.id, 'graded')
+        entry.refresh_from_db()
+        assert entry.task_state == SUCCESS
+        assert_dict_contains_subset(self, {'attempted': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.task_output))
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        assert len(report_store.links_for(self.course.id)) == 1
+
     def test_cohort_data_in_grading(self):
         """
         Test that cohort data is included in grades csv if cohort configuration is enabled for course.
@@ -683,6 +761,48 @@ class TestProblemResponsesReport(TestReportMixin, InstructorTaskModuleTestCase):
         assert student_data_keys_list == ['username', 'title', 'location', 'Answer', 'Answer ID', 'Correct Answer',
                                           'Question', 'block_key', 'state']
 
+    @patch(USE_INCREMENTAL_PROBLEM_RESPONSES, return_value=True)
+    def test_build_student_data_incremental(self, _):
+        """
+        Ensure that the incremental mode only reads the responses modified since
+        the previous report, and returns the same data as a full report.
+        """
+        self.define_option_problem('Problem1')
+        student2 = self.create_student('student2')
+        self.submit_student_answer(self.student.username, 'Problem1', ['Option 1'])
+        self.submit_student_answer(student2.username, 'Problem1', ['Option 2'])
+
+        def build_student_data():
+            return ProblemResponses._build_student_data(
+                user_id=self.instructor.id,
+                course_key=self.course.id,
+                usage_key_str_list=[str(self.course.location)],
+            )
+
+        with patch(
+            'lms.djangoapps.instructor_task.tasks_helper.grades.list_problem_responses',
+            wraps=list_problem_responses,
+        ) as mock_list_problem_responses:
+            read_time = datetime.now(UTC)
+            with freeze_time(read_time):
+                first_report = build_student_data()
+            self.submit_student_answer(student2.username, 'Problem1', ['Option 1'])
+            # The response is read again although it was modified before the previous
+            # report was read, since it could have been committed after.
+            StudentModule.objects.filter(student=student2).update(modified=read_time - timedelta(seconds=1))
+            StudentModule.objects.filter(student=self.student).delete()
+            second_report = build_student_data()
+
+        assert [row['username'] for row in first_report[0]] == ['student', 'student2']
+        assert mock_list_problem_responses.call_args_list[0] == call(self.course.id, ANY, None)
+        assert mock_list_problem_responses.call_args_list[1] == call(
+            self.course.id, ANY, None, modified_after=read_time - INCREMENTAL_RESPONSES_SAFETY_WINDOW,
+        )
+
+        with patch(USE_INCREMENTAL_PROBLEM_RESPONSES, return_value=False):
+            assert second_report == build_student_data()
+        assert [(row['username'], row['Answer']) for row in second_report[0]] == [('student2', 'Option 1')]
+
     def test_build_student_data_for_multiple_problems(self):
         """
         Ensure that building student data works when supplied multiple usage keys.
@@ -910,6 +1030,62 @@ class TestProblemGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
             )))
         ])
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    @ddt.data(True, False)
+    def test_single_problem_score_matrix(self, use_tempfile, _):
+        """
+        Verify that the rows computed from the problem score matrix are the
+        same as the ones computed from the course grades, and that the course
+        grades are only read for the learners without a persisted grade.
+        """
+        vertical = BlockFactory.create(
+            parent_location=self.problem_section.location,
+            category='vertical',
+            metadata={'graded': True},
+            display_name='Problem Vertical'
+        )
+        self.define_option_problem('Problem1', parent=vertical)
+
+        self.submit_student_answer(self.student_1.username, 'Problem1', ['Option 1'])
+        with patch(USE_ON_DISK_GRADE_REPORT, return_value=use_tempfile):
+            with patch(USE_PROBLEM_SCORE_MATRIX, return_value=True):
+                with patch.object(
+                    CourseGradeFactory, 'iter', autospec=True, side_effect=CourseGradeFactory.iter,
+                ) as mock_iter:
+                    result = ProblemGradeReport.generate(None, None, self.course.id, {}, 'graded')
+        # Only student_1 has a persisted course grade, from their submission.
+        mock_iter.assert_called_once()
+        assert [user.id for user in mock_iter.call_args[0][1]] == [self.student_2.id]
+        assert_dict_contains_subset(
+            self,
+            {'action_name': 'graded', 'attempted': 2, 'succeeded': 2, 'failed': 0},
+            result
+        )
+        problem_name = 'Homework 1: Subsection - Problem1'
+        header_row = self.csv_header_row + [problem_name + ' (Earned)', problem_name + ' (Possible)']
+        self.verify_rows_in_csv([
+            dict(list(zip(
+                header_row,
+                [
+                    str(self.student_1.id),
+                    self.student_1.email,
+                    self.student_1.username,
+                    ENROLLED_IN_COURSE,
+                    '0.01', '1.0', '2.0',
+                ]
+            ))),
+            dict(list(zip(
+                header_row,
+                [
+                    str(self.student_2.id),
+                    self.student_2.email,
+                    self.student_2.username,
+                    ENROLLED_IN_COURSE,
+                    '0.0', 'Not Attempted', '2.0',
+                ]
+            )))
+        ])
+
     @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
     @ddt.data(True, False)
     def test_single_problem_verified_student_only(self, use_tempfile, _):
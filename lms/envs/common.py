@@ -1130,6 +1130,12 @@ MODULESTORE = {
                         'default_class': 'xmodule.hidden_block.HiddenBlock',
                         'fs_root': Derived(lambda settings: settings.DATA_DIR),
                         'render_template': 'common.djangoapps.edxmako.shortcuts.render_to_string',
+                        # Large loads of definitions are queried in batches of definition_load_batch_size
+                        # definitions, on up to definition_load_workers threads (if not 0). The definitions of
+                        # lazily loaded blocks are fetched together, lazy_definition_batch_size at a time.
+                        'definition_load_workers': 0,
+                        'definition_load_batch_size': 500,
+                        'lazy_definition_batch_size': 100,
                     }
                 },
                 {
@@ -2229,7 +2235,7 @@ INSTALLED_APPS = [
     # Course data caching
     'openedx.core.djangoapps.content.course_overviews.apps.CourseOverviewsConfig',
     'openedx.core.djangoapps.content.block_structure.apps.BlockStructureConfig',
-    'lms.djangoapps.course_blocks',
+    'lms.djangoapps.course_blocks.apps.CourseBlocksConfig',
 
     # Mailchimp Syncing
     'lms.djangoapps.mailing',
@@ -2634,6 +2640,13 @@ CERT_NAME_LONG = "Certificate of Achievement"
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = Derived(lambda settings: settings.HIGH_MEM_QUEUE)
 
+# .. setting_name: GRADE_REPORT_LEARNERS_PER_SHARD
+# .. setting_default: 5000
+# .. setting_description: Number of learners whose rows each subtask of a sharded grade report computes, when the
+#   instructor_task.use_sharded_grade_reporting course waffle flag is enabled. Reports with fewer learners are
+#   computed by a single task.
+GRADE_REPORT_LEARNERS_PER_SHARD = 5000
+
 RECALCULATE_GRADES_ROUTING_KEY = 'edx.lms.core.default'
 
 ############################ ORA 2 ############################################
@@ -3156,6 +3169,17 @@ COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 
 COMPLETION_BY_VIEWING_DELAY_MS = 5000
 
+############## Settings for Course Blocks #########################
+
+# .. setting_name: COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT
+# .. setting_default: 60
+# .. setting_description: Time, in seconds, for which block structures transformed for a user by
+#   get_course_blocks are kept in the shared django cache, when the
+#   course_blocks.cache_transformed_structures waffle switch is enabled. Keep this short, since
+#   the passing of start and due dates is not signalled. Set to 0 to only cache them for the
+#   rest of the request.
+COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT = 60
+
 ############### Settings for Django Rate limit #####################
 
 # .. toggle_name: RATELIMIT_ENABLE
@@ -3329,6 +3353,50 @@ FACEBOOK_API_VERSION = None
 # Maximum number of rows to fetch in XBlockUserStateClient calls. Adjust for performance
 USER_STATE_BATCH_SIZE = 5000
 
+# .. setting_name: USER_STATE_COURSE_SCAN_MIN_BLOCKS
+# .. setting_default: 501
+# .. setting_description: Minimum number of blocks of a course whose user state DjangoXBlockUserStateClient loads by
+#   scanning all the StudentModule rows of the user in the course with a single query on the
+#   (student, course_id) index, instead of querying the rows of the blocks in chunks of 500 blocks. The default is
+#   the smallest number of blocks that takes more than one chunked query. The number of queries saved is reported in
+#   the xb_user_state.get_student_modules.queries_saved custom attribute. Set to None to always query the rows in
+#   chunks.
+USER_STATE_COURSE_SCAN_MIN_BLOCKS = 501
+
+# .. setting_name: USER_STATE_COURSE_SCAN_MAX_ROWS_PER_BLOCK
+# .. setting_default: 2
+# .. setting_description: Once a scan found that a user has more than this number of StudentModule rows in a course
+#   per requested block, the user state of the user in the course is queried in chunks again, until the row count
+#   expires from the cache after a day. See USER_STATE_COURSE_SCAN_MIN_BLOCKS.
+USER_STATE_COURSE_SCAN_MAX_ROWS_PER_BLOCK = 2
+
+# .. setting_name: USER_STATE_WRITE_BEHIND_FIELDS
+# .. setting_default: {}
+# .. setting_description: Low-criticality user_state fields of XBlocks, by block type, that
+#   DjangoXBlockUserStateClient buffers in the cache and writes to the StudentModule table at most once per
+#   USER_STATE_WRITE_BEHIND_SECONDS, such as {'video': ['saved_video_position']}. They are only buffered when they
+#   are the only fields saved for a block, are written along with any other field of the block, and are written
+#   before a score of the block is published. Never list fields that scores are computed from.
+# .. setting_warning: Requires a django cache shared by the LMS and its celery workers. Buffered values are lost if
+#   they are evicted from the cache before they are written.
+USER_STATE_WRITE_BEHIND_FIELDS = {}
+
+# .. setting_name: USER_STATE_WRITE_BEHIND_SECONDS
+# .. setting_default: 30
+# .. setting_description: How long the fields of USER_STATE_WRITE_BEHIND_FIELDS are buffered before they are written
+#   to the database.
+USER_STATE_WRITE_BEHIND_SECONDS = 30
+
+# .. setting_name: STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE
+# .. setting_default: None
+# .. setting_description: Minimum length, in characters, of the XBlock user states that are stored compressed in the
+#   StudentModule table when they are saved, such as 1024. Compressed states are decompressed transparently when they
+#   are loaded through the Django ORM, whatever the value of this setting. Existing states can be compressed with the
+#   compress_student_module_state management command. None disables the compression.
+# .. setting_warning: Processes that read the courseware_studentmodule table without the Django ORM, such as SQL
+#   exports, must decompress the states starting with 'zlib:', which are zlib-compressed and base85-encoded.
+STUDENT_MODULE_STATE_COMPRESSION_MIN_SIZE = None
+
 ############## Plugin Django Apps #########################
 
 from edx_django_utils.plugins import get_plugin_apps, add_plugins  # pylint: disable=wrong-import-position,wrong-import-order
@@ -3,10 +3,13 @@ Module with family of classes for block structures.
     BlockStructure - responsible for block existence and relations.
     BlockStructureBlockData - responsible for block & transformer data.
     BlockStructureModulestoreData - responsible for xBlock data.
+    RemovalMaskFilter - filter function that removes a precomputed set of blocks.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
     _BlockData - Data structure for a single block's data.
+    _LazyTransformerDataMap - Data structure for a single block's transformer
+        data, loaded from TransformerBlockDataSegments on first access.
 """
 
 
@@ -377,6 +380,170 @@ class TransformerDataMap(dict):
             return key
 
 
+class TransformerBlockDataSegments:
+    """
+    Data structure to encapsulate the block-specific data of each
+    transformer, kept in its serialized form until it is first accessed.
+
+    Each segment is decoded at most once and the decoded data is shared
+    by all copies of the block structure, so it is never to be mutated.
+    """
+    def __init__(self, encoded_segments, decode_segment):
+        """
+        Arguments:
+            encoded_segments (dict {string: bytes}) - Map of a
+                transformer's name to its serialized block data.
+
+            decode_segment ((bytes) -> ([int], dict)) - Function that
+                decodes a serialized segment into the indices of blocks
+                with data for the transformer, and a map of each field
+                name to the indices of blocks with a value for it, and
+                their values.
+        """
+        self._encoded_segments = encoded_segments
+        self._decode_segment = decode_segment
+
+        # Map of a transformer's name to its decoded segment.
+        # dict {string: ([int], dict {string: ([int], [any])})}
+        self._decoded_segments = {}
+
+        # Map of a transformer's name to each block index's fields.
+        # dict {string: dict {int: dict}}
+        self._fields_by_block = {}
+
+    def __contains__(self, transformer_name):
+        return transformer_name in self._encoded_segments
+
+    def __deepcopy__(self, memo):
+        # Segments are immutable once decoded, so copies of a block
+        # structure can share them and decode each segment only once.
+        return self
+
+    def transformer_names(self):
+        """
+        Returns the names of the transformers with segments.
+        """
+        return self._encoded_segments.keys()
+
+    def get(self, transformer_name):
+        """
+        Returns the decoded segment of the given transformer.
+        """
+        try:
+            return self._decoded_segments[transformer_name]
+        except KeyError:
+            decoded = self._decode_segment(self._encoded_segments[transformer_name])
+            self._decoded_segments[transformer_name] = decoded
+            return decoded
+
+    def get_block_fields(self, transformer_name, block_index):
+        """
+        Returns the fields of the given transformer for the block with
+        the given index, or None if the block has no data for it.
+        """
+        try:
+            fields_by_block = self._fields_by_block[transformer_name]
+        except KeyError:
+            block_indices, fields = self.get(transformer_name)
+            fields_by_block = {index: {} for index in block_indices}
+            for field_name, (indices, values) in fields.items():
+                for index, value in zip(indices, values):
+                    fields_by_block[index][field_name] = value
+            self._fields_by_block[transformer_name] = fields_by_block
+        return fields_by_block.get(block_index)
+
+
+class _LazyTransformerDataMap(TransformerDataMap):
+    """
+    A TransformerDataMap for a single block that loads the block's data
+    for each transformer from TransformerBlockDataSegments when it is
+    first accessed.
+    """
+    def __init__(self, segments, block_index):
+        super().__init__()
+        self._segments = segments
+        self._block_index = block_index
+
+        # Names of the transformers whose data was already loaded, or
+        # explicitly set, for this block.
+        self._loaded = set()
+
+    def __getitem__(self, key):
+        self._load(self._translate_key(key))
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self._loaded.add(self._translate_key(key))
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._load(self._translate_key(key))
+        super().__delitem__(key)
+
+    def __contains__(self, key):
+        self._load(self._translate_key(key))
+        return super().__contains__(self._translate_key(key))
+
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load_all()
+        return super().__len__()
+
+    def __deepcopy__(self, memo):
+        copied = _LazyTransformerDataMap(self._segments, self._block_index)
+        copied._loaded = set(self._loaded)
+        for key, value in dict.items(self):
+            dict.__setitem__(copied, key, deepcopy(value, memo))
+        return copied
+
+    def __reduce_ex__(self, protocol):
+        # Pickle as a regular TransformerDataMap with all data loaded.
+        self._load_all()
+        return (TransformerDataMap, (), None, None, iter(dict.items(self)))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        self._load_all()
+        return super().keys()
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    def _load(self, transformer_name):
+        """
+        Loads this block's data for the given transformer, if not
+        already loaded.
+        """
+        if transformer_name in self._loaded or transformer_name not in self._segments:
+            return
+        self._loaded.add(transformer_name)
+        fields = self._segments.get_block_fields(transformer_name, self._block_index)
+        if fields is not None:
+            transformer_data = TransformerData()
+            transformer_data.fields = deepcopy(fields)
+            dict.__setitem__(self, transformer_name, transformer_data)
+
+    def _load_all(self):
+        """
+        Loads this block's data for all transformers.
+        """
+        for transformer_name in self._segments.transformer_names():
+            self._load(transformer_name)
+
+
 class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
@@ -394,6 +561,50 @@ class BlockData(FieldData):
         self.transformer_data = TransformerDataMap()
 
 
+class RemovalMaskFilter:
+    """
+    A filter function, as created by
+    BlockStructureBlockData.create_removal_mask_filter, that removes the
+    blocks in its removal mask from the block structure and returns
+    whether the given block was retained.
+    """
+    def __init__(self, block_structure, removal_mask, keep_descendants):
+        # The block structure from which blocks are removed.
+        # BlockStructureBlockData
+        self.block_structure = block_structure
+
+        # Usage keys of the blocks to remove.
+        # set(UsageKey)
+        self.removal_mask = removal_mask
+
+        # Whether the descendants of the removed blocks are to be kept.
+        # bool
+        self.keep_descendants = keep_descendants
+
+    def __call__(self, block_key):
+        if block_key not in self.removal_mask:
+            return True
+        self.block_structure.remove_block(block_key, self.keep_descendants)
+        return False
+
+    def can_merge(self, other):
+        """
+        Returns whether the given filter can be merged with this one,
+        that is whether it removes blocks in the same way.
+        """
+        return isinstance(other, RemovalMaskFilter) and other.keep_descendants == self.keep_descendants
+
+    def merge(self, other):
+        """
+        Returns a filter that removes the blocks in the removal masks of
+        both this filter and the given one, which must be mergeable with
+        it.
+        """
+        return RemovalMaskFilter(
+            self.block_structure, self.removal_mask | other.removal_mask, self.keep_descendants,
+        )
+
+
 class BlockStructureBlockData(BlockStructure):
     """
     Subclass of BlockStructure that is responsible for managing block
@@ -468,6 +679,32 @@ class BlockStructureBlockData(BlockStructure):
         block_data = self._block_data_map.get(usage_key)
         return get_datetime_field(block_data, field_name, default) if block_data else default
 
+    def get_xblock_field_values(self, field_name, default=None):
+        """
+        Returns the collected values of the xBlock field for all blocks
+        in the block structure, in a single pass over the collected data.
+
+        This is the batched counterpart of get_xblock_field, for
+        transformers that compute removal masks for
+        create_removal_mask_filter.
+
+        Arguments:
+            field_name (string) - The name of the field that is
+                requested.
+
+            default (any type) - The value to return for blocks without
+                a field value.
+
+        Returns:
+            dict {UsageKey: any type} - Map of the usage key of each
+                block to its field value.
+        """
+        values = {}
+        for usage_key in self.get_block_keys():
+            block_data = self._block_data_map.get(usage_key)
+            values[usage_key] = get_datetime_field(block_data, field_name, default) if block_data else default
+        return values
+
     def override_xblock_field(self, usage_key, field_name, override_data):
         """
         Set value of the XBlock field for the requested block for the requested field_name;
@@ -558,6 +795,40 @@ class BlockStructureBlockData(BlockStructure):
             return default
         return get_datetime_field(transformer_data, key, default)
 
+    def get_transformer_block_field_values(self, transformer, key, default=None):
+        """
+        Returns the values associated with the given key for the given
+        transformer for all blocks in the block structure, in a single
+        pass over the collected data.
+
+        This is the batched counterpart of get_transformer_block_field,
+        for transformers that compute removal masks for
+        create_removal_mask_filter.
+
+        Arguments:
+            transformer (BlockStructureTransformer) - The transformer
+                whose dictionary data is requested.
+
+            key (string) - A dictionary key to the transformer's data
+                that is requested.
+
+            default (any type) - The value to return for blocks without
+                a dictionary entry.
+
+        Returns:
+            dict {UsageKey: any type} - Map of the usage key of each
+                block to its value.
+        """
+        values = {}
+        for usage_key in self.get_block_keys():
+            try:
+                transformer_data = self.get_transformer_block_data(usage_key, transformer)
+            except KeyError:
+                values[usage_key] = default
+            else:
+                values[usage_key] = get_datetime_field(transformer_data, key, default)
+        return values
+
     def set_transformer_block_field(self, usage_key, transformer, key, value):
         """
         Updates the given transformer's data dictionary with the given
@@ -666,6 +937,30 @@ class BlockStructureBlockData(BlockStructure):
             keep_descendants=keep_descendants,
         )
 
+    def create_removal_mask_filter(self, removal_mask, keep_descendants=False):
+        """
+        Returns a filter function that removes the blocks in the given
+        removal_mask.
+
+        This is the batched alternative to create_removal_filter: the
+        transformer computes the blocks to remove up front, in a single
+        pass over the values returned by get_xblock_field_values and
+        get_transformer_block_field_values, rather than evaluating a
+        removal condition for each block during the traversal.  Removal
+        mask filters that are adjacent in the filters given to
+        combine_filters, and have the same keep_descendants value, are
+        merged into a single filter, so a traversal checks all their
+        masks with one lookup per block.
+
+        Arguments:
+            removal_mask (set(UsageKey)) - The usage keys of the blocks
+                that are to be removed from the block structure.
+
+            keep_descendants (bool) - See the description in
+                remove_block.
+        """
+        return RemovalMaskFilter(self, set(removal_mask), keep_descendants)
+
     def retain_or_remove(self, block_key, removal_condition, keep_descendants=False):
         """
         Removes the given block if it satisfies the removal_condition.
@@ -752,6 +1047,22 @@ class BlockStructureBlockData(BlockStructure):
             raise TransformerException('Version attributes are not set on transformer {0}.', transformer.name())  # lint-amnesty, pylint: disable=raising-format-tuple
         self.set_transformer_data(transformer, TRANSFORMER_VERSION_KEY, transformer.WRITE_VERSION)
 
+    def _replace_collected_data(self, block_structure):
+        """
+        Replaces the collected data of the blocks in the given block
+        structure, and all non-block-specific transformer data, with the
+        data collected in the given block structure.  The given block
+        structure is expected to contain a subset of the blocks in this
+        one, with the same relations, and is not to be used afterwards.
+
+        Arguments:
+            block_structure (BlockStructureBlockData) - The block
+                structure with the newly collected data.
+        """
+        self.transformer_data = block_structure.transformer_data
+        for usage_key, block_data in block_structure.iteritems():
+            self._block_data_map[usage_key] = block_data
+
     def _get_or_create_block(self, usage_key):
         """
         Returns the BlockData associated with the given usage_key.
@@ -0,0 +1,963 @@
+"""
+Module with an array-backed implementation of BlockStructureBlockData.
+    CompactBlockStructureBlockData - drop-in replacement for
+        BlockStructureBlockData that interns usage keys to integer ids.
+
+The following internal data structures are implemented:
+    _ColumnarFieldData - Column-oriented storage of field values, indexed by block id.
+    _BlockDataView - BlockData-like accessor for a single block's columnar data.
+    _BlockTransformerDataMap - TransformerDataMap-like accessor for a single block.
+    _TransformerBlockDataView - TransformerData-like accessor for a single block.
+
+Instead of one _BlockRelations and one BlockData object per block, the
+compact structure stores:
+
+  * a single list of usage keys, where a block's position in the list is its
+    integer id, and a dict mapping each usage key back to its id.
+  * the parent and child relations of all blocks as CSR (compressed sparse
+    row) style arrays of ids: the children of block ``i`` are
+    ``child_ids[child_offsets[i]:child_offsets[i + 1]]``.
+  * collected xBlock fields and per-block transformer data as one list
+    (column) per field name, indexed by block id.
+
+Relations modified after construction (for example, by remove_block with
+keep_descendants) are recorded as per-block overrides on top of the CSR
+arrays and folded back into new arrays by _prune_unreachable.
+
+Copying a compact structure copies a handful of flat arrays and lists,
+rather than deep-copying tens of thousands of small objects, which makes
+it well suited for the per-request copy done by get_transformed.
+"""
+
+
+from array import array
+from copy import deepcopy
+from datetime import datetime
+
+from xmodule.block_metadata_utils import get_datetime_field
+
+from openedx.core.lib.graph_traversals import traverse_post_order, traverse_topologically
+
+from .block_structure import BlockStructureBlockData, TransformerDataMap
+
+
+class _MissingType:
+    """
+    Type of the marker for a missing value in a column, which keeps its
+    identity when the columns are pickled.
+    """
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self):
+        return '_MISSING'
+
+
+# Marker for a missing value in a column.
+_MISSING = _MissingType()
+
+# Typecode of the arrays used to store block ids.
+_ID_TYPECODE = 'l'
+
+
+class _ColumnarFieldData:
+    """
+    Data structure to encapsulate the field values of all blocks in a
+    structure, stored as one list per field name and indexed by block id.
+    """
+    __slots__ = ('has_data', 'columns')
+
+    def __init__(self):
+        # Whether a block (by id) has a data entry, even if it is empty.
+        # bytearray
+        self.has_data = bytearray()
+
+        # Map of field name to the list of values for each block id.
+        # dict {string: [any picklable type or _MISSING]}
+        self.columns = {}
+
+    @classmethod
+    def from_sparse(cls, size, block_ids, fields):
+        """
+        Returns new columnar data of the given size for the given blocks
+        and sparse field values.
+
+        Arguments:
+            size (int) - The number of block ids.
+            block_ids ([int]) - The ids of the blocks that have data.
+            fields (dict {string: ([int], [any])}) - Map of a field name
+                to the ids of blocks with values for it, and the values.
+        """
+        field_data = cls()
+        field_data.has_data = bytearray(size)
+        for block_id in block_ids:
+            field_data.has_data[block_id] = 1
+        for field_name, (value_block_ids, values) in fields.items():
+            column = [_MISSING] * size
+            for block_id, value in zip(value_block_ids, values):
+                column[block_id] = value
+            field_data.columns[field_name] = column
+        return field_data
+
+    def copy(self):
+        """
+        Returns a copy of this data, with new columns that share the
+        (immutable by convention) field values.
+        """
+        copied = _ColumnarFieldData()
+        copied.has_data = bytearray(self.has_data)
+        copied.columns = {field_name: list(column) for field_name, column in self.columns.items()}
+        return copied
+
+    def has(self, block_id):
+        """
+        Returns whether the block with the given id has a data entry.
+        """
+        return block_id < len(self.has_data) and bool(self.has_data[block_id])
+
+    def add(self, block_id):
+        """
+        Records a (possibly empty) data entry for the block with the given id.
+        """
+        if block_id >= len(self.has_data):
+            self.has_data.extend(bytes(block_id + 1 - len(self.has_data)))
+        self.has_data[block_id] = 1
+
+    def discard(self, block_id):
+        """
+        Removes the data entry, and all values, for the block with the given id.
+        """
+        if self.has(block_id):
+            self.has_data[block_id] = 0
+            for column in self.columns.values():
+                if block_id < len(column):
+                    column[block_id] = _MISSING
+
+    def get(self, block_id, field_name):
+        """
+        Returns the value of the given field for the given block id.
+
+        Raises AttributeError if not found.
+        """
+        column = self.columns.get(field_name)
+        if column is not None and block_id < len(column):
+            value = column[block_id]
+            if value is not _MISSING:
+                return value
+        raise AttributeError(f"Field {field_name} does not exist")
+
+    def set(self, block_id, field_name, value):
+        """
+        Sets the value of the given field for the given block id.
+        """
+        column = self.columns.get(field_name)
+        if column is None:
+            column = self.columns[field_name] = []
+        if block_id >= len(column):
+            column.extend([_MISSING] * (block_id + 1 - len(column)))
+        column[block_id] = value
+        self.add(block_id)
+
+    def delete(self, block_id, field_name):
+        """
+        Deletes the value of the given field for the given block id.
+
+        Raises AttributeError if not found.
+        """
+        self.get(block_id, field_name)
+        self.columns[field_name][block_id] = _MISSING
+
+    def fields(self, block_id):
+        """
+        Returns a dict of all field values for the given block id.
+        """
+        return {
+            field_name: column[block_id]
+            for field_name, column in self.columns.items()
+            if block_id < len(column) and column[block_id] is not _MISSING
+        }
+
+
+class _FieldDataView:
+    """
+    Base class for accessors that expose a single block's columnar data
+    with the attribute-style interface of FieldData.
+    """
+    __slots__ = ('_field_data', '_block_id')
+
+    def __init__(self, field_data, block_id):
+        object.__setattr__(self, '_field_data', field_data)
+        object.__setattr__(self, '_block_id', block_id)
+
+    @property
+    def fields(self):
+        """
+        Returns a dict snapshot of the block's field values.
+        """
+        return self._field_data.fields(self._block_id)
+
+    def __getattr__(self, field_name):
+        return self._field_data.get(self._block_id, field_name)
+
+    def __setattr__(self, field_name, field_value):
+        self._field_data.set(self._block_id, field_name, field_value)
+
+    def __delattr__(self, field_name):
+        self._field_data.delete(self._block_id, field_name)
+
+
+class _TransformerBlockDataView(_FieldDataView):
+    """
+    TransformerData-like accessor for a single transformer's data of a
+    single block.
+    """
+    __slots__ = ()
+
+
+class _BlockTransformerDataMap:
+    """
+    TransformerDataMap-like accessor for all transformers' data of a
+    single block.
+    """
+    __slots__ = ('_block_structure', '_block_id')
+
+    def __init__(self, block_structure, block_id):
+        self._block_structure = block_structure
+        self._block_id = block_id
+
+    def __getitem__(self, transformer):
+        field_data = self._block_structure._get_transformer_field_data(_transformer_name(transformer))
+        if field_data is None or not field_data.has(self._block_id):
+            raise KeyError(transformer)
+        return _TransformerBlockDataView(field_data, self._block_id)
+
+    def __contains__(self, transformer):
+        try:
+            self[transformer]
+        except KeyError:
+            return False
+        return True
+
+    def get_or_create(self, transformer):
+        """
+        Returns the data for the given transformer, creating an empty
+        entry if not found.
+        """
+        field_data = self._block_structure._get_or_create_transformer_block_data(transformer)  # pylint: disable=protected-access
+        field_data.add(self._block_id)
+        return _TransformerBlockDataView(field_data, self._block_id)
+
+
+class _BlockDataView(_FieldDataView):
+    """
+    BlockData-like accessor for the collected data of a single block.
+    """
+    __slots__ = ('location', 'transformer_data')
+
+    def __init__(self, block_structure, block_id):
+        super().__init__(block_structure._xblock_field_data, block_id)
+        object.__setattr__(self, 'location', block_structure._usage_keys[block_id])
+        object.__setattr__(self, 'transformer_data', _BlockTransformerDataMap(block_structure, block_id))
+
+
+def _transformer_name(transformer):
+    """
+    Returns the name of the given transformer class or name.
+    See TransformerDataMap._translate_key.
+    """
+    try:
+        return transformer.name()
+    except AttributeError:
+        return transformer
+
+
+class CompactBlockStructureBlockData(BlockStructureBlockData):
+    """
+    Subclass of BlockStructureBlockData that stores block relations as
+    CSR-style arrays of integer block ids, and block and transformer data
+    as columns indexed by block id.
+
+    The public interface is identical to that of BlockStructureBlockData,
+    and all usage keys passed in and returned are the original usage keys.
+    """
+    def __init__(self, root_block_usage_key):  # pylint: disable=super-init-not-called
+        # The usage key of the root block for this structure.
+        # UsageKey
+        self.root_block_usage_key = root_block_usage_key
+
+        # List of interned usage keys; a key's index is its block id.
+        # list [UsageKey]
+        self._usage_keys = []
+
+        # Map of a usage key to its block id.
+        # dict {UsageKey: int}
+        self._block_ids = {}
+
+        # Whether _usage_keys and _block_ids are shared with another
+        # structure and need to be copied before they are modified.
+        self._interned_keys_shared = False
+
+        # CSR arrays of the relations of blocks, by block id.
+        self._child_offsets = array(_ID_TYPECODE, [0])
+        self._child_ids = array(_ID_TYPECODE)
+        self._parent_offsets = array(_ID_TYPECODE, [0])
+        self._parent_ids = array(_ID_TYPECODE)
+
+        # Map of a block id to its (parent ids, child ids) lists, for
+        # blocks whose relations changed since the CSR arrays were built.
+        # dict {int: ([int], [int])}
+        self._relation_overrides = {}
+
+        # Whether a block (by id) is currently in the structure.
+        # bytearray
+        self._present = bytearray()
+        self._num_present = 0
+
+        # Collected xBlock field values of all blocks.
+        # _ColumnarFieldData
+        self._xblock_field_data = _ColumnarFieldData()
+
+        # Map of a transformer's name to its block-specific data.
+        # dict {string: _ColumnarFieldData}
+        self._transformer_block_data = {}
+
+        # Block-specific data of transformers that is not yet loaded
+        # into _transformer_block_data, if any.
+        # TransformerBlockDataSegments
+        self._transformer_block_segments = None
+
+        # Map of a transformer's name to its non-block-specific data.
+        self.transformer_data = TransformerDataMap()
+
+        self._add_block_id(root_block_usage_key)
+
+    @classmethod
+    def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
+        """
+        Returns a new compact block structure for the given relations and
+        data, as stored by BlockStructureBlockData.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage key of the root block.
+
+            block_relations (dict {UsageKey: _BlockRelations}) - The
+                relations of each block in the structure.
+
+            transformer_data (TransformerDataMap) - Non-block-specific
+                transformer data.
+
+            block_data_map (dict {UsageKey: BlockData}) - The collected
+                data of each block in the structure.
+        """
+        block_structure = cls(root_block_usage_key)
+        block_structure.transformer_data = transformer_data
+
+        # Intern all keys in a single pass, so that block ids follow the
+        # order of the original map.
+        for usage_key in block_relations:
+            block_structure._add_block_id(usage_key)
+        for usage_key in block_data_map:
+            block_structure._intern(usage_key)
+
+        block_ids = block_structure._block_ids
+        block_structure._build_relation_arrays({
+            block_ids[usage_key]: (
+                [block_ids[parent] for parent in relations.parents],
+                [block_ids[child] for child in relations.children],
+            )
+            for usage_key, relations in block_relations.items()
+        })
+
+        for usage_key, block_data in block_data_map.items():
+            block_id = block_ids[usage_key]
+            block_structure._xblock_field_data.add(block_id)
+            for field_name, value in block_data.fields.items():
+                block_structure._xblock_field_data.set(block_id, field_name, value)
+            for transformer_name, transformer_block_data in block_data.transformer_data.items():
+                field_data = block_structure._get_or_create_transformer_block_data(transformer_name)
+                field_data.add(block_id)
+                for key, value in transformer_block_data.fields.items():
+                    field_data.set(block_id, key, value)
+
+        return block_structure
+
+    @classmethod
+    def create_from_columns(
+            cls,
+            root_block_usage_key,
+            usage_keys,
+            num_blocks,
+            children,
+            transformer_data,
+            block_data_ids,
+            xblock_fields,
+            transformer_block_fields,
+            transformer_block_segments=None,
+    ):
+        """
+        Returns a new compact block structure for the given id-based
+        relations and columnar data, as written by the binary
+        serialization format (see serialization.py).
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage key of the root block.
+
+            usage_keys ([UsageKey]) - The usage keys of all blocks, by id.
+
+            num_blocks (int) - The number of blocks in the structure.
+                These are the first num_blocks entries of usage_keys.
+
+            children ([[int]]) - The child ids of each block, by id.
+
+            transformer_data (TransformerDataMap) - Non-block-specific
+                transformer data.
+
+            block_data_ids ([int]) - The ids of the blocks with data.
+
+            xblock_fields (dict {string: ([int], [any])}) - Map of an
+                xBlock field name to the ids of blocks with values for
+                the field, and those values.
+
+            transformer_block_fields (dict {string: ([int], dict)}) - Map
+                of a transformer's name to the ids of blocks with data for
+                the transformer, and the transformer's field values in the
+                same form as xblock_fields.
+
+            transformer_block_segments (TransformerBlockDataSegments) -
+                Block-specific data of additional transformers, to be
+                loaded when first accessed.
+        """
+        block_structure = cls.__new__(cls)
+        block_structure.root_block_usage_key = root_block_usage_key
+        block_structure._usage_keys = list(usage_keys)
+        block_structure._block_ids = {usage_key: block_id for block_id, usage_key in enumerate(usage_keys)}
+        block_structure._interned_keys_shared = False
+        block_structure._present = bytearray(len(usage_keys))
+        block_structure._present[:num_blocks] = b'\x01' * num_blocks
+        block_structure._num_present = num_blocks
+
+        parents = [[] for _ in range(num_blocks)]
+        for parent_id, child_ids in enumerate(children):
+            for child_id in child_ids:
+                parents[child_id].append(parent_id)
+        block_structure._build_relation_arrays({
+            block_id: (parents[block_id], children[block_id])
+            for block_id in range(num_blocks)
+        })
+
+        block_structure._xblock_field_data = _ColumnarFieldData.from_sparse(
+            len(usage_keys), block_data_ids, xblock_fields,
+        )
+        block_structure._transformer_block_data = {
+            transformer_name: _ColumnarFieldData.from_sparse(len(usage_keys), block_ids, fields)
+            for transformer_name, (block_ids, fields) in transformer_block_fields.items()
+        }
+        block_structure._transformer_block_segments = transformer_block_segments
+        block_structure.transformer_data = transformer_data
+        return block_structure
+
+    @classmethod
+    def from_block_structure(cls, block_structure):
+        """
+        Returns a new compact block structure with the contents of the
+        given BlockStructureBlockData.
+        """
+        return cls.create_new(
+            block_structure.root_block_usage_key,
+            block_structure._block_relations,  # pylint: disable=protected-access
+            deepcopy(block_structure.transformer_data),
+            block_structure._block_data_map,  # pylint: disable=protected-access
+        )
+
+    def __len__(self):
+        return self._num_present
+
+    def __contains__(self, usage_key):
+        block_id = self._block_ids.get(usage_key)
+        return block_id is not None and self._is_present(block_id)
+
+    def __getitem__(self, usage_key):
+        """
+        Returns a BlockData-like view of the data associated with the
+        given key.
+        """
+        block_id = self._block_ids.get(usage_key)
+        if block_id is None or not self._xblock_field_data.has(block_id):
+            raise KeyError(usage_key)
+        return _BlockDataView(self, block_id)
+
+    #--- Block structure relation methods ---#
+
+    def get_parents(self, usage_key):
+        """
+        Returns the parents of the block identified by the given
+        usage_key.  See BlockStructure.get_parents.
+        """
+        if usage_key not in self:
+            return []
+        usage_keys = self._usage_keys
+        return [usage_keys[parent_id] for parent_id in self._get_parent_ids(self._block_ids[usage_key])]
+
+    def get_children(self, usage_key):
+        """
+        Returns the children of the block identified by the given
+        usage_key.  See BlockStructure.get_children.
+        """
+        if usage_key not in self:
+            return []
+        usage_keys = self._usage_keys
+        return [usage_keys[child_id] for child_id in self._get_child_ids(self._block_ids[usage_key])]
+
+    def set_root_block(self, usage_key):
+        """
+        Sets the given usage key as the new root of the block structure.
+        See BlockStructure.set_root_block.
+        """
+        self.root_block_usage_key = usage_key
+        self._get_relation_override(self._block_ids[usage_key])[0].clear()
+
+    def get_block_keys(self):
+        """
+        Returns an iterator of the usage keys of all the blocks in the
+        block structure.
+        """
+        present = self._present
+        return (usage_key for block_id, usage_key in enumerate(self._usage_keys) if present[block_id])
+
+    #--- Block structure traversal methods ---#
+
+    def topological_traversal(
+            self,
+            filter_func=None,
+            yield_descendants_of_unyielded=False,
+            start_node=None,
+    ):
+        """
+        Performs a topological sort of the block structure and yields
+        the usage_key of each block as it is encountered.
+
+        The traversal itself runs on integer block ids; the given
+        filter_func is still called with usage keys.  See
+        BlockStructure.topological_traversal.
+        """
+        usage_keys = self._usage_keys
+        for block_id in traverse_topologically(
+            start_node=self._block_ids[start_node or self.root_block_usage_key],
+            get_parents=self._get_parent_ids,
+            get_children=self._get_child_ids,
+            filter_func=self._id_filter(filter_func),
+            yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+        ):
+            yield usage_keys[block_id]
+
+    def post_order_traversal(
+            self,
+            filter_func=None,
+            start_node=None,
+    ):
+        """
+        Performs a post-order sort of the block structure and yields
+        the usage_key of each block as it is encountered.
+
+        See BlockStructure.post_order_traversal.
+        """
+        usage_keys = self._usage_keys
+        for block_id in self._post_order_ids(
+            start_id=self._block_ids[start_node or self.root_block_usage_key],
+            filter_func=self._id_filter(filter_func),
+        ):
+            yield usage_keys[block_id]
+
+    #--- Block data methods ---#
+
+    def copy(self):
+        """
+        Returns a new instance of CompactBlockStructureBlockData with a
+        copy of this instance's contents.
+
+        The interned usage keys are shared between the copies until one
+        of them adds a new block.  Collected field values are shared as
+        well; as in all transformers, they are to be replaced rather than
+        mutated in place.
+        """
+        # pylint: disable=protected-access
+        copied = CompactBlockStructureBlockData.__new__(CompactBlockStructureBlockData)
+        copied.root_block_usage_key = self.root_block_usage_key
+        copied._usage_keys = self._usage_keys
+        copied._block_ids = self._block_ids
+        copied._interned_keys_shared = self._interned_keys_shared = True
+        copied._child_offsets = array(_ID_TYPECODE, self._child_offsets)
+        copied._child_ids = array(_ID_TYPECODE, self._child_ids)
+        copied._parent_offsets = array(_ID_TYPECODE, self._parent_offsets)
+        copied._parent_ids = array(_ID_TYPECODE, self._parent_ids)
+        copied._relation_overrides = {
+            block_id: (list(parent_ids), list(child_ids))
+            for block_id, (parent_ids, child_ids) in self._relation_overrides.items()
+        }
+        copied._present = bytearray(self._present)
+        copied._num_present = self._num_present
+        copied._xblock_field_data = self._xblock_field_data.copy()
+        copied._transformer_block_data = {
+            transformer_name: field_data.copy()
+            for transformer_name, field_data in self._transformer_block_data.items()
+        }
+        copied._transformer_block_segments = self._transformer_block_segments
+        copied.transformer_data = deepcopy(self.transformer_data)
+        return copied
+
+    def iteritems(self):
+        """
+        Returns iterator of (UsageKey, BlockData) pairs for all
+        blocks in the BlockStructure.
+        """
+        return ((block_data.location, block_data) for block_data in self.itervalues())
+
+    def itervalues(self):
+        """
+        Returns iterator of BlockData for all blocks in the
+        BlockStructure.
+        """
+        has_data = self._xblock_field_data.has_data
+        return (
+            _BlockDataView(self, block_id)
+            for block_id in range(len(has_data))
+            if has_data[block_id]
+        )
+
+    def get_xblock_field(self, usage_key, field_name, default=None):
+        """
+        Returns the collected value of the xBlock field for the
+        requested block for the requested field_name; returns default if
+        not found.
+        """
+        block_id = self._block_ids.get(usage_key)
+        if block_id is None or not self._xblock_field_data.has(block_id):
+            return default
+        return get_datetime_field(_FieldDataView(self._xblock_field_data, block_id), field_name, default)
+
+    def get_xblock_field_values(self, field_name, default=None):
+        """
+        Returns the collected values of the xBlock field for all blocks
+        in the block structure, read from the field's column.
+        """
+        return self._get_column_values(self._xblock_field_data, field_name, default)
+
+    def override_xblock_field(self, usage_key, field_name, override_data):
+        """
+        Set value of the XBlock field for the requested block for the
+        requested field_name.
+        """
+        self._xblock_field_data.set(self._intern(usage_key), field_name, override_data)
+
+    def get_transformer_block_data(self, usage_key, transformer):
+        """
+        Returns the TransformerData for the given
+        transformer for the block identified by the given usage_key.
+
+        Raises KeyError if not found.
+        """
+        block_id = self._block_ids.get(usage_key)
+        if block_id is None or not self._xblock_field_data.has(block_id):
+            raise KeyError(usage_key)
+        return _BlockTransformerDataMap(self, block_id)[transformer]
+
+    def get_transformer_block_field(self, usage_key, transformer, key, default=None):
+        """
+        Returns the value associated with the given key for the given
+        transformer for the block identified by the given usage_key;
+        returns default if not found.
+        """
+        block_id = self._block_ids.get(usage_key)
+        field_data = self._get_transformer_field_data(_transformer_name(transformer))
+        if block_id is None or field_data is None or not field_data.has(block_id):
+            return default
+        return get_datetime_field(_TransformerBlockDataView(field_data, block_id), key, default)
+
+    def get_transformer_block_field_values(self, transformer, key, default=None):
+        """
+        Returns the values associated with the given key for the given
+        transformer for all blocks in the block structure, read from the
+        key's column.
+        """
+        field_data = self._get_transformer_field_data(_transformer_name(transformer))
+        return self._get_column_values(field_data, key, default)
+
+    def set_transformer_block_field(self, usage_key, transformer, key, value):
+        """
+        Updates the given transformer's data dictionary with the given
+        key and value for the block identified by the given usage_key.
+        """
+        block_id = self._intern(usage_key)
+        self._xblock_field_data.add(block_id)
+        self._get_or_create_transformer_block_data(transformer).set(block_id, key, value)
+
+    def remove_transformer_block_field(self, usage_key, transformer, key):
+        """
+        Deletes the given key from the given transformer's data for the
+        block identified by the given usage_key.
+        """
+        block_id = self._block_ids.get(usage_key)
+        field_data = self._get_transformer_field_data(_transformer_name(transformer))
+        if block_id is None or field_data is None:
+            return
+        try:
+            field_data.delete(block_id, key)
+        except AttributeError:
+            pass
+
+    def remove_block(self, usage_key, keep_descendants):
+        """
+        Removes the block identified by the usage_key and all of its
+        related data from the block structure.
+
+        See BlockStructureBlockData.remove_block.
+        """
+        block_id = self._block_ids[usage_key]
+        if not self._is_present(block_id):
+            raise KeyError(usage_key)
+
+        parent_ids = list(self._get_parent_ids(block_id))
+        child_ids = list(self._get_child_ids(block_id))
+
+        # Remove block from its children.
+        for child_id in child_ids:
+            self._get_relation_override(child_id)[0].remove(block_id)
+
+        # Remove block from its parents.
+        for parent_id in parent_ids:
+            self._get_relation_override(parent_id)[1].remove(block_id)
+
+        # Remove block.
+        self._relation_overrides[block_id] = ([], [])
+        self._present[block_id] = 0
+        self._num_present -= 1
+        self._xblock_field_data.discard(block_id)
+        for field_data in self._transformer_block_data.values():
+            field_data.discard(block_id)
+
+        # Recreate the graph connections if descendants are to be kept.
+        if keep_descendants:
+            for child_id in child_ids:
+                for parent_id in parent_ids:
+                    self._add_relation_ids(parent_id, child_id)
+
+    #--- Internal methods ---#
+    # To be used within the block_structure framework or by tests.
+
+    def _prune_unreachable(self):
+        """
+        Mutates this block structure by removing any unreachable blocks,
+        rebuilding the relation arrays from the reachable blocks only.
+        """
+        root_id = self._block_ids[self.root_block_usage_key]
+        reachable = bytearray(len(self._usage_keys))
+        for block_id in self._post_order_ids(start_id=root_id, filter_func=self._is_present):
+            reachable[block_id] = 1
+
+        relations = {}
+        for block_id, is_reachable in enumerate(reachable):
+            if is_reachable:
+                relations[block_id] = (
+                    [parent_id for parent_id in self._get_parent_ids(block_id) if reachable[parent_id]],
+                    list(self._get_child_ids(block_id)),
+                )
+        self._present = reachable
+        self._num_present = len(relations)
+        self._build_relation_arrays(relations)
+
+    def _add_relation(self, parent_key, child_key):
+        """
+        Adds a parent to child relationship in this block structure.
+        """
+        self._add_relation_ids(self._add_block_id(parent_key), self._add_block_id(child_key))
+
+    def _add_relation_ids(self, parent_id, child_id):
+        """
+        Adds a parent to child relationship between the given block ids.
+        """
+        self._get_relation_override(child_id)[0].append(parent_id)
+        self._get_relation_override(parent_id)[1].append(child_id)
+
+    def _get_or_create_block(self, usage_key):
+        """
+        Returns a view of the BlockData associated with the given
+        usage_key, creating an empty entry if not found.
+        """
+        block_id = self._intern(usage_key)
+        self._xblock_field_data.add(block_id)
+        return _BlockDataView(self, block_id)
+
+    def _get_or_create_transformer_block_data(self, transformer):
+        """
+        Returns the columnar block data of the given transformer,
+        creating it if not found.
+        """
+        transformer_name = _transformer_name(transformer)
+        field_data = self._get_transformer_field_data(transformer_name)
+        if field_data is None:
+            field_data = self._transformer_block_data[transformer_name] = _ColumnarFieldData()
+        return field_data
+
+    def _get_transformer_field_data(self, transformer_name):
+        """
+        Returns the columnar block data of the given transformer, loading
+        it from the pending segments on first access; returns None if
+        not found.
+        """
+        field_data = self._transformer_block_data.get(transformer_name)
+        if field_data is None:
+            segments = self._transformer_block_segments
+            if segments is None or transformer_name not in segments:
+                return None
+            block_ids, fields = segments.get(transformer_name)
+            field_data = _ColumnarFieldData.from_sparse(len(self._usage_keys), block_ids, fields)
+
+            # Skip the data of blocks that were removed before the
+            # segment was loaded.
+            has_block_data = self._xblock_field_data.has
+            for block_id in block_ids:
+                if not has_block_data(block_id):
+                    field_data.discard(block_id)
+            self._transformer_block_data[transformer_name] = field_data
+        return field_data
+
+    def _get_column_values(self, field_data, field_name, default):
+        """
+        Returns a map of the usage key of each block in the structure to
+        its value in the given field's column of field_data, or default
+        if it has none.
+        """
+        column = field_data.columns.get(field_name, ()) if field_data is not None else ()
+        num_values = len(column)
+        values = {}
+        for block_id, (usage_key, is_present) in enumerate(zip(self._usage_keys, self._present)):
+            if not is_present:
+                continue
+            value = column[block_id] if block_id < num_values else _MISSING
+            if value is _MISSING:
+                value = default
+            elif isinstance(value, datetime):
+                value = get_datetime_field(_FieldDataView(field_data, block_id), field_name, default)
+            values[usage_key] = value
+        return values
+
+    def _intern(self, usage_key):
+        """
+        Returns the block id of the given usage key, assigning a new id
+        if the key was not seen before.
+        """
+        block_id = self._block_ids.get(usage_key)
+        if block_id is None:
+            if self._interned_keys_shared:
+                self._usage_keys = list(self._usage_keys)
+                self._block_ids = dict(self._block_ids)
+                self._interned_keys_shared = False
+            block_id = len(self._usage_keys)
+            self._usage_keys.append(usage_key)
+            self._block_ids[usage_key] = block_id
+            self._present.append(0)
+        return block_id
+
+    def _add_block_id(self, usage_key):
+        """
+        Adds the given usage key to the structure, if not already
+        present, and returns its block id.
+        """
+        block_id = self._intern(usage_key)
+        if not self._present[block_id]:
+            self._present[block_id] = 1
+            self._num_present += 1
+        return block_id
+
+    def _is_present(self, block_id):
+        """
+        Returns whether the block with the given id is in the structure.
+        """
+        return bool(self._present[block_id])
+
+    def _get_parent_ids(self, block_id):
+        """
+        Returns the parent ids of the block with the given id.
+        """
+        override = self._relation_overrides.get(block_id)
+        if override is not None:
+            return override[0]
+        if block_id + 1 >= len(self._parent_offsets):
+            return ()
+        return self._parent_ids[self._parent_offsets[block_id]:self._parent_offsets[block_id + 1]]
+
+    def _get_child_ids(self, block_id):
+        """
+        Returns the child ids of the block with the given id.
+        """
+        override = self._relation_overrides.get(block_id)
+        if override is not None:
+            return override[1]
+        if block_id + 1 >= len(self._child_offsets):
+            return ()
+        return self._child_ids[self._child_offsets[block_id]:self._child_offsets[block_id + 1]]
+
+    def _get_relation_override(self, block_id):
+        """
+        Returns the mutable (parent ids, child ids) lists of the block
+        with the given id, copying them out of the CSR arrays if needed.
+        """
+        override = self._relation_overrides.get(block_id)
+        if override is None:
+            override = self._relation_overrides[block_id] = (
+                list(self._get_parent_ids(block_id)),
+                list(self._get_child_ids(block_id)),
+            )
+        return override
+
+    def _build_relation_arrays(self, relations):
+        """
+        Replaces the CSR relation arrays with the given relations and
+        discards all relation overrides.
+
+        Arguments:
+            relations (dict {int: ([int], [int])}) - Map of a block id to
+                its parent ids and child ids.
+        """
+        num_ids = len(self._usage_keys)
+        self._parent_offsets, self._parent_ids = self._csr_arrays(
+            num_ids, relations, lambda relation: relation[0],
+        )
+        self._child_offsets, self._child_ids = self._csr_arrays(
+            num_ids, relations, lambda relation: relation[1],
+        )
+        self._relation_overrides = {}
+
+    @staticmethod
+    def _csr_arrays(num_ids, relations, get_related_ids):
+        """
+        Returns the (offsets, ids) CSR arrays for the given relations.
+        """
+        offsets = array(_ID_TYPECODE, [0])
+        ids = array(_ID_TYPECODE)
+        for block_id in range(num_ids):
+            relation = relations.get(block_id)
+            if relation is not None:
+                ids.extend(get_related_ids(relation))
+            offsets.append(len(ids))
+        return offsets, ids
+
+    def _post_order_ids(self, start_id, filter_func=None):
+        """
+        Performs a post-order traversal over block ids.
+        """
+        return traverse_post_order(
+            start_node=start_id,
+            get_children=self._get_child_ids,
+            filter_func=filter_func,
+        )
+
+    def _id_filter(self, filter_func):
+        """
+        Returns a filter function on block ids for the given filter
+        function on usage keys.
+        """
+        if filter_func is None:
+            return None
+        usage_keys = self._usage_keys
+        return lambda block_id: filter_func(usage_keys[block_id])
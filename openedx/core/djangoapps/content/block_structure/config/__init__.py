@@ -9,6 +9,30 @@ from openedx.core.lib.cache_utils import request_cached
 
 from .models import BlockStructureConfiguration
 
+# .. toggle_name: block_structure.compact_representation
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, collected block structures loaded from the store are
+#   represented by CompactBlockStructureBlockData, which interns usage keys to integer ids and
+#   stores relations and block data in flat arrays, instead of one object per block. This reduces
+#   the memory used, and the time spent copying, by each call to get_transformed.
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+COMPACT_REPRESENTATION = WaffleSwitch('block_structure.compact_representation', __name__)
+
+# .. toggle_name: block_structure.incremental_collect
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: When enabled, the block structure of a course that was changed by a publish
+#   is updated by re-collecting only the changed blocks, their descendants and their ancestors, and
+#   merging them into the previously collected block structure. A full collect is still done when the
+#   course's tree changed, when the previous structure can't be compared with the new one, or when
+#   any registered transformer doesn't support incremental collection (see INCREMENTAL_COLLECT in
+#   BlockStructureTransformer).
+# .. toggle_use_cases: open_edx
+# .. toggle_creation_date: 2026-10-18
+INCREMENTAL_COLLECT = WaffleSwitch('block_structure.incremental_collect', __name__)
+
 
 @request_cached()
 def num_versions_to_keep():
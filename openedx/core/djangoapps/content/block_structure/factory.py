@@ -2,6 +2,7 @@
 Module for factory class for BlockStructure objects.
 """
 from .block_structure import BlockStructureBlockData, BlockStructureModulestoreData
+from .compact import CompactBlockStructureBlockData
 
 
 class BlockStructureFactory:
@@ -57,6 +58,70 @@ class BlockStructureFactory:
         build_block_structure(root_xblock)
         return block_structure
 
+    @classmethod
+    def create_partial_from_modulestore(
+        cls, root_block_usage_key, modulestore, collected_block_structure, changed_usage_keys,
+    ):
+        """
+        Creates and returns a block structure from the modulestore with
+        only the blocks that need to be re-collected when the given blocks
+        change: the changed blocks, their descendants, and all ancestors
+        of those, up to the root.  The children of those ancestors are
+        included as well, since transformers commonly set data on all
+        the children of a block while collecting its data.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure that is to be created.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the data for the xBlocks within the block
+                structure.
+
+            collected_block_structure (BlockStructureBlockData) - A
+                previously collected block structure, starting at
+                root_block_usage_key, with the same relations between
+                blocks as in the modulestore.
+
+            changed_usage_keys (set(UsageKey)) - The usage keys of the
+                blocks that changed.  Keys that are not in
+                collected_block_structure are ignored.
+
+        Returns:
+            BlockStructureModulestoreData - The created block structure
+                with instantiated xBlocks for the blocks to re-collect,
+                and the relations between them.
+        """
+        usage_keys = set()
+        blocks_to_visit = [key for key in changed_usage_keys if key in collected_block_structure]
+        while blocks_to_visit:
+            usage_key = blocks_to_visit.pop()
+            if usage_key not in usage_keys:
+                usage_keys.add(usage_key)
+                blocks_to_visit.extend(collected_block_structure.get_children(usage_key))
+
+        # Add the ancestors and their children, until all the parents of
+        # the included blocks are included.
+        blocks_to_visit = list(usage_keys) or [root_block_usage_key]
+        usage_keys.add(root_block_usage_key)
+        while blocks_to_visit:
+            for parent_key in collected_block_structure.get_parents(blocks_to_visit.pop()):
+                if parent_key not in usage_keys:
+                    usage_keys.add(parent_key)
+                    blocks_to_visit.append(parent_key)
+                for child_key in collected_block_structure.get_children(parent_key):
+                    if child_key not in usage_keys:
+                        usage_keys.add(child_key)
+                        blocks_to_visit.append(child_key)
+
+        block_structure = BlockStructureModulestoreData(root_block_usage_key)
+        for usage_key in usage_keys:
+            block_structure._add_xblock(usage_key, modulestore.get_item(usage_key))  # pylint: disable=protected-access
+            for child_key in collected_block_structure.get_children(usage_key):
+                if child_key in usage_keys:
+                    block_structure._add_relation(usage_key, child_key)  # pylint: disable=protected-access
+        return block_structure
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
@@ -86,10 +151,22 @@ class BlockStructureFactory:
         return block_structure_store.get(root_block_usage_key)
 
     @classmethod
-    def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map):
+    def create_new(cls, root_block_usage_key, block_relations, transformer_data, block_data_map, compact=False):
         """
         Returns a new block structure for given the arguments.
+
+        If compact is True, the returned block structure is a
+        CompactBlockStructureBlockData, which stores the given relations
+        and data in flat arrays indexed by integer block ids.
         """
+        if compact:
+            return CompactBlockStructureBlockData.create_new(
+                root_block_usage_key,
+                block_relations,
+                transformer_data,
+                block_data_map,
+            )
+
         block_structure = BlockStructureBlockData(root_block_usage_key)
         block_structure._block_relations = block_relations  # pylint: disable=protected-access
         block_structure.transformer_data = transformer_data
@@ -0,0 +1,152 @@
+"""
+Command to benchmark the serialization formats of collected block structures.
+"""
+
+
+import logging
+import timeit
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureModulestoreData
+from openedx.core.djangoapps.content.block_structure.serialization import (
+    MSGPACK_FORMAT,
+    PICKLE_FORMAT,
+    deserialize,
+    serialize
+)
+
+log = logging.getLogger(__name__)
+
+# Number of children of each block at each level of a synthetic course.
+CHAPTER_FAN_OUT = 10
+SEQUENTIAL_FAN_OUT = 5
+VERTICAL_FAN_OUT = 4
+
+
+def create_synthetic_block_structure(num_blocks):
+    """
+    Returns a collected block structure of a synthetic course with
+    approximately num_blocks blocks, with xBlock and transformer data
+    similar to that collected for real courses.
+    """
+    course_key = CourseLocator('edX', 'Benchmark', f'Blocks_{num_blocks}')
+    root_key = course_key.make_usage_key('course', 'course')
+    block_structure = BlockStructureModulestoreData(root_key)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    num_added = 1
+
+    def add_block(parent_key, block_type, index):
+        """
+        Adds a child block of the given type to the given parent, with
+        collected data.
+        """
+        block_key = course_key.make_usage_key(block_type, f'{block_type}_{index}')
+        block_structure._add_relation(parent_key, block_key)  # pylint: disable=protected-access
+        block_structure.override_xblock_field(block_key, 'display_name', f'{block_type.title()} {index}')
+        block_structure.override_xblock_field(block_key, 'start', start)
+        block_structure.override_xblock_field(block_key, 'visible_to_staff_only', False)
+        block_structure.override_xblock_field(block_key, 'graded', block_type == 'problem')
+        block_structure.override_xblock_field(block_key, 'group_access', {})
+        block_structure.set_transformer_block_field(block_key, 'start_date', 'merged_start_date', start)
+        block_structure.set_transformer_block_field(block_key, 'visibility', 'merged_visible_to_staff_only', False)
+        if block_type == 'problem':
+            block_structure.set_transformer_block_field(block_key, 'grades', 'max_score', 1.0)
+            block_structure.set_transformer_block_field(block_key, 'grades', 'explicit_graded', None)
+        return block_key
+
+    block_structure.override_xblock_field(root_key, 'display_name', 'Benchmark course')
+    block_structure.override_xblock_field(root_key, 'start', start)
+    for chapter_index in range(CHAPTER_FAN_OUT):
+        chapter_key = add_block(root_key, 'chapter', chapter_index)
+        num_added += 1
+        for sequential_index in range(SEQUENTIAL_FAN_OUT):
+            sequential_key = add_block(chapter_key, 'sequential', f'{chapter_index}_{sequential_index}')
+            num_added += 1
+            for vertical_index in range(VERTICAL_FAN_OUT):
+                vertical_id = f'{chapter_index}_{sequential_index}_{vertical_index}'
+                vertical_key = add_block(sequential_key, 'vertical', vertical_id)
+                num_added += 1
+                num_leaves = max(1, (num_blocks - num_added) // _remaining_verticals(
+                    chapter_index, sequential_index, vertical_index,
+                ))
+                for leaf_index in range(num_leaves):
+                    add_block(vertical_key, ('problem', 'html', 'video')[leaf_index % 3], f'{vertical_id}_{leaf_index}')
+                    num_added += 1
+
+    for transformer_name in ('start_date', 'visibility', 'grades'):
+        block_structure.set_transformer_data(transformer_name, '_version', 1)
+    return block_structure
+
+
+def _remaining_verticals(chapter_index, sequential_index, vertical_index):
+    """
+    Returns the number of verticals, including the given one, that have
+    not yet been populated with leaf blocks.
+    """
+    total = CHAPTER_FAN_OUT * SEQUENTIAL_FAN_OUT * VERTICAL_FAN_OUT
+    done = (chapter_index * SEQUENTIAL_FAN_OUT + sequential_index) * VERTICAL_FAN_OUT + vertical_index
+    return total - done
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 1000 10000 50000 --settings=devstack
+    """
+    help = (
+        'Compares the size, serialization time and load time of the block structure '
+        'serialization formats on synthetic courses.'
+    )
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--num_blocks',
+            dest='num_blocks',
+            nargs='+',
+            type=int,
+            default=[1000, 10000],
+            help='Approximate number of blocks of each synthetic course.',
+        )
+        parser.add_argument(
+            '--iterations',
+            dest='iterations',
+            type=int,
+            default=10,
+            help='Number of times to repeat each measurement.',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        self.stdout.write(
+            f"{'blocks':>8} {'format':>8} {'size (KB)':>10} {'dump (ms)':>10} {'load (ms)':>10} "
+            f"{'compact load (ms)':>18}"
+        )
+        for num_blocks in options['num_blocks']:
+            block_structure = create_synthetic_block_structure(num_blocks)
+            root_key = block_structure.root_block_usage_key
+            for serialization_format in (PICKLE_FORMAT, MSGPACK_FORMAT):
+                serialized_data = serialize(block_structure, serialization_format)
+                dump_time = _best_time(lambda: serialize(block_structure, serialization_format), iterations)  # pylint: disable=cell-var-from-loop
+                load_time = _best_time(lambda: deserialize(serialized_data, root_key), iterations)  # pylint: disable=cell-var-from-loop
+                compact_load_time = _best_time(
+                    lambda: deserialize(serialized_data, root_key, compact=True), iterations,  # pylint: disable=cell-var-from-loop
+                )
+                self.stdout.write(
+                    f'{len(block_structure):>8} {serialization_format:>8} {len(serialized_data) / 1024:>10.1f} '
+                    f'{dump_time * 1000:>10.1f} {load_time * 1000:>10.1f} {compact_load_time * 1000:>18.1f}'
+                )
+
+
+def _best_time(func, iterations):
+    """
+    Returns the shortest time, in seconds, of the given number of calls
+    to func.
+    """
+    return min(timeit.repeat(func, number=1, repeat=iterations))
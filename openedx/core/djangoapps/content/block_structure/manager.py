@@ -5,14 +5,20 @@ BlockStructures.
 
 
 from contextlib import contextmanager
+from logging import getLogger
+
+from edx_django_utils import monitoring
 
 from xmodule.modulestore import ModuleStoreEnum
 
+from . import config
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
+logger = getLogger(__name__)  # pylint: disable=C0103
+
 
 class BlockStructureManager:
     """
@@ -123,10 +129,14 @@ class BlockStructureManager:
         """
         The store is updated with newly collected transformers data from
         the modulestore, only if the data in the store is outdated.
+
+        When possible, only the data of the blocks that changed since the
+        data in the store was collected is re-collected.
         """
         with self._bulk_operations():
             if not self.store.is_up_to_date(self.root_block_usage_key, self.modulestore):
-                self._update_collected()
+                if self._update_collected_incrementally() is None:
+                    self._update_collected()
 
     def _update_collected(self):
         """
@@ -148,6 +158,77 @@ class BlockStructureManager:
             self.store.add(block_structure)
             return block_structure
 
+    def _update_collected_incrementally(self):
+        """
+        The store is updated with transformers data newly collected from
+        the modulestore for only the blocks that changed since the data in
+        the store was collected, along with their descendants and ancestors.
+
+        Returns the updated block structure, or None if the data in the
+        store can't be updated incrementally and a full collect is needed.
+        """
+        if not config.INCREMENTAL_COLLECT.is_enabled():
+            return None
+        if not BlockStructureTransformers.supports_incremental_collect():
+            return None
+
+        from_version = self.store.get_collected_data_version(self.root_block_usage_key)
+        get_changed_blocks = getattr(self.modulestore, 'get_changed_blocks', None)
+        if from_version is None or get_changed_blocks is None:
+            return None
+
+        course_key = self.root_block_usage_key.course_key
+        with self._bulk_operations():
+            # Always uses published-only branch regardless of CMS or LMS context.
+            with self.modulestore.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+                root_block = self.modulestore.get_item(self.root_block_usage_key)
+                changed_usage_keys = get_changed_blocks(
+                    course_key, from_version, getattr(root_block, 'course_version', None),
+                )
+
+                # A change to the root block affects all of its descendants,
+                # so it's no cheaper than a full collect.
+                if changed_usage_keys is None or self.root_block_usage_key in changed_usage_keys:
+                    return None
+
+                try:
+                    # The collected data is merged into, and stored from, a
+                    # block structure with the full (non-compact) representation.
+                    block_structure = self.store.get(self.root_block_usage_key, compact=False)
+                except BlockStructureNotFound:
+                    return None
+
+                partial_block_structure = BlockStructureFactory.create_partial_from_modulestore(
+                    self.root_block_usage_key,
+                    self.modulestore,
+                    block_structure,
+                    changed_usage_keys,
+                )
+
+            BlockStructureTransformers.collect(partial_block_structure)
+            block_structure._replace_collected_data(partial_block_structure)  # pylint: disable=protected-access
+            self.store.add(block_structure)
+
+        # .. custom_attribute_name: block_structure_incremental_collect_num_blocks
+        # .. custom_attribute_description: The number of blocks re-collected by an incremental
+        #   update of a course's block structure.
+        monitoring.set_custom_attribute('block_structure_incremental_collect_num_blocks', len(partial_block_structure))
+        logger.info(
+            "BlockStructure: Incrementally collected %d of %d blocks; %s.",
+            len(partial_block_structure),
+            len(block_structure),
+            self.root_block_usage_key,
+        )
+        return block_structure
+
+    def get_collected_data_version(self):
+        """
+        Returns the version of the modulestore data from which the block
+        structure in the store was collected, or None if there is no
+        usable block structure in the store.
+        """
+        return self.store.get_collected_data_version(self.root_block_usage_key)
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,226 @@
+"""
+Module for the in-process cache of collected BlockStructures.
+
+The process cache is an optional, size-bounded LRU tier in front of the
+django cache used by BlockStructureStore. It keeps deserialized collected
+block structures in the memory of the current process, so repeated
+requests for the same version of a course skip both the round trip to the
+django cache and the deserialization of its data.
+
+Entries are keyed by the root block's usage key and the version data of
+the stored block structure, so an outdated entry is not returned once a
+newer version is stored, even by another process. Checking the version
+costs a query of the stored block structure, which is skipped for the
+entries whose version was checked within the last
+BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_VERSION_CHECK_SECONDS'], at the
+cost of returning an outdated entry for as long. Entries of a course are
+also evicted eagerly when the course is published or deleted in this
+process, which only happens in Studio.
+
+The cache is configured with BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_MAX_ENTRIES']
+and BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_MAX_SIZE_IN_MBS'], and is
+disabled by default.
+"""
+
+
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+from time import time
+
+from django.conf import settings
+from edx_django_utils import monitoring
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+class BlockStructureProcessCache:
+    """
+    A thread-safe LRU cache of collected block structures, bounded by the
+    number of entries and by the total serialized size of the entries.
+    """
+    def __init__(self, max_entries, max_size_in_bytes=None):
+        """
+        Arguments:
+            max_entries (int) - The maximum number of block structures
+                to keep.
+
+            max_size_in_bytes (int) - The maximum total serialized size,
+                in bytes, of the block structures to keep. No limit if None.
+        """
+        self.max_entries = max_entries
+        self.max_size_in_bytes = max_size_in_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Map of root_block_usage_key to the version_key, block_structure and
+        # size_in_bytes of its cached version, and the time its version was
+        # last checked, in LRU order.
+        # OrderedDict {UsageKey: (string, BlockStructureBlockData, int, float)}
+        self._entries = OrderedDict()
+        self._size_in_bytes = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, root_block_usage_key, version_key):
+        """
+        Returns the cached block structure for the given root and version,
+        or None if not found.
+
+        The returned block structure is shared and must not be mutated.
+        """
+        with self._lock:
+            entry = self._entries.get(root_block_usage_key)
+            if entry is not None and entry[0] == version_key:
+                entry = self._entries[root_block_usage_key] = (*entry[:3], time())
+                self._entries.move_to_end(root_block_usage_key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+        self._accumulate_hit_or_miss(entry)
+        return entry[1] if entry else None
+
+    def get_recently_checked(self, root_block_usage_key, max_age):
+        """
+        Returns the version key and the cached block structure for the given
+        root, whatever its version, if its version was checked by a call to
+        get or set within the last max_age seconds, or None.
+
+        The returned block structure is shared and must not be mutated.
+        """
+        with self._lock:
+            entry = self._entries.get(root_block_usage_key)
+            if entry is None or entry[3] + max_age < time():
+                return None
+            self._entries.move_to_end(root_block_usage_key)
+            self.hits += 1
+        self._accumulate_hit_or_miss(entry)
+        return entry[:2]
+
+    @staticmethod
+    def _accumulate_hit_or_miss(entry):
+        """
+        Accumulates the hit or miss of a lookup of the given entry in the
+        metrics of the request.
+        """
+        # .. custom_attribute_name: block_structure_process_cache_hits
+        # .. custom_attribute_description: The number of block structures found in the
+        #   in-process block structure cache during the request.
+        # .. custom_attribute_name: block_structure_process_cache_misses
+        # .. custom_attribute_description: The number of block structures not found in the
+        #   in-process block structure cache during the request.
+        monitoring.accumulate(
+            'block_structure_process_cache_hits' if entry else 'block_structure_process_cache_misses', 1,
+        )
+
+    def set(self, root_block_usage_key, version_key, block_structure, size_in_bytes):
+        """
+        Caches the given block structure for the given root and version,
+        replacing any other version of the same root, and evicting the
+        least recently used entries as needed.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage key of the root
+                of the block structure.
+
+            version_key (string) - A key that identifies the version of
+                the block structure.
+
+            block_structure (BlockStructureBlockData) - The collected block
+                structure, which must not be mutated after it's cached.
+
+            size_in_bytes (int) - The serialized size of the block structure.
+        """
+        if self.max_size_in_bytes is not None and size_in_bytes > self.max_size_in_bytes:
+            return
+
+        with self._lock:
+            self._remove(lambda key: key == root_block_usage_key)
+            self._entries[root_block_usage_key] = (version_key, block_structure, size_in_bytes, time())
+            self._size_in_bytes += size_in_bytes
+
+            num_evicted = 0
+            while len(self._entries) > self.max_entries or (
+                self.max_size_in_bytes is not None and self._size_in_bytes > self.max_size_in_bytes
+            ):
+                _, (_, _, evicted_size, _) = self._entries.popitem(last=False)
+                self._size_in_bytes -= evicted_size
+                num_evicted += 1
+            self.evictions += num_evicted
+
+        if num_evicted:
+            # .. custom_attribute_name: block_structure_process_cache_evictions
+            # .. custom_attribute_description: The number of block structures evicted from the
+            #   in-process block structure cache, to stay within its size limits, during the request.
+            monitoring.accumulate('block_structure_process_cache_evictions', num_evicted)
+
+    def invalidate(self, root_block_usage_key):
+        """
+        Removes all cached versions of the block structure with the given root.
+        """
+        with self._lock:
+            self._remove(lambda key: key == root_block_usage_key)
+
+    def invalidate_course(self, course_key):
+        """
+        Removes all cached block structures of the given course.
+        """
+        with self._lock:
+            self._remove(lambda key: getattr(key, 'course_key', None) == course_key)
+
+    def clear(self):
+        """
+        Removes all cached block structures and resets the metrics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def _remove(self, key_filter):
+        """
+        Removes the entries whose keys match the given filter. Must be
+        called with the lock held.
+        """
+        for key in [key for key in self._entries if key_filter(key)]:
+            _, _, size_in_bytes, _ = self._entries.pop(key)
+            self._size_in_bytes -= size_in_bytes
+
+
+_process_cache = None
+
+
+def get_process_cache():
+    """
+    Returns the process cache as configured in BLOCK_STRUCTURES_SETTINGS,
+    or None if it's disabled.
+    """
+    global _process_cache  # pylint: disable=global-statement
+
+    max_entries = settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_MAX_ENTRIES', 0)
+    max_size_in_mbs = settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_MAX_SIZE_IN_MBS')
+    if not max_entries:
+        return None
+
+    max_size_in_bytes = max_size_in_mbs * 1024 * 1024 if max_size_in_mbs is not None else None
+    if (
+        _process_cache is None or
+        _process_cache.max_entries != max_entries or
+        _process_cache.max_size_in_bytes != max_size_in_bytes
+    ):
+        _process_cache = BlockStructureProcessCache(max_entries, max_size_in_bytes)
+    return _process_cache
+
+
+def invalidate_course(course_key):
+    """
+    Removes all block structures of the given course from the process
+    cache, if enabled.
+    """
+    process_cache = get_process_cache()
+    if process_cache is not None:
+        process_cache.invalidate_course(course_key)
@@ -0,0 +1,314 @@
+"""
+Module for the serialization formats of collected BlockStructures.
+
+Two formats are supported:
+
+  * pickle (legacy) - A zlib compressed pickle of the structure's
+    block relations, transformer data and block data map. Every block
+    is pickled as a set of small objects, including its full usage key.
+
+  * msgpack - A versioned binary format, prefixed with MSGPACK_MAGIC and
+    a version byte, followed by a zlib compressed msgpack document.
+    Usage keys are stored once, in an interned key table, and all
+    relations and data refer to blocks by their index in that table.
+    Block and transformer data are stored per field (columnar) rather
+    than per block. Values that msgpack cannot represent natively
+    (datetimes, usage keys, sets, tuples, ...) are embedded as pickles.
+    The block data of each transformer is stored as a separate segment,
+    which is only decoded when the transformer's data is first accessed.
+
+The format of stored data is detected when reading, so data written in
+either format can be read regardless of the configured format.
+"""
+
+
+import pickle
+import zlib
+
+import msgpack
+from django.conf import settings
+
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+from .block_structure import (
+    BlockData,
+    TransformerBlockDataSegments,
+    TransformerData,
+    TransformerDataMap,
+    _BlockRelations,
+    _LazyTransformerDataMap
+)
+from .compact import CompactBlockStructureBlockData
+from .factory import BlockStructureFactory
+
+PICKLE_FORMAT = 'pickle'
+MSGPACK_FORMAT = 'msgpack'
+
+# Prefix of data serialized in the msgpack format. The first byte can
+# never start a zlib stream, so the formats cannot be confused.
+MSGPACK_MAGIC = b'BSMP'
+
+# The latest version of the msgpack format. Increment this value whenever
+# the layout of the document changes, and keep reading older versions
+# until they have expired from the cache and storage.
+#   1 - Initial version.
+#   2 - Block data of each transformer is stored as a separate segment.
+MSGPACK_VERSION = 2
+SUPPORTED_MSGPACK_VERSIONS = (1, 2)
+
+# msgpack extension type code for values embedded as pickles.
+_PICKLE_EXT_TYPE = 1
+
+
+def get_serialization_format():
+    """
+    Returns the configured format for serializing block structures.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('SERIALIZATION_FORMAT', PICKLE_FORMAT)
+
+
+def serialize(block_structure, serialization_format=None):
+    """
+    Serializes the data of the given block_structure in the given format,
+    or the configured format if None.
+    """
+    serialization_format = serialization_format or get_serialization_format()
+    if serialization_format == MSGPACK_FORMAT:
+        return _serialize_msgpack(block_structure)
+    elif serialization_format == PICKLE_FORMAT:
+        return zpickle((
+            block_structure._block_relations,  # pylint: disable=protected-access
+            block_structure.transformer_data,
+            block_structure._block_data_map,  # pylint: disable=protected-access
+        ))
+    raise ValueError(f'Unknown block structure serialization format: {serialization_format}')
+
+
+def deserialize(serialized_data, root_block_usage_key, compact=False):
+    """
+    Deserializes the given data, in any supported format, and returns the
+    parsed block structure.
+
+    Arguments:
+        serialized_data (bytes) - The data returned by serialize.
+
+        root_block_usage_key (UsageKey) - The usage key of the root block
+            of the serialized structure.
+
+        compact (bool) - Whether to return a CompactBlockStructureBlockData.
+    """
+    if serialized_data[:len(MSGPACK_MAGIC)] == MSGPACK_MAGIC:
+        return _deserialize_msgpack(serialized_data, root_block_usage_key, compact)
+
+    block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        block_data_map,
+        compact=compact,
+    )
+
+
+def _serialize_msgpack(block_structure):
+    """
+    Serializes the given block structure in the msgpack format.
+
+    The document is a list of:
+        course_key - The course key shared by all interned block keys.
+        keys - The interned key table. Each entry is a (block_type,
+            block_id) pair for keys within course_key, or the key itself.
+        num_blocks - The number of blocks in the structure; the first
+            num_blocks entries of the key table.
+        children - The child indices of each block in the structure.
+        transformer_data - Map of a transformer's name to the fields of
+            its non-block-specific data.
+        block_data_ids - The indices of the blocks with collected data.
+        xblock_fields - Map of an xBlock field name to the indices of
+            blocks with a value for it, and their values.
+        transformer_block_fields - Map of a transformer's name to its
+            segment: a separately packed msgpack document of the indices
+            of blocks with data for it, and its fields in the same form as
+            xblock_fields.
+    """
+    # pylint: disable=protected-access
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+    course_key = getattr(block_structure.root_block_usage_key, 'course_key', None)
+
+    usage_keys = list(block_relations)
+    key_indices = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+    for usage_key in block_data_map:
+        if usage_key not in key_indices:
+            key_indices[usage_key] = len(usage_keys)
+            usage_keys.append(usage_key)
+
+    block_data_ids = []
+    xblock_fields = {}
+    transformer_block_fields = {}
+    for usage_key, block_data in block_data_map.items():
+        index = key_indices[usage_key]
+        block_data_ids.append(index)
+        _add_sparse_fields(xblock_fields, index, block_data.fields)
+        for transformer_name, transformer_block_data in block_data.transformer_data.items():
+            block_ids, fields = transformer_block_fields.setdefault(transformer_name, [[], {}])
+            block_ids.append(index)
+            _add_sparse_fields(fields, index, transformer_block_data.fields)
+
+    document = [
+        course_key,
+        [_encode_usage_key(usage_key, course_key) for usage_key in usage_keys],
+        len(block_relations),
+        [[key_indices[child] for child in relations.children] for relations in block_relations.values()],
+        {
+            transformer_name: transformer_data.fields
+            for transformer_name, transformer_data in block_structure.transformer_data.items()
+        },
+        block_data_ids,
+        xblock_fields,
+        {
+            transformer_name: _pack(segment)
+            for transformer_name, segment in transformer_block_fields.items()
+        },
+    ]
+    return MSGPACK_MAGIC + bytes([MSGPACK_VERSION]) + zlib.compress(_pack(document))
+
+
+def _deserialize_msgpack(serialized_data, root_block_usage_key, compact):
+    """
+    Deserializes the given data in the msgpack format.
+    """
+    version = serialized_data[len(MSGPACK_MAGIC)]
+    if version not in SUPPORTED_MSGPACK_VERSIONS:
+        raise ValueError(f'Unsupported block structure serialization version: {version}')
+
+    (
+        course_key,
+        encoded_keys,
+        num_blocks,
+        children,
+        encoded_transformer_data,
+        block_data_ids,
+        xblock_fields,
+        transformer_block_fields,
+    ) = _unpack(zlib.decompress(serialized_data[len(MSGPACK_MAGIC) + 1:]))
+    usage_keys = [_decode_usage_key(encoded_key, course_key) for encoded_key in encoded_keys]
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, fields in encoded_transformer_data.items():
+        transformer_data[transformer_name] = _new_field_data(TransformerData(), fields)
+
+    # Version 1 documents contain already decoded segments.
+    transformer_block_segments = TransformerBlockDataSegments(
+        transformer_block_fields,
+        _unpack if version >= 2 else lambda segment: segment,
+    )
+
+    if compact:
+        return CompactBlockStructureBlockData.create_from_columns(
+            root_block_usage_key,
+            usage_keys,
+            num_blocks,
+            children,
+            transformer_data,
+            block_data_ids,
+            xblock_fields,
+            {},
+            transformer_block_segments,
+        )
+
+    block_relations = {usage_keys[index]: _BlockRelations() for index in range(num_blocks)}
+    for index, child_indices in enumerate(children):
+        relations = block_relations[usage_keys[index]]
+        for child_index in child_indices:
+            relations.children.append(usage_keys[child_index])
+            block_relations[usage_keys[child_index]].parents.append(usage_keys[index])
+
+    block_data_list = [None] * len(usage_keys)
+    for index in block_data_ids:
+        block_data = BlockData(usage_keys[index])
+        block_data.transformer_data = _LazyTransformerDataMap(transformer_block_segments, index)
+        block_data_list[index] = block_data
+    for field_name, (indices, values) in xblock_fields.items():
+        for index, value in zip(indices, values):
+            block_data_list[index].fields[field_name] = value
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        {usage_keys[index]: block_data_list[index] for index in block_data_ids},
+    )
+
+
+def _add_sparse_fields(sparse_fields, index, fields):
+    """
+    Adds the given fields of the block with the given index to the
+    given map of field name to (indices, values).
+    """
+    for field_name, value in fields.items():
+        indices, values = sparse_fields.setdefault(field_name, [[], []])
+        indices.append(index)
+        values.append(value)
+
+
+def _new_field_data(field_data, fields):
+    """
+    Sets the given fields on the given FieldData and returns it.
+    """
+    field_data.fields.update(fields)
+    return field_data
+
+
+def _encode_usage_key(usage_key, course_key):
+    """
+    Returns the key table entry for the given usage key.
+    """
+    if course_key is not None and getattr(usage_key, 'course_key', None) == course_key:
+        return [usage_key.block_type, usage_key.block_id]
+    return usage_key
+
+
+def _decode_usage_key(encoded_key, course_key):
+    """
+    Returns the usage key for the given key table entry.
+    """
+    if isinstance(encoded_key, list):
+        return course_key.make_usage_key(*encoded_key)
+    return encoded_key
+
+
+def _pack(data):
+    """
+    Returns the given data packed with msgpack.
+    """
+    return msgpack.packb(data, use_bin_type=True, strict_types=True, default=_pack_default)
+
+
+def _unpack(packed_data):
+    """
+    Returns the data unpacked from the given msgpack data.
+    """
+    return msgpack.unpackb(
+        packed_data,
+        raw=False,
+        strict_map_key=False,
+        use_list=True,
+        ext_hook=_unpack_ext_hook,
+    )
+
+
+def _pack_default(value):
+    """
+    Embeds values that msgpack cannot represent natively as pickles.
+    """
+    return msgpack.ExtType(_PICKLE_EXT_TYPE, pickle.dumps(value, 4))
+
+
+def _unpack_ext_hook(code, data):
+    """
+    Loads values embedded by _pack_default.
+    """
+    if code == _PICKLE_EXT_TYPE:
+        return pickle.loads(data, encoding='latin1')
+    return msgpack.ExtType(code, data)
@@ -6,14 +6,13 @@ Module for the Storage of BlockStructure objects.
 
 from logging import getLogger
 
+from django.conf import settings
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
-
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
-from .factory import BlockStructureFactory
 from .models import BlockStructureModel
+from .process_cache import get_process_cache
 from .transformer_registry import TransformerRegistry
 
 from edx_django_utils import monitoring
@@ -51,8 +50,9 @@ class BlockStructureStore:
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
+        self._invalidate_process_cache(block_structure.root_block_usage_key)
 
-    def get(self, root_block_usage_key):
+    def get(self, root_block_usage_key, compact=None):
         """
         Deserializes and returns the block structure starting at
         root_block_usage_key, if found in the cache or storage.
@@ -65,6 +65,10 @@ class BlockStructureStore:
                 root of the block structure that is to be retrieved
                 from the store.
 
+            compact (bool) - Whether to return a
+                CompactBlockStructureBlockData.  If None, the
+                COMPACT_REPRESENTATION switch is used.
+
         Returns:
             BlockStructure - The deserialized block structure starting
             at root_block_usage_key, if found.
@@ -73,7 +77,26 @@ class BlockStructureStore:
             BlockStructureNotFound if the root_block_usage_key is not
             found.
         """
+        if compact is None:
+            compact = config.COMPACT_REPRESENTATION.is_enabled()
+
+        process_cache = get_process_cache()
+        version_check_seconds = settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_VERSION_CHECK_SECONDS', 0)
+        if process_cache is not None and version_check_seconds:
+            # The query of the model is skipped if the cached version was checked recently.
+            recently_checked = process_cache.get_recently_checked(root_block_usage_key, version_check_seconds)
+            if recently_checked is not None:
+                (_, cached_compact), block_structure = recently_checked
+                if cached_compact == compact:
+                    return block_structure.copy()
+
         bs_model = self._get_model(root_block_usage_key)
+        if process_cache is not None:
+            block_structure = process_cache.get(
+                root_block_usage_key, self._encode_process_cache_key(bs_model, compact),
+            )
+            if block_structure is not None:
+                return block_structure.copy()
 
         try:
             serialized_data = self._get_from_cache(bs_model)
@@ -81,7 +104,16 @@ class BlockStructureStore:
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        block_structure = self._deserialize(serialized_data, root_block_usage_key, compact)
+        if process_cache is not None:
+            # Callers may mutate the returned structure, so cache a copy.
+            process_cache.set(
+                root_block_usage_key,
+                self._encode_process_cache_key(bs_model, compact),
+                block_structure.copy(),
+                len(serialized_data),
+            )
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -94,6 +126,7 @@ class BlockStructureStore:
         """
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
+        self._invalidate_process_cache(root_block_usage_key)
         bs_model.delete()
         logger.info("BlockStructure: Deleted from cache and store; %s.", bs_model)
 
@@ -111,6 +144,27 @@ class BlockStructureStore:
 
         return False
 
+    def get_collected_data_version(self, root_block_usage_key):
+        """
+        Returns the version of the modulestore data from which the block
+        structure in storage for the given key was collected.
+
+        Returns None if the block structure is not in storage, or if it was
+        stored with a different schema of the Transformers or BlockStructure
+        classes, since its collected data can then not be reused.
+        """
+        try:
+            bs_model = self._get_model(root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+
+        version_data = self._version_data_of_model(bs_model)
+        current_version_data = self._version_data_of_block(None)
+        for field_name in ('transformers_schema_version', 'block_structure_schema_version'):
+            if version_data[field_name] != current_version_data[field_name]:
+                return None
+        return version_data['data_version']
+
     def _get_model(self, root_block_usage_key):
         """
         Returns the model associated with the given key.
@@ -174,34 +228,42 @@ class BlockStructureStore:
 
     def _serialize(self, block_structure):
         """
-        Serializes the data for the given block_structure.
+        Serializes the data for the given block_structure, in the
+        configured serialization format.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        return zpickle(data_to_cache)
+        return serialization.serialize(block_structure)
 
-    def _deserialize(self, serialized_data, root_block_usage_key):
+    def _deserialize(self, serialized_data, root_block_usage_key, compact):
         """
         Deserializes the given data and returns the parsed block_structure.
         """
 
         try:
-            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            return serialization.deserialize(serialized_data, root_block_usage_key, compact=compact)
         except Exception:
             # Somehow failed to de-serialized the data, assume it's corrupt.
             bs_model = self._get_model(root_block_usage_key)
             logger.exception("BlockStructure: Failed to load data from cache for %s", bs_model)
             raise BlockStructureNotFound(bs_model.data_usage_key)  # lint-amnesty, pylint: disable=raise-missing-from
 
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
+    @staticmethod
+    def _invalidate_process_cache(root_block_usage_key):
+        """
+        Removes the block structure for the given root from the process
+        cache, if enabled.
+        """
+        process_cache = get_process_cache()
+        if process_cache is not None:
+            process_cache.invalidate(root_block_usage_key)
+
+    @staticmethod
+    def _encode_process_cache_key(bs_model, compact):
+        """
+        Returns the version key to use in the process cache for the
+        given BlockStructureModel and representation of the
+        deserialized structure, as a (version, compact) tuple.
+        """
+        return str(bs_model), compact
 
     @staticmethod
     def _encode_root_cache_key(bs_model):
@@ -9,13 +9,15 @@ from collections import namedtuple
 from copy import deepcopy
 from datetime import datetime
 from unittest import TestCase
+from unittest.mock import patch
 
 import ddt
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockStructure, BlockStructureModulestoreData, RemovalMaskFilter
 from ..exceptions import TransformerException
+from ..transformer import combine_filters
 from .helpers import ChildrenMapTestMixin, MockTransformer, MockXBlock
 
 
@@ -248,6 +250,63 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         block_structure.remove_block_traversal(lambda block: block == 2)
         self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
 
+    def test_field_values(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+        block_structure.override_xblock_field(1, 'field1', 'B.val1')
+        block_structure.set_transformer_block_field(2, MockTransformer, 't1.key1', 't1.c.val1')
+        block_structure.remove_block(3, keep_descendants=False)
+
+        assert block_structure.get_xblock_field_values('field1', 'default') == {0: 'default', 1: 'B.val1', 2: 'default'}
+        assert block_structure.get_transformer_block_field_values(MockTransformer, 't1.key1') == {
+            0: None, 1: None, 2: 't1.c.val1',
+        }
+        assert block_structure.get_transformer_block_field_values(MockTransformer, 'unknown', False) == {
+            0: False, 1: False, 2: False,
+        }
+
+    @ddt.data(
+        (False, [[2], [], [], [], []], [1, 3, 4]),
+        (True, [[2, 3, 4], [], [], [], []], [1]),
+    )
+    @ddt.unpack
+    def test_removal_mask_filter(self, keep_descendants, expected_children_map, missing_blocks):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        removal_filter = block_structure.create_removal_mask_filter({1}, keep_descendants)
+        block_structure.filter_topological_traversal(removal_filter)
+        block_structure._prune_unreachable()
+        self.assert_block_structure(block_structure, expected_children_map, missing_blocks)
+
+    def test_combined_removal_mask_filters(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.DAG_CHILDREN_MAP)
+        block_structure.filter_topological_traversal(combine_filters(block_structure, [
+            block_structure.create_removal_mask_filter({1, 3}, keep_descendants=True),
+            block_structure.create_removal_filter(lambda block_key: block_key == 4),
+            block_structure.create_removal_mask_filter({3, 6}),
+        ]))
+        block_structure._prune_unreachable()
+
+        # The first filter's keep_descendants value is used for block 3.
+        self.assert_block_structure(
+            block_structure, [[2, 5], [], [5], [], [], [], []], missing_blocks=[1, 3, 4, 6],
+        )
+
+    def test_combined_filters_order(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        with patch.object(RemovalMaskFilter, 'merge', autospec=True, side_effect=RemovalMaskFilter.merge) as mock_merge:
+            block_structure.filter_topological_traversal(combine_filters(block_structure, [
+                block_structure.create_removal_filter(lambda block_key: block_key == 1),
+                block_structure.create_removal_mask_filter({1}, keep_descendants=True),
+                block_structure.create_removal_mask_filter({2}, keep_descendants=True),
+                block_structure.create_removal_mask_filter({3}),
+            ]))
+        block_structure._prune_unreachable()
+
+        # The filters are applied in order, so block 1 is removed with its
+        # descendants, and only the adjacent filters with the same
+        # keep_descendants value are merged.
+        self.assert_block_structure(block_structure, [[], [], [], [], []], missing_blocks=[1, 2, 3, 4])
+        assert mock_merge.call_count == 1
+
     def test_copy(self):
         def _set_value(structure, value):
             """
@@ -0,0 +1,120 @@
+"""
+Tests for compact.py
+"""
+# pylint: disable=protected-access
+
+
+from unittest import TestCase
+
+import ddt
+
+from ..block_structure import BlockStructureBlockData
+from ..compact import CompactBlockStructureBlockData
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+from .test_block_structure import TestBlockStructureData
+
+
+class TestCompactBlockStructureData(TestBlockStructureData):
+    """
+    Runs the BlockStructureBlockData tests against CompactBlockStructureBlockData.
+    """
+    def create_block_structure(self, children_map, block_structure_cls=CompactBlockStructureBlockData):
+        return super().create_block_structure(children_map, block_structure_cls)
+
+
+@ddt.ddt
+class TestCompactBlockStructure(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the conversion and copying of CompactBlockStructureBlockData.
+    """
+    def _create_collected_structure(self, children_map):
+        """
+        Returns a BlockStructureBlockData for the given children_map, with
+        xBlock and transformer data set on each block.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_data(MockTransformer, 'global', 'global_value')
+        for block_id in range(len(children_map)):
+            block_key = self.block_key_factory(block_id)
+            block_structure.override_xblock_field(block_key, 'display_name', f'Block {block_id}')
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'index', block_id)
+        return block_structure
+
+    def assert_same_structure(self, block_structure, compact_structure):
+        """
+        Verifies that the given structures have the same blocks, relations
+        and data.
+        """
+        assert len(block_structure) == len(compact_structure)
+        # Pruning reorders the blocks of a BlockStructureBlockData, so
+        # only the traversals are expected to be in the same order.
+        assert set(block_structure.get_block_keys()) == set(compact_structure.get_block_keys())
+        assert list(block_structure.topological_traversal()) == list(compact_structure.topological_traversal())
+        assert list(block_structure.post_order_traversal()) == list(compact_structure.post_order_traversal())
+        for block_key in block_structure:
+            assert block_structure.get_children(block_key) == compact_structure.get_children(block_key)
+            assert block_structure.get_parents(block_key) == compact_structure.get_parents(block_key)
+            assert block_structure.get_xblock_field(block_key, 'display_name') ==\
+                compact_structure.get_xblock_field(block_key, 'display_name')
+            assert block_structure.get_transformer_block_field(block_key, MockTransformer, 'index') ==\
+                compact_structure.get_transformer_block_field(block_key, MockTransformer, 'index')
+        assert compact_structure.get_transformer_data(MockTransformer, 'global') == 'global_value'
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_from_block_structure(self, children_map):
+        block_structure = self._create_collected_structure(children_map)
+        compact_structure = CompactBlockStructureBlockData.from_block_structure(block_structure)
+        assert isinstance(compact_structure, BlockStructureBlockData)
+        self.assert_same_structure(block_structure, compact_structure)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_transform_matches_original(self, children_map):
+        block_structure = self._create_collected_structure(children_map)
+        compact_structure = CompactBlockStructureBlockData.from_block_structure(block_structure)
+
+        for structure in (block_structure, compact_structure):
+            structure.remove_block_traversal(lambda block_key: block_key == self.block_key_factory(1))
+            structure._prune_unreachable()
+
+        self.assert_same_structure(block_structure, compact_structure)
+
+    def test_block_data_view(self):
+        block_structure = self._create_collected_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        compact_structure = CompactBlockStructureBlockData.from_block_structure(block_structure)
+        block_key = self.block_key_factory(2)
+
+        block_data = compact_structure[block_key]
+        assert block_data.location == block_key
+        assert block_data.display_name == 'Block 2'
+        assert block_data.transformer_data[MockTransformer].index == 2
+        assert block_data.transformer_data[MockTransformer].fields == {'index': 2}
+        assert getattr(block_data, 'nonexistent', 'default') == 'default'
+
+        block_data.display_name = 'New name'
+        assert compact_structure.get_xblock_field(block_key, 'display_name') == 'New name'
+
+        compact_structure.remove_transformer_block_field(block_key, MockTransformer, 'index')
+        assert compact_structure.get_transformer_block_field(block_key, MockTransformer, 'index') is None
+
+    def test_copy_shares_interned_keys(self):
+        compact_structure = CompactBlockStructureBlockData.from_block_structure(
+            self._create_collected_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        )
+        new_copy = compact_structure.copy()
+        assert new_copy._usage_keys is compact_structure._usage_keys
+
+        # Adding a block to the copy must not affect the original.
+        new_block_key = self.block_key_factory(100)
+        new_copy._add_relation(self.block_key_factory(0), new_block_key)
+        assert new_copy._usage_keys is not compact_structure._usage_keys
+        assert new_block_key in new_copy
+        assert new_block_key not in compact_structure
+        assert new_block_key not in compact_structure.get_children(self.block_key_factory(0))
@@ -4,12 +4,15 @@ Tests for manager.py
 
 import pytest
 import ddt
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from django.test import TestCase
+from edx_toggles.toggles.testutils import override_waffle_switch
 
 from xmodule.modulestore import ModuleStoreEnum
 
 from ..block_structure import BlockStructureBlockData
+from ..compact import CompactBlockStructureBlockData
+from ..config import COMPACT_REPRESENTATION, INCREMENTAL_COLLECT
 from ..exceptions import UsageKeyNotInBlockStructure
 from ..manager import BlockStructureManager
 from ..transformers import BlockStructureTransformers
@@ -95,6 +98,35 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + str(block_key)
 
 
+class TestIncrementalTransformer(MockTransformer):
+    """
+    Test Transformer class that supports incremental collection, and
+    collects xBlock fields along with a value merged from the parents.
+    """
+    INCREMENTAL_COLLECT = True
+    collect_call_count = 0
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the display names of the blocks, and the concatenated
+        display names of their ancestors.
+        """
+        block_structure.request_xblock_fields('display_name', 'course_version')
+        for block_key in block_structure.topological_traversal():
+            path = ''.join(
+                block_structure.get_transformer_block_field(parent_key, cls, 'path')
+                for parent_key in block_structure.get_parents(block_key)
+            )
+            block_structure.set_transformer_block_field(
+                block_key, cls, 'path', path + block_structure.get_xblock(block_key).display_name,
+            )
+        cls.collect_call_count += 1
+
+    def transform(self, usage_info, block_structure):
+        pass
+
+
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
     """
@@ -253,3 +285,135 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
                 setattr(self.modulestore, attr_name, original_branch_setting)
             elif hasattr(self.modulestore, attr_name):
                 delattr(self.modulestore, attr_name)
+
+
+@ddt.ddt
+class TestIncrementalCollect(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Test class for the incremental collection of BlockStructureManager.
+    """
+    #       0
+    #      / \
+    #     1   2
+    #    / \   \
+    #   3   4   5
+    #            \
+    #             6
+    CHILDREN_MAP = [[1, 2], [3, 4], [5], [], [], [6], []]
+
+    def setUp(self):
+        super().setUp()
+        TestIncrementalTransformer.collect_call_count = 0
+        self.registered_transformers = [TestIncrementalTransformer()]
+        self.modulestore = MockModulestoreFactory.create(self.CHILDREN_MAP, self.block_key_factory)
+        self.modulestore.get_changed_blocks = MagicMock(return_value=set())
+        self.publish(version=1, display_names={block_id: str(block_id) for block_id in range(len(self.CHILDREN_MAP))})
+        self.bs_manager = BlockStructureManager(self.block_key_factory(0), self.modulestore, MockCache())
+
+    def publish(self, version, display_names, changed_blocks=()):
+        """
+        Updates the display names of the given blocks in the mock
+        modulestore, as a new version of the course.
+        """
+        for block_id, display_name in display_names.items():
+            self.modulestore.blocks[self.block_key_factory(block_id)].field_map['display_name'] = display_name
+        self.modulestore.blocks[self.block_key_factory(0)].field_map['course_version'] = version
+        self.modulestore.get_changed_blocks.return_value = None if changed_blocks is None else {
+            self.block_key_factory(block_id) for block_id in changed_blocks
+        }
+
+    def update_and_get_collected(self):
+        """
+        Updates the collected block structure, if needed, and returns it.
+        """
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.update_collected_if_needed()
+            return self.bs_manager.get_collected()
+
+    def assert_collected(self, block_structure, display_names):
+        """
+        Verifies the display names, and the merged paths, collected for each block.
+        """
+        self.assert_block_structure(block_structure, self.CHILDREN_MAP)
+        for block_id in range(len(self.CHILDREN_MAP)):
+            block_key = self.block_key_factory(block_id)
+            assert block_structure.get_xblock_field(block_key, 'display_name') == display_names[block_id]
+            path = ''.join(
+                display_names[ancestor_id] for ancestor_id in self.get_ancestor_ids(block_id)
+            ) + display_names[block_id]
+            assert block_structure.get_transformer_block_field(block_key, TestIncrementalTransformer, 'path') == path
+
+    def get_ancestor_ids(self, block_id):
+        """
+        Returns the ids of the ancestors of the given block, from the root.
+        """
+        parents_map = self.get_parents_map(self.CHILDREN_MAP)
+        ancestor_ids = []
+        while parents_map[block_id]:
+            block_id = parents_map[block_id][0]
+            ancestor_ids.insert(0, block_id)
+        return ancestor_ids
+
+    @ddt.data(False, True)
+    def test_update_collected_incrementally(self, compact):
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True):
+            with override_waffle_switch(COMPACT_REPRESENTATION, active=compact):
+                self.update_and_get_collected()
+                assert TestIncrementalTransformer.collect_call_count == 1
+
+                # Block 5 is not reported as changed, so it's not re-collected.
+                display_names = {0: '0', 1: 'a', 2: '2', 3: '3', 4: '4', 5: '5', 6: '6'}
+                self.publish(version=2, display_names={**display_names, 5: 'b'}, changed_blocks=[1])
+                with patch.object(self.modulestore, 'get_item', wraps=self.modulestore.get_item) as mock_get_item:
+                    block_structure = self.update_and_get_collected()
+
+        assert isinstance(block_structure, CompactBlockStructureBlockData) == compact
+        assert TestIncrementalTransformer.collect_call_count == 2
+        self.modulestore.get_changed_blocks.assert_called_once_with(self.course_key, '1', 2)
+        self.assert_collected(block_structure, display_names)
+        assert block_structure.get_xblock_field(self.block_key_factory(0), 'course_version') == 2
+
+        # Only the changed block, its descendants, and its ancestors and
+        # their children are loaded from the modulestore.
+        loaded_block_ids = {int(call.args[0].block_id) for call in mock_get_item.call_args_list}
+        assert loaded_block_ids == {0, 1, 2, 3, 4}
+
+    @ddt.data(
+        # switch disabled
+        (False, True, [5]),
+        # transformer doesn't support incremental collection
+        (True, False, [5]),
+        # the tree of the course changed
+        (True, True, None),
+        # the root block changed
+        (True, True, [0]),
+    )
+    @ddt.unpack
+    def test_full_collect(self, switch_active, incremental_transformer, changed_blocks):
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=switch_active):
+            with patch.object(TestIncrementalTransformer, 'INCREMENTAL_COLLECT', incremental_transformer):
+                self.update_and_get_collected()
+
+                # Block 3 is not reported as changed, so its change is only
+                # collected by a full collect.
+                display_names = {0: '0', 1: '1', 2: '2', 3: 'c', 4: '4', 5: '5', 6: '6'}
+                self.publish(version=2, display_names=display_names, changed_blocks=changed_blocks)
+                block_structure = self.update_and_get_collected()
+
+        assert TestIncrementalTransformer.collect_call_count == 2
+        self.assert_collected(block_structure, display_names)
+
+    def test_full_collect_with_full_collect_transformer(self):
+        self.registered_transformers.append(TestTransformer1())
+        with override_waffle_switch(INCREMENTAL_COLLECT, active=True):
+            self.update_and_get_collected()
+
+            # A transformer that doesn't support incremental collection makes
+            # a single full collect, which also collects the change of block 3.
+            display_names = {0: '0', 1: 'a', 2: '2', 3: 'c', 4: '4', 5: '5', 6: '6'}
+            self.publish(version=2, display_names=display_names, changed_blocks=[1])
+            block_structure = self.update_and_get_collected()
+
+        assert TestIncrementalTransformer.collect_call_count == 2
+        self.assert_collected(block_structure, display_names)
+        TestTransformer1.assert_collected(block_structure)
@@ -0,0 +1,95 @@
+"""
+Tests for process_cache.py
+"""
+
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from freezegun import freeze_time
+from opaque_keys.edx.locator import CourseLocator
+
+from ..process_cache import BlockStructureProcessCache
+
+
+@patch('openedx.core.djangoapps.content.block_structure.process_cache.monitoring.accumulate')
+class TestBlockStructureProcessCache(TestCase):
+    """
+    Tests for BlockStructureProcessCache
+    """
+    def setUp(self):
+        super().setUp()
+        self.course_key = CourseLocator('org', 'course', 'run')
+        self.root_keys = [
+            self.course_key.make_usage_key('course', 'course'),
+            self.course_key.make_usage_key('chapter', 'chapter'),
+            CourseLocator('org', 'other', 'run').make_usage_key('course', 'course'),
+        ]
+
+    def test_get_and_set(self, mock_accumulate):
+        process_cache = BlockStructureProcessCache(max_entries=2)
+        assert process_cache.get(self.root_keys[0], 'v1') is None
+        process_cache.set(self.root_keys[0], 'v1', 'structure_v1', 10)
+        assert process_cache.get(self.root_keys[0], 'v1') == 'structure_v1'
+        assert process_cache.get(self.root_keys[0], 'v2') is None
+        assert (process_cache.hits, process_cache.misses) == (1, 2)
+        mock_accumulate.assert_any_call('block_structure_process_cache_hits', 1)
+        mock_accumulate.assert_any_call('block_structure_process_cache_misses', 1)
+
+        # A new version replaces the previous one.
+        process_cache.set(self.root_keys[0], 'v2', 'structure_v2', 10)
+        assert len(process_cache) == 1
+        assert process_cache.get(self.root_keys[0], 'v2') == 'structure_v2'
+
+    def test_evict_by_entries(self, mock_accumulate):
+        process_cache = BlockStructureProcessCache(max_entries=2)
+        process_cache.set(self.root_keys[0], 'v1', 'structure_0', 10)
+        process_cache.set(self.root_keys[1], 'v1', 'structure_1', 10)
+
+        # Mark the first entry as the most recently used.
+        process_cache.get(self.root_keys[0], 'v1')
+        process_cache.set(self.root_keys[2], 'v1', 'structure_2', 10)
+
+        assert process_cache.get(self.root_keys[1], 'v1') is None
+        assert process_cache.get(self.root_keys[0], 'v1') == 'structure_0'
+        assert process_cache.evictions == 1
+        mock_accumulate.assert_any_call('block_structure_process_cache_evictions', 1)
+
+    def test_evict_by_size(self, _mock_accumulate):
+        process_cache = BlockStructureProcessCache(max_entries=10, max_size_in_bytes=25)
+        process_cache.set(self.root_keys[0], 'v1', 'structure_0', 10)
+        process_cache.set(self.root_keys[1], 'v1', 'structure_1', 10)
+        process_cache.set(self.root_keys[2], 'v1', 'structure_2', 10)
+        assert len(process_cache) == 2
+        assert process_cache.evictions == 1
+
+        # Structures larger than the cache are not cached.
+        process_cache.set(self.root_keys[0], 'v1', 'structure_0', 30)
+        assert process_cache.get(self.root_keys[0], 'v1') is None
+
+    def test_get_recently_checked(self, _mock_accumulate):
+        process_cache = BlockStructureProcessCache(max_entries=2)
+        assert process_cache.get_recently_checked(self.root_keys[0], 10) is None
+        with freeze_time('2020-01-01 00:00:00'):
+            process_cache.set(self.root_keys[0], 'v1', 'structure_v1', 10)
+        with freeze_time('2020-01-01 00:00:10'):
+            assert process_cache.get_recently_checked(self.root_keys[0], 10) == ('v1', 'structure_v1')
+        with freeze_time('2020-01-01 00:00:11'):
+            assert process_cache.get_recently_checked(self.root_keys[0], 10) is None
+            # Getting the structure by its version checks it again.
+            assert process_cache.get(self.root_keys[0], 'v1') == 'structure_v1'
+            assert process_cache.get_recently_checked(self.root_keys[0], 10) == ('v1', 'structure_v1')
+        assert (process_cache.hits, process_cache.misses) == (3, 0)
+
+    def test_invalidate(self, _mock_accumulate):
+        process_cache = BlockStructureProcessCache(max_entries=10)
+        for root_key in self.root_keys:
+            process_cache.set(root_key, 'v1', str(root_key), 10)
+
+        process_cache.invalidate(self.root_keys[1])
+        assert process_cache.get(self.root_keys[1], 'v1') is None
+        assert len(process_cache) == 2
+
+        process_cache.invalidate_course(self.course_key)
+        assert process_cache.get(self.root_keys[0], 'v1') is None
+        assert process_cache.get(self.root_keys[2], 'v1') == str(self.root_keys[2])
@@ -0,0 +1,136 @@
+"""
+Tests for serialization.py
+"""
+# pylint: disable=protected-access
+
+
+from datetime import datetime, timezone
+from unittest import TestCase
+
+import ddt
+import pytest
+from django.conf import settings
+from django.test.utils import override_settings
+
+from ..block_structure import TransformerDataMap
+from ..compact import CompactBlockStructureBlockData
+from ..management.commands.benchmark_block_structure_serialization import create_synthetic_block_structure
+from ..serialization import MSGPACK_FORMAT, MSGPACK_MAGIC, PICKLE_FORMAT, deserialize, serialize
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+@ddt.ddt
+class TestSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the block structure serialization formats.
+    """
+    def setUp(self):
+        super().setUp()
+        self.children_map = self.DAG_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.block_structure._add_transformer(MockTransformer)
+        self.block_structure.set_transformer_data(MockTransformer, 'global', {'a': (1, 2)})
+        self.start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        for block_id in range(len(self.children_map)):
+            block_key = self.block_key_factory(block_id)
+            self.block_structure.override_xblock_field(block_key, 'start', self.start)
+            self.block_structure.override_xblock_field(block_key, 'children', [block_key])
+            if block_id % 2:
+                self.block_structure.set_transformer_block_field(block_key, MockTransformer, 'odd', {block_id})
+
+    def assert_deserialized(self, deserialized):
+        """
+        Verifies that the given deserialized structure equals the
+        original structure.
+        """
+        root_key = self.block_key_factory(0)
+        assert deserialized.root_block_usage_key == root_key
+        self.assert_block_structure(deserialized, self.children_map)
+        assert list(deserialized.topological_traversal()) == list(self.block_structure.topological_traversal())
+        assert deserialized._get_transformer_data_version(MockTransformer) == MockTransformer.WRITE_VERSION
+        assert deserialized.get_transformer_data(MockTransformer, 'global') == {'a': (1, 2)}
+        for block_id in range(len(self.children_map)):
+            block_key = self.block_key_factory(block_id)
+            assert deserialized.get_xblock_field(block_key, 'start') == self.start
+            assert deserialized.get_xblock_field(block_key, 'children') == [block_key]
+            assert deserialized.get_transformer_block_field(block_key, MockTransformer, 'odd') ==\
+                ({block_id} if block_id % 2 else None)
+
+    @ddt.data(
+        *[
+            (serialization_format, compact)
+            for serialization_format in (PICKLE_FORMAT, MSGPACK_FORMAT)
+            for compact in (False, True)
+        ]
+    )
+    @ddt.unpack
+    def test_round_trip(self, serialization_format, compact):
+        serialized_data = serialize(self.block_structure, serialization_format)
+        deserialized = deserialize(serialized_data, self.block_key_factory(0), compact=compact)
+        assert isinstance(deserialized, CompactBlockStructureBlockData) == compact
+        self.assert_deserialized(deserialized)
+
+    @ddt.data(PICKLE_FORMAT, MSGPACK_FORMAT)
+    def test_configured_format(self, serialization_format):
+        with override_settings(BLOCK_STRUCTURES_SETTINGS=dict(
+            settings.BLOCK_STRUCTURES_SETTINGS, SERIALIZATION_FORMAT=serialization_format,
+        )):
+            serialized_data = serialize(self.block_structure)
+        assert serialized_data.startswith(MSGPACK_MAGIC) == (serialization_format == MSGPACK_FORMAT)
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            serialize(self.block_structure, 'unknown')
+
+    def test_unsupported_version(self):
+        serialized_data = serialize(self.block_structure, MSGPACK_FORMAT)
+        serialized_data = MSGPACK_MAGIC + b'\xff' + serialized_data[len(MSGPACK_MAGIC) + 1:]
+        with pytest.raises(ValueError):
+            deserialize(serialized_data, self.block_key_factory(0))
+
+    def test_synthetic_course(self):
+        block_structure = create_synthetic_block_structure(1000)
+        root_key = block_structure.root_block_usage_key
+        pickled = serialize(block_structure, PICKLE_FORMAT)
+        packed = serialize(block_structure, MSGPACK_FORMAT)
+        assert len(packed) < len(pickled)
+
+        deserialized = deserialize(packed, root_key)
+        assert list(deserialized.topological_traversal()) == list(block_structure.topological_traversal())
+        for block_key in block_structure:
+            assert deserialized[block_key].fields == block_structure[block_key].fields
+
+    @ddt.data(False, True)
+    def test_lazy_transformer_data(self, compact):
+        self.block_structure.set_transformer_block_field(self.block_key_factory(0), 'other', 'key', 'value')
+        serialized_data = serialize(self.block_structure, MSGPACK_FORMAT)
+        deserialized = deserialize(serialized_data, self.block_key_factory(0), compact=compact)
+        if compact:
+            segments = deserialized._transformer_block_segments
+        else:
+            segments = deserialized._block_data_map[self.block_key_factory(0)].transformer_data._segments
+        assert not segments._decoded_segments
+
+        # Copies share the segments, so each segment is decoded once.
+        new_copy = deserialized.copy()
+        assert new_copy.get_transformer_block_field(self.block_key_factory(1), MockTransformer, 'odd') == {1}
+        assert list(segments._decoded_segments) == [MockTransformer.name()]
+        assert deserialized.get_transformer_block_field(self.block_key_factory(3), MockTransformer, 'odd') == {3}
+        assert list(segments._decoded_segments) == [MockTransformer.name()]
+
+        assert deserialized.get_transformer_block_field(self.block_key_factory(0), 'other', 'key') == 'value'
+        assert set(segments._decoded_segments) == {MockTransformer.name(), 'other'}
+
+    def test_lazy_transformer_data_removed_block(self):
+        serialized_data = serialize(self.block_structure, MSGPACK_FORMAT)
+        for compact in (False, True):
+            deserialized = deserialize(serialized_data, self.block_key_factory(0), compact=compact)
+            deserialized.remove_block(self.block_key_factory(5), keep_descendants=False)
+            assert deserialized.get_transformer_block_field(self.block_key_factory(5), MockTransformer, 'odd') is None
+            assert deserialized.get_transformer_block_field(self.block_key_factory(3), MockTransformer, 'odd') == {3}
+
+    def test_repickle_lazy_transformer_data(self):
+        deserialized = deserialize(serialize(self.block_structure, MSGPACK_FORMAT), self.block_key_factory(0))
+        repickled = deserialize(serialize(deserialized, PICKLE_FORMAT), self.block_key_factory(0))
+        self.assert_deserialized(repickled)
+        assert type(repickled._block_data_map[self.block_key_factory(1)].transformer_data) is TransformerDataMap
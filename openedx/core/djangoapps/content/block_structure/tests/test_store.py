@@ -2,13 +2,19 @@
 Tests for block_structure/cache.py
 """
 
+from unittest.mock import patch
+
 import pytest
 import ddt
+from django.conf import settings
+from django.test.utils import override_settings
+from freezegun import freeze_time
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..process_cache import get_process_cache
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
@@ -76,3 +82,55 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
         assert self.mock_cache.timeout_from_last_call == 0
         self.store.add(self.block_structure)
         assert self.mock_cache.timeout_from_last_call == timeout
+
+    @override_settings(BLOCK_STRUCTURES_SETTINGS=dict(
+        settings.BLOCK_STRUCTURES_SETTINGS, PROCESS_CACHE_MAX_ENTRIES=2,
+    ))
+    def test_process_cache(self):
+        root_key = self.block_structure.root_block_usage_key
+        process_cache = get_process_cache()
+        process_cache.clear()
+
+        self.store.add(self.block_structure)
+        first_value = self.store.get(root_key)
+        assert (process_cache.hits, process_cache.misses) == (0, 1)
+
+        # The django cache is not accessed once the structure is in the process cache.
+        with patch.object(self.store, '_get_from_cache') as mock_get_from_cache:
+            second_value = self.store.get(root_key)
+        assert not mock_get_from_cache.called
+        assert (process_cache.hits, process_cache.misses) == (1, 1)
+        self.assert_block_structure(second_value, self.children_map)
+
+        # Each call returns a separate copy, which can be mutated.
+        assert first_value is not second_value
+        second_value.remove_block(self.block_key_factory(1), keep_descendants=False)
+        self.assert_block_structure(self.store.get(root_key), self.children_map)
+
+        # Updating or deleting the structure invalidates it.
+        self.store.add(self.block_structure)
+        assert len(process_cache) == 0
+        self.store.get(root_key)
+        self.store.delete(root_key)
+        assert len(process_cache) == 0
+
+    @override_settings(BLOCK_STRUCTURES_SETTINGS=dict(
+        settings.BLOCK_STRUCTURES_SETTINGS, PROCESS_CACHE_MAX_ENTRIES=2, PROCESS_CACHE_VERSION_CHECK_SECONDS=10,
+    ))
+    def test_process_cache_version_check(self):
+        root_key = self.block_structure.root_block_usage_key
+        get_process_cache().clear()
+        self.store.add(self.block_structure)
+        with freeze_time('2020-01-01 00:00:00'):
+            self.store.get(root_key)
+
+        # The stored version isn't queried while the cached version was checked recently.
+        with freeze_time('2020-01-01 00:00:10'), patch.object(self.store, '_get_model') as mock_get_model:
+            self.assert_block_structure(self.store.get(root_key), self.children_map)
+        assert not mock_get_model.called
+
+        with freeze_time('2020-01-01 00:00:11'), patch.object(
+            self.store, '_get_model', wraps=self.store._get_model,  # pylint: disable=protected-access
+        ) as mock_get_model:
+            self.assert_block_structure(self.store.get(root_key), self.children_map)
+        assert mock_get_model.called
@@ -7,6 +7,8 @@ Transformers.
 from abc import abstractmethod
 import functools
 
+from .block_structure import RemovalMaskFilter
+
 
 class BlockStructureTransformer:
     """
@@ -58,6 +60,22 @@ class BlockStructureTransformer:
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collect method supports incremental
+    # collection.  When all registered transformers support it, a
+    # published change to a few blocks of a course is collected only for
+    # the changed blocks, their descendants and their ancestors, and
+    # merged into the previously collected block structure.
+    #
+    # A transformer can support incremental collection if, when its
+    # collect method is given such a partial block structure, it
+    # collects the same data for those blocks as it would for the whole
+    # structure.  That is, the data collected for a block depends only
+    # on the block and its ancestors, and any non-block-specific data
+    # depends only on the root block.  Transformers that aggregate data
+    # of a block's descendants must not set this.
+    #
+    INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -192,6 +210,7 @@ class FilteringTransformerMixin(BlockStructureTransformer):
         methods are commonly used by implementations of transform_block_filters:
             create_universal_filter
             create_removal_filter
+            create_removal_mask_filter
 
         Note: Transformers that implement this alternative should be
         independent of all other registered transformers as they may not
@@ -213,9 +232,25 @@ class FilteringTransformerMixin(BlockStructureTransformer):
 
 
 def combine_filters(block_structure, filters):
+    """
+    Returns a filter function that 'ands' the given filters together.
+
+    Adjacent removal mask filters that remove blocks in the same way are
+    merged into a single filter.  The order of the filters is kept, since
+    a filter may depend on the blocks removed by the previous ones.
+    """
+    combined_filters = []
+    for filter_func in filters:
+        if combined_filters and isinstance(combined_filters[-1], RemovalMaskFilter) and (
+            combined_filters[-1].can_merge(filter_func)
+        ):
+            combined_filters[-1] = combined_filters[-1].merge(filter_func)
+        else:
+            combined_filters.append(filter_func)
+
     return functools.reduce(
         _filter_chain,
-        filters,
+        combined_filters,
         block_structure.create_universal_filter()
     )
 
@@ -80,6 +80,16 @@ class BlockStructureTransformers:
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def supports_incremental_collect(cls):
+        """
+        Returns whether all registered transformers support incremental
+        collection of their data.
+        """
+        return all(
+            transformer.INCREMENTAL_COLLECT for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
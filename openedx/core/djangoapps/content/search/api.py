@@ -37,10 +37,16 @@ from openedx.core.djangoapps.content.search.index_config import (
     INDEX_SEARCHABLE_ATTRIBUTES,
     INDEX_SORTABLE_ATTRIBUTES
 )
-from openedx.core.djangoapps.content.search.models import IncrementalIndexCompleted, get_access_ids_for_request
+from openedx.core.djangoapps.content.search.models import (
+    IncrementalIndexCompleted,
+    IndexedCourseVersion,
+    get_access_ids_for_request,
+)
 from openedx.core.djangoapps.content_libraries import api as lib_api
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.util.keys import BlockKey
 
 from .documents import (
     Fields,
@@ -77,6 +83,9 @@ MAX_ORGS_IN_FILTER = 1_000
 
 EXCLUDED_XBLOCK_TYPES = ['course', 'course_info']
 
+# Maximum number of documents that are updated or deleted at once by the incremental indexing of a course
+INDEX_DOCS_BATCH_SIZE = 1_000
+
 
 @contextmanager
 def _index_rebuild_lock() -> Generator[str, None, None]:
@@ -268,15 +277,24 @@ def _configure_index(index_name):
     client.index(index_name).update_ranking_rules(INDEX_RANKING_RULES)
 
 
-def _recurse_children(block, fn, status_cb: Callable[[str], None] | None = None) -> None:
+def _recurse_children(
+    block,
+    fn,
+    status_cb: Callable[[str], None] | None = None,
+    child_filter: Callable[[UsageKey], bool] | None = None,
+) -> None:
     """
     Recurse the children of an XBlock and call the given function for each
 
     The main purpose of this is just to wrap the loading of each child in
     try...except. Otherwise block.get_children() would do what we need.
+
+    If child_filter is given, only the children whose usage key it accepts are loaded.
     """
     if block.has_children:
         for child_id in block.children:
+            if child_filter is not None and not child_filter(child_id):
+                continue
             try:
                 child = block.get_child(child_id)
                 if child is None:
@@ -344,6 +362,7 @@ def reset_index(status_cb: Callable[[str], None] | None = None) -> None:
     with _using_temp_index(status_cb) as temp_index_name:
         _configure_index(temp_index_name)
         status_cb("Index recreated!")
+    IndexedCourseVersion.objects.all().delete()
     status_cb("Index reset complete.")
 
 
@@ -426,9 +445,131 @@ def index_course(course_key: CourseKey, index_name: str | None = None) -> list:
     if docs:
         # Add all the docs in this course at once (usually faster than adding one at a time):
         _wait_for_meili_task(client.index(index_name).add_documents(docs))
+    course_version = getattr(course, "course_version", None)
+    if index_name == STUDIO_INDEX_NAME and course_version is not None:
+        # Docs added to the index of a rebuild in progress are not recorded, since the rebuild may not complete.
+        IndexedCourseVersion.objects.update_or_create(
+            context_key=course_key, defaults={"structure_version": str(course_version)},
+        )
     return docs
 
 
+def update_course_index(course_key: CourseKey) -> None:
+    """
+    Updates the index for a given course, with only the blocks that were added,
+    changed or removed since it was last indexed.
+
+    The blocks are found by comparing the structure of the course that was last
+    indexed with its current structure, so only their docs are loaded and sent
+    to the index. Courses that were never indexed whole, or whose structure is
+    not versioned (not in split), are indexed whole instead.
+    """
+    store = modulestore()
+    indexed_version = IndexedCourseVersion.objects.filter(
+        context_key=course_key,
+    ).values_list("structure_version", flat=True).first()
+    if indexed_version is None or store.get_modulestore_type(course_key) != ModuleStoreEnum.Type.split:
+        index_course(course_key)
+        return
+
+    course = store.get_course(course_key)
+    if course is None:
+        raise ItemNotFoundError(course_key)
+    if str(course.course_version) == indexed_version:
+        return
+
+    split_store = store._get_modulestore_for_courselike(course_key)  # pylint: disable=protected-access
+    indexed_structure = split_store.get_structure(course_key, course_key.as_object_id(indexed_version))
+    if indexed_structure is None:
+        # The indexed structure was pruned
+        index_course(course_key)
+        return
+    changed, removed = _diff_course_structures(
+        indexed_structure, split_store.get_structure(course_key, course.course_version),
+    )
+
+    # Load only the changed blocks and their ancestors, top-down so that the breadcrumbs are cached:
+    keys_to_load = set(changed).union(*changed.values())
+    docs = []
+
+    def add_if_changed(block):
+        """ Index the given XBlock if it changed, and its changed descendants """
+        if BlockKey.from_usage_key(block.usage_key) in changed:
+            doc = searchable_doc_for_course_block(block)
+            doc.update(searchable_doc_tags(block.usage_key))
+            docs.append(doc)
+        _recurse_children(
+            block, add_if_changed, child_filter=lambda child_id: BlockKey.from_usage_key(child_id) in keys_to_load,
+        )
+
+    add_if_changed(course)
+    for start in range(0, len(docs), INDEX_DOCS_BATCH_SIZE):
+        _update_index_docs(docs[start:start + INDEX_DOCS_BATCH_SIZE])
+
+    removed_ids = [
+        meili_id_from_opaque_key(course_key.make_usage_key(block_key.type, block_key.id))
+        for block_key in sorted(removed)
+    ]
+    for start in range(0, len(removed_ids), INDEX_DOCS_BATCH_SIZE):
+        _delete_index_docs(removed_ids[start:start + INDEX_DOCS_BATCH_SIZE])
+
+    IndexedCourseVersion.objects.filter(context_key=course_key).update(structure_version=str(course.course_version))
+    log.info(f"Updated {len(docs)} and deleted {len(removed_ids)} index docs of course {course_key}")
+
+
+def _course_structure_breadcrumbs(structure: dict) -> dict:
+    """
+    Returns the breadcrumbs of the blocks of a split course structure that are
+    reachable from its root, by BlockKey, as a tuple of the (BlockKey, display
+    name) of each of their ancestors.
+    """
+    blocks = structure["blocks"]
+    breadcrumbs = {structure["root"]: ()}
+    keys_to_visit = [structure["root"]]
+    while keys_to_visit:
+        block_key = keys_to_visit.pop()
+        block = blocks[block_key]
+        display_name = block.fields.get("display_name", block.defaults.get("display_name"))
+        child_breadcrumbs = breadcrumbs[block_key] + ((block_key, display_name),)
+        for child_key in block.fields.get("children", []):
+            if child_key in blocks and child_key not in breadcrumbs:
+                breadcrumbs[child_key] = child_breadcrumbs
+                keys_to_visit.append(child_key)
+    return breadcrumbs
+
+
+def _diff_course_structures(old_structure: dict, new_structure: dict) -> tuple[dict, set]:
+    """
+    Compares two versions of the split structure of a course, and returns:
+        changed - the BlockKeys of the blocks whose index docs must be updated,
+            with the tuple of the BlockKeys of their ancestors.
+        removed - the set of BlockKeys of the blocks whose index docs must be
+            deleted.
+
+    The doc of a block must be updated if the block was added or edited (i.e.
+    its edit_info.update_version changed), or if its breadcrumbs changed, i.e.
+    it was moved or one of its ancestors was renamed. The root of the course
+    is not indexed, and neither are blocks that are not reachable from it.
+    """
+    old_blocks = old_structure["blocks"]
+    new_blocks = new_structure["blocks"]
+    old_breadcrumbs = _course_structure_breadcrumbs(old_structure)
+    new_breadcrumbs = _course_structure_breadcrumbs(new_structure)
+
+    changed = {
+        block_key: tuple(ancestor_key for ancestor_key, _ in breadcrumbs)
+        for block_key, breadcrumbs in new_breadcrumbs.items()
+        if (
+            block_key not in old_breadcrumbs
+            or breadcrumbs != old_breadcrumbs[block_key]
+            or new_blocks[block_key].edit_info.update_version != old_blocks[block_key].edit_info.update_version
+        )
+    }
+    changed.pop(new_structure["root"], None)
+    removed = set(old_breadcrumbs) - set(new_breadcrumbs) - {new_structure["root"]}
+    return changed, removed
+
+
 def rebuild_index(status_cb: Callable[[str], None] | None = None, incremental=False) -> None:  # lint-amnesty, pylint: disable=too-many-statements
     """
     Rebuild the Meilisearch index from scratch
@@ -606,6 +747,9 @@ def rebuild_index(status_cb: Callable[[str], None] | None = None, incremental=Fa
                 num_blocks_done += len(course_docs)
 
     IncrementalIndexCompleted.objects.all().delete()
+    if not incremental:
+        # The courses were indexed in the new index, so their indexed versions are unknown:
+        IndexedCourseVersion.objects.all().delete()
     status_cb(f"Done! {num_blocks_done} blocks indexed across {num_contexts_done} courses, collections and libraries.")
 
 
@@ -656,6 +800,7 @@ def delete_docs_with_context_key(key: OpaqueKey) -> None:
     Delete all docs for given context key
     """
     _delete_documents(f'{Fields.context_key} = "{key}"')
+    IndexedCourseVersion.objects.filter(context_key=key).delete()
 
 
 def _delete_documents(filter_query: str) -> None:
@@ -702,6 +847,28 @@ def _delete_index_doc(doc_id) -> None:
     _wait_for_meili_tasks(tasks)
 
 
+def _delete_index_docs(doc_ids) -> None:
+    """
+    Helper function that deletes the documents with the given IDs from the search index
+
+    If there is a rebuild in progress, the documents will also be removed from the new index.
+    """
+    if not doc_ids:
+        return
+
+    client = _get_meilisearch_client()
+    current_rebuild_index_name = _get_running_rebuild_index_name()
+
+    tasks = []
+    if current_rebuild_index_name:
+        # If there is a rebuild in progress, the documents will also be removed from the new index.
+        tasks.append(client.index(current_rebuild_index_name).delete_documents(doc_ids))
+
+    tasks.append(client.index(STUDIO_INDEX_NAME).delete_documents(doc_ids))
+
+    _wait_for_meili_tasks(tasks)
+
+
 def upsert_library_block_index_doc(usage_key: UsageKey) -> None:
     """
     Creates or updates the document for the given Library Block in the search index
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.16 on 2026-10-18 12:00
+
+from django.db import migrations, models
+import opaque_keys.edx.django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_incrementalindexcompleted'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexedCourseVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('context_key', opaque_keys.edx.django.models.LearningContextKeyField(max_length=255, unique=True)),
+                ('structure_version', models.CharField(help_text='Version (ObjectId) of the structure of the course that is in the search index.', max_length=255)),
+            ],
+        ),
+    ]
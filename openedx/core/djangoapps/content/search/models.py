@@ -77,3 +77,20 @@ class IncrementalIndexCompleted(models.Model):
         unique=True,
         null=False,
     )
+
+
+class IndexedCourseVersion(models.Model):
+    """
+    Stores the version of the structure of each course that was last indexed, so that only the blocks that changed
+    since then need to be indexed again.
+    """
+
+    context_key = LearningContextKeyField(
+        max_length=255,
+        unique=True,
+        null=False,
+    )
+    structure_version = models.CharField(
+        max_length=255,
+        help_text=_("Version (ObjectId) of the structure of the course that is in the search index."),
+    )
@@ -41,12 +41,14 @@ def upsert_xblock_index_doc(usage_key_str: str, recursive: bool) -> None:
 def upsert_course_blocks_docs(course_key_str: str) -> None:
     """
     Celery task to update the content index document for all XBlocks in a course.
+
+    Only the XBlocks that changed since the course was last indexed are updated.
     """
     course_key = CourseKey.from_string(course_key_str)
 
     log.info("Updating content index documents for XBlocks in course with id: %s", course_key)
 
-    api.index_course(course_key)
+    api.update_course_index(course_key)
 
 
 @shared_task(base=LoggedTask, autoretry_for=(MeilisearchError, ConnectionError))
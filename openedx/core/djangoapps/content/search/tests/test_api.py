@@ -29,7 +29,7 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE,
 try:
     # This import errors in the lms because content.search is not an installed app there.
     from .. import api
-    from ..models import SearchAccess, IncrementalIndexCompleted
+    from ..models import SearchAccess, IncrementalIndexCompleted, IndexedCourseVersion
 except RuntimeError:
     SearchAccess = {}
 
@@ -435,6 +435,54 @@ class TestSearchApi(ModuleStoreTestCase):
         # one missing course indexed
         assert mock_meilisearch.return_value.index.return_value.add_documents.call_count == 8
 
+    def test_update_course_index(self, mock_meilisearch) -> None:
+        """
+        Test that only the blocks that changed since a course was indexed are indexed again.
+        """
+        index = mock_meilisearch.return_value.index.return_value
+        doc_sequential = copy.deepcopy(self.doc_sequential)
+        doc_sequential["tags"] = {}
+        doc_vertical = copy.deepcopy(self.doc_vertical)
+        doc_vertical["tags"] = {}
+
+        # The course was never indexed, so it is indexed whole
+        with override_settings(MEILISEARCH_ENABLED=True):
+            api.update_course_index(self.course.id)
+        index.add_documents.assert_called_once_with([doc_sequential, doc_vertical])
+        assert IndexedCourseVersion.objects.filter(context_key=self.course.id).exists()
+
+        # Renaming the sequential changes the breadcrumbs of the vertical
+        renamed_date = datetime(2024, 6, 7, 8, 9, 10, tzinfo=timezone.utc)
+        with freeze_time(renamed_date):
+            sequential = self.store.get_item(self.sequential.location)
+            sequential.display_name = "Renamed"
+            self.store.update_item(sequential, self.user_id)
+        doc_sequential["display_name"] = "Renamed"
+        doc_sequential["modified"] = renamed_date.timestamp()
+        doc_vertical["breadcrumbs"][1]["display_name"] = "Renamed"
+        with override_settings(MEILISEARCH_ENABLED=True):
+            api.update_course_index(self.course.id)
+        index.update_documents.assert_called_once_with([doc_sequential, doc_vertical])
+        index.delete_documents.assert_not_called()
+
+        # Deleting the vertical changes the children of the sequential
+        index.update_documents.reset_mock()
+        deleted_date = datetime(2024, 7, 8, 9, 10, 11, tzinfo=timezone.utc)
+        with freeze_time(deleted_date):
+            self.store.delete_item(sequential.children[0], self.user_id)
+        doc_sequential["modified"] = deleted_date.timestamp()
+        with override_settings(MEILISEARCH_ENABLED=True):
+            api.update_course_index(self.course.id)
+        index.update_documents.assert_called_once_with([doc_sequential])
+        index.delete_documents.assert_called_once_with([doc_vertical["id"]])
+
+        # Nothing changed since the last update
+        index.update_documents.reset_mock()
+        with override_settings(MEILISEARCH_ENABLED=True):
+            api.update_course_index(self.course.id)
+        index.update_documents.assert_not_called()
+        assert index.add_documents.call_count == 1
+
     @override_settings(MEILISEARCH_ENABLED=True)
     def test_reset_meilisearch_index(self, mock_meilisearch) -> None:
         api.reset_index()
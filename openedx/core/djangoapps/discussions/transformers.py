@@ -13,6 +13,8 @@ class DiscussionsTopicLinkTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    # Nothing is collected; the topic links are read in transform.
+    INCREMENTAL_COLLECT = True
     EXTERNAL_ID = "discussions_id"
     EMBED_URL = "discussions_url"
 
@@ -1247,6 +1247,43 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     #   For more information, check https://github.com/openedx/edx-platform/pull/13388 and
     #   https://github.com/openedx/edx-platform/pull/14571.
     TASK_MAX_RETRIES=5,
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['SERIALIZATION_FORMAT']
+    # .. setting_default: 'pickle'
+    # .. setting_description: Format in which collected block structures are written to the cache
+    #   and storage. Either 'pickle' (zlib compressed pickle) or 'msgpack' (versioned binary format
+    #   with an interned usage key table and columnar block data, which is smaller and faster to
+    #   load for large courses). Data in either format is always readable, so the setting can be
+    #   changed without clearing existing block structures. The benchmark_block_structure_serialization
+    #   management command compares both formats.
+    SERIALIZATION_FORMAT='pickle',
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_MAX_ENTRIES']
+    # .. setting_default: 0
+    # .. setting_description: Maximum number of deserialized collected block structures to keep in
+    #   an in-process LRU cache, in front of the django cache. Requests for a course version that is
+    #   in the process cache skip the django cache round trip and deserialization. Entries are keyed
+    #   by course version, so outdated structures are not returned, see PROCESS_CACHE_VERSION_CHECK_SECONDS.
+    #   Set to 0 to disable.
+    #   Note: each request receives a copy of the cached structure, which is cheapest with the
+    #   block_structure.compact_representation waffle switch enabled.
+    PROCESS_CACHE_MAX_ENTRIES=0,
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_MAX_SIZE_IN_MBS']
+    # .. setting_default: None
+    # .. setting_description: Maximum total serialized size, in MBs, of the block structures kept in
+    #   the in-process cache. None for no limit other than PROCESS_CACHE_MAX_ENTRIES.
+    PROCESS_CACHE_MAX_SIZE_IN_MBS=None,
+
+    # .. setting_name: BLOCK_STRUCTURES_SETTINGS['PROCESS_CACHE_VERSION_CHECK_SECONDS']
+    # .. setting_default: 0
+    # .. setting_description: Number of seconds for which a block structure in the in-process cache is
+    #   returned without checking that it's still the stored version. Checking the version costs a
+    #   query of the stored block structure, so with 0 every request for a cached structure still
+    #   makes one query. Studio evicts the structures of a course from its process cache when the
+    #   course is published, but the LMS processes don't, so a positive value lets them return an
+    #   outdated structure for that many seconds after a new version is stored.
+    PROCESS_CACHE_VERSION_CHECK_SECONDS=0,
 )
 
 ################################ Bulk Email ################################
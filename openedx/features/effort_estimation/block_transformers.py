@@ -26,14 +26,16 @@ class EffortEstimationTransformer(BlockStructureTransformer):
     - effort_time: Our best guess at how long the block and lower will take, in seconds. We use an estimated reading
                    speed and video duration to calculate this. Just a rough guide.
 
-    If there is any missing data (like no video duration), we don't provide any estimates at all for the course.
-    We'd rather provide no estimate than a misleading estimate.
+    If there is any missing data (like no video duration) in the blocks of the course, we don't provide any estimates
+    at all for the course. We'd rather provide no estimate than a misleading estimate.
 
     This transformer requires data gathered during the collection phase (from a course publish), so it won't work
     on a course until the next publish.
     """
-    WRITE_VERSION = 1
-    READ_VERSION = 1
+    WRITE_VERSION = 2
+    READ_VERSION = 2
+    # Only leaf content is collected, and missing data is noted on the block it's missing from.
+    INCREMENTAL_COLLECT = True
 
     # Public xblock field names
     EFFORT_ACTIVITIES = 'effort_activities'
@@ -74,18 +76,17 @@ class EffortEstimationTransformer(BlockStructureTransformer):
             'video': cls._collect_video_effort,
         }
 
-        try:
-            for block_key in block_structure.topological_traversal():
-                xblock = block_structure.get_xblock(block_key)
+        for block_key in block_structure.topological_traversal():
+            xblock = block_structure.get_xblock(block_key)
 
-                if xblock.category in collections:
+            if xblock.category in collections:
+                try:
                     collections[xblock.category](block_structure, block_key, xblock, collection_cache)
-
-        except cls.MissingEstimationData:
-            # Some bit of required data is missing. Likely some duration info is missing from the video pipeline.
-            # Rather than attempt to work around it, just set a note for ourselves to not show durations for this
-            # course at all. Better no estimate than a misleading estimate.
-            block_structure.set_transformer_data(cls, cls.DISABLE_ESTIMATION, True)
+                except cls.MissingEstimationData:
+                    # Some bit of required data is missing. Likely some duration info is missing from the video
+                    # pipeline. Rather than attempt to work around it, just set a note for ourselves to not show
+                    # durations for this course at all. Better no estimate than a misleading estimate.
+                    block_structure.set_transformer_block_field(block_key, cls, cls.DISABLE_ESTIMATION, True)
 
     @classmethod
     def _collect_html_effort(cls, block_structure, block_key, xblock, _cache):
@@ -127,7 +128,11 @@ class EffortEstimationTransformer(BlockStructureTransformer):
 
         # Skip any transformation if our collection phase said to
         cls = EffortEstimationTransformer
-        if block_structure.get_transformer_data(cls, cls.DISABLE_ESTIMATION, default=False):
+        block_keys = list(block_structure.post_order_traversal())
+        if any(
+            block_structure.get_transformer_block_field(block_key, cls, cls.DISABLE_ESTIMATION, False)
+            for block_key in block_keys
+        ):
             return
 
         # These estimation methods should return a tuple of (a number in seconds, an activity count)
@@ -141,7 +146,7 @@ class EffortEstimationTransformer(BlockStructureTransformer):
         }
 
         # We're good to continue and make user-specific estimates based on collected data
-        for block_key in block_structure.post_order_traversal():
+        for block_key in block_keys:
             category = block_structure.get_xblock_field(block_key, 'category')
             if category not in estimations:
                 continue
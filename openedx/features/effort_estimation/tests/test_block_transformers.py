@@ -117,7 +117,7 @@ class TestEffortEstimationTransformer(ModuleStoreTestCase):
         assert self.get_collection_field(self.video_web_key, VIDEO_CLIP_DURATION) is None
         assert self.get_collection_field(self.html_key, HTML_WORD_COUNT) == 2
 
-        assert self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION) is None
+        assert not any(self.get_collection_field(key, DISABLE_ESTIMATION) for key in self.block_structure)
 
     def test_collection(self):
         self.collect()
@@ -128,7 +128,8 @@ class TestEffortEstimationTransformer(ModuleStoreTestCase):
         remove_video_for_course(str(self.course_key), 'edxval3')
         self.collect_and_transform()
 
-        assert self.block_structure.get_transformer_data(EffortEstimationTransformer, DISABLE_ESTIMATION) is True
+        assert self.get_collection_field(self.video_web_key, DISABLE_ESTIMATION) is True
+        assert self.get_collection_field(self.video_normal_key, DISABLE_ESTIMATION) is None
 
         assert self.block_structure.get_xblock_field(self.section_key, EFFORT_ACTIVITIES) is None
         assert self.block_structure.get_xblock_field(self.section_key, EFFORT_TIME) is None
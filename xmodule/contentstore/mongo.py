@@ -7,11 +7,14 @@ import hashlib
 import json
 import os
 
+import fs.path
 import gridfs
 import pymongo
+from bson.objectid import ObjectId
 from bson.son import SON
 from fs.osfs import OSFS
 from gridfs.errors import NoFile, FileExists
+from pymongo.errors import DuplicateKeyError
 from opaque_keys.edx.keys import AssetKey
 
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
@@ -31,13 +34,18 @@ class MongoContentStore(ContentStore):
 
     def __init__(
         self, host, db,
-        port=27017, tz_aware=True, user=None, password=None, bucket='fs', collection=None, **kwargs
+        port=27017, tz_aware=True, user=None, password=None, bucket='fs', collection=None,
+        share_copied_assets=False, **kwargs
     ):
         """
         Establish the connection with the mongo backend and connect to the collections
 
         :param collection: ignores but provided for consistency w/ other doc_store_config patterns
+        :param share_copied_assets: if True, the assets copied to another course (e.g. by a course rerun)
+            share the content of the original assets until either of them is saved again, rather than
+            having their content copied. The shared content is deleted with the last asset that uses it.
         """
+        self.share_copied_assets = share_copied_assets
         # GridFS will throw an exception if the Database is wrapped in a MongoProxy. So don't wrap it.
         self.connection_params = {
             'db': db,
@@ -121,9 +129,18 @@ class MongoContentStore(ContentStore):
         # the location as the _id, we must delete before adding (there's no replace method in gridFS)
         self.delete(content_id)  # delete is a noop if the entry doesn't exist; so, don't waste time checking
 
+        # The chunks of the previous content are kept if other assets still share them, in which
+        # case the content is written to the chunks of a new blob_id.
+        blob_id = None
+        if self.chunks.find_one({'files_id': content_id}, {'_id': 1}) is not None:
+            blob_id = ObjectId()
+
         thumbnail_location = content.thumbnail_location.to_deprecated_list_repr() if content.thumbnail_location else None  # lint-amnesty, pylint: disable=line-too-long
-        with self.fs.new_file(_id=content_id, filename=str(content.location), content_type=content.content_type,  # lint-amnesty, pylint: disable=line-too-long
-                              displayname=content.name, content_son=content_son,
+        with self.fs.new_file(_id=content_id if blob_id is None else blob_id,
+                              filename=str(content.location), content_type=content.content_type,
+                              displayname=content.name,
+                              # the file of a new blob_id isn't an asset of the course until it's saved as one
+                              content_son=content_son if blob_id is None else None,
                               thumbnail_location=thumbnail_location,
                               import_path=content.import_path,
                               # getattr b/c caching may mean some pickled instances don't have attr
@@ -150,27 +167,75 @@ class MongoContentStore(ContentStore):
                     fp.write(content.data)
                     fp.custom_md5 = hashlib.md5(content.data).hexdigest()
 
+        if blob_id is not None:
+            self._save_blob_file(blob_id, content_id, content_son)
         return content
 
+    def _save_blob_file(self, blob_id, content_id, content_son):
+        """
+        Saves the file written to the chunks of a new blob_id as the asset with the given id,
+        once all of its chunks are written.
+        """
+        blob_file = self.fs_files.find_one({'_id': blob_id})
+        self.fs_files.insert_one(dict(blob_file, _id=content_id, content_son=content_son, blob_id=blob_id))
+        self.fs_files.delete_one({'_id': blob_id})
+
     def delete(self, location_or_id):
         """
         Delete an asset.
         """
         if isinstance(location_or_id, AssetKey):
             location_or_id, _ = self.asset_db_key(location_or_id)
+        # Assets may share their content even if share_copied_assets was unset since they were copied.
+        asset = self.fs_files.find_one({'_id': location_or_id}, {'blob_id': 1})
+        if asset is not None and 'blob_id' in asset:
+            self._delete_asset_sharing_content(location_or_id, asset['blob_id'])
+            return
         # Deletes of non-existent files are considered successful
         self.fs.delete(location_or_id)
 
+    def _delete_asset_sharing_content(self, asset_id, blob_id):
+        """
+        Delete an asset whose content may be shared with other assets, and its content
+        if no other asset uses it.
+
+        The asset is deleted before looking for the other assets, and the assets copied
+        from it check that it still exists once they are inserted, so that the content
+        isn't deleted while an asset uses it.
+        """
+        self.fs_files.delete_one({'_id': asset_id})
+        if self.fs_files.count_documents(self._blob_query(blob_id), limit=1) == 0:
+            self.chunks.delete_many({'files_id': blob_id})
+
+    @staticmethod
+    def _blob_query(blob_id):
+        """
+        Returns the query of the assets that read the chunks of the given blob_id, which
+        include the asset whose id it is, unless that asset has a blob_id of its own.
+        """
+        return {'$or': [{'blob_id': blob_id}, {'_id': blob_id, 'blob_id': {'$exists': False}}]}
+
+    def _get_file(self, content_id):
+        """
+        Returns the GridOut of the asset with the given id, which reads the chunks
+        of its content.
+        """
+        fp = self.fs.get(content_id)
+        # Need to replace dict IDs with SON for chunk lookup to work under Python 3
+        # because field order can be different and mongo cares about the order
+        if isinstance(fp._id, dict):  # lint-amnesty, pylint: disable=protected-access
+            fp._file['_id'] = content_id  # lint-amnesty, pylint: disable=protected-access
+        # The chunks of an asset that shares its content with other assets belong to the blob_id.
+        if 'blob_id' in fp._file:  # lint-amnesty, pylint: disable=protected-access
+            fp._file['_id'] = fp._file['blob_id']  # lint-amnesty, pylint: disable=protected-access
+        return fp
+
     def find(self, location, throw_on_not_found=True, as_stream=False):  # lint-amnesty, pylint: disable=arguments-differ
         content_id, __ = self.asset_db_key(location)
 
         try:
             if as_stream:
-                fp = self.fs.get(content_id)
-                # Need to replace dict IDs with SON for chunk lookup to work under Python 3
-                # because field order can be different and mongo cares about the order
-                if isinstance(fp._id, dict):  # lint-amnesty, pylint: disable=protected-access
-                    fp._file['_id'] = content_id  # lint-amnesty, pylint: disable=protected-access
+                fp = self._get_file(content_id)
                 thumbnail_location = getattr(fp, 'thumbnail_location', None)
                 if thumbnail_location:
                     thumbnail_location = location.course_key.make_asset_key(
@@ -186,11 +251,7 @@ class MongoContentStore(ContentStore):
                     content_digest=getattr(fp, 'custom_md5', None),
                 )
             else:
-                with self.fs.get(content_id) as fp:
-                    # Need to replace dict IDs with SON for chunk lookup to work under Python 3
-                    # because field order can be different and mongo cares about the order
-                    if isinstance(fp._id, dict):  # lint-amnesty, pylint: disable=protected-access
-                        fp._file['_id'] = content_id  # lint-amnesty, pylint: disable=protected-access
+                with self._get_file(content_id) as fp:
                     thumbnail_location = getattr(fp, 'thumbnail_location', None)
                     if thumbnail_location:
                         thumbnail_location = location.course_key.make_asset_key(
@@ -253,13 +314,69 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.items():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
+            self._add_asset_policy(policy, asset)
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
+    def export_to_fs(self, location, export_fs, output_dir):
+        """
+        Export the asset to the given directory of a filesystem, streaming its
+        content from GridFS rather than reading it all in memory.
+
+        Args:
+            location (AssetKey): the key of the asset
+            export_fs (fs.base.FS): the filesystem to export to
+            output_dir (str): the path of the directory in `export_fs` under
+                which to put the asset file
+        """
+        content = self.find(location, as_stream=True)
+        try:
+            if content.import_path is not None:
+                output_dir = fs.path.join(output_dir, os.path.dirname(content.import_path))
+            export_fs.makedirs(output_dir, recreate=True)
+
+            # Escape invalid char from filename.
+            export_name = escape_invalid_characters(name=content.name, invalid_char_list=['/', '\\'])
+            export_fs.upload(
+                fs.path.join(output_dir, export_name),
+                content._stream,  # pylint: disable=protected-access
+            )
+        finally:
+            content.close()
+
+    def export_all_for_course_to_fs(self, course_key, export_fs, static_dir, assets_policy_path):
+        """
+        Export all of this course's assets to the static_dir of the given filesystem.
+        Export all of the assets' attributes to the policy file.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            export_fs (fs.base.FS): the filesystem to export to
+            static_dir (str): the path of the directory in `export_fs` under which to
+                put all the asset files
+            assets_policy_path (str): the path of the policy file in `export_fs`, whose
+                directory must exist
+        """
+        policy = {}
+        assets, __ = self.get_all_content_for_course(course_key)
+
+        for asset in assets:
+            self.export_to_fs(asset['asset_key'], export_fs, static_dir)
+            self._add_asset_policy(policy, asset)
+
+        with export_fs.open(assets_policy_path, 'w') as f:
+            json.dump(policy, f, sort_keys=True, indent=4)
+
+    @staticmethod
+    def _add_asset_policy(policy, asset):
+        """
+        Add the attributes of the asset to the assets policy.
+        """
+        for attr, value in asset.items():
+            if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
+
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
@@ -419,38 +536,86 @@ class MongoContentStore(ContentStore):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
 
-        This implementation fairly expensively copies all of the data
+        This implementation fairly expensively copies all of the data, unless share_copied_assets is set
         """
         source_query = query_for_course(source_course_key)
         # it'd be great to figure out how to do all of this on the db server and not pull the bits over
         for asset in self.fs_files.find(source_query):
             asset_key = self.make_id_son(asset)
+            if self.share_copied_assets:
+                asset_id, dest_asset_key = self._copied_asset_id(asset_key, dest_course_key)
+                self._copy_asset_sharing_content(asset, asset_id, dest_asset_key)
+                continue
             # don't convert from string until fs access
             source_content = self.fs.get(asset_key)
-            if isinstance(asset_key, str):
-                asset_key = AssetKey.from_string(asset_key)
-                __, asset_key = self.asset_db_key(asset_key)
             # Need to replace dict IDs with SON for chunk lookup to work under Python 3
             # because field order can be different and mongo cares about the order
             if isinstance(source_content._id, dict):  # lint-amnesty, pylint: disable=protected-access
                 source_content._file['_id'] = asset_key.copy()  # lint-amnesty, pylint: disable=protected-access
-            asset_key['org'] = dest_course_key.org
-            asset_key['course'] = dest_course_key.course
-            if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
-                if 'run' in asset_key:
-                    del asset_key['run']
-                asset_id = asset_key
-            else:  # add the run, since it's the last field, we're golden
-                asset_key['run'] = dest_course_key.run
-                asset_id = str(
-                    dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
-                )
+            # The chunks of an asset that shares its content with other assets belong to the blob_id.
+            if 'blob_id' in asset:
+                source_content._file['_id'] = asset['blob_id']  # lint-amnesty, pylint: disable=protected-access
+            asset_id, asset_key = self._copied_asset_id(asset_key, dest_course_key)
             try:
                 self.create_asset(source_content, asset_id, asset, asset_key)
             except FileExists:
                 self.fs.delete(file_id=asset_id)
                 self.create_asset(source_content, asset_id, asset, asset_key)
 
+    def _copied_asset_id(self, asset_key, dest_course_key):
+        """
+        Returns the id and the SON key of the copy in dest_course_key of the asset
+        with the given id.
+        """
+        if isinstance(asset_key, str):
+            asset_key = AssetKey.from_string(asset_key)
+            __, asset_key = self.asset_db_key(asset_key)
+        else:
+            asset_key = asset_key.copy()
+        asset_key['org'] = dest_course_key.org
+        asset_key['course'] = dest_course_key.course
+        if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
+            if 'run' in asset_key:
+                del asset_key['run']
+            asset_id = asset_key
+        else:  # add the run, since it's the last field, we're golden
+            asset_key['run'] = dest_course_key.run
+            asset_id = str(
+                dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
+            )
+        return asset_id, asset_key
+
+    def _copy_asset_sharing_content(self, asset, asset_id, asset_key):
+        """
+        Copies the asset without copying its content. Both assets read the chunks of
+        a blob_id, which are deleted with the last asset that references them, and an
+        asset that is saved again gets chunks of its own.
+        """
+        while asset is not None:
+            blob_id = asset.get('blob_id')
+            if blob_id is None:
+                # The chunks of the source asset stay where they are, as the chunks of a blob
+                # whose id is the id of the source asset.
+                blob_id = asset['_id']
+                self.fs_files.update_one(
+                    {'_id': asset['_id'], 'blob_id': {'$exists': False}}, {'$set': {'blob_id': blob_id}},
+                )
+
+            copied_asset = dict(asset, _id=asset_id, content_son=asset_key, blob_id=blob_id)
+            try:
+                self.fs_files.insert_one(copied_asset)
+            except DuplicateKeyError:
+                self.delete(asset_id)
+                self.fs_files.insert_one(copied_asset)
+
+            # The content may have been deleted if the source asset was deleted or saved again
+            # before the copy was inserted, in which case the copy is made again, if at all.
+            source_query = {'_id': asset['_id'], 'blob_id': blob_id, 'uploadDate': asset['uploadDate']}
+            if self.fs_files.count_documents(source_query, limit=1):
+                return
+            self._delete_asset_sharing_content(asset_id, blob_id)
+            asset = self.fs_files.find_one({'_id': asset['_id']})
+
     def create_asset(self, source_content, asset_id, asset, asset_key):
         """
         Creates a new asset
@@ -482,7 +647,10 @@ class MongoContentStore(ContentStore):
         matching_assets = self.fs_files.find(course_query)
         for asset in matching_assets:
             asset_key = self.make_id_son(asset)
-            self.fs.delete(asset_key)
+            if 'blob_id' in asset:
+                self._delete_asset_sharing_content(asset_key, asset['blob_id'])
+            else:
+                self.fs.delete(asset_key)
 
     # codifying the original order which pymongo used for the dicts coming out of location_to_dict
     # stability of order is more important than sanity of order as any changes to order make things
@@ -531,6 +699,13 @@ class MongoContentStore(ContentStore):
         return dbkey
 
     def ensure_indexes(self):
+        # Index needed to find the assets that share the content of a blob.
+        create_collection_index(
+            self.fs_files,
+            [('blob_id', pymongo.ASCENDING)],
+            sparse=True,
+            background=True
+        )
         # Index needed thru 'category' by `_get_all_content_for_course` and others. That query also takes a sort
         # which can be `uploadDate`, `displayname`,
         # TODO: uncomment this line once this index in prod is cleaned up. See OPS-2863 for tracking clean up.
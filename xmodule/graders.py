@@ -11,6 +11,7 @@ import sys
 from collections import OrderedDict
 from datetime import datetime
 
+import numpy as np
 from pytz import UTC
 from django.utils.translation import gettext_lazy as _
 
@@ -237,6 +238,17 @@ class CourseGrader(metaclass=abc.ABCMeta):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def grade_percents(self, grade_sheets):
+        """
+        Given a list of grade sheets, for example those of many learners,
+        returns a NumPy array of the percent that grade() returns for each of
+        them, without building their breakdowns.
+
+        Subclasses override this with vectorized computations, which must
+        return exactly the same values as grade().
+        """
+        return np.array([self.grade(grade_sheet)['percent'] for grade_sheet in grade_sheets], dtype=float)
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -292,6 +304,14 @@ class WeightedSubsectionsGrader(CourseGrader):
             'grade_breakdown': grade_breakdown
         }
 
+    def grade_percents(self, grade_sheets):
+        total_percents = np.zeros(len(grade_sheets))
+        for subgrader, _, weight in self.subgraders:
+            # Summed in the same order as in grade(), so that the results are
+            # exactly the same.
+            total_percents += subgrader.grade_percents(grade_sheets) * weight
+        return total_percents
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -453,6 +473,43 @@ class AssignmentFormatGrader(CourseGrader):
             # No grade_breakdown here
         }
 
+    def grade_percents(self, grade_sheets):
+        """
+        Vectorized version of grade() for many grade sheets.
+
+        The percents of the sections of all grade sheets are laid out in a
+        matrix with a row per grade sheet, padded with zeros up to min_count
+        (like the unreleased sections of grade()) and to the widest row. The
+        lowest scores are dropped with the same tie-breaking as in
+        total_with_drops, and the rest are summed in section order.
+        """
+        rows = [
+            [section.percent_graded for section in grade_sheet.get(self.type, {}).values()]
+            for grade_sheet in grade_sheets
+        ]
+        section_counts = np.array([max(int(float(self.min_count)), len(row)) for row in rows], dtype=int)
+        width = int(section_counts.max()) if rows else 0
+        if width == 0:
+            return np.zeros(len(rows))
+
+        percents = np.zeros((len(rows), width))
+        for row_index, row in enumerate(rows):
+            percents[row_index, :len(row)] = row
+        indices = np.broadcast_to(np.arange(width), percents.shape)
+        is_section = indices < section_counts[:, np.newaxis]
+
+        drop_counts = np.clip(self.drop_count, 0, section_counts)
+        # Rank the sections by ascending percent and, for equal percents, by
+        # descending index, leaving out the padding.
+        ranked_indices = np.lexsort((-indices, np.where(is_section, percents, np.inf)), axis=-1)
+        is_dropped = np.zeros(percents.shape, dtype=bool)
+        np.put_along_axis(is_dropped, ranked_indices, indices < drop_counts[:, np.newaxis], axis=-1)
+
+        # cumsum adds the values one by one, in the same order as grade().
+        totals = np.cumsum(np.where(is_section & ~is_dropped, percents, 0.0), axis=1)[:, -1]
+        kept_counts = section_counts - self.drop_count
+        return np.divide(totals, kept_counts, out=totals.copy(), where=kept_counts > 0)
+
 
 def _iter_graded(scores):
     """
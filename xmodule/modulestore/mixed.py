@@ -8,6 +8,7 @@ import functools
 import itertools
 import logging
 from datetime import datetime, timezone
+from collections import defaultdict
 from contextlib import contextmanager
 
 from opaque_keys import InvalidKeyError
@@ -616,6 +617,32 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except NotImplementedError:
             return None, None
 
+    def get_changed_blocks(self, course_key, from_version, to_version):
+        """
+        Returns the usage keys of the blocks of the course whose content differs
+        between the two given versions, or None if the versions can't be compared
+        block by block (including when the course's store doesn't support it).
+        """
+        try:
+            store = self._verify_modulestore_support(course_key, 'get_changed_blocks')
+            return store.get_changed_blocks(course_key, from_version, to_version)
+        except NotImplementedError:
+            return None
+
+    def prefetch_courses(self, course_keys, branch):
+        """
+        Fetches the indexes and the ``branch`` structures of the given courses in
+        batch, in each of their modulestores that supports it, so that later reads
+        of the courses in this request don't query them one by one.
+        """
+        course_keys_by_store = defaultdict(list)
+        for course_key in course_keys:
+            store = self._get_modulestore_for_courselike(course_key)
+            if hasattr(store, 'prefetch_courses'):
+                course_keys_by_store[store].append(course_key)
+        for store, store_course_keys in course_keys_by_store.items():
+            store.prefetch_courses(store_course_keys, branch)
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
@@ -0,0 +1,115 @@
+"""
+Copy-on-write map of the blocks of split structures.
+
+Versioning a structure used to deep-copy all of its blocks, although a write
+usually modifies only a few of them. A CopyOnWriteBlockMap instead shares the
+BlockData entries of the structure it was versioned from, and copies an entry
+only when it is looked up, since the caller may then modify it.
+"""
+
+
+import copy
+from collections.abc import MutableMapping
+
+
+class CopyOnWriteBlockMap(MutableMapping):
+    """
+    Map of BlockKey to BlockData for the 'blocks' of a split structure, whose
+    entries may be shared with the structure it was versioned from.
+
+    Looking up an entry (with [], get, items, values, pop, ...) returns a copy
+    of it owned by this map, which the caller may modify. Iterating over the
+    keys, membership tests and len() don't copy any entries, and neither does
+    reading the entries with iter_blocks_for_reading.
+    """
+
+    def __init__(self, blocks=None):
+        # All entries, shared or owned.
+        # dict {BlockKey: BlockData}
+        self._blocks = dict(blocks or {})
+
+        # Keys of the entries that belong to this map only.
+        # set(BlockKey)
+        self._owned = set(self._blocks)
+
+    @classmethod
+    def version_of(cls, blocks):
+        """
+        Returns a new map with the same entries as the given blocks, shared
+        with them.
+
+        Arguments:
+            blocks (dict or CopyOnWriteBlockMap) - The blocks of the structure
+                that is being versioned.
+        """
+        new_map = cls()
+        if isinstance(blocks, CopyOnWriteBlockMap):
+            new_map._blocks = dict(blocks._blocks)  # pylint: disable=protected-access
+            # The entries are now shared by both maps, so neither map may
+            # modify them in place anymore.
+            blocks._owned.clear()  # pylint: disable=protected-access
+        else:
+            new_map._blocks = dict(blocks)
+        return new_map
+
+    @classmethod
+    def version_of_structure(cls, structure):
+        """
+        Returns a new map with the same entries as the blocks of the given
+        structure, shared with them.
+
+        If the blocks of the structure are a plain dict, they are replaced by
+        a map of the same entries, so that the structure doesn't modify the
+        shared entries in place either.
+
+        Arguments:
+            structure (dict) - The structure that is being versioned.
+        """
+        if not isinstance(structure['blocks'], CopyOnWriteBlockMap):
+            structure['blocks'] = cls.version_of(structure['blocks'])
+        return cls.version_of(structure['blocks'])
+
+    def __getitem__(self, block_key):
+        block = self._blocks[block_key]
+        if block_key not in self._owned:
+            block = self._blocks[block_key] = copy.deepcopy(block)
+            self._owned.add(block_key)
+        return block
+
+    def __setitem__(self, block_key, block):
+        self._blocks[block_key] = block
+        self._owned.add(block_key)
+
+    def __delitem__(self, block_key):
+        del self._blocks[block_key]
+        self._owned.discard(block_key)
+
+    def __contains__(self, block_key):
+        return block_key in self._blocks
+
+    def __iter__(self):
+        return iter(self._blocks)
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._blocks!r})'
+
+    def shared_items(self):
+        """
+        Returns the (BlockKey, BlockData) items of the map without copying
+        the shared entries, which must therefore not be modified.
+        """
+        return self._blocks.items()
+
+
+def iter_blocks_for_reading(blocks):
+    """
+    Returns the (BlockKey, BlockData) items of the given blocks of a
+    structure, without copying any shared entries. The returned BlockData
+    must not be modified.
+    """
+    if isinstance(blocks, CopyOnWriteBlockMap):
+        return blocks.shared_items()
+    return blocks.items()
@@ -1,6 +1,8 @@
 # lint-amnesty, pylint: disable=missing-module-docstring
 
 import copy
+from collections import defaultdict
+from itertools import islice
 
 from opaque_keys.edx.locator import DefinitionLocator
 
@@ -12,16 +14,21 @@ class DefinitionLazyLoader:
     object doesn't force access during init but waits until client wants the
     definition. Only works if the modulestore is a split mongo store.
     """
-    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter):
+    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter, definition_batch=None):
         """
         Simple placeholder for yet-to-be-fetched data
         :param modulestore: the pymongo db connection with the definitions
         :param definition_locator: the id of the record in the above to fetch
+        :param definition_batch: if not None, the LazyDefinitionBatch that fetches the
+            definition along with those of other lazily loaded blocks
         """
         self.modulestore = modulestore
         self.course_key = course_key
         self.definition_locator = DefinitionLocator(block_type, definition_id)
         self.field_converter = field_converter
+        self.definition_batch = definition_batch
+        if definition_batch is not None:
+            definition_batch.add(course_key, definition_id)
 
     def fetch(self):
         """
@@ -31,5 +38,52 @@ class DefinitionLazyLoader:
         # get_definition may return a cached value perhaps from another course or code path
         # so, we copy the result here so that updates don't cross-pollinate nor change the cached
         # value in such a way that we can't tell that the definition's been updated.
-        definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
+        if self.definition_batch is not None:
+            definition = self.definition_batch.get(self.course_key, self.definition_locator.definition_id)
+        else:
+            definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
         return copy.deepcopy(definition)
+
+
+class LazyDefinitionBatch:
+    """
+    The definitions of the blocks lazily loaded by a runtime, which are fetched
+    together when the first of them is needed, in batches of at most batch_size
+    definitions, rather than with one query per block.
+    """
+    def __init__(self, modulestore, batch_size):
+        self.modulestore = modulestore
+        self.batch_size = batch_size
+
+        # Ids of the definitions yet to be fetched, in the order they were added.
+        # dict {course_key: {definition_id: None}}
+        self._pending = defaultdict(dict)
+
+        # Definitions fetched along with another one, until they're needed.
+        # dict {definition_id: definition}
+        self._fetched = {}
+
+    def add(self, course_key, definition_id):
+        """
+        Adds the id of a definition that may be needed later.
+        """
+        if definition_id not in self._fetched:
+            self._pending[course_key][definition_id] = None
+
+    def get(self, course_key, definition_id):
+        """
+        Returns the definition of the given id, or None if it doesn't exist,
+        fetching it with the next pending definitions unless it already was.
+        """
+        if definition_id not in self._fetched:
+            pending = self._pending[course_key]
+            pending.pop(definition_id, None)
+            ids = [definition_id] + list(islice(pending, self.batch_size - 1))
+            for other_id in ids[1:]:
+                del pending[other_id]
+            definitions = {
+                definition['_id']: definition for definition in self.modulestore.get_definitions(course_key, ids)
+            }
+            for fetched_id in ids:
+                self._fetched[fetched_id] = definitions.get(fetched_id)
+        return self._fetched.pop(definition_id)
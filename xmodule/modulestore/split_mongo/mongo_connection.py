@@ -9,6 +9,7 @@ import math
 import pickle
 import re
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from time import time
 
@@ -18,7 +19,7 @@ from django.db.transaction import TransactionManagementError
 import pymongo
 import pytz
 # Import this just to export it
-from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
+from pymongo.errors import BulkWriteError, DuplicateKeyError  # pylint: disable=unused-import
 from edx_django_utils import monitoring
 from edx_django_utils.cache import RequestCache
 
@@ -26,6 +27,7 @@ from common.djangoapps.split_modulestore_django.models import SplitModulestoreCo
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.copy_on_write import iter_blocks_for_reading
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 from openedx.core.lib.cache_utils import request_cached
 
@@ -140,6 +142,9 @@ class QueryTimer:
 
 TIMER = QueryTimer(__name__, 0.01)
 
+# Code of the errors of the writes of documents whose _id is already in a collection.
+DUPLICATE_KEY_ERROR_CODE = 11000
+
 
 def structure_from_mongo(structure, course_context=None):
     """
@@ -182,7 +187,7 @@ def structure_to_mongo(structure, course_context=None):
         new_structure = dict(structure)
         new_structure['blocks'] = []
 
-        for block_key, block in structure['blocks'].items():
+        for block_key, block in iter_blocks_for_reading(structure['blocks']):
             new_block = dict(block.to_storable())
             new_block.setdefault('block_type', block_key.type)
             new_block['block_id'] = block_key.id
@@ -234,6 +239,29 @@ class CourseStructureCache:
                 self.cache.delete(key)
                 return None
 
+    def get_many(self, keys, course_context=None):
+        """
+        Pull the compressed, pickled struct data of all the given keys from cache
+        in a single round trip, and deserialize it.
+
+        Returns a dict of the found keys to their structures.
+        """
+        if self.cache is None or not keys:
+            return {}
+
+        with TIMER.timer("CourseStructureCache.get_many", course_context) as tagger:
+            tagger.measure('requested_keys', len(keys))
+            structures = {}
+            for key, compressed_pickled_data in self.cache.get_many(keys).items():
+                try:
+                    structures[key] = pickle.loads(zlib.decompress(compressed_pickled_data), encoding='latin-1')
+                except Exception:  # lint-amnesty, pylint: disable=broad-except
+                    # The cached data is corrupt in some way, get rid of it.
+                    log.warning("CourseStructureCache: Bad data in cache for %s", key)
+                    self.cache.delete(key)
+            tagger.measure('found_keys', len(structures))
+            return structures
+
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
         if self.cache is None:
@@ -380,6 +408,28 @@ class MongoPersistenceBackend:
             tagger.measure("structures", len(docs))
             return docs
 
+    def get_structures(self, ids, course_context=None):
+        """
+        Return all structures specified in ``ids``, like ``get_structure`` does for a
+        single structure: cached structures are used when available, and the rest
+        are found with a single query and added to the cache.
+
+        Arguments:
+            ids (list): A list of structure ids
+        """
+        with TIMER.timer("get_structures", course_context) as tagger:
+            cache = CourseStructureCache()
+            structures = cache.get_many(ids, course_context)
+            tagger.measure("from_cache", len(structures))
+
+            missing_ids = [_id for _id in ids if _id not in structures]
+            if missing_ids:
+                for structure in self.find_structures_by_id(missing_ids, course_context):
+                    structures[structure['_id']] = structure
+                    cache.set(structure['_id'], structure, course_context)
+
+            return list(structures.values())
+
     def find_courselike_blocks_by_id(self, ids, block_type, course_context=None):
         """
         Find all structures that specified in `ids`. Among the blocks only return block whose type is `block_type`.
@@ -408,6 +458,20 @@ class MongoPersistenceBackend:
             tagger.measure("blocks", len(structure["blocks"]))
             self.structures.insert_one(structure_to_mongo(structure, course_context))
 
+    def insert_structures(self, structures, batch_size, course_context=None):
+        """
+        Insert new structures into the database, with one query per batch of
+        at most `batch_size` structures, skipping the ones that are already in
+        the database.
+        """
+        with TIMER.timer("insert_structures", course_context) as tagger:
+            tagger.measure("structures", len(structures))
+            _insert_many_in_batches(
+                self.structures,
+                [structure_to_mongo(structure, course_context) for structure in structures],
+                batch_size,
+            )
+
     def get_course_index(self, key, ignore_case=False):
         """
         Get the course_index from the persistence mechanism whose id is the given key
@@ -556,6 +620,44 @@ class MongoPersistenceBackend:
             definitions = self.definitions.find({'_id': {'$in': definitions}})
             return definitions
 
+    def get_definitions_in_batches(self, definitions, batch_size, max_workers, course_context=None):
+        """
+        Retrieve all definitions listed in `definitions`, with one query per batch
+        of at most `batch_size` definitions, running on up to `max_workers` threads.
+        """
+        batches = [definitions[i:i + batch_size] for i in range(0, len(definitions), batch_size)]
+        if not batches:
+            return []
+
+        start = time()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            results = list(executor.map(
+                lambda batch: list(self.get_definitions(batch, course_context)),
+                batches,
+            ))
+        found_definitions = [definition for result in results for definition in result]
+
+        # .. custom_attribute_name: split_mongo_batched_definitions_count
+        # .. custom_attribute_description: The number of definitions fetched by a
+        #   batched, parallel load of split modulestore definitions.
+        monitoring.set_custom_attribute('split_mongo_batched_definitions_count', len(found_definitions))
+        # .. custom_attribute_name: split_mongo_batched_definitions_batch_count
+        # .. custom_attribute_description: The number of queries, of at most
+        #   split_mongo_batched_definitions_batch_size definitions each, of a batched,
+        #   parallel load of split modulestore definitions.
+        monitoring.set_custom_attribute('split_mongo_batched_definitions_batch_count', len(batches))
+        # .. custom_attribute_name: split_mongo_batched_definitions_batch_size
+        # .. custom_attribute_description: The maximum number of definitions per query
+        #   of a batched, parallel load of split modulestore definitions.
+        monitoring.set_custom_attribute('split_mongo_batched_definitions_batch_size', batch_size)
+        # .. custom_attribute_name: split_mongo_batched_definitions_duration_ms
+        # .. custom_attribute_description: The wall time, in milliseconds, of a batched,
+        #   parallel load of split modulestore definitions.
+        monitoring.set_custom_attribute(
+            'split_mongo_batched_definitions_duration_ms', round((time() - start) * 1000),
+        )
+        return found_definitions
+
     def insert_definition(self, definition, course_context=None):
         """
         Create the definition in the db
@@ -565,6 +667,15 @@ class MongoPersistenceBackend:
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert_one(definition)
 
+    def insert_definitions(self, definitions, batch_size, course_context=None):
+        """
+        Create the definitions in the db, with one query per batch of at most
+        `batch_size` definitions, skipping the ones that are already in the db.
+        """
+        with TIMER.timer("insert_definitions", course_context) as tagger:
+            tagger.measure('definitions', len(definitions))
+            _insert_many_in_batches(self.definitions, definitions, batch_size)
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
@@ -624,6 +735,29 @@ class MongoPersistenceBackend:
             connection.close()
 
 
+def _insert_many_in_batches(collection, documents, batch_size):
+    """
+    Insert the documents into the collection with one unordered insert_many per
+    batch of at most `batch_size` documents, skipping the documents whose _id is
+    already in the collection.
+    """
+    for start in range(0, len(documents), batch_size):
+        try:
+            collection.insert_many(documents[start:start + batch_size], ordered=False)
+        except BulkWriteError as error:
+            write_errors = error.details['writeErrors']
+            duplicate_ids = [
+                write_error['op']['_id'] for write_error in write_errors
+                if write_error['code'] == DUPLICATE_KEY_ERROR_CODE
+            ]
+            if len(duplicate_ids) < len(write_errors) or error.details.get('writeConcernErrors'):
+                raise
+            # We may not have looked up these documents inside the bulk operation, and thus
+            # didn't realize that they were already in the database. That's OK, the store is
+            # append only, so if they've already been written, we can just keep going.
+            log.debug("Attempted to insert duplicate documents %s", duplicate_ids)
+
+
 class DjangoFlexPersistenceBackend(MongoPersistenceBackend):
     """
     Backend for split mongo that can read/write from MySQL and/or S3 instead of Mongo,
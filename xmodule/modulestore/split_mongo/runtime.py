@@ -19,7 +19,8 @@ from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import InheritanceMixin, inheriting_field_data
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
-from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
+from xmodule.modulestore.split_mongo.copy_on_write import iter_blocks_for_reading
+from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader, LazyDefinitionBatch
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
 from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
 from xmodule.util.misc import get_library_or_course_attribute
@@ -82,10 +83,16 @@ class SplitModuleStoreRuntime(ModuleStoreRuntime, EditInfoRuntimeMixin):  # pyli
         # Cache of block field datas, keyed by the XBlock instance (since the ScopeId changes!)
         self.block_field_datas = weakref.WeakKeyDictionary()
 
+        # The definitions of the lazily loaded blocks are fetched in batches.
+        definition_batch_size = getattr(modulestore, 'lazy_definition_batch_size', 0)
+        self._definition_batch = (
+            LazyDefinitionBatch(modulestore, definition_batch_size) if definition_batch_size > 1 else None
+        )
+
     @lazy
     def _parent_map(self):  # lint-amnesty, pylint: disable=missing-function-docstring
         parent_map = {}
-        for block_key, block in self.course_entry.structure['blocks'].items():
+        for block_key, block in iter_blocks_for_reading(self.course_entry.structure['blocks']):
             for child in block.fields.get('children', []):
                 parent_map[child] = block_key
         return parent_map
@@ -289,6 +296,7 @@ class SplitModuleStoreRuntime(ModuleStoreRuntime, EditInfoRuntimeMixin):  # pyli
                 block_key.type,
                 definition_id,
                 convert_fields,
+                definition_batch=self._definition_batch,
             )
         else:
             definition_loader = None
@@ -99,6 +99,7 @@ from xmodule.modulestore.exceptions import (
     VersionConflictError
 )
 from xmodule.modulestore.split_mongo import CourseEnvelope
+from xmodule.modulestore.split_mongo.copy_on_write import CopyOnWriteBlockMap, iter_blocks_for_reading
 from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, DjangoFlexPersistenceBackend
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
@@ -203,6 +204,24 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
     """
     _bulk_ops_record_type = SplitBulkWriteRecord
 
+    # Loads of more than definition_load_batch_size definitions are split into
+    # batches, queried on up to definition_load_workers threads (if not 0).
+    definition_load_workers = 0
+    definition_load_batch_size = 500
+
+    # If more than 1, the definitions of the blocks loaded lazily by a runtime
+    # are fetched together, in batches of at most this many definitions.
+    lazy_definition_batch_size = 0
+
+    # If not 0, the structures and definitions written at the end of a bulk
+    # operation are inserted with one query per batch of this many documents,
+    # rather than with one query each.
+    bulk_write_batch_size = 0
+
+    # Names of the request cache entries of the data fetched by prefetch_courses.
+    _PREFETCHED_INDEXES = 'split_prefetched_course_indexes'
+    _PREFETCHED_STRUCTURES = 'split_prefetched_structures'
+
     def _get_bulk_ops_record(self, course_key, ignore_case=False):
         """
         Return the :class:`.SplitBulkWriteRecord` for this course.
@@ -242,7 +261,9 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         """
         Begin a bulk write operation on course_key.
         """
-        bulk_write_record.initial_index = self.db_connection.get_course_index(course_key, ignore_case=ignore_case)
+        bulk_write_record.initial_index = self._get_prefetched_course_index(course_key, ignore_case)
+        if bulk_write_record.initial_index is None:
+            bulk_write_record.initial_index = self.db_connection.get_course_index(course_key, ignore_case=ignore_case)
         # Ensure that any edits to the index don't pollute the initial_index
         bulk_write_record.index = copy.deepcopy(bulk_write_record.initial_index)
         bulk_write_record.course_key = course_key
@@ -252,33 +273,49 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         End the active bulk write operation on structure_key (course or library key).
         """
 
-        dirty = False
+        new_structures = [
+            bulk_write_record.structures[_id]
+            for _id in bulk_write_record.structures.keys() - bulk_write_record.structures_in_db
+        ]
+        new_definitions = [
+            bulk_write_record.definitions[_id]
+            for _id in bulk_write_record.definitions.keys() - bulk_write_record.definitions_in_db
+        ]
 
         # If the content is dirty, then update the database
-        for _id in bulk_write_record.structures.keys() - bulk_write_record.structures_in_db:
-            dirty = True
+        dirty = bool(new_structures or new_definitions)
 
-            try:
-                self.db_connection.insert_structure(bulk_write_record.structures[_id], bulk_write_record.course_key)
-            except DuplicateKeyError:
-                # We may not have looked up this structure inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate structure %s", _id)
-
-        for _id in bulk_write_record.definitions.keys() - bulk_write_record.definitions_in_db:
-            dirty = True
-
-            try:
-                self.db_connection.insert_definition(bulk_write_record.definitions[_id], bulk_write_record.course_key)
-            except DuplicateKeyError:
-                # We may not have looked up this definition inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate definition %s", _id)
+        if self.bulk_write_batch_size:
+            # Batched inserts skip the documents that are already in the database, as the
+            # store is append only.
+            self.db_connection.insert_structures(
+                new_structures, self.bulk_write_batch_size, bulk_write_record.course_key,
+            )
+            self.db_connection.insert_definitions(
+                new_definitions, self.bulk_write_batch_size, bulk_write_record.course_key,
+            )
+        else:
+            for structure in new_structures:
+                try:
+                    self.db_connection.insert_structure(structure, bulk_write_record.course_key)
+                except DuplicateKeyError:
+                    # We may not have looked up this structure inside this bulk operation, and thus
+                    # didn't realize that it was already in the database. That's OK, the store is
+                    # append only, so if it's already been written, we can just keep going.
+                    log.debug("Attempted to insert duplicate structure %s", structure['_id'])
+
+            for definition in new_definitions:
+                try:
+                    self.db_connection.insert_definition(definition, bulk_write_record.course_key)
+                except DuplicateKeyError:
+                    # We may not have looked up this definition inside this bulk operation, and thus
+                    # didn't realize that it was already in the database. That's OK, the store is
+                    # append only, so if it's already been written, we can just keep going.
+                    log.debug("Attempted to insert duplicate definition %s", definition['_id'])
 
         if bulk_write_record.index is not None and bulk_write_record.index != bulk_write_record.initial_index:
             dirty = True
+            self._clear_prefetched_course_index(bulk_write_record.course_key)
 
             if bulk_write_record.initial_index is None:
                 self.db_connection.insert_course_index(bulk_write_record.index, bulk_write_record.course_key)
@@ -298,8 +335,27 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         if self._is_in_bulk_operation(course_key, ignore_case):
             return self._get_bulk_ops_record(course_key, ignore_case).index
         else:
+            index = self._get_prefetched_course_index(course_key, ignore_case)
+            if index is not None:
+                return index
             return self.db_connection.get_course_index(course_key, ignore_case)
 
+    def _get_prefetched_course_index(self, course_key, ignore_case=False):
+        """
+        Return a copy of the index for course_key fetched by :meth:`prefetch_courses`
+        earlier in the request, or None.
+        """
+        if ignore_case:
+            return None
+        index = self._get_prefetched(self._PREFETCHED_INDEXES).get(self._prefetch_key(course_key))
+        return copy.deepcopy(index)
+
+    def _clear_prefetched_course_index(self, course_key):
+        """
+        Forget the index for course_key fetched by :meth:`prefetch_courses`, if any.
+        """
+        self._get_prefetched(self._PREFETCHED_INDEXES).pop(self._prefetch_key(course_key), None)
+
     def delete_course_index(self, course_key):
         """
         Delete the course index from cache and the db
@@ -307,9 +363,11 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         if self._is_in_bulk_operation(course_key, False):
             self._clear_bulk_ops_record(course_key)
 
+        self._clear_prefetched_course_index(course_key)
         self.db_connection.delete_course_index(course_key)
 
     def insert_course_index(self, course_key, index_entry):  # lint-amnesty, pylint: disable=missing-function-docstring
+        self._clear_prefetched_course_index(course_key)
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.index = index_entry
@@ -324,6 +382,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
         Does not return anything useful.
         """
+        self._clear_prefetched_course_index(course_key)
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.index = updated_index_entry
@@ -337,7 +396,11 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
             # The structure hasn't been loaded from the db yet, so load it
             if structure is None:
-                structure = self.db_connection.get_structure(version_guid, course_key)
+                structure = self._get_prefetched(self._PREFETCHED_STRUCTURES).get(version_guid)
+                if structure is None:
+                    structure = self.db_connection.get_structure(version_guid, course_key)
+                else:
+                    structure = self._copy_prefetched_structure(structure)
                 bulk_write_record.structures[version_guid] = structure
                 if structure is not None:
                     bulk_write_record.structures_in_db.add(version_guid)
@@ -346,6 +409,9 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         else:
             # cast string to ObjectId if necessary
             version_guid = course_key.as_object_id(version_guid)
+            structure = self._get_prefetched(self._PREFETCHED_STRUCTURES).get(version_guid)
+            if structure is not None:
+                return self._copy_prefetched_structure(structure)
             return self.db_connection.get_structure(version_guid, course_key)
 
     def update_structure(self, course_key, structure):
@@ -444,7 +510,12 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
         if len(ids):  # lint-amnesty, pylint: disable=len-as-condition
             # Query the db for the definitions.
-            defs_from_db = list(self.db_connection.get_definitions(list(ids), course_key))
+            if self.definition_load_workers and len(ids) > self.definition_load_batch_size:
+                defs_from_db = self.db_connection.get_definitions_in_batches(
+                    list(ids), self.definition_load_batch_size, self.definition_load_workers, course_key,
+                )
+            else:
+                defs_from_db = list(self.db_connection.get_definitions(list(ids), course_key))
             defs_dict = {d.get('_id'): d for d in defs_from_db}
             # Add the retrieved definitions to the cache.
             bulk_write_record.definitions_in_db.update(defs_dict.keys())
@@ -476,8 +547,11 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         if bulk_write_record.active and course_key.branch in bulk_write_record.dirty_branches:
             return bulk_write_record.structure_for_branch(course_key.branch)
 
-        # Otherwise, make a new structure
-        new_structure = copy.deepcopy(structure)
+        # Otherwise, make a new structure, which shares the blocks of the
+        # original one until they're modified
+        new_structure = copy.deepcopy({key: value for key, value in structure.items() if key != 'blocks'})
+        if 'blocks' in structure:
+            new_structure['blocks'] = CopyOnWriteBlockMap.version_of_structure(structure)
         new_structure['_id'] = ObjectId()
         new_structure['previous_version'] = structure['_id']
         new_structure['edited_by'] = user_id
@@ -623,6 +697,142 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         structures.extend(self.db_connection.find_structures_by_id(list(ids)))
         return structures
 
+    def prefetch_courses(self, course_keys, branch):
+        """
+        Fetch the indexes of the given courses, and their structures for ``branch``,
+        in batched queries rather than in a few queries per course.
+
+        The indexes and structures are kept for the rest of the request and used by
+        later reads of these courses. The structures are also added to the course
+        structure cache, and to the records of the courses in an active bulk operation.
+        Every read of a kept structure gets its own copy, which the caller may modify.
+
+        Arguments:
+            course_keys (list): CourseLocators or LibraryLocators of the courses
+            branch (str): the branch whose structures to fetch
+
+        Returns:
+            a list of (structure, course_index) tuples for the courses that have ``branch``
+        """
+        course_keys = [course_key.for_branch(None).version_agnostic() for course_key in course_keys]
+        if not course_keys:
+            return []
+        course_indexes = self.find_matching_course_indexes(branch, course_keys=course_keys)
+        return self._prefetch_structures_for_indexes(course_indexes, branch)
+
+    def _prefetch_structures_for_indexes(self, course_indexes, branch):
+        """
+        Keep the given course indexes for the rest of the request, and fetch the
+        structures of their ``branch`` in batch.
+
+        Returns:
+            a list of (structure, course_index) tuples
+        """
+        id_index_map = self._prefetch_course_indexes(course_indexes, branch)
+        structures = self._prefetch_structures(list(id_index_map), branch)
+        return [
+            (structure, course_index)
+            for structure in structures
+            for course_index in id_index_map[structure['_id']]
+        ]
+
+    def _prefetch_course_indexes(self, course_indexes, branch):
+        """
+        Keep the given course indexes that have ``branch`` for the rest of the request.
+
+        Returns:
+            a dict of the ids of their ``branch`` structures to lists of their course indexes
+        """
+        # Indexes of courses in an active bulk operation may not be written yet.
+        active_keys = {self._prefetch_key(course_key) for course_key, _ in self._active_records}
+        prefetched_indexes = self._get_prefetched(self._PREFETCHED_INDEXES)
+
+        id_index_map = defaultdict(list)
+        for course_index in course_indexes:
+            version_guid = course_index['versions'].get(branch)
+            if version_guid is None:
+                continue
+            id_index_map[version_guid].append(course_index)
+            key = (course_index['org'], course_index['course'], course_index['run'])
+            if key not in active_keys:
+                prefetched_indexes[key] = course_index
+        return id_index_map
+
+    def _get_loaded_structures(self, ids):
+        """
+        Return a dict of the structures specified in ``ids`` that are already loaded,
+        by active bulk operations or by an earlier prefetch, by id. The prefetched
+        structures are copied, see :meth:`_copy_prefetched_structure`.
+        """
+        prefetched_structures = self._get_prefetched(self._PREFETCHED_STRUCTURES)
+        id_set = set(ids)
+        structures = {}
+        for _, record in self._active_records:
+            for structure in record.structures.values():
+                if structure is not None and structure['_id'] in id_set:
+                    structures[structure['_id']] = structure
+        for _id in ids:
+            if _id not in structures and _id in prefetched_structures:
+                structures[_id] = self._copy_prefetched_structure(prefetched_structures[_id])
+        return structures
+
+    @staticmethod
+    def _copy_prefetched_structure(structure):
+        """
+        Return a copy of a structure kept by :meth:`prefetch_courses`, since the kept
+        structure is shared by all the reads of the request.
+
+        The blocks of the copy are shared with the kept structure until they are
+        looked up, so that only the blocks that are read are copied.
+        """
+        structure_copy = copy.deepcopy({key: value for key, value in structure.items() if key != 'blocks'})
+        if 'blocks' in structure:
+            structure_copy['blocks'] = CopyOnWriteBlockMap.version_of_structure(structure)
+        return structure_copy
+
+    def _prefetch_structures(self, ids, branch):
+        """
+        Return the structures specified in ``ids``, preferring those of active bulk
+        operations and those already prefetched, and fetching the rest in batch.
+
+        Fetched structures are kept for the rest of the request, and added to the
+        records of active bulk operations whose ``branch`` has their id.
+        """
+        prefetched_structures = self._get_prefetched(self._PREFETCHED_STRUCTURES)
+        structures = self._get_loaded_structures(ids)
+
+        missing_ids = [_id for _id in ids if _id not in structures]
+        if missing_ids:
+            for structure in self.db_connection.get_structures(missing_ids):
+                prefetched_structures[structure['_id']] = structure
+                structures[structure['_id']] = self._copy_prefetched_structure(structure)
+
+        for _, record in self._active_records:
+            version_guid = (record.index or {}).get('versions', {}).get(branch)
+            if version_guid in structures and record.structures.get(version_guid) is None:
+                record.structures[version_guid] = structures[version_guid]
+                record.structures_in_db.add(version_guid)
+
+        return [structures[_id] for _id in ids if _id in structures]
+
+    def _get_prefetched(self, name):
+        """
+        Return the dict of the data of the given name fetched by :meth:`prefetch_courses`
+        for the rest of the request, or an empty dict if there is no request cache.
+        """
+        request_cache = getattr(self, 'request_cache', None)
+        if request_cache is None:
+            return {}
+        return request_cache.data.setdefault(name, {})
+
+    @staticmethod
+    def _prefetch_key(course_key):
+        """
+        Return the key of the course in the prefetched course indexes, which matches
+        the org, course and run fields of its index.
+        """
+        return (course_key.org, get_library_or_course_attribute(course_key), course_key.run)
+
 
 class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     """
@@ -644,13 +854,26 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None,
+                 definition_load_workers=0, definition_load_batch_size=500, lazy_definition_batch_size=0,
+                 bulk_write_batch_size=0, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param definition_load_workers: if not 0, the definitions of non-lazy loads are queried in
+            batches of at most definition_load_batch_size definitions, on up to this many threads.
+        :param lazy_definition_batch_size: if more than 1, the definitions of lazily loaded blocks
+            are fetched together when the first of them is needed, in batches of at most this many.
+        :param bulk_write_batch_size: if not 0, the structures and definitions of a bulk operation
+            (e.g. of a course import) are inserted in batches of this many documents when it ends.
         """
 
         super().__init__(contentstore, **kwargs)
 
+        self.definition_load_workers = definition_load_workers
+        self.definition_load_batch_size = definition_load_batch_size
+        self.lazy_definition_batch_size = lazy_definition_batch_size
+        self.bulk_write_batch_size = bulk_write_batch_size
+
         self.db_connection = DjangoFlexPersistenceBackend(**doc_store_config)
 
         if default_class is not None:
@@ -867,31 +1090,50 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     def _get_courselike_blocks_for_branch(self, branch, **kwargs):
         """
         Internal generator for fetching lists of courselike without loading them.
-        """
-        version_guids, id_version_map = self.collect_ids_from_matching_indexes(branch, **kwargs)
 
-        if not version_guids:
+        The indexes are prefetched for later reads of the courses. The structures
+        that were already loaded or prefetched are used as they are, but only the
+        courselike blocks of the other structures are fetched: use
+        _get_structures_for_branch to load whole structures.
+        """
+        matching_indexes = self.find_matching_course_indexes(
+            branch,
+            search_targets=None,
+            org_target=kwargs.get('org'),
+            course_keys=kwargs.get('course_keys')
+        )
+        id_version_map = self._prefetch_course_indexes(matching_indexes, branch)
+        if not id_version_map:
             return
 
         block_type = SplitMongoModuleStore.DEFAULT_ROOT_LIBRARY_BLOCK_TYPE \
             if branch == 'library' else SplitMongoModuleStore.DEFAULT_ROOT_COURSE_BLOCK_TYPE
 
-        for entry in self.find_courselike_blocks_by_id(version_guids, block_type):
-            for course_index in id_version_map[entry['_id']]:
-                yield entry, course_index
+        entries = self._get_loaded_structures(list(id_version_map))
+        missing_ids = [_id for _id in id_version_map if _id not in entries]
+        if missing_ids:
+            for entry in self.find_courselike_blocks_by_id(missing_ids, block_type):
+                entries[entry['_id']] = entry
+
+        for version_guid, course_indexes in id_version_map.items():
+            if version_guid in entries:
+                for course_index in course_indexes:
+                    yield entries[version_guid], course_index
 
     def _get_structures_for_branch(self, branch, **kwargs):
         """
         Internal generator for fetching lists of courses, libraries, etc.
-        """
-        version_guids, id_version_map = self.collect_ids_from_matching_indexes(branch, **kwargs)
-
-        if not version_guids:
-            return
 
-        for entry in self.find_structures_by_id(version_guids):
-            for course_index in id_version_map[entry['_id']]:
-                yield entry, course_index
+        The indexes and structures are prefetched, so that loading the courses
+        doesn't query them again one by one.
+        """
+        matching_indexes = self.find_matching_course_indexes(
+            branch,
+            search_targets=None,
+            org_target=kwargs.get('org'),
+            course_keys=kwargs.get('course_keys')
+        )
+        yield from self._prefetch_structures_for_indexes(matching_indexes, branch)
 
     def collect_ids_from_matching_indexes(self, branch, **kwargs):
         """
@@ -1295,7 +1537,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         :return dict: a dictionary containing mapping of block_keys against their parents.
         """
         children_to_parents = defaultdict(list)
-        for parent_key, value in structure['blocks'].items():
+        for parent_key, value in iter_blocks_for_reading(structure['blocks']):
             for child_key in value.fields.get('children', []):
                 children_to_parents[child_key].append(parent_key)
 
@@ -1484,6 +1726,43 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return usage_key, block.edit_info.original_usage_version
         return None, None
 
+    def get_changed_blocks(self, course_key, from_version, to_version):
+        """
+        Returns the usage keys of the blocks of the course whose content (fields,
+        definition, defaults or asides) differs between the two given structure
+        versions. Differences in edit_info alone are ignored, since publishing
+        updates it for all the published blocks.
+
+        Returns None if either structure is not found, or if the tree of the course
+        changed between the versions; i.e. if any block was added, removed or had
+        its children changed.
+        """
+        if not from_version or not to_version:
+            return None
+        from_structure = self.get_structure(course_key, course_key.as_object_id(from_version))
+        to_structure = self.get_structure(course_key, course_key.as_object_id(to_version))
+        if from_structure is None or to_structure is None:
+            return None
+
+        from_blocks = from_structure['blocks']
+        to_blocks = to_structure['blocks']
+        if from_blocks.keys() != to_blocks.keys():
+            return None
+
+        changed_blocks = set()
+        for block_key, to_block in to_blocks.items():
+            from_block = from_blocks[block_key]
+            if from_block.fields.get('children', []) != to_block.fields.get('children', []):
+                return None
+            if (
+                from_block.fields != to_block.fields or
+                from_block.definition != to_block.definition or
+                from_block.defaults != to_block.defaults or
+                from_block.get_asides() != to_block.get_asides()
+            ):
+                changed_blocks.add(course_key.make_usage_key(block_key.type, block_key.id))
+        return changed_blocks
+
     def create_definition_from_data(self, course_key, new_def_data, category, user_id):
         """
         Pull the definition fields out of block and save to the db as a new definition
@@ -2576,7 +2855,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         # create mapping from each child's key to its parents' keys
         child_parent_map = defaultdict(set)
-        for block_key, block_data in blocks.items():
+        for block_key, block_data in iter_blocks_for_reading(blocks):
             for child in block_data.fields.get('children', []):
                 child_parent_map[BlockKey(*child)].add(block_key)
 
@@ -3068,7 +3347,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         """
         return [
             parent_block_key
-            for parent_block_key, value in structure['blocks'].items()
+            for parent_block_key, value in iter_blocks_for_reading(structure['blocks'])
             if block_key in value.fields.get('children', [])
         ]
 
@@ -0,0 +1,100 @@
+"""
+Filesystem that streams the exported OLX of a course into a tar archive.
+
+Exports write their files to a PyFilesystem, which used to be a directory on
+disk that was then archived in a second pass. A TarExportFS instead adds each
+file to a tar archive as soon as it is written, so that a course can be
+exported straight into a (compressed) tarball, without a directory tree on
+disk.
+"""
+
+
+import io
+import tarfile
+import time
+
+from fs import errors
+from fs.memoryfs import MemoryFS
+from fs.mode import Mode
+from fs.path import normpath, relpath
+
+
+class TarExportFS(MemoryFS):
+    """
+    Write-only filesystem whose directories and files are added to a tar
+    archive when they are created and written.
+
+    Only the names of the directories and files are kept in memory, so that
+    the exporters can create and look up their directories as usual, but the
+    files can't be read back. A file must be written whole, by opening it in
+    a truncating mode ('w' or 'x') or with upload(). A file that is written
+    twice is added twice to the archive, and the last one wins on extraction.
+    """
+
+    def __init__(self, tar_file):
+        """
+        Arguments:
+            tar_file (tarfile.TarFile): the archive to write to, which may be
+                a stream (e.g. opened with mode 'w|gz').
+        """
+        super().__init__()
+        self.tar_file = tar_file
+
+    def makedir(self, path, permissions=None, recreate=False):
+        with self._lock:
+            is_new = not self.exists(path)
+            sub_fs = super().makedir(path, permissions=permissions, recreate=recreate)
+            if is_new:
+                self._add_member(path, tarfile.DIRTYPE)
+        return sub_fs
+
+    def openbin(self, path, mode='r', buffering=-1, **options):
+        _mode = Mode(mode)
+        if not _mode.writing:
+            return super().openbin(path, mode, buffering, **options)
+        if not _mode.truncate:
+            raise errors.Unsupported(f'files of a {self.__class__.__name__} can only be written whole')
+        # Creates the (empty) file, after checking that its directory exists.
+        super().openbin(path, mode, buffering, **options).close()
+        return _TarMemberFile(self, path)
+
+    def upload(self, path, file, chunk_size=None, **options):
+        """
+        Adds the content of the given seekable binary file to the archive,
+        without reading it all in memory.
+        """
+        super().openbin(path, 'wb', **options).close()
+        file.seek(0, io.SEEK_END)
+        size = file.tell()
+        file.seek(0)
+        self._add_member(path, tarfile.REGTYPE, size, file)
+
+    def _add_member(self, path, member_type, size=0, fileobj=None):
+        """
+        Adds a directory or file member to the archive.
+        """
+        tar_info = tarfile.TarInfo(relpath(normpath(path)))
+        tar_info.type = member_type
+        tar_info.mode = 0o755 if member_type == tarfile.DIRTYPE else 0o644
+        tar_info.mtime = int(time.time())
+        tar_info.size = size
+        with self._lock:
+            self.tar_file.addfile(tar_info, fileobj)
+
+
+class _TarMemberFile(io.BytesIO):
+    """
+    File of a TarExportFS, buffered in memory until it is closed.
+    """
+
+    def __init__(self, tar_fs, path):
+        super().__init__()
+        self.tar_fs = tar_fs
+        self.path = path
+
+    def close(self):
+        if not self.closed:
+            size = self.getbuffer().nbytes
+            self.seek(0)
+            self.tar_fs._add_member(self.path, tarfile.REGTYPE, size, self)  # pylint: disable=protected-access
+        super().close()
@@ -210,6 +210,76 @@ class TestContentstore(unittest.TestCase):
         __, count = self.contentstore.get_all_content_for_course(dest_course)
         assert count == 5
 
+    @ddt.data(True, False)
+    def test_copy_assets_sharing_content(self, deprecated):
+        """
+        Copied assets share the content of the source assets, which outlives either of them
+        """
+        self.set_up_assets(deprecated)
+        self.contentstore.share_copied_assets = True
+        dest_course = self.course2_key
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        __, count = self.contentstore.get_all_content_for_course(dest_course)
+        assert count == 5
+
+        filename = self.course1_files[1]
+        asset_key = self.course1_key.make_asset_key('asset', filename)
+        dest_key = dest_course.make_asset_key('asset', filename)
+        data = self.contentstore.find(asset_key).data
+        assert self.contentstore.find(dest_key).data == data
+        assert self.contentstore.chunks.count_documents({}) == len(self.course1_files) + len(self.course2_files) - 1
+
+        self.contentstore.delete(asset_key)
+        assert self.contentstore.find(dest_key).data == data
+
+        # saving the copy again gives it content of its own
+        self.save_asset(self.course2_files[1], dest_key, filename, False)
+        assert self.contentstore.find(dest_key).data != data
+        assert self.contentstore.chunks.count_documents({}) == len(self.course1_files) + len(self.course2_files) - 1
+
+    @ddt.data(True, False)
+    def test_delete_assets_sharing_content(self, deprecated):
+        """
+        The shared content is deleted with the last asset that uses it
+        """
+        self.set_up_assets(deprecated)
+        self.contentstore.share_copied_assets = True
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+
+        self.contentstore.delete_all_course_assets(self.course1_key)
+        for filename in self.course1_files:
+            self.contentstore.find(dest_course.make_asset_key('asset', filename))
+        assert self.contentstore.chunks.count_documents({}) == len(self.course1_files) + len(self.course2_files)
+
+        self.contentstore.delete_all_course_assets(dest_course)
+        assert self.contentstore.chunks.count_documents({}) == len(self.course2_files)
+
+    @ddt.data(True, False)
+    def test_save_asset_sharing_content(self, deprecated):
+        """
+        Saving an asset whose content is shared gives it content of its own, and the shared
+        content is deleted with the last asset that uses it even if assets aren't shared anymore
+        """
+        self.set_up_assets(deprecated)
+        self.contentstore.share_copied_assets = True
+        dest_course = CourseLocator('test', 'destination', 'copy')
+        self.contentstore.copy_all_course_assets(self.course1_key, dest_course)
+        self.contentstore.share_copied_assets = False
+
+        filename = self.course1_files[1]
+        asset_key = self.course1_key.make_asset_key('asset', filename)
+        dest_key = dest_course.make_asset_key('asset', filename)
+        data = self.contentstore.find(dest_key).data
+        self.save_asset(self.course1_files[2], asset_key, filename, False)
+        assert self.contentstore.find(asset_key).data != data
+        assert self.contentstore.find(dest_key).data == data
+        assert self.contentstore.chunks.count_documents({}) == len(self.course1_files) + len(self.course2_files) + 1
+
+        self.contentstore.delete(asset_key)
+        self.contentstore.delete(dest_key)
+        assert self.contentstore.chunks.count_documents({}) == len(self.course1_files) + len(self.course2_files) - 1
+
     @ddt.data(True, False)
     def test_delete_assets(self, deprecated):
         """
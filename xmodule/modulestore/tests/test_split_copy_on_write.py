@@ -0,0 +1,90 @@
+"""
+Tests for the copy-on-write map of the blocks of split structures.
+"""
+
+
+import pickle
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.copy_on_write import CopyOnWriteBlockMap, iter_blocks_for_reading
+from xmodule.modulestore.split_mongo.mongo_connection import structure_to_mongo
+
+
+class TestCopyOnWriteBlockMap(unittest.TestCase):
+    """
+    Tests for CopyOnWriteBlockMap.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course_key = BlockKey('course', 'course')
+        self.chapter_key = BlockKey('chapter', 'chapter')
+        self.blocks = {
+            self.course_key: BlockData(block_type='course', fields={'children': [self.chapter_key]}),
+            self.chapter_key: BlockData(block_type='chapter', fields={'display_name': 'Chapter'}),
+        }
+        self.block_map = CopyOnWriteBlockMap.version_of(self.blocks)
+
+    def test_shares_entries(self):
+        assert len(self.block_map) == 2
+        assert self.chapter_key in self.block_map
+        assert set(self.block_map) == set(self.blocks)
+        for block_key, block in iter_blocks_for_reading(self.block_map):
+            assert block is self.blocks[block_key]
+
+    def test_copies_looked_up_entry(self):
+        chapter = self.block_map[self.chapter_key]
+        assert chapter is not self.blocks[self.chapter_key]
+        assert chapter == self.blocks[self.chapter_key]
+        assert self.block_map.get(self.chapter_key) is chapter
+
+        chapter.fields['display_name'] = 'Changed'
+        assert self.blocks[self.chapter_key].fields['display_name'] == 'Chapter'
+        assert dict(iter_blocks_for_reading(self.block_map))[self.course_key] is self.blocks[self.course_key]
+
+    def test_set_and_delete(self):
+        new_key = BlockKey('sequential', 'new')
+        new_block = BlockData(block_type='sequential')
+        self.block_map[new_key] = new_block
+        assert self.block_map[new_key] is new_block
+
+        del self.block_map[self.chapter_key]
+        assert self.chapter_key not in self.block_map
+        assert self.chapter_key in self.blocks
+        assert self.block_map.pop(new_key) is new_block
+        assert list(self.block_map) == [self.course_key]
+
+    def test_version_of_map(self):
+        chapter = self.block_map[self.chapter_key]
+        new_map = CopyOnWriteBlockMap.version_of(self.block_map)
+
+        # Entries owned by the original map become shared, so modifying them
+        # in either map doesn't affect the other.
+        new_map[self.chapter_key].fields['display_name'] = 'New'
+        self.block_map[self.chapter_key].fields['display_name'] = 'Original'
+        assert chapter.fields['display_name'] == 'Chapter'
+        assert new_map[self.chapter_key].fields['display_name'] == 'New'
+
+    def test_version_of_structure(self):
+        structure = {'_id': ObjectId(), 'blocks': self.blocks}
+        new_map = CopyOnWriteBlockMap.version_of_structure(structure)
+
+        # The plain dict blocks of the original structure are wrapped too, so
+        # modifying them in the original doesn't affect the new map.
+        assert isinstance(structure['blocks'], CopyOnWriteBlockMap)
+        structure['blocks'][self.chapter_key].fields['display_name'] = 'Original'
+        assert new_map[self.chapter_key].fields['display_name'] == 'Chapter'
+        assert self.blocks[self.chapter_key].fields['display_name'] == 'Chapter'
+
+    def test_equality_and_pickling(self):
+        assert self.block_map == self.blocks
+        assert pickle.loads(pickle.dumps(self.block_map)) == self.blocks
+
+    def test_structure_to_mongo(self):
+        structure = {'_id': ObjectId(), 'root': self.course_key, 'blocks': self.blocks}
+        versioned_structure = dict(structure, blocks=self.block_map)
+        assert structure_to_mongo(versioned_structure) == structure_to_mongo(structure)
@@ -0,0 +1,61 @@
+"""
+Tests for the lazy loading of the definitions of split blocks.
+"""
+
+
+import unittest
+from unittest.mock import Mock
+
+from opaque_keys.edx.locator import CourseLocator
+
+from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader, LazyDefinitionBatch
+
+
+class TestLazyDefinitionBatch(unittest.TestCase):
+    """
+    Tests for fetching the definitions of DefinitionLazyLoaders with a LazyDefinitionBatch.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.course_key = CourseLocator('org', 'course', 'run')
+        self.definitions = {_id: {'_id': _id, 'fields': {'data': f'data{_id}'}} for _id in range(5)}
+        self.modulestore = Mock()
+        self.modulestore.get_definitions.side_effect = lambda course_key, ids: [
+            self.definitions[_id] for _id in ids if _id in self.definitions
+        ]
+        self.batch = LazyDefinitionBatch(self.modulestore, batch_size=2)
+
+    def make_loader(self, definition_id, definition_batch=None):
+        """
+        Returns a DefinitionLazyLoader of the given definition, fetched by the given batch.
+        """
+        return DefinitionLazyLoader(
+            self.modulestore, self.course_key, 'problem', definition_id, lambda fields: fields,
+            definition_batch=definition_batch,
+        )
+
+    def test_fetch_in_batches(self):
+        loaders = [self.make_loader(_id, self.batch) for _id in (3, 0, 1, 2)]
+        assert [loader.fetch() for loader in loaders] == [self.definitions[_id] for _id in (3, 0, 1, 2)]
+        assert [call.args for call in self.modulestore.get_definitions.call_args_list] == [
+            (self.course_key, [3, 0]),
+            (self.course_key, [1, 2]),
+        ]
+        assert not self.modulestore.get_definition.called
+
+    def test_fetch_copies_definition(self):
+        definition = self.make_loader(0, self.batch).fetch()
+        definition['fields']['data'] = 'changed'
+        assert self.definitions[0]['fields']['data'] == 'data0'
+
+    def test_missing_definition(self):
+        loader = self.make_loader(10, self.batch)
+        self.make_loader(0, self.batch)
+        assert loader.fetch() is None
+
+    def test_without_batch(self):
+        self.modulestore.get_definition.return_value = self.definitions[0]
+        assert self.make_loader(0).fetch() == self.definitions[0]
+        self.modulestore.get_definition.assert_called_once_with(self.course_key, 0)
+        assert not self.modulestore.get_definitions.called
@@ -1985,6 +1985,38 @@ class TestPublish(SplitModuleTest):
         ]
         self._check_course(source_course, dest_course, expected, [BlockKey("chapter", "chapter2"), BlockKey("problem", "problem3_2")])  # lint-amnesty, pylint: disable=line-too-long
 
+    def test_get_changed_blocks(self):
+        """
+        Test the blocks reported as changed between published versions.
+        """
+        source_course = CourseLocator(org='testx', course='GreekHero', run='run', branch=BRANCH_NAME_DRAFT)
+        dest_course = CourseLocator(org='testx', course='GreekHero', run='run', branch=BRANCH_NAME_PUBLISHED)
+        head = source_course.make_usage_key('course', "head12345")
+        modulestore().copy(self.user_id, source_course, dest_course, [head], [])
+        first_version = modulestore().get_course(dest_course).location.version_guid
+
+        # republishing an unchanged course changes no blocks
+        modulestore().copy(self.user_id, source_course, dest_course, [head], [])
+        second_version = modulestore().get_course(dest_course).location.version_guid
+        assert modulestore().get_changed_blocks(dest_course, first_version, second_version) == set()
+
+        # only the edited block is changed
+        problem = modulestore().get_item(source_course.make_usage_key('problem', 'problem1'))
+        problem.display_name = 'Problem 1 renamed'
+        modulestore().update_item(problem, self.user_id)
+        modulestore().copy(self.user_id, source_course, dest_course, [head], [])
+        third_version = modulestore().get_course(dest_course).location.version_guid
+        assert modulestore().get_changed_blocks(dest_course, second_version, third_version) == {
+            dest_course.make_usage_key('problem', 'problem1'),
+        }
+
+        # changes to the tree of the course are not reported
+        modulestore().delete_item(source_course.make_usage_key('problem', 'problem3_2'), self.user_id)
+        modulestore().copy(self.user_id, source_course, dest_course, [head], [])
+        fourth_version = modulestore().get_course(dest_course).location.version_guid
+        assert modulestore().get_changed_blocks(dest_course, third_version, fourth_version) is None
+        assert modulestore().get_changed_blocks(dest_course, None, fourth_version) is None
+
     def _check_course(self, source_course_loc, dest_course_loc, expected_blocks, unexpected_blocks):
         """
         Check that the course has the expected blocks and does not have the unexpected blocks
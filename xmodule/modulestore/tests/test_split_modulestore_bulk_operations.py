@@ -14,6 +14,7 @@ from opaque_keys.edx.locator import CourseLocator
 
 from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
 from xmodule.modulestore.split_mongo.split import SplitBulkWriteMixin
+from xmodule.modulestore.tests.utils import MemoryCache
 
 VERSION_GUID_DICT = {
     'SAMPLE_VERSION_GUID': 'deadbeef1234' * 2,
@@ -217,6 +218,23 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
             self.conn.mock_calls
         )
 
+    def test_write_in_batches_on_close(self):
+        self.bulk.bulk_write_batch_size = 100
+        self.conn.get_course_index.return_value = None
+        self.bulk._begin_bulk_operation(self.course_key)
+        self.conn.reset_mock()
+        self.bulk.update_structure(self.course_key, self.structure)
+        self.bulk.update_definition(self.course_key, self.definition)
+        other_definition = {'another': 'definition', '_id': ObjectId()}
+        self.bulk.update_definition(self.course_key, other_definition)
+        self.assertConnCalls()
+        self.bulk._end_bulk_operation(self.course_key)
+        assert not self.conn.insert_structure.called
+        assert not self.conn.insert_definition.called
+        self.conn.insert_structures.assert_called_once_with([self.structure], 100, self.course_key)
+        self.conn.insert_definitions.assert_called_once()
+        self.assertCountEqual(self.conn.insert_definitions.call_args.args[0], [self.definition, other_definition])
+
     def test_write_definition_on_close(self):
         self.conn.get_course_index.return_value = None
         self.bulk._begin_bulk_operation(self.course_key)
@@ -466,6 +484,26 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
             else:
                 assert db_definition(_id) not in results
 
+    def test_get_definitions_in_batches(self):
+        self.bulk.definition_load_workers = 2
+        self.bulk.definition_load_batch_size = 2
+        db_definitions = [{'db': 'definition', '_id': _id} for _id in [1, 2, 3]]
+        self.conn.get_definitions_in_batches.return_value = db_definitions
+
+        results = self.bulk.get_definitions(self.course_key, [1, 2, 3])
+        self.conn.get_definitions_in_batches.assert_called_once_with([1, 2, 3], 2, 2, self.course_key)
+        assert not self.conn.get_definitions.called
+        self.assertCountEqual(results, db_definitions)
+
+    def test_get_definitions_below_batch_size(self):
+        self.bulk.definition_load_workers = 2
+        self.bulk.definition_load_batch_size = 3
+        self.conn.get_definitions.return_value = []
+
+        self.bulk.get_definitions(self.course_key, [1, 2, 3])
+        self.conn.get_definitions.assert_called_once_with([1, 2, 3], self.course_key)
+        assert not self.conn.get_definitions_in_batches.called
+
     def test_get_definitions_doesnt_update_db(self):
         test_ids = [1, 2]
         db_definition = lambda _id: {'db': 'definition', '_id': _id}
@@ -478,6 +516,98 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
         assert not self.conn.insert_definition.called
 
 
+@ddt.ddt
+class TestBulkWriteMixinPrefetch(TestBulkWriteMixin):
+    """
+    Tests of prefetching courses with the bulk write mixin.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.bulk.request_cache = MemoryCache()
+        self.structure_b = {'this': 'is', 'another': 'structure', '_id': ObjectId()}
+        self.index_a = self.make_index(self.course_key, self.structure['_id'])
+        self.index_b = self.make_index(self.course_key_b, self.structure_b['_id'])
+        self.conn.find_matching_course_indexes.return_value = [self.index_a, self.index_b]
+        self.conn.get_structures.return_value = [self.structure, self.structure_b]
+
+    def make_index(self, course_key, version_guid):
+        """
+        Return a course index for the given course, with version_guid on the test branch.
+        """
+        return {
+            'org': course_key.org,
+            'course': course_key.course,
+            'run': course_key.run,
+            'versions': {'test': version_guid},
+        }
+
+    def test_prefetch_courses(self):
+        result = self.bulk.prefetch_courses([self.course_key, self.course_key_b], 'test')
+        self.assertCountEqual(result, [(self.structure, self.index_a), (self.structure_b, self.index_b)])
+        self.assertConnCalls(
+            call.find_matching_course_indexes(
+                'test', None, None,
+                course_keys=[self.course_key.for_branch(None), self.course_key_b.for_branch(None)],
+            ),
+            call.get_structures([self.structure['_id'], self.structure_b['_id']]),
+        )
+
+    def test_read_prefetched_course(self):
+        self.bulk.prefetch_courses([self.course_key, self.course_key_b], 'test')
+        self.conn.reset_mock()
+
+        assert self.bulk.get_course_index(self.course_key) == self.index_a
+        assert self.bulk.get_structure(self.course_key, self.structure['_id']) == self.structure
+        self.bulk._begin_bulk_operation(self.course_key_b)
+        assert self.bulk.get_course_index(self.course_key_b) == self.index_b
+        assert self.bulk.get_structure(self.course_key_b, self.structure_b['_id']) == self.structure_b
+        self.bulk._end_bulk_operation(self.course_key_b)
+        self.assertConnCalls()
+
+    def test_prefetched_index_is_copied(self):
+        self.bulk.prefetch_courses([self.course_key], 'test')
+        self.bulk.get_course_index(self.course_key)['versions']['test'] = ObjectId()
+        assert self.bulk.get_course_index(self.course_key) == self.index_a
+
+    def test_prefetched_structure_is_copied(self):
+        self.structure['blocks'] = {'block': {'fields': {'display_name': 'Block'}}}
+        self.bulk.prefetch_courses([self.course_key], 'test')
+        self.bulk.get_structure(self.course_key, self.structure['_id'])['blocks']['block']['fields'].clear()
+        self.bulk.get_structure(self.course_key, self.structure['_id'])['root'] = 'root'
+        structure = self.bulk.get_structure(self.course_key, self.structure['_id'])
+        assert structure['blocks']['block'] == {'fields': {'display_name': 'Block'}}
+        assert 'root' not in structure
+
+    def test_prefetch_warms_active_bulk_operation(self):
+        self.conn.get_course_index.return_value = self.index_a
+        self.bulk._begin_bulk_operation(self.course_key)
+        self.bulk.prefetch_courses([self.course_key, self.course_key_b], 'test')
+        self.conn.reset_mock()
+
+        assert self.bulk.get_structure(self.course_key, self.structure['_id']) == self.structure
+        self.bulk._end_bulk_operation(self.course_key)
+        self.assertConnCalls()
+
+        # The index of the course in the bulk operation wasn't kept
+        self.bulk.get_course_index(self.course_key)
+        self.conn.get_course_index.assert_called_once_with(self.course_key, False)
+
+    def test_write_index_clears_prefetched_index(self):
+        self.bulk.prefetch_courses([self.course_key], 'test')
+        self.bulk.update_course_index(self.course_key, self.index_entry)
+        self.conn.reset_mock()
+        self.bulk.get_course_index(self.course_key)
+        self.conn.get_course_index.assert_called_once_with(self.course_key, False)
+
+    def test_prefetch_without_request_cache(self):
+        self.bulk.request_cache = None
+        self.bulk.prefetch_courses([self.course_key], 'test')
+        self.conn.reset_mock()
+        self.bulk.get_structure(self.course_key, self.structure['_id'])
+        self.assertConnCalls(call.get_structure(self.structure['_id'], self.course_key))
+
+
 @ddt.ddt
 class TestBulkWriteMixinOpen(TestBulkWriteMixin):
     """
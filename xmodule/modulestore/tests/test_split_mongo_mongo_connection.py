@@ -2,10 +2,10 @@
 
 
 import unittest
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 import pytest
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import BulkWriteError, ConnectionFailure
 
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore.split_mongo.mongo_connection import MongoPersistenceBackend
@@ -23,3 +23,57 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
         with pytest.raises(HeartbeatFailure):
             useless_conn.heartbeat()
+
+
+class TestGetDefinitionsInBatches(unittest.TestCase):
+    """ Test fetching definitions with batched queries on multiple threads """
+
+    @patch('pymongo.mongo_client.MongoClient')
+    def test_get_definitions_in_batches(self, MockClient):  # pylint: disable=unused-argument
+        conn = MongoPersistenceBackend('useless', 'useless', 'useless')
+        with patch.object(conn, 'get_definitions', side_effect=lambda ids, course_context: iter(ids)) as mock_get:
+            result = conn.get_definitions_in_batches(list(range(5)), 2, 4)
+
+        assert sorted(result) == list(range(5))
+        self.assertCountEqual(
+            [call_args.args[0] for call_args in mock_get.call_args_list],
+            [[0, 1], [2, 3], [4]],
+        )
+
+    @patch('pymongo.mongo_client.MongoClient')
+    def test_get_no_definitions_in_batches(self, MockClient):  # pylint: disable=unused-argument
+        conn = MongoPersistenceBackend('useless', 'useless', 'useless')
+        assert conn.get_definitions_in_batches([], 2, 4) == []
+
+
+class TestInsertDefinitions(unittest.TestCase):
+    """ Test inserting definitions with batched queries """
+
+    @patch('pymongo.mongo_client.MongoClient')
+    def test_insert_definitions(self, MockClient):  # pylint: disable=unused-argument
+        conn = MongoPersistenceBackend('useless', 'useless', 'useless')
+        definitions = [{'_id': _id, 'block_type': 'html', 'fields': {}} for _id in range(5)]
+        with patch.object(conn, 'definitions') as mock_definitions:
+            conn.insert_definitions(definitions, 2)
+        assert mock_definitions.insert_many.call_args_list == [
+            call(definitions[0:2], ordered=False),
+            call(definitions[2:4], ordered=False),
+            call(definitions[4:5], ordered=False),
+        ]
+
+    @patch('pymongo.mongo_client.MongoClient')
+    def test_insert_duplicate_definitions(self, MockClient):  # pylint: disable=unused-argument
+        conn = MongoPersistenceBackend('useless', 'useless', 'useless')
+        definitions = [{'_id': _id, 'block_type': 'html', 'fields': {}} for _id in range(2)]
+        with patch.object(conn, 'definitions') as mock_definitions:
+            mock_definitions.insert_many.side_effect = BulkWriteError({
+                'writeErrors': [{'code': 11000, 'op': definitions[0]}], 'writeConcernErrors': [],
+            })
+            conn.insert_definitions(definitions, 2)
+
+            mock_definitions.insert_many.side_effect = BulkWriteError({
+                'writeErrors': [{'code': 11000, 'op': definitions[0]}, {'code': 2, 'op': definitions[1]}],
+                'writeConcernErrors': [],
+            })
+            with pytest.raises(BulkWriteError):
+                conn.insert_definitions(definitions, 2)
@@ -0,0 +1,71 @@
+"""
+Tests for tar_export.py
+"""
+
+import io
+import tarfile
+import unittest
+
+from fs import errors
+
+from xmodule.modulestore.tar_export import TarExportFS
+
+
+class TestTarExportFS(unittest.TestCase):
+    """
+    Tests for TarExportFS
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tar_buffer = io.BytesIO()
+        self.tar_file = tarfile.open(fileobj=self.tar_buffer, mode='w|gz')  # pylint: disable=consider-using-with
+        self.export_fs = TarExportFS(self.tar_file)
+
+    def _read_members(self):
+        """
+        Closes the archive and returns the content of its files, or None for
+        its directories, by name in the order of the archive.
+        """
+        self.tar_file.close()
+        self.tar_buffer.seek(0)
+        with tarfile.open(fileobj=self.tar_buffer, mode='r:gz') as tar_file:
+            return [
+                (member.name, tar_file.extractfile(member).read() if member.isfile() else None)
+                for member in tar_file.getmembers()
+            ]
+
+    def test_export(self):
+        course_dir = self.export_fs.makedir('course', recreate=True)
+        with course_dir.open('course.xml', 'wb') as course_xml:
+            course_xml.write(b'<course/>')
+        policies_dir = course_dir.makedirs('policies/run', recreate=True)
+        with policies_dir.open('policy.json', 'w') as policy:
+            policy.write('{}')
+        course_dir.makedir('static').upload('image.png', io.BytesIO(b'image'))
+
+        assert self._read_members() == [
+            ('course', None),
+            ('course/course.xml', b'<course/>'),
+            ('course/policies', None),
+            ('course/policies/run', None),
+            ('course/policies/run/policy.json', b'{}'),
+            ('course/static', None),
+            ('course/static/image.png', b'image'),
+        ]
+
+    def test_recreated_dir_is_added_once(self):
+        self.export_fs.makedir('course')
+        self.export_fs.makedir('course', recreate=True)
+        self.export_fs.makedirs('course/static', recreate=True)
+        self.export_fs.makedirs('course/static', recreate=True)
+
+        assert self._read_members() == [('course', None), ('course/static', None)]
+
+    def test_files_are_written_whole(self):
+        with self.export_fs.open('course.xml', 'wb') as course_xml:
+            course_xml.write(b'<course/>')
+        with self.assertRaises(errors.Unsupported):
+            self.export_fs.openbin('course.xml', 'ab')
+        with self.assertRaises(errors.ResourceNotFound):
+            self.export_fs.openbin('missing/course.xml', 'wb')
@@ -3,8 +3,10 @@ Tests for XML importer.
 """
 
 
+import hashlib
 import importlib
 import os
+import tempfile
 import unittest
 from uuid import uuid4
 from unittest import mock
@@ -18,7 +20,11 @@ from xblock.runtime import DictKeyValueStore, KvsFieldData, Runtime
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
-from xmodule.modulestore.xml_importer import StaticContentImporter, _update_block_location
+from xmodule.modulestore.xml_importer import (
+    StaticContentImporter,
+    _update_block_location,
+    generate_missing_thumbnails,
+)
 from xmodule.tests import DATA_DIR
 from xmodule.x_module import XModuleMixin
 
@@ -257,3 +263,63 @@ class StaticContentImporterTest(unittest.TestCase):  # lint-amnesty, pylint: dis
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.generate_thumbnail.assert_called_once()
+
+    def test_import_static_content_directory_in_parallel(self):
+        course_data_path = path(tempfile.mkdtemp())
+        self.addCleanup(course_data_path.rmtree)
+        (course_data_path / 'static' / 'inner').makedirs_p()
+        (course_data_path / 'static' / 'unchanged.txt').write_bytes(b'unchanged')
+        (course_data_path / 'static' / 'inner' / 'changed.txt').write_bytes(b'changed')
+        (course_data_path / 'static' / '.DS_Store').write_bytes(b'ignored')
+        target_id = CourseKey.from_string('course-v1:edX+DemoX+Demo_Course')
+        stored_assets = [
+            {
+                'asset_key': target_id.make_asset_key('asset', 'unchanged.txt'),
+                'custom_md5': hashlib.md5(b'unchanged').hexdigest(),
+                'displayname': 'unchanged.txt',
+                'contentType': 'text/plain',
+                'import_path': 'unchanged.txt',
+            },
+            {
+                'asset_key': target_id.make_asset_key('asset', 'inner_changed.txt'),
+                'custom_md5': hashlib.md5(b'original').hexdigest(),
+                'displayname': 'changed.txt',
+                'contentType': 'text/plain',
+                'import_path': 'inner/changed.txt',
+            },
+        ]
+        self.mocked_content_store.get_all_content_for_course.return_value = (stored_assets, len(stored_assets))
+        static_content_importer = StaticContentImporter(
+            static_content_store=self.mocked_content_store,
+            course_data_path=course_data_path,
+            target_id=target_id,
+            max_workers=2,
+            defer_thumbnails=True,
+        )
+
+        remap_dict = static_content_importer.import_static_content_directory('static')
+
+        assert remap_dict == {
+            'unchanged.txt': target_id.make_asset_key('asset', 'unchanged.txt'),
+            'inner/changed.txt': target_id.make_asset_key('asset', 'inner_changed.txt'),
+        }
+        saved_content = [call.args[0] for call in self.mocked_content_store.save.call_args_list]
+        assert [(content.import_path, content.data) for content in saved_content] == [('inner/changed.txt', b'changed')]
+        assert not self.mocked_content_store.generate_thumbnail.called
+
+    def test_generate_missing_thumbnails(self):
+        course_key = CourseKey.from_string('course-v1:edX+DemoX+Demo_Course')
+        asset_key = course_key.make_asset_key('asset', 'image.png')
+        thumbnail_location = course_key.make_asset_key('thumbnail', 'image-png.jpg')
+        self.mocked_content_store.get_all_content_for_course.return_value = ([{'asset_key': asset_key}], 1)
+        self.mocked_content_store.generate_thumbnail.return_value = (mock.Mock(), thumbnail_location)
+
+        generate_missing_thumbnails(self.mocked_content_store, course_key)
+
+        self.mocked_content_store.find.assert_called_once_with(asset_key)
+        self.mocked_content_store.generate_thumbnail.assert_called_once_with(
+            self.mocked_content_store.find.return_value
+        )
+        self.mocked_content_store.set_attr.assert_called_once_with(
+            asset_key, 'thumbnail_location', thumbnail_location.to_deprecated_list_repr()
+        )
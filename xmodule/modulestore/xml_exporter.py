@@ -4,7 +4,6 @@ Methods for exporting course data to XML
 
 
 import logging
-import os
 from abc import abstractmethod
 from json import dumps
 
@@ -110,7 +109,7 @@ class ExportManager:
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, root_fs=None):
         """
         Export all blocks from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -119,12 +118,15 @@ class ExportManager:
         `courselike_key`: The Locator of the block to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `root_fs`: The filesystem to write the exported xml to instead of `root_dir`, e.g. a
+            `TarExportFS` to export straight into a tarball, can be None
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = str(target_dir)
+        self.root_fs = root_fs
 
     @abstractmethod
     def get_key(self):
@@ -160,7 +162,7 @@ class ExportManager:
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            fsm = self.root_fs or OSFS(self.root_dir)
             root = lxml.etree.Element('unknown')
 
             # export only the published content
@@ -178,7 +180,7 @@ class ExportManager:
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            root_courselike_dir = self.root_dir + '/' + self.target_dir if self.root_fs is None else None
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
@@ -209,26 +211,22 @@ class CourseExportManager(ExportManager):
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
         set_custom_attribute("export_asset_started", str(courselike))
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makedir(AssetMetadata.EXPORTED_ASSET_DIR, recreate=True)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file, encoding='utf-8')
 
         # export the static assets
         set_custom_attribute("export_static_assets_started", str(courselike))
         policies_dir = export_fs.makedir('policies', recreate=True)
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
+            self.contentstore.export_all_for_course_to_fs(
+                self.courselike_key, export_fs, 'static', 'policies/assets.json',
             )
 
             # If we are using the default course image, export it to the
@@ -244,10 +242,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    output_dir = export_fs.makedirs('static/images', recreate=True)
+                    with output_dir.open('course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -339,10 +335,8 @@ class LibraryExportManager(ExportManager):
         export_fs.makedir('policies', recreate=True)
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
+            self.contentstore.export_all_for_course_to_fs(
+                self.courselike_key, export_fs, 'static', 'policies/assets.json',
             )
 
     def post_process(self, root, export_fs):
@@ -358,18 +352,18 @@ class LibraryExportManager(ExportManager):
         xml_file.close()
 
 
-def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
+def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir, root_fs=None):
     """
     Thin wrapper for the Course Export Manager. See ExportManager for details.
     """
-    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir).export()
+    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir, root_fs=root_fs).export()
 
 
-def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir):
+def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir, root_fs=None):
     """
     Thin wrapper for the Library Export Manager. See ExportManager for details.
     """
-    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
+    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir, root_fs=root_fs).export()
 
 
 def adapt_references(subtree, destination_course_key, export_fs):
@@ -21,12 +21,14 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
 
+import hashlib
 import json
 import logging
 import mimetypes
 import os
 import re
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import xblock
@@ -121,10 +123,18 @@ class LocationMixin(XBlockMixin):
 
 
 class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docstring
-    def __init__(self, static_content_store, course_data_path, target_id):
+    def __init__(self, static_content_store, course_data_path, target_id, max_workers=0, defer_thumbnails=False):
+        """
+        `max_workers`: if not 0, the files of a directory are imported on up to this many threads,
+            skipping the files whose asset is already stored with the same content and attributes.
+        `defer_thumbnails`: if True, the thumbnails of the imported images aren't generated, so that
+            they can be generated in the background after the import (see generate_missing_thumbnails).
+        """
         self.static_content_store = static_content_store
         self.target_id = target_id
         self.course_data_path = course_data_path
+        self.max_workers = max_workers
+        self.defer_thumbnails = defer_thumbnails
         try:
             with open(course_data_path / 'policies/assets.json') as f:
                 self.policy = json.load(f)
@@ -138,9 +148,25 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
         self.mimetypes_list = list(mimetypes.types_map.values())
 
     def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):  # lint-amnesty, pylint: disable=missing-function-docstring
+        static_dir = self.course_data_path / content_subdir
+        if self.max_workers:
+            return self._import_static_files_in_parallel(self._static_file_paths(static_dir, verbose), static_dir)
+
         remap_dict = {}
+        for file_path in self._static_file_paths(static_dir, verbose):
+            imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
 
-        static_dir = self.course_data_path / content_subdir
+            if imported_file_attrs:
+                # store the remapping information which will be needed
+                # to subsitute in the module data
+                remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+
+        return remap_dict
+
+    def _static_file_paths(self, static_dir, verbose):
+        """
+        Yields the paths of the files of the static directory to import.
+        """
         for dirname, _, filenames in os.walk(static_dir):
             for filename in filenames:
 
@@ -154,16 +180,61 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
                 if verbose:
                     log.debug('importing static content %s...', file_path)
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+                yield file_path
 
-                if imported_file_attrs:
-                    # store the remapping information which will be needed
-                    # to subsitute in the module data
-                    remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+    def _import_static_files_in_parallel(self, file_paths, base_dir):
+        """
+        Imports the static files on up to max_workers threads, and returns the
+        remapping of their subpaths to their asset keys.
 
-        return remap_dict
+        The files whose asset is already stored with the same content digest
+        and attributes, e.g. when a course is imported again, aren't uploaded.
+        """
+        stored_assets = {
+            asset['asset_key'].block_id: asset
+            for asset in self.static_content_store.get_all_content_for_course(self.target_id)[0]
+        }
+
+        def import_file(file_path):
+            static_file = self._read_static_file(file_path, base_dir)
+            if static_file is None:
+                return None
+            file_subpath, content = static_file
+            if self._is_stored(content, stored_assets.get(content.location.block_id)):
+                log.debug('Course import %s: skipping unchanged static content %s', self.target_id, file_subpath)
+            else:
+                self._save_static_content(content, file_subpath)
+            return file_subpath, content.location
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(attrs for attrs in executor.map(import_file, file_paths) if attrs)
+
+    @staticmethod
+    def _is_stored(content, stored_asset):
+        """
+        Returns whether the asset is already stored with the same content and attributes.
+        """
+        return stored_asset is not None and (
+            stored_asset.get('custom_md5') == hashlib.md5(content.data).hexdigest()
+            and stored_asset.get('displayname') == content.name
+            and stored_asset.get('contentType') == content.content_type
+            and stored_asset.get('import_path') == content.import_path
+            and stored_asset.get('locked', False) == content.locked
+        )
 
     def import_static_file(self, full_file_path, base_dir):  # lint-amnesty, pylint: disable=missing-function-docstring
+        static_file = self._read_static_file(full_file_path, base_dir)
+        if static_file is None:
+            return None
+        file_subpath, content = static_file
+        self._save_static_content(content, file_subpath)
+        return file_subpath, content.location
+
+    def _read_static_file(self, full_file_path, base_dir):
+        """
+        Reads the static file, and returns its subpath and its StaticContent, or
+        None if the file should be ignored.
+        """
         filename = os.path.basename(full_file_path)
         try:
             with open(full_file_path, 'rb') as f:
@@ -199,12 +270,18 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
             asset_key, displayname, mime_type, data,
             import_path=file_subpath, locked=locked
         )
+        return file_subpath, content
 
-        # first let's save a thumbnail so we can get back a thumbnail location
-        thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
+    def _save_static_content(self, content, file_subpath):
+        """
+        Saves the static content, with its thumbnail unless thumbnails are deferred.
+        """
+        if not self.defer_thumbnails:
+            # first let's save a thumbnail so we can get back a thumbnail location
+            thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
 
-        if thumbnail_content is not None:
-            content.thumbnail_location = thumbnail_location
+            if thumbnail_content is not None:
+                content.thumbnail_location = thumbnail_location
 
         # then commit the content
         try:
@@ -214,7 +291,22 @@ class StaticContentImporter:  # lint-amnesty, pylint: disable=missing-class-docs
             log.exception(f'Course import {self.target_id}: {msg}')
             monitor_import_failure(self.target_id, 'Updating', exception=err)
 
-        return file_subpath, asset_key
+
+def generate_missing_thumbnails(static_content_store, course_key):
+    """
+    Generates the thumbnails of the image assets of the course that have none,
+    e.g. because their generation was deferred during the import of the course.
+    """
+    assets, __ = static_content_store.get_all_content_for_course(
+        course_key, filter_params={'contentType': {'$regex': '^image/'}, 'thumbnail_location': None},
+    )
+    for asset in assets:
+        content = static_content_store.find(asset['asset_key'])
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+        if thumbnail_content is not None:
+            static_content_store.set_attr(
+                asset['asset_key'], 'thumbnail_location', thumbnail_location.to_deprecated_list_repr(),
+            )
 
 
 class ImportManager:
@@ -258,6 +350,9 @@ class ImportManager:
         python_lib_filename: The filename of the courselike's python library. Course authors can optionally
             create this file to implement custom logic in their course.
 
+        static_content_workers, defer_thumbnails: are arguments for constructing the StaticContentImporter
+            (see its doc)
+
         default_class, load_error_blocks: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -271,6 +366,7 @@ class ImportManager:
             create_if_not_present=False, raise_on_failure=False,
             static_content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR,
             python_lib_filename='python_lib.zip',
+            static_content_workers=0, defer_thumbnails=False,
     ):
         self.store = store
         self.user_id = user_id
@@ -286,6 +382,8 @@ class ImportManager:
         self.do_import_python_lib = do_import_python_lib
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_content_workers = static_content_workers
+        self.defer_thumbnails = defer_thumbnails
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -319,7 +417,9 @@ class ImportManager:
         static_content_importer = StaticContentImporter(
             self.static_content_store,
             course_data_path=data_path,
-            target_id=dest_id
+            target_id=dest_id,
+            max_workers=self.static_content_workers,
+            defer_thumbnails=self.defer_thumbnails,
         )
         if self.do_import_static:
             if self.verbose:
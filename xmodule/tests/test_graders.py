@@ -3,6 +3,7 @@ Grading tests
 """
 
 
+import random
 import unittest
 from datetime import datetime, timedelta
 import pytest
@@ -267,6 +268,64 @@ class GraderTest(unittest.TestCase):
         assert len(graded['section_breakdown']) == 0
         assert len(graded['grade_breakdown']) == 0
 
+    def _random_gradesheet(self, rand):
+        """
+        Returns a gradesheet with random scores, including ties and zeros.
+        """
+        return {
+            section_type: {
+                f'{section_type}{index}': self.MockGrade(
+                    AggregatedScore(
+                        tw_earned=rand.choice([0, 1, 2, 3, 1.5]),
+                        tw_possible=rand.choice([3, 3.0, 7]),
+                        **self.common_fields
+                    ),
+                    location=f'location_{section_type}{index}_mock',
+                    display_name=f'{section_type}{index}',
+                )
+                for index in range(rand.randint(0, 14))
+            }
+            for section_type in ('Homework', 'Lab', 'Midterm')
+        }
+
+    @ddt.data(
+        ('Homework', 12, 2),
+        ('Homework', 12, 0),
+        ('Lab', 3, 2),
+        ('Lab', 7, 3),
+        ('Lab', 0, 20),
+        ('Midterm', 1, 0),
+        ('Midterm', 0, 0),
+    )
+    @ddt.unpack
+    def test_assignment_format_grade_percents(self, section_type, min_count, drop_count):
+        grader = graders.AssignmentFormatGrader(section_type, min_count, drop_count)
+        rand = random.Random(section_type + str(min_count) + str(drop_count))
+        gradesheets = [self.empty_gradesheet, self.incomplete_gradesheet, self.test_gradesheet]
+        gradesheets += [self._random_gradesheet(rand) for _ in range(50)]
+
+        # Exactly the same values, not just approximately.
+        assert grader.grade_percents(gradesheets).tolist() == [
+            grader.grade(gradesheet)['percent'] for gradesheet in gradesheets
+        ]
+        assert grader.grade_percents([]).tolist() == []
+
+    def test_weighted_subsections_grade_percents(self):
+        weighted_grader = graders.grader_from_conf([
+            {'type': "Homework", 'min_count': 12, 'drop_count': 2, 'weight': 0.15},
+            {'type': "Lab", 'min_count': '7', 'drop_count': 3, 'weight': 0.15},
+            {'type': "Midterm", 'min_count': 1, 'drop_count': 0, 'weight': 0.3},
+            {'type': "Final", 'min_count': 1, 'drop_count': 0, 'weight': 0.4},
+        ])
+        rand = random.Random(0)
+        gradesheets = [self.empty_gradesheet, self.incomplete_gradesheet, self.test_gradesheet]
+        gradesheets += [self._random_gradesheet(rand) for _ in range(100)]
+
+        assert weighted_grader.grade_percents(gradesheets).tolist() == [
+            weighted_grader.grade(gradesheet)['percent'] for gradesheet in gradesheets
+        ]
+        assert graders.WeightedSubsectionsGrader([]).grade_percents(gradesheets).tolist() == [0.0] * len(gradesheets)
+
     def test_grade_with_string_min_count(self):
         """
         Test that the grading succeeds in case the min_count is set to a string